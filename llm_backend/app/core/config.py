@@ -15,6 +15,8 @@ class Settings(BaseSettings):
     DEEPSEEK_API_KEY: str
     DEEPSEEK_BASE_URL: str
     DEEPSEEK_MODEL: str
+    DEEPSEEK_RPM: int = 0  # 每分钟请求数上限，0 表示不限制
+    DEEPSEEK_TPM: int = 0  # 每分钟 token 数上限，0 表示不限制
     
     # Vision Model settings (独立配置)
     VISION_API_KEY: str
@@ -27,6 +29,8 @@ class Settings(BaseSettings):
     OLLAMA_REASON_MODEL: str
     OLLAMA_EMBEDDING_MODEL: str
     OLLAMA_AGENT_MODEL: str
+    OLLAMA_RPM: int = 0  # 每个模型每分钟请求数上限，0 表示不限制
+    OLLAMA_TPM: int = 0  # 每个模型每分钟 token 数上限，0 表示不限制
     # Service selection
     CHAT_SERVICE: ServiceType = ServiceType.DEEPSEEK
     REASON_SERVICE: ServiceType = ServiceType.OLLAMA
@@ -48,6 +52,11 @@ class Settings(BaseSettings):
     NEO4J_USERNAME: str = "neo4j"
     NEO4J_PASSWORD: str = "password"
     NEO4J_DATABASE: str = "neo4j"
+    NEO4J_MAX_CONNECTION_POOL_SIZE: int = 50  # 异步查询驱动的连接池上限
+    NEO4J_QUERY_TIMEOUT: float = 30  # 单条 Cypher 查询的超时时间(秒)，0 表示不限制
+    NEO4J_VALUE_MAPPING_INDEXES: bool = False  # 启动时为字符串属性创建小写全文索引，加速 Cypher 取值校验
+    NEO4J_VALUE_MAPPING_CACHE_SIZE: int = 10000  # 缓存已确认存在的属性取值数量
+    NEO4J_SCHEMA_REFRESH_INTERVAL: int = 600  # 定时重新读取图谱结构的间隔(秒)，0 表示不定时刷新
     
     # JWT settings
     SECRET_KEY: str = "your-secret-key"  # 在生产环境中使用安全的密钥
@@ -60,12 +69,18 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_PASSWORD: str = ""
     REDIS_CACHE_EXPIRE: int = 3600
+    REDIS_MAX_CONNECTIONS: int = 50  # 共享异步连接池的最大连接数
     REDIS_CACHE_THRESHOLD: float = 0.8
+    REDIS_CACHE_INDEX_TYPE: str = "matrix"  # 语义缓存向量索引: matrix(精确) 或 hnsw(近似, 需要 faiss)
     
     # Embedding settings 
     EMBEDDING_TYPE: str = "ollama"  # ollama 或 sentence_transformer
     EMBEDDING_MODEL: str = "bge-m3"  # ollama embedding模型
     EMBEDDING_THRESHOLD: float = 0.90  # 语义相似度阈值
+    EMBEDDING_CACHE_SIZE: int = 4096  # 共享向量化客户端的 LRU 缓存条数
+    EMBEDDING_BATCH_SIZE: int = 32  # 合并请求时单次批量的最大文本数
+    EMBEDDING_BATCH_WAIT_MS: float = 5  # 合并并发请求的等待窗口(毫秒)
+    CYPHER_EXAMPLE_RETRIEVER: str = "embedding"  # Cypher 示例检索方式：embedding(向量相似度) 或 northwind(关键词匹配)
     
     # GraphRAG settings
     GRAPHRAG_PROJECT_DIR: str = "llm_backend/app/graphrag"  # GraphRAG项目目录
@@ -74,6 +89,22 @@ class Settings(BaseSettings):
     GRAPHRAG_RESPONSE_TYPE: str = "text"                    # 响应类型
     GRAPHRAG_COMMUNITY_LEVEL: int = 3                       # 社区级别
     GRAPHRAG_DYNAMIC_COMMUNITY: bool = False                # 是否动态选择社区
+    GRAPHRAG_MAX_CONCURRENT_INDEX_JOBS: int = 2             # 同时运行的索引构建任务数(不同用户之间)
+    GRAPHRAG_CACHE_ENABLED: bool = True                     # 是否缓存 GraphRAG 查询结果
+    GRAPHRAG_CACHE_THRESHOLD: float = 0.95                  # 查询结果语义缓存的相似度阈值
+    GRAPHRAG_CACHE_EXPIRE: int = 24 * 3600                  # 查询结果缓存过期时间(秒)
+    GRAPHRAG_CACHE_MAX_SIZE: int = 5000                     # 每个索引版本最多缓存的查询条数
+    INDEXING_WORKERS: int = 2                               # 后台索引任务 worker 数
+    INDEXING_BATCH_SIZE: int = 20                           # 每个 worker 单次领取的最大任务数
+    INDEXING_POLL_INTERVAL: float = 5                       # worker 轮询任务表的间隔(秒)
+    INDEXING_JOB_LEASE: float = 120                         # 任务租约时长(秒)，超过该时间未续约的 running 任务会重新排队
+    
+    # LangGraph settings
+    LANGGRAPH_CHECKPOINTER: str = "sqlite"                  # 会话状态存储: memory / sqlite(单机) / mysql(多机)
+    LANGGRAPH_CHECKPOINT_DB: str = "data/langgraph_checkpoints.db"  # sqlite 文件路径，相对路径基于 llm_backend 目录
+    LANGGRAPH_CHECKPOINT_TTL: int = 7 * 24 * 3600           # 会话闲置多久后清理(秒)，0 表示不清理
+    LANGGRAPH_CHECKPOINT_CLEANUP_INTERVAL: int = 3600       # 清理闲置会话的间隔(秒)
+    LANGGRAPH_CHECKPOINT_COMPRESS_THRESHOLD: int = 1024     # 超过该字节数的状态数据用 zlib 压缩，0 表示不压缩
     
     @property
     def DATABASE_URL(self) -> str:
@@ -0,0 +1,115 @@
+from typing import Any, Dict, List, Optional
+from langchain_core.callbacks import AsyncCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.rate_limiters import BaseRateLimiter
+from graphrag.index.utils.tokens import num_tokens_from_string
+from graphrag.language_model.rate_limiter import (
+    RateLimitReservation,
+    TokenBucketLimiter,
+    get_rate_limiter,
+)
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(service="llm_rate_limit")
+
+
+def deepseek_rate_limiter(model: Optional[str] = None) -> TokenBucketLimiter:
+    """获取 DeepSeek 模型的限流器，与 GraphRAG 中调用同一接口和模型的请求共用"""
+    return get_rate_limiter(
+        settings.DEEPSEEK_BASE_URL,
+        model or settings.DEEPSEEK_MODEL,
+        settings.DEEPSEEK_RPM,
+        settings.DEEPSEEK_TPM,
+    )
+
+
+def ollama_rate_limiter(model: str) -> TokenBucketLimiter:
+    """获取 Ollama 上某个模型的限流器"""
+    return get_rate_limiter(
+        settings.OLLAMA_BASE_URL,
+        model,
+        settings.OLLAMA_RPM,
+        settings.OLLAMA_TPM,
+    )
+
+
+def estimate_message_tokens(messages: List[Dict]) -> int:
+    """估算一组对话消息的 token 数，只用于限流时预占额度"""
+    return sum(
+        num_tokens_from_string(message["content"])
+        for message in messages
+        if isinstance(message.get("content"), str)
+    )
+
+
+async def acquire_rate_limit(limiter: TokenBucketLimiter, messages: List[Dict], max_tokens: int = 0) -> RateLimitReservation:
+    """等待限流器放行一次请求
+
+    按消息估算的 token 数预占额度，拿到回复后用 settle_usage 或 settle_completion 按实际用量修正。
+    优先级取自当前上下文，默认是交互请求，后台索引任务会排在交互请求之后。
+    """
+    tokens = estimate_message_tokens(messages) + max_tokens if limiter.tokens_per_minute > 0 else 0
+    return await limiter.acquire(tokens)
+
+
+def settle_usage(reservation: RateLimitReservation, response: Any):
+    """按 OpenAI 接口返回的 usage 修正预占的 token 数"""
+    usage = getattr(response, "usage", None)
+    if usage is not None and usage.total_tokens:
+        reservation.settle(usage.total_tokens)
+
+
+def settle_completion(reservation: RateLimitReservation, completion: str):
+    """流式回复没有 usage 信息，按生成的文本估算并补扣 token"""
+    if completion and reservation.limiter.tokens_per_minute > 0:
+        reservation.settle(reservation.tokens + num_tokens_from_string(completion))
+
+
+class LangChainRateLimiter(BaseRateLimiter):
+    """让 LangChain 聊天模型在发送请求前经过共享限流器
+
+    LangChain 的限流接口拿不到请求内容，所以这里只按请求数放行，
+    token 在模型返回后由 RateLimitUsageHandler 按实际用量扣除。
+    """
+
+    def __init__(self, limiter: TokenBucketLimiter):
+        self.limiter = limiter
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        """同步调用时直接阻塞当前线程等待额度，不依赖事件循环；blocking=False 时没有额度立即返回 False"""
+        return self.limiter.acquire_sync(blocking=blocking) is not None
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        if not blocking:
+            return self.limiter.acquire_sync(blocking=False) is not None
+        await self.limiter.acquire()
+        return True
+
+
+class RateLimitUsageHandler(AsyncCallbackHandler):
+    """模型返回后，把实际消耗的 token 从共享限流器中扣除"""
+
+    def __init__(self, limiter: TokenBucketLimiter):
+        self.limiter = limiter
+
+    async def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        used = 0
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) or {}
+                used += usage.get("total_tokens", 0)
+        if not used:
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            used = token_usage.get("total_tokens", 0)
+        if used:
+            self.limiter.adjust_tokens(-used)
+
+
+def langchain_rate_limit(limiter: TokenBucketLimiter) -> Dict[str, Any]:
+    """创建 LangChain 聊天模型时需要传入的限流参数"""
+    return {
+        "rate_limiter": LangChainRateLimiter(limiter),
+        "callbacks": [RateLimitUsageHandler(limiter)],
+    }
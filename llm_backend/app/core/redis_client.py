@@ -0,0 +1,32 @@
+from typing import Dict, Optional
+import redis.asyncio as aioredis
+from app.core.config import settings
+
+# 按 URL 复用的异步连接池，所有 Redis 客户端共享，避免每个请求都新建连接
+_pools: Dict[str, aioredis.ConnectionPool] = {}
+
+
+def get_redis_pool(redis_url: Optional[str] = None) -> aioredis.ConnectionPool:
+    """获取(必要时创建)指定 URL 的共享异步连接池"""
+    url = redis_url or settings.REDIS_URL
+    pool = _pools.get(url)
+    if pool is None:
+        pool = aioredis.ConnectionPool.from_url(
+            url,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,  # 连接池上限，超出时等待空闲连接
+            health_check_interval=30  # 定期检测断开的连接
+        )
+        _pools[url] = pool
+    return pool
+
+
+def get_async_redis(redis_url: Optional[str] = None) -> aioredis.Redis:
+    """获取基于共享连接池的异步 Redis 客户端，客户端本身很轻量，可以按需创建"""
+    return aioredis.Redis(connection_pool=get_redis_pool(redis_url))
+
+
+async def close_redis_pools():
+    """关闭所有共享连接池，在应用退出时调用"""
+    for pool in _pools.values():
+        await pool.disconnect()
+    _pools.clear()
@@ -18,6 +18,7 @@ if TYPE_CHECKING:
 from graphrag.cache.json_pipeline_cache import JsonPipelineCache
 from graphrag.cache.memory_pipeline_cache import InMemoryCache
 from graphrag.cache.noop_pipeline_cache import NoopPipelineCache
+from graphrag.cache.sqlite_pipeline_cache import create_sqlite_cache
 
 
 class CacheFactory:
@@ -56,6 +57,8 @@ class CacheFactory:
                 return JsonPipelineCache(create_blob_storage(**kwargs))
             case CacheType.cosmosdb:
                 return JsonPipelineCache(create_cosmosdb_storage(**kwargs))
+            case CacheType.sqlite:
+                return create_sqlite_cache(root_dir=root_dir, **kwargs)
             case _:
                 if cache_type in cls.cache_types:
                     return cls.cache_types[cache_type](**kwargs)
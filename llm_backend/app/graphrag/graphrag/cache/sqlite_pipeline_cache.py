@@ -0,0 +1,356 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""A module containing the 'SQLitePipelineCache' model."""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Any
+
+from graphrag.cache.pipeline_cache import PipelineCache
+
+log = logging.getLogger(__name__)
+
+_PLAIN = b"j"
+_ZLIB = b"z"
+_ZSTD = b"s"
+
+
+class _Codec:
+    """Encode cache entries as JSON bytes, optionally compressed.
+
+    Every value is prefixed with a marker byte so entries written with a different
+    compression setting can still be read.
+    """
+
+    def __init__(self, compression: str | None):
+        self.compression = compression or "none"
+        self._zstd_compressor = None
+        self._zstd_decompressor = None
+        if self.compression == "zstd":
+            try:
+                import zstandard
+            except ImportError as e:
+                msg = "zstd cache compression requires the zstandard package"
+                raise ValueError(msg) from e
+            self._zstd_compressor = zstandard.ZstdCompressor()
+            self._zstd_decompressor = zstandard.ZstdDecompressor()
+        elif self.compression not in ("none", "zlib"):
+            msg = f"Unknown cache compression: {compression}"
+            raise ValueError(msg)
+
+    def encode(self, data: dict) -> bytes:
+        raw = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        if self.compression == "zstd":
+            return _ZSTD + self._zstd_compressor.compress(raw)  # type: ignore
+        if self.compression == "zlib":
+            return _ZLIB + zlib.compress(raw)
+        return _PLAIN + raw
+
+    def decode(self, value: bytes) -> dict:
+        """Decode an entry, raising ValueError if it cannot be read."""
+        marker, payload = value[:1], value[1:]
+        if marker == _ZSTD:
+            try:
+                import zstandard
+            except ImportError as e:
+                msg = "zstd cache entry found but zstandard is not installed"
+                raise ValueError(msg) from e
+            if self._zstd_decompressor is None:
+                self._zstd_decompressor = zstandard.ZstdDecompressor()
+            try:
+                payload = self._zstd_decompressor.decompress(payload)
+            except zstandard.ZstdError as e:
+                msg = "corrupt zstd cache entry"
+                raise ValueError(msg) from e
+        elif marker == _ZLIB:
+            payload = zlib.decompress(payload)
+        return json.loads(payload.decode("utf-8"))
+
+
+class SQLiteCacheStore:
+    """Key-value store backing one or more `SQLitePipelineCache` namespaces.
+
+    Entries live in WAL-mode SQLite files, sharded by key hash. Writes are buffered
+    in memory and committed in batches; buffered entries are visible to reads.
+    The methods block on SQLite, `SQLitePipelineCache` calls them off the event loop.
+    """
+
+    def __init__(
+        self,
+        base_dir: str | Path,
+        shards: int = 1,
+        compression: str | None = None,
+        write_batch_size: int = 256,
+        flush_interval: float = 1.0,
+    ):
+        self._base_dir = Path(base_dir)
+        self._base_dir.mkdir(parents=True, exist_ok=True)
+        self._codec = _Codec(compression)
+        self._write_batch_size = write_batch_size
+        self._flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._pending: dict[tuple[str, str], bytes | None] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_loop: asyncio.AbstractEventLoop | None = None
+        self._connections = [
+            self._connect(self._base_dir / f"cache-{shard}.db")
+            for shard in range(max(1, shards))
+        ]
+        atexit.register(self.flush)
+
+    @staticmethod
+    def _connect(path: Path) -> sqlite3.Connection:
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, "
+            "PRIMARY KEY (namespace, key)) WITHOUT ROWID"
+        )
+        connection.commit()
+        return connection
+
+    def _shard(self, key: str) -> sqlite3.Connection:
+        if len(self._connections) == 1:
+            return self._connections[0]
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=4).digest()
+        return self._connections[int.from_bytes(digest, "big") % len(self._connections)]
+
+    def get(self, namespace: str, key: str) -> dict | None:
+        """Get a decoded entry with a single lookup, or None if it is missing."""
+        with self._lock:
+            if (namespace, key) in self._pending:
+                value = self._pending[namespace, key]
+            else:
+                row = (
+                    self
+                    ._shard(key)
+                    .execute(
+                        "SELECT value FROM cache WHERE namespace = ? AND key = ?",
+                        (namespace, key),
+                    )
+                    .fetchone()
+                )
+                value = row[0] if row else None
+        if value is None:
+            return None
+        try:
+            return self._codec.decode(value)
+        except (ValueError, zlib.error):
+            log.warning("Dropping corrupt cache entry %s/%s", namespace, key)
+            self.delete(namespace, key)
+            return None
+
+    def has(self, namespace: str, key: str) -> bool:
+        """Check whether an entry exists without decoding it."""
+        with self._lock:
+            if (namespace, key) in self._pending:
+                return self._pending[namespace, key] is not None
+            row = (
+                self
+                ._shard(key)
+                .execute(
+                    "SELECT 1 FROM cache WHERE namespace = ? AND key = ?",
+                    (namespace, key),
+                )
+                .fetchone()
+            )
+            return row is not None
+
+    def set(self, namespace: str, key: str, data: dict) -> None:
+        """Buffer an entry; it is written with the next batch."""
+        if self.buffer(namespace, key, data):
+            self.flush()
+        else:
+            self.schedule_flush()
+
+    def buffer(self, namespace: str, key: str, data: dict) -> bool:
+        """Buffer an entry without writing, return whether a batch is full."""
+        value = self._codec.encode(data)
+        with self._lock:
+            self._pending[namespace, key] = value
+            return len(self._pending) >= self._write_batch_size
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Delete an entry, including a buffered one."""
+        with self._lock:
+            self._pending[namespace, key] = None
+        self.flush()
+
+    def clear(self, namespace: str) -> None:
+        """Delete all entries of a namespace and its children."""
+        with self._lock:
+            self._pending = {
+                entry: value
+                for entry, value in self._pending.items()
+                if not _in_namespace(entry[0], namespace)
+            }
+            for connection in self._connections:
+                if namespace:
+                    prefix = f"{namespace}/"
+                    connection.execute(
+                        "DELETE FROM cache WHERE namespace = ? "
+                        "OR substr(namespace, 1, ?) = ?",
+                        (namespace, len(prefix), prefix),
+                    )
+                else:
+                    connection.execute("DELETE FROM cache")
+                connection.commit()
+
+    def flush(self) -> None:
+        """Write all buffered entries, one transaction per shard."""
+        with self._lock:
+            self._cancel_flush()
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            batches: dict[int, tuple[list, list]] = {}
+            for (namespace, key), value in pending.items():
+                connection = self._shard(key)
+                upserts, deletes = batches.setdefault(id(connection), ([], []))
+                if value is None:
+                    deletes.append((namespace, key))
+                else:
+                    upserts.append((namespace, key, value))
+            for connection in self._connections:
+                upserts, deletes = batches.get(id(connection), ([], []))
+                if not upserts and not deletes:
+                    continue
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO cache (namespace, key, value) VALUES (?, ?, ?)",
+                        upserts,
+                    )
+                    connection.executemany(
+                        "DELETE FROM cache WHERE namespace = ? AND key = ?", deletes
+                    )
+
+    def schedule_flush(self) -> None:
+        """Flush buffered entries after the flush interval, in a worker thread.
+
+        Without a running event loop the entries are flushed right away.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        with self._lock:
+            if self._flush_handle is not None:
+                # a timer of a loop that has been closed since would never fire
+                if self._flush_loop is loop and not loop.is_closed():
+                    return
+                self._cancel_flush()
+            self._flush_loop = loop
+            self._flush_handle = loop.call_later(
+                self._flush_interval, loop.run_in_executor, None, self.flush
+            )
+
+    def _cancel_flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+            self._flush_loop = None
+
+    def close(self) -> None:
+        """Flush buffered entries and close the database files."""
+        self.flush()
+        atexit.unregister(self.flush)
+        for connection in self._connections:
+            connection.close()
+
+
+def _in_namespace(namespace: str, parent: str) -> bool:
+    return not parent or namespace == parent or namespace.startswith(f"{parent}/")
+
+
+class SQLitePipelineCache(PipelineCache):
+    """Pipeline cache backed by an embedded SQLite key-value store.
+
+    Stores the same entries as `JsonPipelineCache` (the result plus debug data),
+    but in a few database files instead of one JSON file per LLM call, so a
+    lookup is a single indexed read.
+    """
+
+    _store: SQLiteCacheStore
+    _namespace: str
+
+    def __init__(self, store: SQLiteCacheStore, namespace: str = ""):
+        """Init method definition."""
+        self._store = store
+        self._namespace = namespace
+
+    async def get(self, key: str) -> Any:
+        """Get method definition."""
+        data = await asyncio.to_thread(self._store.get, self._namespace, key)
+        return data.get("result") if data is not None else None
+
+    async def set(self, key: str, value: Any, debug_data: dict | None = None) -> None:
+        """Set method definition."""
+        if value is None:
+            return
+        data = {"result": value, **(debug_data or {})}
+        if self._store.buffer(self._namespace, key, data):
+            await asyncio.to_thread(self._store.flush)
+        else:
+            self._store.schedule_flush()
+
+    async def has(self, key: str) -> bool:
+        """Has method definition."""
+        return await asyncio.to_thread(self._store.has, self._namespace, key)
+
+    async def delete(self, key: str) -> None:
+        """Delete method definition."""
+        await asyncio.to_thread(self._store.delete, self._namespace, key)
+
+    async def clear(self) -> None:
+        """Clear method definition."""
+        await asyncio.to_thread(self._store.clear, self._namespace)
+
+    def child(self, name: str) -> SQLitePipelineCache:
+        """Child method definition."""
+        namespace = f"{self._namespace}/{name}" if self._namespace else name
+        return SQLitePipelineCache(self._store, namespace)
+
+    def flush(self) -> None:
+        """Write buffered entries to disk."""
+        self._store.flush()
+
+
+_stores: dict[tuple[str, int, str | None], SQLiteCacheStore] = {}
+_stores_lock = threading.Lock()
+
+
+def create_sqlite_cache(
+    root_dir: str,
+    base_dir: str,
+    shards: int = 1,
+    compression: str | None = None,
+    **_kwargs: Any,
+) -> SQLitePipelineCache:
+    """Create a SQLite pipeline cache under root_dir/base_dir.
+
+    Caches for the same directory share one store, so repeated pipeline runs in a
+    long-lived process reuse the open database files and write buffer. Settings
+    that only apply to other cache types are ignored.
+    """
+    path = (Path(root_dir) / base_dir).resolve()
+    store_key = (str(path), shards, compression)
+    with _stores_lock:
+        store = _stores.get(store_key)
+        if store is None:
+            store = _stores[store_key] = SQLiteCacheStore(
+                path, shards=shards, compression=compression
+            )
+    return SQLitePipelineCache(store)
@@ -62,6 +62,8 @@ class CacheDefaults:
     container_name: None = None
     storage_account_blob_url: None = None
     cosmosdb_account_url: None = None
+    shards: int = 1
+    compression: None = None
 
 
 @dataclass
@@ -236,6 +238,9 @@ class GlobalSearchDefaults:
     map_max_tokens: int = 1000
     reduce_max_tokens: int = 2000
     concurrency: int = 32
+    early_reduce_key_points: None = None
+    early_reduce_min_score: int = 50
+    map_timeout: None = None
     dynamic_search_llm: str = "gpt-4o-mini"
     dynamic_search_threshold: int = 1
     dynamic_search_keep_parent: bool = False
@@ -273,6 +278,7 @@ class InputDefaults:
     image_description_api_key: None = None
     image_description_model: None = None
     image_description_base_url: None = None
+    concurrent_files: int = 8
 
 @dataclass
 class LanguageModelDefaults:
@@ -408,6 +414,16 @@ class VectorStoreDefaults:
     api_key: None = None
     audience: None = None
     database_name: None = None
+    vector_dtype: str = "float32"
+    index_type: None = None
+    index_num_partitions: None = None
+    index_num_sub_vectors: None = None
+    index_min_rows: int = 10_000
+    index_rebuild_threshold: float = 0.2
+    nprobes: int = 20
+    refine_factor: int = 5
+    exact_search_max_rows: int = 20_000
+    filter_cache_size: int = 4
 
 
 @dataclass
@@ -450,6 +466,7 @@ class GraphRagConfigDefaults:
         default_factory=lambda: {DEFAULT_VECTOR_STORE_ID: VectorStoreDefaults()}
     )
     workflows: None = None
+    concurrent_workflows: int = 4
 
 
 language_model_defaults = LanguageModelDefaults()
@@ -36,3 +36,11 @@ class CacheConfig(BaseModel):
         description="The cosmosdb account url to use.",
         default=graphrag_config_defaults.cache.cosmosdb_account_url,
     )
+    shards: int = Field(
+        description="The number of database files to spread a sqlite cache over.",
+        default=graphrag_config_defaults.cache.shards,
+    )
+    compression: str | None = Field(
+        description="The compression to use for sqlite cache entries (zlib or zstd).",
+        default=graphrag_config_defaults.cache.compression,
+    )
@@ -59,6 +59,18 @@ class GlobalSearchConfig(BaseModel):
         description="The number of concurrent requests.",
         default=graphrag_config_defaults.global_search.concurrency,
     )
+    early_reduce_key_points: int | None = Field(
+        description="Start the streamed reduce once this many high-scoring key points are collected.",
+        default=graphrag_config_defaults.global_search.early_reduce_key_points,
+    )
+    early_reduce_min_score: int = Field(
+        description="The minimum score of a key point counted towards early_reduce_key_points.",
+        default=graphrag_config_defaults.global_search.early_reduce_min_score,
+    )
+    map_timeout: float | None = Field(
+        description="The number of seconds the streamed search waits for map responses before reducing.",
+        default=graphrag_config_defaults.global_search.map_timeout,
+    )
 
     # configurations for dynamic community selection
     dynamic_search_llm: str = Field(
@@ -282,6 +282,12 @@ class GraphRagConfig(BaseModel):
     )
     """List of workflows to run, in execution order."""
 
+    concurrent_workflows: int = Field(
+        description="The maximum number of workflows to run at the same time. Only workflows that do not depend on each other's outputs run concurrently; 1 runs them one after another.",
+        default=graphrag_config_defaults.concurrent_workflows,
+    )
+    """The maximum number of workflows to run at the same time."""
+
     def _validate_vector_store_db_uri(self) -> None:
         """Validate the vector store configuration."""
         for store in self.vector_store.values():
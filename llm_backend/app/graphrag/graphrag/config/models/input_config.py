@@ -106,3 +106,7 @@ class InputConfig(BaseModel):
         description="The image description base url to use.",
         default=graphrag_config_defaults.input.image_description_base_url,
     )
+    concurrent_files: int = Field(
+        description="The maximum number of input files to load at the same time.",
+        default=graphrag_config_defaults.input.concurrent_files,
+    )
@@ -85,6 +85,56 @@ class VectorStoreConfig(BaseModel):
         default=vector_store_defaults.overwrite,
     )
 
+    vector_dtype: str = Field(
+        description="The vector element type when type == lancedb: float32 or float64.",
+        default=vector_store_defaults.vector_dtype,
+    )
+
+    index_type: str | None = Field(
+        description="The ANN index to build when type == lancedb, e.g. IVF_PQ or IVF_HNSW_SQ. None searches exhaustively.",
+        default=vector_store_defaults.index_type,
+    )
+
+    index_num_partitions: int | None = Field(
+        description="The number of IVF partitions. Defaults to the square root of the row count.",
+        default=vector_store_defaults.index_num_partitions,
+    )
+
+    index_num_sub_vectors: int | None = Field(
+        description="The number of PQ sub-vectors. Defaults to a divisor of the vector dimension.",
+        default=vector_store_defaults.index_num_sub_vectors,
+    )
+
+    index_min_rows: int = Field(
+        description="The minimum number of rows before an ANN index is built.",
+        default=vector_store_defaults.index_min_rows,
+    )
+
+    index_rebuild_threshold: float = Field(
+        description="The fraction of unindexed rows after which the ANN index is rebuilt instead of extended.",
+        default=vector_store_defaults.index_rebuild_threshold,
+    )
+
+    nprobes: int = Field(
+        description="The number of IVF partitions to search per query.",
+        default=vector_store_defaults.nprobes,
+    )
+
+    refine_factor: int | None = Field(
+        description="Re-rank refine_factor * k ANN candidates with exact distances.",
+        default=vector_store_defaults.refine_factor,
+    )
+
+    exact_search_max_rows: int = Field(
+        description="The largest include_ids filter that is searched exactly against cached vectors when type == lancedb; larger filters are applied as a prefilter.",
+        default=vector_store_defaults.exact_search_max_rows,
+    )
+
+    filter_cache_size: int = Field(
+        description="The number of include_ids filters cached per collection when type == lancedb.",
+        default=vector_store_defaults.filter_cache_size,
+    )
+
     @model_validator(mode="after")
     def _validate_model(self):
         """Validate the model."""
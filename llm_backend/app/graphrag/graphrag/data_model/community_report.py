@@ -22,6 +22,12 @@ class CommunityReport(Named):
     full_content: str = ""
     """Full content of the report."""
 
+    summary_tokens: int | None = None
+    """Number of tokens in the summary, computed at indexing time (optional)."""
+
+    full_content_tokens: int | None = None
+    """Number of tokens in the full content, computed at indexing time (optional)."""
+
     rank: float | None = 1.0
     """Rank of the report, used for sorting (optional). Higher means more important"""
 
@@ -47,6 +53,8 @@ class CommunityReport(Named):
         short_id_key: str = "human_readable_id",
         summary_key: str = "summary",
         full_content_key: str = "full_content",
+        summary_tokens_key: str = "summary_tokens",
+        full_content_tokens_key: str = "full_content_tokens",
         rank_key: str = "rank",
         attributes_key: str = "attributes",
         size_key: str = "size",
@@ -60,6 +68,8 @@ class CommunityReport(Named):
             short_id=d.get(short_id_key),
             summary=d[summary_key],
             full_content=d[full_content_key],
+            summary_tokens=d.get(summary_tokens_key),
+            full_content_tokens=d.get(full_content_tokens_key),
             rank=d[rank_key],
             attributes=d.get(attributes_key),
             size=d.get(size_key),
@@ -19,6 +19,9 @@ class Entity(Named):
     description: str | None = None
     """Description of the entity (optional)."""
 
+    description_tokens: int | None = None
+    """Number of tokens in the description, computed at indexing time (optional)."""
+
     description_embedding: list[float] | None = None
     """The semantic (i.e. text) embedding of the entity (optional)."""
 
@@ -46,6 +49,7 @@ class Entity(Named):
         title_key: str = "title",
         type_key: str = "type",
         description_key: str = "description",
+        description_tokens_key: str = "description_tokens",
         description_embedding_key: str = "description_embedding",
         name_embedding_key: str = "name_embedding",
         community_key: str = "community",
@@ -60,6 +64,7 @@ class Entity(Named):
             short_id=d.get(short_id_key),
             type=d.get(type_key),
             description=d.get(description_key),
+            description_tokens=d.get(description_tokens_key),
             name_embedding=d.get(name_embedding_key),
             description_embedding=d.get(description_embedding_key),
             community_ids=d.get(community_key),
@@ -25,6 +25,9 @@ class Relationship(Identified):
     description: str | None = None
     """A description of the relationship (optional)."""
 
+    description_tokens: int | None = None
+    """Number of tokens in the description, computed at indexing time (optional)."""
+
     description_embedding: list[float] | None = None
     """The semantic embedding for the relationship description (optional)."""
 
@@ -46,6 +49,7 @@ class Relationship(Identified):
         source_key: str = "source",
         target_key: str = "target",
         description_key: str = "description",
+        description_tokens_key: str = "description_tokens",
         rank_key: str = "rank",
         weight_key: str = "weight",
         text_unit_ids_key: str = "text_unit_ids",
@@ -59,6 +63,7 @@ class Relationship(Identified):
             target=d[target_key],
             rank=d.get(rank_key, 1),
             description=d.get(description_key),
+            description_tokens=d.get(description_tokens_key),
             weight=d.get(weight_key, 1.0),
             text_unit_ids=d.get(text_unit_ids_key),
             attributes=d.get(attributes_key),
@@ -59,6 +59,11 @@ DOCUMENT_IDS = "document_ids"
 PERIOD = "period"
 SIZE = "size"
 
+# TOKEN COUNTS OF STATIC TEXT, USED TO BUDGET QUERY CONTEXT
+DESCRIPTION_TOKENS = "description_tokens"
+SUMMARY_TOKENS = "summary_tokens"
+FULL_CONTENT_TOKENS = "full_content_tokens"
+
 # text units
 ENTITY_DEGREE = "entity_degree"
 ALL_DETAILS = "all_details"
@@ -75,6 +80,7 @@ ENTITIES_FINAL_COLUMNS = [
     TITLE,
     TYPE,
     DESCRIPTION,
+    DESCRIPTION_TOKENS,
     TEXT_UNIT_IDS,
     NODE_FREQUENCY,
     NODE_DEGREE,
@@ -88,6 +94,7 @@ RELATIONSHIPS_FINAL_COLUMNS = [
     EDGE_SOURCE,
     EDGE_TARGET,
     DESCRIPTION,
+    DESCRIPTION_TOKENS,
     EDGE_WEIGHT,
     EDGE_DEGREE,
     TEXT_UNIT_IDS,
@@ -117,7 +124,9 @@ COMMUNITY_REPORTS_FINAL_COLUMNS = [
     COMMUNITY_CHILDREN,
     TITLE,
     SUMMARY,
+    SUMMARY_TOKENS,
     FULL_CONTENT,
+    FULL_CONTENT_TOKENS,
     RATING,
     EXPLANATION,
     FINDINGS,
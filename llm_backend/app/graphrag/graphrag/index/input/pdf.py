@@ -3,6 +3,7 @@
 
 """A module containing load method for PDF files."""
 
+import asyncio
 import logging
 import re
 from pathlib import Path
@@ -81,7 +82,7 @@ async def download_output_files(url:str, output_dir:str, local_dir:str, doc_id:s
         full_path = f"{clean_output_dir}/{doc_id}"
         
         # 发送请求
-        response = requests.get(url, params={'output_dir': full_path})
+        response = await asyncio.to_thread(requests.get, url, params={'output_dir': full_path})
         
         if response.status_code == 200:
             # 保存ZIP文件到临时位置
@@ -198,8 +199,8 @@ async def load_pdf(
                 temp_file.write(buffer.getvalue())
                 file_path = temp_file.name
                 
-            # 1. 调用MinerU远程Server服务解析PDF
-            result = do_parse(file_path, url=config.mineru_api_url)
+            # 1. 调用MinerU远程Server服务解析PDF，阻塞的请求放到线程中，其他文件可以同时加载
+            result = await asyncio.to_thread(do_parse, file_path, url=config.mineru_api_url)
             
             if not result or 'output_dir' not in result:
                 data = pd.DataFrame([{
@@ -283,19 +284,19 @@ async def load_pdf(
        
                 # 为表格生成描述
                 if structured_info and structured_info.get("tables") and config.table_description_api_key and config.table_description_model:
-                    structured_info = generate_descriptions_for_tables(auto_dir if auto_dir.exists() else doc_local_dir, structured_info, config)
+                    structured_info = await asyncio.to_thread(generate_descriptions_for_tables, auto_dir if auto_dir.exists() else doc_local_dir, structured_info, config)
                     
                 # 从content_list.json提取图片信息 - 更新路径
                 image_info = None
                 if content_list_path and content_list_path.exists():
-                    image_info = extract_images_from_content_list(auto_dir if auto_dir.exists() else doc_local_dir, doc_id)
+                    image_info = await asyncio.to_thread(extract_images_from_content_list, auto_dir if auto_dir.exists() else doc_local_dir, doc_id)
                 else:
                     log.error(f"content_list.json文件不存在: {content_list_path}")
                 
         
                 # # 为图片生成描述
                 if image_info and image_info.get("images") and config.image_description_api_key and config.image_description_model:
-                    image_info = generate_descriptions_for_images(auto_dir if auto_dir.exists() else doc_local_dir, image_info, config)
+                    image_info = await asyncio.to_thread(generate_descriptions_for_images, auto_dir if auto_dir.exists() else doc_local_dir, image_info, config)
                     
                 # 构建增强的Markdown文本，包含元数据
                 enhanced_text = enhance_markdown_with_metadata(text_content, structured_info, image_info)
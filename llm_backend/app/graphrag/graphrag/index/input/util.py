@@ -3,8 +3,10 @@
 
 """Shared column processing for structured input files."""
 
+import itertools
 import logging
 import re
+from collections import deque
 from typing import Any, Dict, List, Tuple, Optional
 import os
 import base64
@@ -22,18 +24,29 @@ import pandas as pd
 from graphrag.config.models.input_config import InputConfig
 from graphrag.index.utils.hashing import gen_sha512_hash
 from graphrag.logger.base import ProgressLogger
+from graphrag.logger.progress import Progress
 from graphrag.storage.pipeline_storage import PipelineStorage
 
 log = logging.getLogger(__name__)
 
 
+# loaded files are concatenated in ordered batches of this many frames
+LOAD_BATCH_SIZE = 100
+
+
 async def load_files(
     loader: Any,
     config: InputConfig,
     storage: PipelineStorage,
     progress: ProgressLogger | None,
 ) -> pd.DataFrame:
-    """Load files from storage and apply a loader function."""
+    """Load files from storage and apply a loader function.
+
+    Up to `config.concurrent_files` files are loaded at the same time, and at most
+    twice that many are loading or waiting to be concatenated, so a slow file holds
+    back a bounded number of finished frames. The rows keep the order in which the
+    files were found, and files that fail to load are skipped.
+    """
     files = list(
         storage.find(
             re.compile(config.file_pattern),
@@ -46,19 +59,68 @@ async def load_files(
         msg = f"No {config.file_type} files found in {config.base_dir}"
         raise ValueError(msg)
 
-    files_loaded = []
-    
-    for file, group in files:
-        try:
-            files_loaded.append(await loader(file, group))
-        except Exception as e:  # noqa: BLE001 (catching Exception is fine here)
-            log.warning("Warning! Error loading file %s. Skipping...", file)
-            log.warning("Error: %s", e)
+    semaphore = asyncio.Semaphore(max(1, config.concurrent_files))
+    completed = 0
+
+    async def load(file: str, group: dict | None) -> pd.DataFrame | None:
+        nonlocal completed
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                data = await loader(file, group)
+            except Exception as e:  # noqa: BLE001 (catching Exception is fine here)
+                log.warning("Warning! Error loading file %s. Skipping...", file)
+                log.warning("Error: %s", e)
+                data = None
+            elapsed = time.perf_counter() - start
+        completed += 1
+        log.info("Loaded %s in %.2fs", file, elapsed)
+        if progress is not None:
+            progress(
+                Progress(
+                    description=f"{file} ({elapsed:.2f}s)",
+                    total_items=len(files),
+                    completed_items=completed,
+                )
+            )
+        return data
+
+    remaining = iter(files)
+    tasks: deque[asyncio.Task[pd.DataFrame | None]] = deque(
+        asyncio.create_task(load(file, group))
+        for file, group in itertools.islice(
+            remaining, 2 * max(1, config.concurrent_files)
+        )
+    )
+    batches: list[pd.DataFrame] = []
+    pending: list[pd.DataFrame] = []
+    files_loaded = 0
+    try:
+        # concatenate in file order as results come in, starting the next file
+        # only when one is consumed
+        while tasks:
+            data = await tasks.popleft()
+            tasks.extend(
+                asyncio.create_task(load(file, group))
+                for file, group in itertools.islice(remaining, 1)
+            )
+            if data is None:
+                continue
+            files_loaded += 1
+            pending.append(data)
+            if len(pending) >= LOAD_BATCH_SIZE:
+                batches.append(pd.concat(pending))
+                pending = []
+    finally:
+        for task in tasks:
+            task.cancel()
+    if pending:
+        batches.append(pd.concat(pending))
 
     log.info(
-        "Found %d %s files, loading %d", len(files), config.file_type, len(files_loaded)
+        "Found %d %s files, loading %d", len(files), config.file_type, files_loaded
     )
-    result = pd.concat(files_loaded)
+    result = pd.concat(batches)
     total_files_log = (
         f"Total number of unfiltered {config.file_type} rows: {len(result)}"
     )
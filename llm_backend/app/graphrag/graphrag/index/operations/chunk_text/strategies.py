@@ -3,16 +3,22 @@
 
 """A module containing chunk strategies."""
 
-from collections.abc import Iterable
+import os
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import replace
 
 import nltk
+import numpy as np
 import tiktoken
 
 from graphrag.config.models.chunking_config import ChunkingConfig
 from graphrag.index.operations.chunk_text.typing import TextChunk
 from graphrag.index.text_splitting.text_splitting import (
+    EncodeBatchFn,
     Tokenizer,
-    split_multiple_texts_on_tokens,
+    encode_texts,
+    split_encoded_texts_on_tokens,
 )
 from graphrag.logger.progress import ProgressTicker
 
@@ -32,27 +38,57 @@ def get_encoding_fn(encoding_name):
     return encode, decode
 
 
+def get_encode_batch_fn(
+    encode: Callable[[str], list[int]], executor: Executor
+) -> EncodeBatchFn:
+    """Get a function encoding several texts at once on the given executor."""
+
+    def encode_batch(texts: list[str]) -> list[list[int]]:
+        # tiktoken releases the GIL while encoding, so the threads run in parallel
+        return list(executor.map(encode, texts))
+
+    return encode_batch
+
+
+def get_tokenizer(config: ChunkingConfig) -> Tokenizer:
+    """Get the tokenizer splitting texts into chunks of the configured size."""
+    encode, decode = get_encoding_fn(config.encoding_model)
+    return Tokenizer(
+        chunk_overlap=config.overlap,
+        tokens_per_chunk=config.size,
+        encode=encode,
+        decode=decode,
+    )
+
+
+def encode_texts_in_parallel(
+    texts: list[str], tokenizer: Tokenizer, tick: ProgressTicker | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Encode texts like `encode_texts`, with one thread pool shared by every batch."""
+    if len(texts) < 2:
+        return encode_texts(texts, tokenizer, tick)
+
+    with ThreadPoolExecutor(
+        max_workers=min(os.cpu_count() or 1, len(texts))
+    ) as executor:
+        return encode_texts(
+            texts,
+            replace(
+                tokenizer, encode_batch=get_encode_batch_fn(tokenizer.encode, executor)
+            ),
+            tick,
+        )
+
+
 def run_tokens(
     input: list[str],
     config: ChunkingConfig,
     tick: ProgressTicker,
 ) -> Iterable[TextChunk]:
     """Chunks text into chunks based on encoding tokens."""
-    tokens_per_chunk = config.size
-    chunk_overlap = config.overlap
-    encoding_name = config.encoding_model
-
-    encode, decode = get_encoding_fn(encoding_name)
-    return split_multiple_texts_on_tokens(
-        input,
-        Tokenizer(
-            chunk_overlap=chunk_overlap,
-            tokens_per_chunk=tokens_per_chunk,
-            encode=encode,
-            decode=decode,
-        ),
-        tick,
-    )
+    tokenizer = get_tokenizer(config)
+    input_ids, ends = encode_texts_in_parallel(input, tokenizer, tick)
+    return split_encoded_texts_on_tokens(input_ids, ends, tokenizer)
 
 
 def run_sentences(
@@ -0,0 +1,33 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""A module containing compute_token_counts definition."""
+
+import pandas as pd
+
+from graphrag.index.utils.tokens import num_tokens_from_strings
+
+
+def compute_token_counts(
+    df: pd.DataFrame,
+    columns: list[str],
+    encoding_model: str | None = None,
+) -> pd.DataFrame:
+    """Store the token count of each text column in a `<column>_tokens` column.
+
+    Only missing counts are computed, so rows carried over from a previous index keep
+    theirs. The counts let query-time context builders budget static text without
+    encoding it again.
+    """
+    for column in columns:
+        token_column = f"{column}_tokens"
+        if token_column not in df.columns:
+            df[token_column] = None
+        missing = df[token_column].isna()
+        if missing.any():
+            df.loc[missing, token_column] = num_tokens_from_strings(
+                df.loc[missing, column].fillna("").astype(str).tolist(),
+                encoding_name=encoding_model,
+            )
+        df[token_column] = df[token_column].astype(int)
+    return df
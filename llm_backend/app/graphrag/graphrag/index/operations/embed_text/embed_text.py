@@ -206,6 +206,8 @@ async def _text_embed_with_vector_store(
         starting_index += len(documents)
         i += 1
 
+    vector_store.create_index()
+
     return all_results
 
 
@@ -7,12 +7,18 @@ from uuid import uuid4
 
 import pandas as pd
 
-from graphrag.data_model.schemas import COMMUNITY_REPORTS_FINAL_COLUMNS
+from graphrag.data_model.schemas import (
+    COMMUNITY_REPORTS_FINAL_COLUMNS,
+    FULL_CONTENT,
+    SUMMARY,
+)
+from graphrag.index.operations.compute_token_counts import compute_token_counts
 
 
 def finalize_community_reports(
     reports: pd.DataFrame,
     communities: pd.DataFrame,
+    encoding_model: str | None = None,
 ) -> pd.DataFrame:
     """All the steps to transform final community reports."""
     # Merge with communities to add shared fields
@@ -26,6 +32,7 @@ def finalize_community_reports(
     community_reports["community"] = community_reports["community"].astype(int)
     community_reports["human_readable_id"] = community_reports["community"]
     community_reports["id"] = [uuid4().hex for _ in range(len(community_reports))]
+    compute_token_counts(community_reports, [SUMMARY, FULL_CONTENT], encoding_model)
 
     return community_reports.loc[
         :,
@@ -9,8 +9,9 @@ import pandas as pd
 
 from graphrag.callbacks.workflow_callbacks import WorkflowCallbacks
 from graphrag.config.models.embed_graph_config import EmbedGraphConfig
-from graphrag.data_model.schemas import ENTITIES_FINAL_COLUMNS
+from graphrag.data_model.schemas import DESCRIPTION, ENTITIES_FINAL_COLUMNS
 from graphrag.index.operations.compute_degree import compute_degree
+from graphrag.index.operations.compute_token_counts import compute_token_counts
 from graphrag.index.operations.create_graph import create_graph
 from graphrag.index.operations.embed_graph.embed_graph import embed_graph
 from graphrag.index.operations.layout_graph.layout_graph import layout_graph
@@ -22,6 +23,7 @@ def finalize_entities(
     callbacks: WorkflowCallbacks,
     embed_config: EmbedGraphConfig | None = None,
     layout_enabled: bool = False,
+    encoding_model: str | None = None,
 ) -> pd.DataFrame:
     """All the steps to transform final entities."""
     graph = create_graph(relationships)
@@ -51,6 +53,7 @@ def finalize_entities(
     final_entities["id"] = final_entities["human_readable_id"].apply(
         lambda _x: str(uuid4())
     )
+    compute_token_counts(final_entities, [DESCRIPTION], encoding_model)
     return final_entities.loc[
         :,
         ENTITIES_FINAL_COLUMNS,
@@ -7,16 +7,18 @@ from uuid import uuid4
 
 import pandas as pd
 
-from graphrag.data_model.schemas import RELATIONSHIPS_FINAL_COLUMNS
+from graphrag.data_model.schemas import DESCRIPTION, RELATIONSHIPS_FINAL_COLUMNS
 from graphrag.index.operations.compute_degree import compute_degree
 from graphrag.index.operations.compute_edge_combined_degree import (
     compute_edge_combined_degree,
 )
+from graphrag.index.operations.compute_token_counts import compute_token_counts
 from graphrag.index.operations.create_graph import create_graph
 
 
 def finalize_relationships(
     relationships: pd.DataFrame,
+    encoding_model: str | None = None,
 ) -> pd.DataFrame:
     """All the steps to transform final relationships."""
     graph = create_graph(relationships)
@@ -37,6 +39,7 @@ def finalize_relationships(
     final_relationships["id"] = final_relationships["human_readable_id"].apply(
         lambda _x: str(uuid4())
     )
+    compute_token_counts(final_relationships, [DESCRIPTION], encoding_model)
 
     return final_relationships.loc[
         :,
@@ -3,6 +3,7 @@
 
 """Different methods to run the pipeline."""
 
+import asyncio
 import json
 import logging
 import re
@@ -22,15 +23,21 @@ from graphrag.index.run.utils import create_run_context
 from graphrag.index.typing.context import PipelineRunContext
 from graphrag.index.typing.pipeline import Pipeline
 from graphrag.index.typing.pipeline_run_result import PipelineRunResult
+from graphrag.index.typing.workflow import WorkflowFunctionOutput
 from graphrag.index.update.incremental_index import (
     get_delta_docs,
     update_dataframe_outputs,
 )
+from graphrag.language_model.concurrency import LLMConcurrencyBudget
+from graphrag.language_model.rate_limiter import (
+    RequestPriority,
+    set_request_priority,
+)
 from graphrag.logger.base import ProgressLogger
 from graphrag.logger.progress import Progress
 from graphrag.storage.pipeline_storage import PipelineStorage
 from graphrag.utils.api import create_cache_from_config, create_storage_from_config
-from graphrag.utils.storage import load_table_from_storage, write_table_to_storage
+from graphrag.utils.storage import write_table_to_storage
 
 log = logging.getLogger(__name__)
 
@@ -141,23 +148,22 @@ async def _run_pipeline(
         await _dump_json(context)
         await write_table_to_storage(dataset, "documents", context.storage)
 
-        for name, workflow_function in pipeline.run():
-            last_workflow = name
-            progress = logger.child(name, transient=False)
-            callbacks.workflow_start(name, None)
-            work_time = time.time()
-            result = await workflow_function(config, context)
-            progress(Progress(percent=1))
-            callbacks.workflow_end(name, result)
+        async for name, result in _run_workflows(
+            pipeline, config, context, callbacks, logger, start_time
+        ):
             yield PipelineRunResult(
                 workflow=name, result=result.result, state=context.state, errors=None
             )
 
-            context.stats.workflows[name] = {"overall": time.time() - work_time}
-
         context.stats.total_runtime = time.time() - start_time
         await _dump_json(context)
 
+    except _WorkflowError as e:
+        log.exception("error running workflow %s", e.workflow)
+        callbacks.error("Error running pipeline!", e.error, traceback.format_exc())
+        yield PipelineRunResult(
+            workflow=e.workflow, result=None, state=context.state, errors=[e.error]
+        )
     except Exception as e:
         log.exception("error running workflow %s", last_workflow)
         callbacks.error("Error running pipeline!", e, traceback.format_exc())
@@ -166,6 +172,78 @@ async def _run_pipeline(
         )
 
 
+class _WorkflowError(Exception):
+    """Raised when a workflow fails, naming the workflow."""
+
+    def __init__(self, workflow: str, error: Exception):
+        super().__init__(f"Workflow {workflow} failed: {error}")
+        self.workflow = workflow
+        self.error = error
+
+
+async def _run_workflows(
+    pipeline: Pipeline,
+    config: GraphRagConfig,
+    context: PipelineRunContext,
+    callbacks: WorkflowCallbacks,
+    logger: ProgressLogger,
+    start_time: float,
+) -> AsyncIterable[tuple[str, WorkflowFunctionOutput]]:
+    """Run the pipeline workflows, yielding each result as it completes.
+
+    A workflow starts once the workflows it depends on have finished; up to
+    `config.concurrent_workflows` workflows run at once and share one LLM
+    concurrency budget. With a limit of 1 the workflows run in pipeline order.
+    """
+    workflows = pipeline.workflows
+    dependencies = pipeline.dependencies()
+    max_running = max(1, config.concurrent_workflows)
+    budget = LLMConcurrencyBudget()
+    waiting = list(range(len(workflows)))
+    finished: set[int] = set()
+    running: dict[asyncio.Task, int] = {}
+
+    async def run_workflow(position: int) -> WorkflowFunctionOutput:
+        name, workflow_function = workflows[position]
+        budget.activate()
+        # indexing yields the endpoint's rate limits to interactive queries
+        set_request_priority(RequestPriority.BACKGROUND)
+        progress = logger.child(name, transient=False)
+        callbacks.workflow_start(name, None)
+        work_time = time.time()
+        try:
+            result = await workflow_function(config, context)
+        except Exception as e:
+            raise _WorkflowError(name, e) from e
+        progress(Progress(percent=1))
+        callbacks.workflow_end(name, result)
+        context.stats.workflows[name] = {
+            "overall": time.time() - work_time,
+            "start": work_time - start_time,
+            "end": time.time() - start_time,
+        }
+        return result
+
+    try:
+        while waiting or running:
+            for position in list(waiting):
+                if len(running) >= max_running:
+                    break
+                if dependencies[position] <= finished:
+                    waiting.remove(position)
+                    running[asyncio.create_task(run_workflow(position))] = position
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=running.__getitem__):
+                position = running.pop(task)
+                result = task.result()
+                finished.add(position)
+                yield workflows[position][0], result
+    finally:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+
 async def _dump_json(context: PipelineRunContext) -> None:
     """Dump the stats and context state to the storage."""
     await context.storage.set(
@@ -180,7 +258,12 @@ async def _copy_previous_output(
     storage: PipelineStorage,
     copy_storage: PipelineStorage,
 ):
-    for file in storage.find(re.compile(r"\.parquet$")):
-        base_name = file[0].replace(".parquet", "")
-        table = await load_table_from_storage(base_name, storage)
-        await write_table_to_storage(table, base_name, copy_storage)
+    """Snapshot the parquet tables of the previous run into the copy storage.
+
+    The files are copied as they are (hard links for file storage, server side copies
+    for blob storage) instead of being parsed and written out again.
+    """
+    await asyncio.gather(*[
+        storage.copy(file, copy_storage)
+        for file, _ in storage.find(re.compile(r"\.parquet$"))
+    ])
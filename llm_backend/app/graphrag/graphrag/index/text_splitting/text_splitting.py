@@ -9,6 +9,7 @@ from collections.abc import Callable, Collection, Iterable
 from dataclasses import dataclass
 from typing import Any, Literal, cast
 
+import numpy as np
 import pandas as pd
 import tiktoken
 
@@ -19,6 +20,7 @@ from graphrag.logger.progress import ProgressTicker
 EncodedText = list[int]
 DecodeFn = Callable[[EncodedText], str]
 EncodeFn = Callable[[str], EncodedText]
+EncodeBatchFn = Callable[[list[str]], list[EncodedText]]
 LengthFn = Callable[[str], int]
 
 log = logging.getLogger(__name__)
@@ -36,6 +38,8 @@ class Tokenizer:
     """ Function to decode a list of token ids to a string"""
     encode: EncodeFn
     """ Function to encode a string to a list of token ids"""
+    encode_batch: EncodeBatchFn | None = None
+    """ Function to encode a list of strings at once, e.g. on several threads"""
 
 
 class TextSplitter(ABC):
@@ -159,35 +163,71 @@ def split_single_text_on_tokens(text: str, tokenizer: Tokenizer) -> list[str]:
     return result
 
 
+# number of documents encoded at once, bounds the memory held in python token lists
+ENCODE_BATCH_SIZE = 1000
+
+
+def encode_texts(
+    texts: list[str], tokenizer: Tokenizer, tick: ProgressTicker | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Encode texts into one flat int32 token array and the end offset of each text."""
+    encoded = []
+    for start in range(0, len(texts), ENCODE_BATCH_SIZE):
+        batch = texts[start : start + ENCODE_BATCH_SIZE]
+        batch_ids = (
+            tokenizer.encode_batch(batch)
+            if tokenizer.encode_batch is not None
+            else [tokenizer.encode(text) for text in batch]
+        )
+        encoded.extend(np.asarray(ids, dtype=np.int32) for ids in batch_ids)
+        if tick:
+            tick(len(batch))  # Track progress if tick callback is provided
+
+    ends = np.cumsum([len(ids) for ids in encoded], dtype=np.int64)
+    input_ids = np.concatenate(encoded) if encoded else np.empty(0, dtype=np.int32)
+    return input_ids, ends
+
+
 # Adapted from - https://github.com/langchain-ai/langchain/blob/77b359edf5df0d37ef0d539f678cf64f5557cb54/libs/langchain/langchain/text_splitter.py#L471
 # So we could have better control over the chunking process
 def split_multiple_texts_on_tokens(
     texts: list[str], tokenizer: Tokenizer, tick: ProgressTicker
 ) -> list[TextChunk]:
     """Split multiple texts and return chunks with metadata using the tokenizer."""
-    result = []
-    mapped_ids = []
+    input_ids, ends = encode_texts(texts, tokenizer, tick)
+    return split_encoded_texts_on_tokens(input_ids, ends, tokenizer)
 
-    for source_doc_idx, text in enumerate(texts):
-        encoded = tokenizer.encode(text)
-        if tick:
-            tick(1)  # Track progress if tick callback is provided
-        mapped_ids.append((source_doc_idx, encoded))
 
-    input_ids = [
-        (source_doc_idx, id) for source_doc_idx, ids in mapped_ids for id in ids
-    ]
+def split_encoded_texts_on_tokens(
+    input_ids: np.ndarray, ends: np.ndarray, tokenizer: Tokenizer
+) -> list[TextChunk]:
+    """Split texts already encoded by `encode_texts` into chunks with metadata."""
+    lengths = np.diff(ends, prepend=0)
 
-    start_idx = 0
-    cur_idx = min(start_idx + tokenizer.tokens_per_chunk, len(input_ids))
-    chunk_ids = input_ids[start_idx:cur_idx]
+    # window bounds, and the first and last document overlapping each window
+    starts = np.arange(
+        0, len(input_ids), tokenizer.tokens_per_chunk - tokenizer.chunk_overlap
+    )
+    stops = np.minimum(starts + tokenizer.tokens_per_chunk, len(input_ids))
+    first_docs = np.searchsorted(ends, starts, side="right")
+    last_docs = np.searchsorted(ends, stops - 1, side="right")
 
-    while start_idx < len(input_ids):
-        chunk_text = tokenizer.decode([id for _, id in chunk_ids])
-        doc_indices = list({doc_idx for doc_idx, _ in chunk_ids})
+    result = []
+    for start_idx, stop_idx, first, last in zip(
+        starts.tolist(),
+        stops.tolist(),
+        first_docs.tolist(),
+        last_docs.tolist(),
+        strict=True,
+    ):
+        chunk_ids = input_ids[start_idx:stop_idx]
+        chunk_text = tokenizer.decode(chunk_ids.tolist())
+        doc_indices = (
+            [first]
+            if first == last
+            # skip the empty documents between the first and last one
+            else (np.flatnonzero(lengths[first : last + 1]) + first).tolist()
+        )
         result.append(TextChunk(chunk_text, doc_indices, len(chunk_ids)))
-        start_idx += tokenizer.tokens_per_chunk - tokenizer.chunk_overlap
-        cur_idx = min(start_idx + tokenizer.tokens_per_chunk, len(input_ids))
-        chunk_ids = input_ids[start_idx:cur_idx]
 
     return result
@@ -5,14 +5,19 @@
 
 from collections.abc import Generator
 
-from graphrag.index.typing.workflow import Workflow
+from graphrag.index.typing.workflow import Workflow, WorkflowTables
 
 
 class Pipeline:
     """Encapsulates running workflows."""
 
-    def __init__(self, workflows: list[Workflow]):
+    def __init__(
+        self,
+        workflows: list[Workflow],
+        tables: dict[str, WorkflowTables] | None = None,
+    ):
         self.workflows = workflows
+        self.tables = tables or {}
 
     def run(self) -> Generator[Workflow]:
         """Return a Generator over the pipeline workflows."""
@@ -21,3 +26,38 @@ class Pipeline:
     def names(self) -> list[str]:
         """Return the names of the workflows in the pipeline."""
         return [name for name, _ in self.workflows]
+
+    def dependencies(self) -> list[set[int]]:
+        """Return, for each workflow, the positions of the workflows it must wait for.
+
+        A workflow waits for the last earlier writer of each table it reads or writes,
+        and for the earlier readers of each table it overwrites, so running the
+        workflows in any order that respects these dependencies gives the same outputs
+        as running them in list order. A workflow without declared tables waits for all
+        earlier workflows, and all later workflows wait for it.
+        """
+        dependencies: list[set[int]] = []
+        last_writer: dict[str, int] = {}
+        readers: dict[str, set[int]] = {}
+        barrier: int | None = None
+        for position, (name, _) in enumerate(self.workflows):
+            tables = self.tables.get(name)
+            if tables is None:
+                dependencies.append(set(range(position)))
+                barrier = position
+                continue
+
+            waits_for = set() if barrier is None else {barrier}
+            for table in (*tables.reads, *tables.writes):
+                if table in last_writer:
+                    waits_for.add(last_writer[table])
+            for table in tables.writes:
+                waits_for.update(readers.get(table, ()))
+            for table in tables.reads:
+                readers.setdefault(table, set()).add(position)
+            for table in tables.writes:
+                last_writer[table] = position
+                readers[table] = set()
+            waits_for.discard(position)
+            dependencies.append(waits_for)
+        return dependencies
@@ -19,6 +19,20 @@ class WorkflowFunctionOutput:
     """The result of the workflow function. This can be anything - we use it only for logging downstream, and expect each workflow function to write official outputs to the provided storage."""
 
 
+@dataclass(frozen=True)
+class WorkflowTables:
+    """The storage tables a workflow reads and writes.
+
+    The pipeline uses these to find which workflows can run at the same time.
+    """
+
+    reads: tuple[str, ...] = ()
+    """Tables loaded from the pipeline storage."""
+
+    writes: tuple[str, ...] = ()
+    """Tables written to the pipeline storage."""
+
+
 WorkflowFunction = Callable[
     [GraphRagConfig, PipelineRunContext],
     Awaitable[WorkflowFunctionOutput],
@@ -8,6 +8,8 @@ import pandas as pd
 from graphrag.data_model.schemas import (
     COMMUNITIES_FINAL_COLUMNS,
     COMMUNITY_REPORTS_FINAL_COLUMNS,
+    FULL_CONTENT_TOKENS,
+    SUMMARY_TOKENS,
 )
 
 
@@ -120,6 +122,11 @@ def _update_and_merge_community_reports(
     if "period" not in delta_community_reports.columns:
         delta_community_reports["period"] = None
 
+    # Reports from older indexes have no token counts, they are filled in after the merge
+    for column in (SUMMARY_TOKENS, FULL_CONTENT_TOKENS):
+        if column not in old_community_reports.columns:
+            old_community_reports[column] = None
+
     # Look for community ids in community and replace them with the corresponding id in the mapping
     delta_community_reports["community"] = (
         delta_community_reports["community"]
@@ -70,7 +70,8 @@ def _group_and_resolve_entities(
     # Force the result into a DataFrame
     resolved: pd.DataFrame = pd.DataFrame(aggregated)
 
-    # Modify column order to keep consistency
-    resolved = resolved.loc[:, ENTITIES_FINAL_COLUMNS]
+    # Modify column order to keep consistency, description token counts are left
+    # empty until the merged descriptions are summarized
+    resolved = resolved.reindex(columns=ENTITIES_FINAL_COLUMNS)
 
     return resolved, id_mapping
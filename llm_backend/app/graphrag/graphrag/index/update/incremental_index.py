@@ -12,6 +12,8 @@ from graphrag.cache.pipeline_cache import PipelineCache
 from graphrag.callbacks.workflow_callbacks import WorkflowCallbacks
 from graphrag.config.embeddings import get_embedded_fields, get_embedding_settings
 from graphrag.config.models.graph_rag_config import GraphRagConfig
+from graphrag.data_model.schemas import DESCRIPTION, FULL_CONTENT, SUMMARY
+from graphrag.index.operations.compute_token_counts import compute_token_counts
 from graphrag.index.update.communities import (
     _update_and_merge_communities,
     _update_and_merge_community_reports,
@@ -25,6 +27,8 @@ from graphrag.index.workflows.generate_text_embeddings import generate_text_embe
 from graphrag.logger.print_progress import ProgressLogger
 from graphrag.storage.pipeline_storage import PipelineStorage
 from graphrag.utils.storage import (
+    concat_table_to_storage,
+    load_column_from_storage,
     load_table_from_storage,
     storage_has_table,
     write_table_to_storage,
@@ -136,7 +140,7 @@ async def update_dataframe_outputs(
     # 合并社区报告
     progress_logger.info("Updating Community Reports")
     merged_community_reports = await _update_community_reports(
-        previous_storage, delta_storage, output_storage, community_id_mapping
+        previous_storage, delta_storage, output_storage, community_id_mapping, config
     )
 
     # 合并新旧文本嵌入
@@ -168,6 +172,7 @@ async def _update_community_reports(
     delta_storage: PipelineStorage,
     output_storage: PipelineStorage,
     community_id_mapping: dict,
+    config: GraphRagConfig,
 ) -> pd.DataFrame:
     """Update the community reports output."""
     old_community_reports = await load_table_from_storage(
@@ -179,6 +184,14 @@ async def _update_community_reports(
     merged_community_reports = _update_and_merge_community_reports(
         old_community_reports, delta_community_reports, community_id_mapping
     )
+    search_llm_settings = config.get_language_model_config(
+        config.global_search.chat_model_id
+    )
+    compute_token_counts(
+        merged_community_reports,
+        [SUMMARY, FULL_CONTENT],
+        search_llm_settings.encoding_model,
+    )
 
     await write_table_to_storage(
         merged_community_reports, "community_reports", output_storage
@@ -209,12 +222,22 @@ async def _update_covariates(
     delta_storage: PipelineStorage,
     output_storage: PipelineStorage,
 ) -> None:
-    """Update the covariates output."""
-    old_covariates = await load_table_from_storage("covariates", previous_storage)
+    """Update the covariates output.
+
+    Previous covariates are never changed by an update, so only their ids are read
+    and the delta is written after the previous rows without loading them into pandas.
+    """
+    old_ids = await load_column_from_storage(
+        "covariates", "human_readable_id", previous_storage
+    )
     delta_covariates = await load_table_from_storage("covariates", delta_storage)
-    merged_covariates = _merge_covariates(old_covariates, delta_covariates)
+    delta_covariates["human_readable_id"] = _continue_ids(
+        old_ids, len(delta_covariates)
+    )
 
-    await write_table_to_storage(merged_covariates, "covariates", output_storage)
+    await concat_table_to_storage(
+        delta_covariates, "covariates", previous_storage, output_storage
+    )
 
 
 async def _update_text_units(
@@ -281,6 +304,11 @@ async def _update_entities_and_relationships(
         summarization_strategy=summarization_strategy,
         summarization_num_threads=summarization_llm_settings.concurrent_requests,
     )
+    search_llm_settings = config.get_language_model_config(
+        config.local_search.chat_model_id
+    )
+    for merged in (merged_entities_df, merged_relationships_df):
+        compute_token_counts(merged, [DESCRIPTION], search_llm_settings.encoding_model)
 
     # Save the updated entities back to storage
     await write_table_to_storage(merged_entities_df, "entities", output_storage)
@@ -347,28 +375,7 @@ def _update_and_merge_text_units(
     return pd.concat([old_text_units, delta_text_units], ignore_index=True, copy=False)
 
 
-def _merge_covariates(
-    old_covariates: pd.DataFrame, delta_covariates: pd.DataFrame
-) -> pd.DataFrame:
-    """Merge the covariates.
-
-    Parameters
-    ----------
-    old_covariates : pd.DataFrame
-        The old covariates.
-    delta_covariates : pd.DataFrame
-        The delta covariates.
-
-    Returns
-    -------
-    pd.DataFrame
-        The merged covariates.
-    """
-    # Get the max human readable id from the old covariates and update the delta covariates
-    initial_id = old_covariates["human_readable_id"].max() + 1
-    delta_covariates["human_readable_id"] = np.arange(
-        initial_id, initial_id + len(delta_covariates)
-    )
-
-    # Concatenate the old and delta covariates
-    return pd.concat([old_covariates, delta_covariates], ignore_index=True, copy=False)
+def _continue_ids(old_ids: pd.Series, count: int) -> np.ndarray:
+    """Get ids for new rows, continuing after the largest previous id."""
+    initial_id = old_ids.max() + 1
+    return np.arange(initial_id, initial_id + count)
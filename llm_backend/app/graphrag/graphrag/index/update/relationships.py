@@ -79,7 +79,5 @@ def _update_and_merge_relationships(
         final_relationships["source_degree"] + final_relationships["target_degree"]
     )
 
-    return final_relationships.loc[
-        :,
-        RELATIONSHIPS_FINAL_COLUMNS,
-    ]
+    # description token counts are left empty until the merged descriptions are summarized
+    return final_relationships.reindex(columns=RELATIONSHIPS_FINAL_COLUMNS)
@@ -6,8 +6,10 @@
 import asyncio
 import inspect
 import logging
+import time
 import traceback
 from collections.abc import Awaitable, Callable, Coroutine, Hashable
+from concurrent.futures import Executor
 from typing import Any, TypeVar, cast
 
 import pandas as pd
@@ -17,6 +19,8 @@ from graphrag.callbacks.workflow_callbacks import WorkflowCallbacks
 from graphrag.config.enums import AsyncType
 from graphrag.logger.progress import progress_ticker
 
+DEFAULT_CHUNK_SIZE = 1000
+
 logger = logging.getLogger(__name__)
 ItemType = TypeVar("ItemType")
 
@@ -33,12 +37,19 @@ class ParallelizationError(ValueError):
 
 async def derive_from_rows(
     input: pd.DataFrame,
-    transform: Callable[[pd.Series], Awaitable[ItemType]],
+    transform: Callable[[Any], Awaitable[ItemType]],
     callbacks: WorkflowCallbacks | None = None,
     num_threads: int = 4,
     async_type: AsyncType = AsyncType.AsyncIO,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    executor: Executor | None = None,
 ) -> list[ItemType | None]:
-    """Apply a generic transform function to each row. Any errors will be reported and thrown."""
+    """Apply a generic transform function to each row. Any errors will be reported and thrown.
+
+    Rows are passed to the transform as a pd.Series, or as a dict of column to value
+    for `AsyncType.Chunked`. `chunk_size` and `executor` only apply to
+    `AsyncType.Chunked`.
+    """
     callbacks = callbacks or NoopWorkflowCallbacks()
     match async_type:
         case AsyncType.AsyncIO:
@@ -49,6 +60,10 @@ async def derive_from_rows(
             return await derive_from_rows_asyncio_threads(
                 input, transform, callbacks, num_threads
             )
+        case AsyncType.Chunked:
+            return await derive_from_rows_chunked(
+                input, transform, callbacks, num_threads, chunk_size, executor
+            )
         case _:
             msg = f"Unsupported scheduling type {async_type}"
             raise ValueError(msg)
@@ -115,6 +130,116 @@ async def derive_from_rows_asyncio(
     return await _derive_from_rows_base(input, transform, callbacks, gather)
 
 
+async def derive_from_rows_chunked(
+    input: pd.DataFrame,
+    transform: Callable[[dict[Hashable, Any]], Awaitable[ItemType] | ItemType],
+    callbacks: WorkflowCallbacks,
+    num_workers: int | None = 4,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    executor: Executor | None = None,
+) -> list[ItemType | None]:
+    """
+    Derive from rows with a fixed pool of workers, streaming the input in chunks.
+
+    Rows are materialized one chunk at a time as dicts of column to value rather
+    than as a pd.Series per row, and only `num_workers` transforms are in flight
+    at once, so memory stays flat regardless of the size of the input.
+
+    If an `executor` is given, synchronous transforms run on it. Use a
+    ProcessPoolExecutor for CPU-bound transforms; the transform and the row
+    values must then be picklable. Coroutine transforms always run on the event loop.
+
+    Throughput is reported through `callbacks.log` after each chunk is queued.
+    Exceptions are collected and raised as a ParallelizationError once every row is
+    done; a BaseException escaping a worker cancels the remaining workers and the
+    producer.
+    """
+    num_workers = num_workers or 4
+    num_total = len(input)
+    results: list[ItemType | None] = [None] * num_total
+    errors: list[tuple[BaseException, str]] = []
+    tick = progress_ticker(callbacks.progress, num_total=num_total)
+    loop = asyncio.get_running_loop()
+    run_in_executor = executor is not None and not inspect.iscoroutinefunction(
+        transform
+    )
+    queue: asyncio.Queue[tuple[int, Any] | None] = asyncio.Queue(
+        maxsize=num_workers * 2
+    )
+    num_completed = 0
+    start_time = time.perf_counter()
+
+    async def execute(row: Any) -> ItemType:
+        if run_in_executor:
+            return await loop.run_in_executor(executor, transform, row)
+        result = transform(row)
+        if inspect.isawaitable(result):
+            result = await result
+        return cast("ItemType", result)
+
+    async def worker() -> None:
+        nonlocal num_completed
+        while (item := await queue.get()) is not None:
+            position, row = item
+            try:
+                results[position] = await execute(row)
+            except Exception as e:  # noqa: BLE001
+                errors.append((e, traceback.format_exc()))
+            finally:
+                num_completed += 1
+                tick(1)
+
+    def report_throughput(message: str) -> None:
+        elapsed = time.perf_counter() - start_time
+        callbacks.log(
+            message,
+            details={
+                "completed_rows": num_completed,
+                "total_rows": num_total,
+                "in_flight": min(num_workers, num_total - num_completed),
+                "elapsed_seconds": round(elapsed, 3),
+                "rows_per_second": round(num_completed / elapsed, 3)
+                if elapsed > 0
+                else None,
+            },
+        )
+
+    async def produce(num_workers: int) -> None:
+        for chunk_start in range(0, num_total, chunk_size):
+            chunk = input.iloc[chunk_start : chunk_start + chunk_size].to_dict(
+                "records"
+            )
+            for offset, row in enumerate(chunk):
+                await queue.put((chunk_start + offset, row))
+            report_throughput("derive_from_rows chunk queued")
+        for _ in range(num_workers):
+            await queue.put(None)
+
+    workers = [
+        asyncio.create_task(worker())
+        for _ in range(max(1, min(num_workers, num_total)))
+    ]
+    # the producer is a task of its own, so a worker dying on a BaseException
+    # cancels it instead of leaving it blocked on a full queue
+    tasks = [asyncio.create_task(produce(len(workers))), *workers]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    tick.done()
+    report_throughput("derive_from_rows completed")
+
+    for error, stack in errors:
+        callbacks.error("parallel transformation error", error, stack)
+
+    if len(errors) > 0:
+        raise ParallelizationError(len(errors), errors[0][1])
+
+    return results
+
+
 ItemType = TypeVar("ItemType")
 
 ExecuteFn = Callable[[tuple[Hashable, pd.Series]], Awaitable[ItemType | None]]
@@ -4,37 +4,37 @@
 """Rate limiter utility."""
 
 import asyncio
+import threading
 import time
 
 
 class RateLimiter:
     """
-    The original TpmRpmLLMLimiter strategy did not account for minute-based rate limiting when scheduled.
+    Allows `rate` acquisitions per `per` seconds, shared safely between tasks.
 
-    The RateLimiter was introduced to ensure that the CommunityReportsExtractor could be scheduled to adhere to rate configurations on a per-minute basis.
+    The bucket holds at most `rate` acquisitions, so a burst never exceeds `rate`.
+    Model requests are already limited per endpoint by the shared limiter in
+    `graphrag.language_model.rate_limiter`; this is kept for other scheduled work.
     """
 
-    # TODO: RateLimiter scheduled: using asyncio for async_mode
-
     def __init__(self, rate: int, per: int):
         self.rate = rate
         self.per = per
-        self.allowance = rate
+        self.allowance = float(rate)
         self.last_check = time.monotonic()
+        self._lock = threading.Lock()
 
     async def acquire(self):
         """Acquire a token from the rate limiter."""
-        current = time.monotonic()
-        elapsed = current - self.last_check
-        self.last_check = current
-        self.allowance += elapsed * (self.rate / self.per)
-
-        if self.allowance > self.rate:
-            self.allowance = self.rate
-
-        if self.allowance < 1.0:
-            sleep_time = (1.0 - self.allowance) * (self.per / self.rate)
-            await asyncio.sleep(sleep_time)
-            self.allowance = 0.0
-        else:
+        with self._lock:
+            current = time.monotonic()
+            elapsed = current - self.last_check
+            self.last_check = current
+            self.allowance = min(
+                self.allowance + elapsed * (self.rate / self.per), self.rate
+            )
+            # reserve the token now, callers arriving later queue up behind it
             self.allowance -= 1.0
+            sleep_time = -self.allowance * (self.per / self.rate)
+        if sleep_time > 0:
+            await asyncio.sleep(sleep_time)
@@ -4,6 +4,7 @@
 """Utilities for working with tokens."""
 
 import logging
+from functools import cache
 
 import tiktoken
 
@@ -14,31 +15,51 @@ DEFAULT_ENCODING_NAME = defs.ENCODING_MODEL
 log = logging.getLogger(__name__)
 
 
+@cache
+def get_encoding(
+    model: str | None = None, encoding_name: str | None = None
+) -> tiktoken.Encoding:
+    """Return the encoding of a model, or the named encoding.
+
+    Encodings are resolved once and reused. Raises a KeyError for unknown models.
+    """
+    if model is not None:
+        return tiktoken.encoding_for_model(model)
+    return tiktoken.get_encoding(encoding_name or DEFAULT_ENCODING_NAME)
+
+
 def num_tokens_from_string(
     string: str, model: str | None = None, encoding_name: str | None = None
 ) -> int:
     """Return the number of tokens in a text string."""
-    if model is not None:
-        try:
-            encoding = tiktoken.encoding_for_model(model)
-        except KeyError:
-            msg = f"Failed to get encoding for {model} when getting num_tokens_from_string. Fall back to default encoding {DEFAULT_ENCODING_NAME}"
-            log.warning(msg)
-            encoding = tiktoken.get_encoding(DEFAULT_ENCODING_NAME)
-    else:
-        encoding = tiktoken.get_encoding(encoding_name or DEFAULT_ENCODING_NAME)
-    return len(encoding.encode(string))
+    return len(_get_encoding(model, encoding_name).encode(string))
+
+
+def num_tokens_from_strings(
+    strings: list[str], model: str | None = None, encoding_name: str | None = None
+) -> list[int]:
+    """Return the number of tokens in each text string, encoding them as a batch."""
+    encoding = _get_encoding(model, encoding_name)
+    return [len(tokens) for tokens in encoding.encode_batch(strings)]
 
 
 def string_from_tokens(
     tokens: list[int], model: str | None = None, encoding_name: str | None = None
 ) -> str:
     """Return a text string from a list of tokens."""
-    if model is not None:
-        encoding = tiktoken.encoding_for_model(model)
-    elif encoding_name is not None:
-        encoding = tiktoken.get_encoding(encoding_name)
-    else:
+    if model is None and encoding_name is None:
         msg = "Either model or encoding_name must be specified."
         raise ValueError(msg)
-    return encoding.decode(tokens)
+    return get_encoding(model, encoding_name).decode(tokens)
+
+
+def _get_encoding(model: str | None, encoding_name: str | None) -> tiktoken.Encoding:
+    """Return the encoding of a model, falling back to the default for unknown models."""
+    if model is None:
+        return get_encoding(encoding_name=encoding_name)
+    try:
+        return get_encoding(model)
+    except KeyError:
+        msg = f"Failed to get encoding for {model} when getting num_tokens_from_string. Fall back to default encoding {DEFAULT_ENCODING_NAME}"
+        log.warning(msg)
+        return get_encoding()
@@ -6,6 +6,20 @@
 
 from graphrag.index.workflows.factory import PipelineFactory
 
+from . import (
+    create_base_text_units,
+    create_communities,
+    create_community_reports,
+    create_community_reports_text,
+    create_final_documents,
+    create_final_text_units,
+    extract_covariates,
+    extract_graph,
+    extract_graph_nlp,
+    finalize_graph,
+    generate_text_embeddings,
+    prune_graph,
+)
 from .create_base_text_units import (
     run_workflow as run_create_base_text_units,
 )
@@ -44,17 +58,33 @@ from .prune_graph import (
 )
 
 # register all of our built-in workflows at once
-PipelineFactory.register_all({
-    "create_base_text_units": run_create_base_text_units,
-    "create_communities": run_create_communities,
-    "create_community_reports_text": run_create_community_reports_text,
-    "create_community_reports": run_create_community_reports,
-    "extract_covariates": run_extract_covariates,
-    "create_final_documents": run_create_final_documents,
-    "create_final_text_units": run_create_final_text_units,
-    "extract_graph_nlp": run_extract_graph_nlp,
-    "extract_graph": run_extract_graph,
-    "finalize_graph": run_finalize_graph,
-    "generate_text_embeddings": run_generate_text_embeddings,
-    "prune_graph": run_prune_graph,
-})
+PipelineFactory.register_all(
+    {
+        "create_base_text_units": run_create_base_text_units,
+        "create_communities": run_create_communities,
+        "create_community_reports_text": run_create_community_reports_text,
+        "create_community_reports": run_create_community_reports,
+        "extract_covariates": run_extract_covariates,
+        "create_final_documents": run_create_final_documents,
+        "create_final_text_units": run_create_final_text_units,
+        "extract_graph_nlp": run_extract_graph_nlp,
+        "extract_graph": run_extract_graph,
+        "finalize_graph": run_finalize_graph,
+        "generate_text_embeddings": run_generate_text_embeddings,
+        "prune_graph": run_prune_graph,
+    },
+    {
+        "create_base_text_units": create_base_text_units.WORKFLOW_TABLES,
+        "create_communities": create_communities.WORKFLOW_TABLES,
+        "create_community_reports_text": create_community_reports_text.WORKFLOW_TABLES,
+        "create_community_reports": create_community_reports.WORKFLOW_TABLES,
+        "extract_covariates": extract_covariates.WORKFLOW_TABLES,
+        "create_final_documents": create_final_documents.WORKFLOW_TABLES,
+        "create_final_text_units": create_final_text_units.WORKFLOW_TABLES,
+        "extract_graph_nlp": extract_graph_nlp.WORKFLOW_TABLES,
+        "extract_graph": extract_graph.WORKFLOW_TABLES,
+        "finalize_graph": finalize_graph.WORKFLOW_TABLES,
+        "generate_text_embeddings": generate_text_embeddings.WORKFLOW_TABLES,
+        "prune_graph": prune_graph.WORKFLOW_TABLES,
+    },
+)
@@ -4,22 +4,38 @@
 """A module containing run_workflow method definition."""
 
 import json
+from dataclasses import replace
 from typing import Any, cast
 
+import numpy as np
 import pandas as pd
 
 from graphrag.callbacks.workflow_callbacks import WorkflowCallbacks
-from graphrag.config.models.chunking_config import ChunkStrategyType
+from graphrag.config.models.chunking_config import ChunkingConfig, ChunkStrategyType
 from graphrag.config.models.graph_rag_config import GraphRagConfig
 from graphrag.index.operations.chunk_text.chunk_text import chunk_text
-from graphrag.index.operations.chunk_text.strategies import get_encoding_fn
+from graphrag.index.operations.chunk_text.strategies import (
+    encode_texts_in_parallel,
+    get_encoding_fn,
+    get_tokenizer,
+)
+from graphrag.index.text_splitting.text_splitting import (
+    Tokenizer,
+    split_encoded_texts_on_tokens,
+)
 from graphrag.index.typing.context import PipelineRunContext
-from graphrag.index.typing.workflow import WorkflowFunctionOutput
+from graphrag.index.typing.workflow import WorkflowFunctionOutput, WorkflowTables
 from graphrag.index.utils.hashing import gen_sha512_hash
-from graphrag.logger.progress import Progress
+from graphrag.logger.progress import Progress, progress_ticker
 from graphrag.utils.storage import load_table_from_storage, write_table_to_storage
 
 
+WORKFLOW_TABLES = WorkflowTables(
+    reads=("documents",),
+    writes=("text_units",),
+)
+
+
 async def run_workflow(
     config: GraphRagConfig,
     context: PipelineRunContext,
@@ -84,12 +100,24 @@ def create_base_text_units(
     )
     aggregated.rename(columns={"text_with_ids": "texts"}, inplace=True)
 
+    # the token strategy encodes the documents of every group in one parallel pass,
+    # each group is then split from its slice of the token offsets
+    tokenizer: Tokenizer | None = None
+    if strategy == ChunkStrategyType.tokens:
+        tokenizer = get_tokenizer(
+            ChunkingConfig(size=size, overlap=overlap, encoding_model=encoding_model)
+        )
+        texts = [text for group in aggregated["texts"] for _, text in group]
+        input_ids, ends = encode_texts_in_parallel(
+            texts, tokenizer, progress_ticker(callbacks.progress, len(texts))
+        )
+        group_starts = np.cumsum([0, *(len(group) for group in aggregated["texts"])])
 
     def chunker(row: dict[str, Any]) -> Any:
         line_delimiter = ".\n"
         metadata_str = ""
         metadata_tokens = 0
-   
+
         if prepend_metadata and "metadata" in row:
             metadata = row["metadata"]
             if isinstance(metadata, str):
@@ -107,16 +135,26 @@ def create_base_text_units(
                     message = "Metadata tokens exceeds the maximum tokens per chunk. Please increase the tokens per chunk."
                     raise ValueError(message)
 
-        # 使用 chunk_text 函数对 text_with_ids 列进行分块处理
-        chunked = chunk_text(
-            pd.DataFrame([row]).reset_index(drop=True),
-            column="texts",
-            size=size - metadata_tokens,
-            overlap=overlap,
-            encoding_model=encoding_model,
-            strategy=strategy,
-            callbacks=callbacks,
-        )[0]
+        if tokenizer is not None:
+            position = cast("int", row.name)  # type: ignore
+            chunked = _split_encoded_group(
+                row["texts"],
+                input_ids,
+                ends,
+                int(group_starts[position]),
+                replace(tokenizer, tokens_per_chunk=size - metadata_tokens),
+            )
+        else:
+            # 使用 chunk_text 函数对 text_with_ids 列进行分块处理
+            chunked = chunk_text(
+                pd.DataFrame([row]).reset_index(drop=True),
+                column="texts",
+                size=size - metadata_tokens,
+                overlap=overlap,
+                encoding_model=encoding_model,
+                strategy=strategy,
+                callbacks=callbacks,
+            )[0]
 
         if prepend_metadata:
             for index, chunk in enumerate(chunked):
@@ -152,3 +190,26 @@ def create_base_text_units(
     return cast(
         "pd.DataFrame", aggregated[aggregated["text"].notna()].reset_index(drop=True)
     )
+
+
+def _split_encoded_group(
+    texts: list[tuple[str, str]],
+    input_ids: np.ndarray,
+    ends: np.ndarray,
+    first: int,
+    tokenizer: Tokenizer,
+) -> list[Any]:
+    """Split the documents of one group from their slice of the encoded tokens."""
+    last = first + len(texts)
+    base = int(ends[first - 1]) if first > 0 else 0
+    chunks = split_encoded_texts_on_tokens(
+        input_ids[base : int(ends[last - 1])], ends[first:last] - base, tokenizer
+    )
+    return [
+        (
+            [texts[index][0] for index in chunk.source_doc_indices],
+            chunk.text_chunk,
+            chunk.n_tokens,
+        )
+        for chunk in chunks
+    ]
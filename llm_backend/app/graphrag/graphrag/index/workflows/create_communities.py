@@ -15,10 +15,16 @@ from graphrag.data_model.schemas import COMMUNITIES_FINAL_COLUMNS
 from graphrag.index.operations.cluster_graph import cluster_graph
 from graphrag.index.operations.create_graph import create_graph
 from graphrag.index.typing.context import PipelineRunContext
-from graphrag.index.typing.workflow import WorkflowFunctionOutput
+from graphrag.index.typing.workflow import WorkflowFunctionOutput, WorkflowTables
 from graphrag.utils.storage import load_table_from_storage, write_table_to_storage
 
 
+WORKFLOW_TABLES = WorkflowTables(
+    reads=("entities", "relationships"),
+    writes=("communities",),
+)
+
+
 async def run_workflow(
     config: GraphRagConfig,
     context: PipelineRunContext,
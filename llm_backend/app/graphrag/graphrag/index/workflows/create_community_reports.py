@@ -25,7 +25,7 @@ from graphrag.index.operations.summarize_communities.summarize_communities impor
     summarize_communities,
 )
 from graphrag.index.typing.context import PipelineRunContext
-from graphrag.index.typing.workflow import WorkflowFunctionOutput
+from graphrag.index.typing.workflow import WorkflowFunctionOutput, WorkflowTables
 from graphrag.utils.storage import (
     load_table_from_storage,
     storage_has_table,
@@ -33,6 +33,12 @@ from graphrag.utils.storage import (
 )
 
 
+WORKFLOW_TABLES = WorkflowTables(
+    reads=("relationships", "entities", "communities", "covariates"),
+    writes=("community_reports",),
+)
+
+
 async def run_workflow(
     config: GraphRagConfig,
     context: PipelineRunContext,
@@ -55,6 +61,10 @@ async def run_workflow(
     summarization_strategy = config.community_reports.resolved_strategy(
         config.root_dir, community_reports_llm_settings
     )
+    # token counts are stored for the model that builds global search context
+    search_llm_settings = config.get_language_model_config(
+        config.global_search.chat_model_id
+    )
 
     output = await create_community_reports(
         edges_input=edges,
@@ -66,6 +76,7 @@ async def run_workflow(
         summarization_strategy=summarization_strategy,
         async_mode=async_mode,
         num_threads=num_threads,
+        encoding_model=search_llm_settings.encoding_model,
     )
 
     await write_table_to_storage(output, "community_reports", context.storage)
@@ -83,6 +94,7 @@ async def create_community_reports(
     summarization_strategy: dict,
     async_mode: AsyncType = AsyncType.AsyncIO,
     num_threads: int = 4,
+    encoding_model: str | None = None,
 ) -> pd.DataFrame:
     """All the steps to transform community reports."""
     nodes = explode_communities(communities, entities)
@@ -121,7 +133,7 @@ async def create_community_reports(
         num_threads=num_threads,
     )
 
-    return finalize_community_reports(community_reports, communities)
+    return finalize_community_reports(community_reports, communities, encoding_model)
 
 
 def _prep_nodes(input: pd.DataFrame) -> pd.DataFrame:
@@ -26,12 +26,18 @@ from graphrag.index.operations.summarize_communities.text_unit_context.context_b
     build_local_context,
 )
 from graphrag.index.typing.context import PipelineRunContext
-from graphrag.index.typing.workflow import WorkflowFunctionOutput
+from graphrag.index.typing.workflow import WorkflowFunctionOutput, WorkflowTables
 from graphrag.utils.storage import load_table_from_storage, write_table_to_storage
 
 log = logging.getLogger(__name__)
 
 
+WORKFLOW_TABLES = WorkflowTables(
+    reads=("entities", "communities", "text_units"),
+    writes=("community_reports",),
+)
+
+
 async def run_workflow(
     config: GraphRagConfig,
     context: PipelineRunContext,
@@ -50,6 +56,10 @@ async def run_workflow(
     summarization_strategy = config.community_reports.resolved_strategy(
         config.root_dir, community_reports_llm_settings
     )
+    # token counts are stored for the model that builds global search context
+    search_llm_settings = config.get_language_model_config(
+        config.global_search.chat_model_id
+    )
 
     output = await create_community_reports_text(
         entities,
@@ -60,6 +70,7 @@ async def run_workflow(
         summarization_strategy,
         async_mode=async_mode,
         num_threads=num_threads,
+        encoding_model=search_llm_settings.encoding_model,
     )
 
     await write_table_to_storage(output, "community_reports", context.storage)
@@ -76,6 +87,7 @@ async def create_community_reports_text(
     summarization_strategy: dict,
     async_mode: AsyncType = AsyncType.AsyncIO,
     num_threads: int = 4,
+    encoding_model: str | None = None,
 ) -> pd.DataFrame:
     """All the steps to transform community reports."""
     nodes = explode_communities(communities, entities)
@@ -103,4 +115,4 @@ async def create_community_reports_text(
         num_threads=num_threads,
     )
 
-    return finalize_community_reports(community_reports, communities)
+    return finalize_community_reports(community_reports, communities, encoding_model)
@@ -8,10 +8,16 @@ import pandas as pd
 from graphrag.config.models.graph_rag_config import GraphRagConfig
 from graphrag.data_model.schemas import DOCUMENTS_FINAL_COLUMNS
 from graphrag.index.typing.context import PipelineRunContext
-from graphrag.index.typing.workflow import WorkflowFunctionOutput
+from graphrag.index.typing.workflow import WorkflowFunctionOutput, WorkflowTables
 from graphrag.utils.storage import load_table_from_storage, write_table_to_storage
 
 
+WORKFLOW_TABLES = WorkflowTables(
+    reads=("documents", "text_units"),
+    writes=("documents",),
+)
+
+
 async def run_workflow(
     _config: GraphRagConfig,
     context: PipelineRunContext,
@@ -8,7 +8,7 @@ import pandas as pd
 from graphrag.config.models.graph_rag_config import GraphRagConfig
 from graphrag.data_model.schemas import TEXT_UNITS_FINAL_COLUMNS
 from graphrag.index.typing.context import PipelineRunContext
-from graphrag.index.typing.workflow import WorkflowFunctionOutput
+from graphrag.index.typing.workflow import WorkflowFunctionOutput, WorkflowTables
 from graphrag.utils.storage import (
     load_table_from_storage,
     storage_has_table,
@@ -16,6 +16,12 @@ from graphrag.utils.storage import (
 )
 
 
+WORKFLOW_TABLES = WorkflowTables(
+    reads=("text_units", "entities", "relationships", "covariates"),
+    writes=("text_units",),
+)
+
+
 async def run_workflow(
     config: GraphRagConfig,
     context: PipelineRunContext,
@@ -17,10 +17,16 @@ from graphrag.index.operations.extract_covariates.extract_covariates import (
     extract_covariates as extractor,
 )
 from graphrag.index.typing.context import PipelineRunContext
-from graphrag.index.typing.workflow import WorkflowFunctionOutput
+from graphrag.index.typing.workflow import WorkflowFunctionOutput, WorkflowTables
 from graphrag.utils.storage import load_table_from_storage, write_table_to_storage
 
 
+WORKFLOW_TABLES = WorkflowTables(
+    reads=("text_units",),
+    writes=("covariates",),
+)
+
+
 async def run_workflow(
     config: GraphRagConfig,
     context: PipelineRunContext,
@@ -18,10 +18,16 @@ from graphrag.index.operations.summarize_descriptions import (
     summarize_descriptions,
 )
 from graphrag.index.typing.context import PipelineRunContext
-from graphrag.index.typing.workflow import WorkflowFunctionOutput
+from graphrag.index.typing.workflow import WorkflowFunctionOutput, WorkflowTables
 from graphrag.utils.storage import load_table_from_storage, write_table_to_storage
 
 
+WORKFLOW_TABLES = WorkflowTables(
+    reads=("text_units",),
+    writes=("entities", "relationships"),
+)
+
+
 async def run_workflow(
     config: GraphRagConfig,
     context: PipelineRunContext,
@@ -8,24 +8,41 @@ from typing import ClassVar
 from graphrag.config.enums import IndexingMethod
 from graphrag.config.models.graph_rag_config import GraphRagConfig
 from graphrag.index.typing.pipeline import Pipeline
-from graphrag.index.typing.workflow import WorkflowFunction
+from graphrag.index.typing.workflow import WorkflowFunction, WorkflowTables
 
 
 class PipelineFactory:
     """A factory class for workflow pipelines."""
 
     workflows: ClassVar[dict[str, WorkflowFunction]] = {}
+    tables: ClassVar[dict[str, WorkflowTables]] = {}
 
     @classmethod
-    def register(cls, name: str, workflow: WorkflowFunction):
-        """Register a custom workflow function."""
+    def register(
+        cls,
+        name: str,
+        workflow: WorkflowFunction,
+        tables: WorkflowTables | None = None,
+    ):
+        """Register a custom workflow function.
+
+        Workflows registered without their tables never run alongside other workflows.
+        """
         cls.workflows[name] = workflow
+        if tables is None:
+            cls.tables.pop(name, None)
+        else:
+            cls.tables[name] = tables
 
     @classmethod
-    def register_all(cls, workflows: dict[str, WorkflowFunction]):
+    def register_all(
+        cls,
+        workflows: dict[str, WorkflowFunction],
+        tables: dict[str, WorkflowTables] | None = None,
+    ):
         """Register a dict of custom workflow functions."""
         for name, workflow in workflows.items():
-            cls.register(name, workflow)
+            cls.register(name, workflow, (tables or {}).get(name))
 
     @classmethod
     def create_pipeline(
@@ -33,7 +50,10 @@ class PipelineFactory:
     ) -> Pipeline:
         """Create a pipeline generator."""
         workflows = _get_workflows_list(config, method)
-        return Pipeline([(name, cls.workflows[name]) for name in workflows])
+        return Pipeline(
+            [(name, cls.workflows[name]) for name in workflows],
+            {name: cls.tables[name] for name in workflows if name in cls.tables},
+        )
 
 
 def _get_workflows_list(
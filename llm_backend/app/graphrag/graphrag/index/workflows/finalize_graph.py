@@ -13,10 +13,16 @@ from graphrag.index.operations.finalize_entities import finalize_entities
 from graphrag.index.operations.finalize_relationships import finalize_relationships
 from graphrag.index.operations.snapshot_graphml import snapshot_graphml
 from graphrag.index.typing.context import PipelineRunContext
-from graphrag.index.typing.workflow import WorkflowFunctionOutput
+from graphrag.index.typing.workflow import WorkflowFunctionOutput, WorkflowTables
 from graphrag.utils.storage import load_table_from_storage, write_table_to_storage
 
 
+WORKFLOW_TABLES = WorkflowTables(
+    reads=("entities", "relationships"),
+    writes=("entities", "relationships"),
+)
+
+
 async def run_workflow(
     config: GraphRagConfig,
     context: PipelineRunContext,
@@ -25,12 +31,18 @@ async def run_workflow(
     entities = await load_table_from_storage("entities", context.storage)
     relationships = await load_table_from_storage("relationships", context.storage)
 
+    # token counts are stored for the model that builds local search context
+    search_llm_settings = config.get_language_model_config(
+        config.local_search.chat_model_id
+    )
+
     final_entities, final_relationships = finalize_graph(
         entities,
         relationships,
         callbacks=context.callbacks,
         embed_config=config.embed_graph,
         layout_enabled=config.umap.enabled,
+        encoding_model=search_llm_settings.encoding_model,
     )
 
     await write_table_to_storage(final_entities, "entities", context.storage)
@@ -59,10 +71,11 @@ def finalize_graph(
     callbacks: WorkflowCallbacks,
     embed_config: EmbedGraphConfig | None = None,
     layout_enabled: bool = False,
+    encoding_model: str | None = None,
 ) -> tuple[pd.DataFrame, pd.DataFrame]:
     """All the steps to finalize the entity and relationship formats."""
     final_entities = finalize_entities(
-        entities, relationships, callbacks, embed_config, layout_enabled
+        entities, relationships, callbacks, embed_config, layout_enabled, encoding_model
     )
-    final_relationships = finalize_relationships(relationships)
+    final_relationships = finalize_relationships(relationships, encoding_model)
     return (final_entities, final_relationships)
@@ -3,6 +3,7 @@
 
 """A module containing run_workflow method definition."""
 
+import asyncio
 import logging
 
 import pandas as pd
@@ -10,6 +11,7 @@ import pandas as pd
 from graphrag.cache.pipeline_cache import PipelineCache
 from graphrag.callbacks.workflow_callbacks import WorkflowCallbacks
 from graphrag.config.embeddings import (
+    all_embeddings,
     community_full_content_embedding,
     community_summary_embedding,
     community_title_embedding,
@@ -24,12 +26,23 @@ from graphrag.config.embeddings import (
 from graphrag.config.models.graph_rag_config import GraphRagConfig
 from graphrag.index.operations.embed_text import embed_text
 from graphrag.index.typing.context import PipelineRunContext
-from graphrag.index.typing.workflow import WorkflowFunctionOutput
+from graphrag.index.typing.workflow import WorkflowFunctionOutput, WorkflowTables
 from graphrag.utils.storage import load_table_from_storage, write_table_to_storage
 
 log = logging.getLogger(__name__)
 
 
+# "vector_store" is not a storage table; declaring it orders this workflow after
+# and before any other workflow that loads the same vector store collections.
+WORKFLOW_TABLES = WorkflowTables(
+    reads=("documents", "relationships", "text_units", "entities", "community_reports"),
+    writes=(
+        "vector_store",
+        *sorted(f"embeddings.{name}" for name in all_embeddings),
+    ),
+)
+
+
 async def run_workflow(
     config: GraphRagConfig,
     context: PipelineRunContext,
@@ -131,16 +144,20 @@ async def generate_text_embeddings(
     }
 
     log.info("Creating embeddings")
-    outputs = {}
-    for field in embedded_fields:
-        outputs[field] = await _run_and_snapshot_embeddings(
+    # the embeddings are independent, so they are generated concurrently; the
+    # requests still share the embedding model's concurrency limit
+    fields = list(embedded_fields)
+    results = await asyncio.gather(*[
+        _run_and_snapshot_embeddings(
             name=field,
             callbacks=callbacks,
             cache=cache,
             text_embed_config=text_embed_config,
             **embedding_param_map[field],
         )
-    return outputs
+        for field in fields
+    ])
+    return dict(zip(fields, results, strict=True))
 
 
 async def _run_and_snapshot_embeddings(
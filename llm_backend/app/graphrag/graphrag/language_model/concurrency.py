@@ -0,0 +1,144 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""Shared limits on concurrent and per-minute language model requests."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from graphrag.index.utils.tokens import get_encoding
+from graphrag.language_model.rate_limiter import (
+    RateLimitReservation,
+    get_rate_limiter,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Sequence
+
+    from graphrag.config.models.language_model_config import LanguageModelConfig
+
+_current_budget: ContextVar[LLMConcurrencyBudget | None] = ContextVar(
+    "llm_concurrency_budget", default=None
+)
+
+
+class LLMConcurrencyBudget:
+    """Caps the in-flight requests to each model endpoint.
+
+    Each workflow sizes its own concurrency from the model's `concurrent_requests`.
+    When several workflows run at once, the budget keeps the total number of requests
+    sent to one endpoint at that limit, however many model instances share it.
+    """
+
+    def __init__(self) -> None:
+        self._semaphores: dict[tuple, asyncio.Semaphore] = {}
+
+    def semaphore(self, config: LanguageModelConfig) -> asyncio.Semaphore:
+        """Get the semaphore shared by all models calling the same endpoint."""
+        key = (config.type, config.api_base, config.deployment_name, config.model)
+        semaphore = self._semaphores.get(key)
+        if semaphore is None:
+            semaphore = self._semaphores[key] = asyncio.Semaphore(
+                max(1, config.concurrent_requests)
+            )
+        return semaphore
+
+    def activate(self) -> None:
+        """Apply this budget to model requests made from the current context.
+
+        Tasks copy their context when they are created, so calling this at the start of
+        a task covers every request the task and its subtasks make.
+        """
+        _current_budget.set(self)
+
+
+_current_slot: ContextVar[LLMRequestSlot | None] = ContextVar(
+    "llm_request_slot", default=None
+)
+
+
+class LLMRequestSlot:
+    """The rate limit capacity and budget slot of one model call.
+
+    Nothing is taken until the model actually sends a request, so a call answered
+    from the cache costs neither a request nor tokens. Every retry sends the request
+    again and takes another request from the rate limiter.
+    """
+
+    def __init__(
+        self, config: LanguageModelConfig, texts: Sequence[str], max_tokens: int
+    ) -> None:
+        self.config = config
+        self.texts = texts
+        self.max_tokens = max_tokens
+        self.reservation: RateLimitReservation | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    async def acquire(self) -> None:
+        """Wait for the endpoint's rate limits, then hold a slot of the active budget."""
+        limiter = get_rate_limiter(
+            self.config.api_base,
+            self.config.model,
+            self.config.requests_per_minute,
+            self.config.tokens_per_minute,
+        )
+        tokens = (
+            _estimate_tokens(self.config, self.texts) + self.max_tokens
+            if limiter.tokens_per_minute > 0
+            else 0
+        )
+        self.reservation = await limiter.acquire(tokens)
+        budget = _current_budget.get()
+        if budget is not None and self._semaphore is None:
+            semaphore = budget.semaphore(self.config)
+            await semaphore.acquire()
+            self._semaphore = semaphore
+
+    def settle(self, used_tokens: int) -> None:
+        """Correct the last reservation with the real usage of the request."""
+        if self.reservation is not None:
+            self.reservation.settle(used_tokens)
+
+    def release(self) -> None:
+        """Give the budget slot back."""
+        if self._semaphore is not None:
+            self._semaphore.release()
+            self._semaphore = None
+
+
+@asynccontextmanager
+async def llm_request_slot(
+    config: LanguageModelConfig,
+    texts: Sequence[str] = (),
+    max_tokens: int = 0,
+) -> AsyncGenerator[LLMRequestSlot, None]:
+    """Make the rate limits and budget apply to the requests sent within the block.
+
+    The token cost of a request is estimated from the texts sent and the number of
+    tokens it may generate. The provider calls `acquire_llm_request_slot` right before
+    it sends a request, below its cache. Callers that learn the real usage settle the
+    slot.
+    """
+    slot = LLMRequestSlot(config, texts, max_tokens)
+    token = _current_slot.set(slot)
+    try:
+        yield slot
+    finally:
+        _current_slot.reset(token)
+        slot.release()
+
+
+async def acquire_llm_request_slot() -> None:
+    """Take the capacity of the request about to be sent from the current slot."""
+    slot = _current_slot.get()
+    if slot is not None:
+        await slot.acquire()
+
+
+def _estimate_tokens(config: LanguageModelConfig, texts: Sequence[str]) -> int:
+    encoding = get_encoding(encoding_name=config.encoding_model or None)
+    return sum(len(encoding.encode_ordinary(text)) for text in texts if text)
@@ -8,14 +8,23 @@ from typing import Any
 from fnllm.events import LLMEvents
 
 from graphrag.index.typing.error_handler import ErrorHandlerFn
+from graphrag.language_model.concurrency import acquire_llm_request_slot
 
 
 class FNLLMEvents(LLMEvents):
-    """FNLLM events handler that calls the error handler."""
+    """FNLLM events handler that calls the error handler.
 
-    def __init__(self, on_error: ErrorHandlerFn):
+    It also applies the shared rate limits right before a request is sent. fnllm
+    only executes requests for cache misses, so cache hits are not limited.
+    """
+
+    def __init__(self, on_error: ErrorHandlerFn | None = None):
         self._on_error = on_error
 
+    async def on_execute_llm(self) -> None:
+        """Wait for the shared rate limits before a request is sent."""
+        await acquire_llm_request_slot()
+
     async def on_error(
         self,
         error: BaseException | None,
@@ -23,4 +32,5 @@ class FNLLMEvents(LLMEvents):
         arguments: dict[str, Any] | None = None,
     ) -> None:
         """Handle an fnllm error."""
-        self._on_error(error, traceback, arguments)
+        if self._on_error is not None:
+            self._on_error(error, traceback, arguments)
@@ -13,11 +13,15 @@ from fnllm.openai import (
     create_openai_embeddings_llm,
 )
 
+from graphrag.language_model.concurrency import llm_request_slot
 from graphrag.language_model.providers.fnllm.events import FNLLMEvents
 from graphrag.language_model.providers.fnllm.utils import (
+    _chat_max_tokens,
+    _chat_request_texts,
     _create_cache,
     _create_error_handler,
     _create_openai_config,
+    _settle_usage,
     run_coroutine_sync,
 )
 from graphrag.language_model.response.base import (
@@ -52,6 +56,7 @@ class OpenAIChatFNLLM:
         callbacks: WorkflowCallbacks | None = None,
         cache: PipelineCache | None = None,
     ) -> None:
+        self.config = config
         model_config = _create_openai_config(config, azure=False)
         error_handler = _create_error_handler(callbacks) if callbacks else None
         model_cache = _create_cache(cache, name)
@@ -60,7 +65,7 @@ class OpenAIChatFNLLM:
             model_config,
             client=client,
             cache=model_cache,
-            events=FNLLMEvents(error_handler) if error_handler else None,
+            events=FNLLMEvents(error_handler),
         )
 
     async def achat(
@@ -77,10 +82,16 @@ class OpenAIChatFNLLM:
         -------
             The response from the Model.
         """
-        if history is None:
-            response = await self.model(prompt, **kwargs)
-        else:
-            response = await self.model(prompt, history=history, **kwargs)
+        async with llm_request_slot(
+            self.config,
+            _chat_request_texts(prompt, history),
+            _chat_max_tokens(self.config, kwargs),
+        ) as slot:
+            if history is None:
+                response = await self.model(prompt, **kwargs)
+            else:
+                response = await self.model(prompt, history=history, **kwargs)
+            _settle_usage(slot, response)
         return BaseModelResponse(
             output=BaseModelOutput(content=response.output.content),
             parsed_response=response.parsed_json,
@@ -104,10 +115,17 @@ class OpenAIChatFNLLM:
         -------
             A generator that yields strings representing the response.
         """
-        if history is None:
-            response = await self.model(prompt, stream=True, **kwargs)
-        else:
-            response = await self.model(prompt, history=history, stream=True, **kwargs)
+        async with llm_request_slot(
+            self.config,
+            _chat_request_texts(prompt, history),
+            _chat_max_tokens(self.config, kwargs),
+        ):
+            if history is None:
+                response = await self.model(prompt, stream=True, **kwargs)
+            else:
+                response = await self.model(
+                    prompt, history=history, stream=True, **kwargs
+                )
         async for chunk in response.output.content:
             if chunk is not None:
                 yield chunk
@@ -157,6 +175,7 @@ class OpenAIEmbeddingFNLLM:
         callbacks: WorkflowCallbacks | None = None,
         cache: PipelineCache | None = None,
     ) -> None:
+        self.config = config
         model_config = _create_openai_config(config, azure=False)
         error_handler = _create_error_handler(callbacks) if callbacks else None
         model_cache = _create_cache(cache, name)
@@ -165,7 +184,7 @@ class OpenAIEmbeddingFNLLM:
             model_config,
             client=client,
             cache=model_cache,
-            events=FNLLMEvents(error_handler) if error_handler else None,
+            events=FNLLMEvents(error_handler),
         )
 
     async def aembed_batch(self, text_list: list[str], **kwargs) -> list[list[float]]:
@@ -180,7 +199,8 @@ class OpenAIEmbeddingFNLLM:
         -------
             The embeddings of the text.
         """
-        response = await self.model(text_list, **kwargs)
+        async with llm_request_slot(self.config, text_list):
+            response = await self.model(text_list, **kwargs)
         if response.output.embeddings is None:
             msg = "No embeddings found in response"
             raise ValueError(msg)
@@ -199,7 +219,8 @@ class OpenAIEmbeddingFNLLM:
         -------
             The embeddings of the text.
         """
-        response = await self.model([text], **kwargs)
+        async with llm_request_slot(self.config, [text]):
+            response = await self.model([text], **kwargs)
         if response.output.embeddings is None:
             msg = "No embeddings found in response"
             raise ValueError(msg)
@@ -248,6 +269,7 @@ class AzureOpenAIChatFNLLM:
         callbacks: WorkflowCallbacks | None = None,
         cache: PipelineCache | None = None,
     ) -> None:
+        self.config = config
         model_config = _create_openai_config(config, azure=True)
         error_handler = _create_error_handler(callbacks) if callbacks else None
         model_cache = _create_cache(cache, name)
@@ -256,7 +278,7 @@ class AzureOpenAIChatFNLLM:
             model_config,
             client=client,
             cache=model_cache,
-            events=FNLLMEvents(error_handler) if error_handler else None,
+            events=FNLLMEvents(error_handler),
         )
 
     async def achat(
@@ -274,10 +296,16 @@ class AzureOpenAIChatFNLLM:
         -------
             The response from the Model.
         """
-        if history is None:
-            response = await self.model(prompt, **kwargs)
-        else:
-            response = await self.model(prompt, history=history, **kwargs)
+        async with llm_request_slot(
+            self.config,
+            _chat_request_texts(prompt, history),
+            _chat_max_tokens(self.config, kwargs),
+        ) as slot:
+            if history is None:
+                response = await self.model(prompt, **kwargs)
+            else:
+                response = await self.model(prompt, history=history, **kwargs)
+            _settle_usage(slot, response)
         return BaseModelResponse(
             output=BaseModelOutput(content=response.output.content),
             parsed_response=response.parsed_json,
@@ -302,10 +330,17 @@ class AzureOpenAIChatFNLLM:
         -------
             A generator that yields strings representing the response.
         """
-        if history is None:
-            response = await self.model(prompt, stream=True, **kwargs)
-        else:
-            response = await self.model(prompt, history=history, stream=True, **kwargs)
+        async with llm_request_slot(
+            self.config,
+            _chat_request_texts(prompt, history),
+            _chat_max_tokens(self.config, kwargs),
+        ):
+            if history is None:
+                response = await self.model(prompt, stream=True, **kwargs)
+            else:
+                response = await self.model(
+                    prompt, history=history, stream=True, **kwargs
+                )
         async for chunk in response.output.content:
             if chunk is not None:
                 yield chunk
@@ -355,6 +390,7 @@ class AzureOpenAIEmbeddingFNLLM:
         callbacks: WorkflowCallbacks | None = None,
         cache: PipelineCache | None = None,
     ) -> None:
+        self.config = config
         model_config = _create_openai_config(config, azure=True)
         error_handler = _create_error_handler(callbacks) if callbacks else None
         model_cache = _create_cache(cache, name)
@@ -363,7 +399,7 @@ class AzureOpenAIEmbeddingFNLLM:
             model_config,
             client=client,
             cache=model_cache,
-            events=FNLLMEvents(error_handler) if error_handler else None,
+            events=FNLLMEvents(error_handler),
         )
 
     async def aembed_batch(self, text_list: list[str], **kwargs) -> list[list[float]]:
@@ -378,7 +414,8 @@ class AzureOpenAIEmbeddingFNLLM:
         -------
             The embeddings of the text.
         """
-        response = await self.model(text_list, **kwargs)
+        async with llm_request_slot(self.config, text_list):
+            response = await self.model(text_list, **kwargs)
         if response.output.embeddings is None:
             msg = "No embeddings found in response"
             raise ValueError(msg)
@@ -397,7 +434,8 @@ class AzureOpenAIEmbeddingFNLLM:
         -------
             The embeddings of the text.
         """
-        response = await self.model([text], **kwargs)
+        async with llm_request_slot(self.config, [text]):
+            response = await self.model([text], **kwargs)
         if response.output.embeddings is None:
             msg = "No embeddings found in response"
             raise ValueError(msg)
@@ -25,6 +25,29 @@ if TYPE_CHECKING:
         LanguageModelConfig,
     )
     from graphrag.index.typing.error_handler import ErrorHandlerFn
+    from graphrag.language_model.concurrency import LLMRequestSlot
+
+
+def _chat_request_texts(prompt: str, history: list | None) -> list[str]:
+    """Get the texts sent with a chat request, to estimate its token cost."""
+    texts = [prompt]
+    for message in history or []:
+        content = message.get("content") if isinstance(message, dict) else None
+        if isinstance(content, str):
+            texts.append(content)
+    return texts
+
+
+def _chat_max_tokens(config: LanguageModelConfig, kwargs: dict[str, Any]) -> int:
+    """Get the number of tokens a chat request may generate."""
+    model_parameters = kwargs.get("model_parameters") or {}
+    return model_parameters.get("max_tokens") or config.max_tokens or 0
+
+
+def _settle_usage(slot: LLMRequestSlot, response: Any) -> None:
+    """Settle a request slot with the usage reported for the response."""
+    if response.metrics is not None and response.metrics.usage.total_tokens > 0:
+        slot.settle(response.metrics.usage.total_tokens)
 
 
 def _create_cache(cache: PipelineCache | None, name: str) -> FNLLMCacheProvider | None:
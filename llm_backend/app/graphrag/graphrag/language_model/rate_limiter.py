@@ -0,0 +1,240 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""Request and token rate limits shared by every caller of a model endpoint."""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+
+# how long a queued request sleeps before checking again whether it is next
+_QUEUE_POLL_SECONDS = 0.005
+
+
+class RequestPriority(IntEnum):
+    """The order in which queued requests are let through, lowest first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+_current_priority: ContextVar[RequestPriority] = ContextVar(
+    "llm_request_priority", default=RequestPriority.INTERACTIVE
+)
+
+
+def set_request_priority(priority: RequestPriority) -> None:
+    """Apply a priority to model requests made from the current context.
+
+    Tasks copy their context when they are created, so calling this at the start of
+    a task covers every request the task and its subtasks make.
+    """
+    _current_priority.set(priority)
+
+
+def get_request_priority() -> RequestPriority:
+    """Get the priority of model requests made from the current context."""
+    return _current_priority.get()
+
+
+@dataclass
+class RateLimitReservation:
+    """The capacity taken from a limiter by one request."""
+
+    limiter: TokenBucketLimiter
+    tokens: int
+
+    def settle(self, used_tokens: int) -> None:
+        """Correct the token bucket once the real usage of the request is known."""
+        self.limiter.adjust_tokens(self.tokens - used_tokens)
+        self.tokens = used_tokens
+
+
+class TokenBucketLimiter:
+    """Limits the requests and tokens per minute sent to one endpoint.
+
+    Both limits are buckets holding one minute of capacity that refill continuously.
+    A request waits until both buckets cover it. Waiting requests are served by
+    priority, then in arrival order, so interactive requests overtake queued
+    background work but a large request is never starved by smaller ones.
+
+    Token counts are estimated before the request is sent; `RateLimitReservation.settle`
+    corrects the bucket once the usage is known. A limit of 0 or less is not enforced.
+    The limiter is safe to share between tasks and between event loops.
+    """
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(max(0, requests_per_minute))
+        self._tokens = float(max(0, tokens_per_minute))
+        self._updated = time.monotonic()
+        self._queue: list[tuple[int, int, int]] = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def tighten(self, requests_per_minute: int, tokens_per_minute: int) -> None:
+        """Lower the limits to the given ones where those are stricter."""
+        with self._lock:
+            self._refill()
+            if requests_per_minute > 0 and not (
+                0 < self.requests_per_minute <= requests_per_minute
+            ):
+                self.requests_per_minute = requests_per_minute
+                self._requests = min(self._requests, requests_per_minute)
+            if tokens_per_minute > 0 and not (
+                0 < self.tokens_per_minute <= tokens_per_minute
+            ):
+                self.tokens_per_minute = tokens_per_minute
+                self._tokens = min(self._tokens, tokens_per_minute)
+
+    async def acquire(
+        self, tokens: int = 0, priority: RequestPriority | None = None
+    ) -> RateLimitReservation:
+        """Wait until the request fits in both limits, then take its capacity."""
+        tokens, ticket = self._enqueue(tokens, priority)
+        try:
+            while True:
+                delay = self._poll(ticket)
+                if delay is None:
+                    return RateLimitReservation(self, tokens)
+                await asyncio.sleep(delay)
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+
+    def acquire_sync(
+        self,
+        tokens: int = 0,
+        priority: RequestPriority | None = None,
+        blocking: bool = True,
+    ) -> RateLimitReservation | None:
+        """Take capacity for a request from synchronous code, blocking the thread.
+
+        Without `blocking`, the capacity is only taken if it is free right now and no
+        other request is queued; otherwise None is returned.
+        """
+        if not blocking:
+            tokens = self._clamp(tokens)
+            with self._lock:
+                if self._queue or self._wait_time(tokens) > 0:
+                    return None
+                self._take(tokens)
+            return RateLimitReservation(self, tokens)
+        tokens, ticket = self._enqueue(tokens, priority)
+        try:
+            while True:
+                delay = self._poll(ticket)
+                if delay is None:
+                    return RateLimitReservation(self, tokens)
+                time.sleep(delay)
+        except BaseException:
+            self._dequeue(ticket)
+            raise
+
+    def _clamp(self, tokens: int) -> int:
+        if self.tokens_per_minute > 0:
+            # a request larger than the bucket would never fit, let it drain the bucket
+            return min(tokens, self.tokens_per_minute)
+        return tokens
+
+    def _enqueue(
+        self, tokens: int, priority: RequestPriority | None
+    ) -> tuple[int, tuple[int, int, int]]:
+        if priority is None:
+            priority = get_request_priority()
+        tokens = self._clamp(tokens)
+        ticket = (int(priority), next(self._counter), tokens)
+        with self._lock:
+            heapq.heappush(self._queue, ticket)
+        return tokens, ticket
+
+    def _poll(self, ticket: tuple[int, int, int]) -> float | None:
+        """Take the capacity if the ticket is next and fits, else return the delay."""
+        with self._lock:
+            head = self._queue[0]
+            delay = self._wait_time(head[2])
+            if head is ticket and delay <= 0:
+                heapq.heappop(self._queue)
+                self._take(ticket[2])
+                return None
+        return delay if head is ticket else max(delay, _QUEUE_POLL_SECONDS)
+
+    def _dequeue(self, ticket: tuple[int, int, int]) -> None:
+        with self._lock:
+            if ticket in self._queue:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+
+    def adjust_tokens(self, tokens: int) -> None:
+        """Return unused tokens to the bucket, or take more if the estimate was low."""
+        if self.tokens_per_minute <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens + tokens, self.tokens_per_minute)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.requests_per_minute > 0:
+            self._requests = min(
+                self._requests + elapsed * self.requests_per_minute / 60,
+                self.requests_per_minute,
+            )
+        if self.tokens_per_minute > 0:
+            self._tokens = min(
+                self._tokens + elapsed * self.tokens_per_minute / 60,
+                self.tokens_per_minute,
+            )
+
+    def _wait_time(self, tokens: int) -> float:
+        """Seconds until a request of this size fits in both buckets."""
+        self._refill()
+        wait = 0.0
+        if self.requests_per_minute > 0 and self._requests < 1:
+            wait = (1 - self._requests) * 60 / self.requests_per_minute
+        if self.tokens_per_minute > 0 and self._tokens < tokens:
+            wait = max(wait, (tokens - self._tokens) * 60 / self.tokens_per_minute)
+        return wait
+
+    def _take(self, tokens: int) -> None:
+        if self.requests_per_minute > 0:
+            self._requests -= 1
+        if self.tokens_per_minute > 0:
+            self._tokens -= tokens
+
+
+_limiters: dict[tuple[str | None, str], TokenBucketLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(
+    api_base: str | None,
+    model: str,
+    requests_per_minute: int = 0,
+    tokens_per_minute: int = 0,
+) -> TokenBucketLimiter:
+    """Get the process-wide limiter of a model endpoint.
+
+    Every caller of the same API base and model shares one limiter. When callers
+    configure different limits for it, the strictest ones apply.
+    """
+    key = (api_base.rstrip("/") if api_base else None, model)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = TokenBucketLimiter(
+                requests_per_minute, tokens_per_minute
+            )
+            return limiter
+    limiter.tighten(requests_per_minute, tokens_per_minute)
+    return limiter
@@ -12,7 +12,7 @@ import tiktoken
 
 from graphrag.data_model.community_report import CommunityReport
 from graphrag.data_model.entity import Entity
-from graphrag.query.llm.text_utils import num_tokens
+from graphrag.query.llm.text_utils import num_row_tokens, num_tokens
 
 log = logging.getLogger(__name__)
 
@@ -61,9 +61,7 @@ def build_community_context(
             header.append(community_rank_name)
         return header
 
-    def _report_context_text(
-        report: CommunityReport, attributes: list[str]
-    ) -> tuple[str, list[str]]:
+    def _report_context(report: CommunityReport, attributes: list[str]) -> list[str]:
         context: list[str] = [
             report.short_id if report.short_id else "",
             report.title,
@@ -75,8 +73,7 @@ def build_community_context(
         context.append(report.summary if use_community_summary else report.full_content)
         if include_community_rank:
             context.append(str(report.rank))
-        result = column_delimiter.join(context) + "\n"
-        return result, context
+        return context
 
     compute_community_weights = (
         entities
@@ -150,9 +147,26 @@ def build_community_context(
     # initialize the first batch
     _init_batch()
 
-    for report in selected_reports:
-        new_context_text, new_context = _report_context_text(report, attributes)
-        new_tokens = num_tokens(new_context_text, token_encoder)
+    # count the tokens of all report rows at once, reusing the token counts of the
+    # summaries or contents stored at indexing time
+    report_contexts = [
+        _report_context(report, attributes) for report in selected_reports
+    ]
+    report_tokens = num_row_tokens(
+        report_contexts,
+        column_delimiter,
+        token_encoder,
+        text_column=len(attributes) + 2,
+        text_tokens=[
+            report.summary_tokens
+            if use_community_summary
+            else report.full_content_tokens
+            for report in selected_reports
+        ],
+    )
+
+    for new_context, new_tokens in zip(report_contexts, report_tokens, strict=True):
+        new_context_text = column_delimiter.join(new_context) + "\n"
 
         if batch_tokens + new_tokens > max_tokens:
             # add the current batch to the context data and start a new batch if we are in multi-batch mode
@@ -18,13 +18,14 @@ from graphrag.query.input.retrieval.covariates import (
 )
 from graphrag.query.input.retrieval.entities import to_entity_dataframe
 from graphrag.query.input.retrieval.relationships import (
+    RelationshipIndex,
     get_candidate_relationships,
     get_entities_from_relationships,
     get_in_network_relationships,
     get_out_network_relationships,
     to_relationship_dataframe,
 )
-from graphrag.query.llm.text_utils import num_tokens
+from graphrag.query.llm.text_utils import num_row_tokens, num_tokens
 
 
 def build_entity_context(
@@ -55,6 +56,7 @@ def build_entity_context(
     current_tokens = num_tokens(current_context_text, token_encoder)
 
     all_context_records = [header]
+    entity_contexts = []
     for entity in selected_entities:
         new_context = [
             entity.short_id if entity.short_id else "",
@@ -70,8 +72,17 @@ def build_entity_context(
                 else ""
             )
             new_context.append(field_value)
+        entity_contexts.append(new_context)
+    entity_tokens = num_row_tokens(
+        entity_contexts,
+        column_delimiter,
+        token_encoder,
+        text_column=2,
+        text_tokens=[entity.description_tokens for entity in selected_entities],
+    )
+
+    for new_context, new_tokens in zip(entity_contexts, entity_tokens, strict=True):
         new_context_text = column_delimiter.join(new_context) + "\n"
-        new_tokens = num_tokens(new_context_text, token_encoder)
         if current_tokens + new_tokens > max_tokens:
             break
         current_context_text += new_context_text
@@ -162,6 +173,7 @@ def build_relationship_context(
     relationship_ranking_attribute: str = "rank",
     column_delimiter: str = "|",
     context_name: str = "Relationships",
+    relationship_index: RelationshipIndex | None = None,
 ) -> tuple[str, pd.DataFrame]:
     """Prepare relationship data tables as context data for system prompt."""
     selected_relationships = _filter_relationships(
@@ -169,6 +181,7 @@ def build_relationship_context(
         relationships=relationships,
         top_k_relationships=top_k_relationships,
         relationship_ranking_attribute=relationship_ranking_attribute,
+        relationship_index=relationship_index,
     )
 
     if len(selected_entities) == 0 or len(selected_relationships) == 0:
@@ -191,6 +204,7 @@ def build_relationship_context(
     current_tokens = num_tokens(current_context_text, token_encoder)
 
     all_context_records = [header]
+    relationship_contexts = []
     for rel in selected_relationships:
         new_context = [
             rel.short_id if rel.short_id else "",
@@ -207,8 +221,19 @@ def build_relationship_context(
                 else ""
             )
             new_context.append(field_value)
+        relationship_contexts.append(new_context)
+    relationship_tokens = num_row_tokens(
+        relationship_contexts,
+        column_delimiter,
+        token_encoder,
+        text_column=3,
+        text_tokens=[rel.description_tokens for rel in selected_relationships],
+    )
+
+    for new_context, new_tokens in zip(
+        relationship_contexts, relationship_tokens, strict=True
+    ):
         new_context_text = column_delimiter.join(new_context) + "\n"
-        new_tokens = num_tokens(new_context_text, token_encoder)
         if current_tokens + new_tokens > max_tokens:
             break
         current_context_text += new_context_text
@@ -230,6 +255,7 @@ def _filter_relationships(
     relationships: list[Relationship],
     top_k_relationships: int = 10,
     relationship_ranking_attribute: str = "rank",
+    relationship_index: RelationshipIndex | None = None,
 ) -> list[Relationship]:
     """Filter and sort relationships based on a set of selected entities and a ranking attribute."""
     # First priority: in-network relationships (i.e. relationships between selected entities)
@@ -237,6 +263,7 @@ def _filter_relationships(
         selected_entities=selected_entities,
         relationships=relationships,
         ranking_attribute=relationship_ranking_attribute,
+        relationship_index=relationship_index,
     )
 
     # Second priority -  out-of-network relationships
@@ -245,39 +272,25 @@ def _filter_relationships(
         selected_entities=selected_entities,
         relationships=relationships,
         ranking_attribute=relationship_ranking_attribute,
+        relationship_index=relationship_index,
     )
     if len(out_network_relationships) <= 1:
         return in_network_relationships + out_network_relationships
 
     # within out-of-network relationships, prioritize mutual relationships
     # (i.e. relationships with out-network entities that are shared with multiple selected entities)
-    selected_entity_names = [entity.title for entity in selected_entities]
-    out_network_source_names = [
-        relationship.source
-        for relationship in out_network_relationships
-        if relationship.source not in selected_entity_names
-    ]
-    out_network_target_names = [
-        relationship.target
-        for relationship in out_network_relationships
-        if relationship.target not in selected_entity_names
-    ]
-    out_network_entity_names = list(
-        set(out_network_source_names + out_network_target_names)
-    )
-    out_network_entity_links = defaultdict(int)
-    for entity_name in out_network_entity_names:
-        targets = [
-            relationship.target
-            for relationship in out_network_relationships
-            if relationship.source == entity_name
-        ]
-        sources = [
-            relationship.source
-            for relationship in out_network_relationships
-            if relationship.target == entity_name
-        ]
-        out_network_entity_links[entity_name] = len(set(targets + sources))
+    # count the distinct selected entities linked to each out-network entity in one pass
+    selected_entity_names = {entity.title for entity in selected_entities}
+    out_network_entity_neighbours: dict[str, set[str]] = defaultdict(set)
+    for relationship in out_network_relationships:
+        if relationship.source not in selected_entity_names:
+            out_network_entity_neighbours[relationship.source].add(relationship.target)
+        if relationship.target not in selected_entity_names:
+            out_network_entity_neighbours[relationship.target].add(relationship.source)
+    out_network_entity_links = {
+        entity_name: len(neighbours)
+        for entity_name, neighbours in out_network_entity_neighbours.items()
+    }
 
     # sort out-network relationships by number of links and rank_attributes
     for rel in out_network_relationships:
@@ -321,12 +334,14 @@ def get_candidate_context(
     include_entity_rank: bool = True,
     entity_rank_description: str = "number of relationships",
     include_relationship_weight: bool = False,
+    relationship_index: RelationshipIndex | None = None,
 ) -> dict[str, pd.DataFrame]:
     """Prepare entity, relationship, and covariate data tables as context data for system prompt."""
     candidate_context = {}
     candidate_relationships = get_candidate_relationships(
         selected_entities=selected_entities,
         relationships=relationships,
+        relationship_index=relationship_index,
     )
     candidate_context["relationships"] = to_relationship_dataframe(
         relationships=candidate_relationships,
@@ -0,0 +1,329 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""Process-wide registry of warm query engines.
+
+Loading the index tables, converting them into data-model objects and
+connecting to the vector store is expensive compared to building the context
+for a single query. The registry keeps this state alive per index output and
+only reloads it when the output on disk changes.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from graphrag.callbacks.noop_query_callbacks import NoopQueryCallbacks
+from graphrag.callbacks.query_callbacks import QueryCallbacks
+from graphrag.config.embeddings import entity_description_embedding
+from graphrag.config.enums import OutputType
+from graphrag.config.load_config import (
+    _search_for_config_in_root_dir,
+    load_config,
+)
+from graphrag.config.models.graph_rag_config import GraphRagConfig
+from graphrag.data_model.community_report import CommunityReport
+from graphrag.data_model.covariate import Covariate
+from graphrag.data_model.entity import Entity
+from graphrag.data_model.relationship import Relationship
+from graphrag.data_model.text_unit import TextUnit
+from graphrag.query.factory import get_local_search_engine
+from graphrag.query.indexer_adapters import (
+    read_indexer_covariates,
+    read_indexer_entities,
+    read_indexer_relationships,
+    read_indexer_reports,
+    read_indexer_text_units,
+)
+from graphrag.query.structured_search.local_search.search import LocalSearch
+from graphrag.utils.api import (
+    create_storage_from_config,
+    get_embedding_store,
+    load_search_prompt,
+)
+from graphrag.utils.storage import load_table_from_storage, storage_has_table
+from graphrag.vector_stores.base import BaseVectorStore
+
+log = logging.getLogger(__name__)
+
+_REQUIRED_TABLES = [
+    "entities",
+    "communities",
+    "community_reports",
+    "text_units",
+    "relationships",
+]
+
+
+@dataclass
+class IndexTables:
+    """The raw output tables of an index."""
+
+    entities: pd.DataFrame
+    communities: pd.DataFrame
+    community_reports: pd.DataFrame
+    text_units: pd.DataFrame
+    relationships: pd.DataFrame
+    covariates: pd.DataFrame | None = None
+
+
+@dataclass
+class LocalSearchData:
+    """Data-model objects used by local search at a single community level."""
+
+    entities: list[Entity]
+    reports: list[CommunityReport]
+    text_units: list[TextUnit]
+    relationships: list[Relationship]
+    covariates: dict[str, list[Covariate]] = field(default_factory=dict)
+
+
+def _file_stamp(path: Path) -> str:
+    stat = path.stat()
+    return f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def get_index_version(config: GraphRagConfig, config_path: Path | None = None) -> str:
+    """Compute a cheap signature of the index output, and of the config file if given.
+
+    For file outputs the signature changes whenever a parquet table is rewritten.
+    Other output types cannot be stat'ed cheaply and are treated as static;
+    call `QueryEngineRegistry.invalidate` after re-indexing them.
+    This stats files, so call it off the event loop.
+    """
+    parts: list[str] = []
+    if config_path is not None and config_path.exists():
+        parts.append(_file_stamp(config_path))
+    if config.output.type == OutputType.file:
+        output_dir = Path(config.output.base_dir)
+        if output_dir.exists():
+            parts.extend(
+                _file_stamp(path) for path in sorted(output_dir.glob("*.parquet"))
+            )
+    else:
+        parts.append(f"{config.output.type}:{config.output.base_dir}")
+    return "|".join(parts)
+
+
+class IndexQueryEngine:
+    """Warm query state for a single index output, shared across queries."""
+
+    def __init__(self, config: GraphRagConfig, tables: IndexTables, version: str):
+        self.config = config
+        self.tables = tables
+        self.version = version
+        self._local_data: dict[int | None, LocalSearchData] = {}
+        self._local_context_builders: dict[int | None, Any] = {}
+        self._description_embedding_store: BaseVectorStore | None = None
+        self._local_search_prompt: str | None = load_search_prompt(
+            config.root_dir, config.local_search.prompt
+        )
+
+    @property
+    def description_embedding_store(self) -> BaseVectorStore:
+        """The entity description vector store, connected once and kept open."""
+        if self._description_embedding_store is None:
+            vector_store_args = {
+                index: store.model_dump()
+                for index, store in self.config.vector_store.items()
+            }
+            self._description_embedding_store = get_embedding_store(
+                config_args=vector_store_args,
+                embedding_name=entity_description_embedding,
+            )
+        return self._description_embedding_store
+
+    def get_local_search_data(self, community_level: int | None) -> LocalSearchData:
+        """Convert the tables into data-model objects once per community level."""
+        data = self._local_data.get(community_level)
+        if data is None:
+            tables = self.tables
+            data = LocalSearchData(
+                entities=read_indexer_entities(
+                    tables.entities, tables.communities, community_level
+                ),
+                reports=read_indexer_reports(
+                    tables.community_reports, tables.communities, community_level
+                ),
+                text_units=read_indexer_text_units(tables.text_units),
+                relationships=read_indexer_relationships(tables.relationships),
+                covariates={
+                    "claims": read_indexer_covariates(tables.covariates)
+                    if tables.covariates is not None
+                    else []
+                },
+            )
+            self._local_data[community_level] = data
+        return data
+
+    def get_local_search_engine(
+        self,
+        community_level: int | None,
+        response_type: str,
+        callbacks: list[QueryCallbacks] | None = None,
+    ) -> LocalSearch:
+        """Create a local search engine on top of the cached context builder.
+
+        The search object itself is cheap and carries the per-query callbacks,
+        so a new one is created for every query.
+        """
+        data = self.get_local_search_data(community_level)
+        search_engine = get_local_search_engine(
+            config=self.config,
+            reports=data.reports,
+            text_units=data.text_units,
+            entities=data.entities,
+            relationships=data.relationships,
+            covariates=data.covariates,
+            description_embedding_store=self.description_embedding_store,
+            response_type=response_type,
+            system_prompt=self._local_search_prompt,
+            callbacks=callbacks,
+            context_builder=self._local_context_builders.get(community_level),
+        )
+        self._local_context_builders[community_level] = search_engine.context_builder
+        return search_engine
+
+    def local_search_streaming(
+        self,
+        query: str,
+        community_level: int | None,
+        response_type: str,
+        callbacks: list[QueryCallbacks] | None = None,
+    ) -> AsyncGenerator:
+        """Perform a local search and stream the response."""
+        search_engine = self.get_local_search_engine(
+            community_level, response_type, callbacks
+        )
+        return search_engine.stream_search(query=query)
+
+    async def local_search(
+        self,
+        query: str,
+        community_level: int | None,
+        response_type: str,
+        callbacks: list[QueryCallbacks] | None = None,
+    ) -> tuple[str, Any]:
+        """Perform a local search and return the response and context data."""
+        callbacks = list(callbacks or [])
+        full_response = ""
+        context_data = {}
+
+        def on_context(context: Any) -> None:
+            nonlocal context_data
+            context_data = context
+
+        local_callbacks = NoopQueryCallbacks()
+        local_callbacks.on_context = on_context
+        callbacks.append(local_callbacks)
+
+        async for chunk in self.local_search_streaming(
+            query=query,
+            community_level=community_level,
+            response_type=response_type,
+            callbacks=callbacks,
+        ):
+            full_response += chunk
+        return full_response, context_data
+
+
+class QueryEngineRegistry:
+    """Keeps one warm `IndexQueryEngine` per project root, reloading on index changes.
+
+    Configs loaded by the registry are reloaded when their settings file changes.
+    """
+
+    def __init__(self):
+        self._engines: dict[str, IndexQueryEngine] = {}
+        # project root -> (config, settings file stamp it was loaded from)
+        self._configs: dict[str, tuple[GraphRagConfig, str | None]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def get_engine(
+        self,
+        root_dir: str | Path,
+        config: GraphRagConfig | None = None,
+    ) -> IndexQueryEngine:
+        """Return the warm engine for a project, loading or reloading it if needed."""
+        # resolving paths, loading the config and stat'ing the output all touch the disk
+        key, config, version = await asyncio.to_thread(
+            self._resolve_config, root_dir, config
+        )
+        engine = self._engines.get(key)
+        if engine is not None and engine.version == version and engine.config is config:
+            return engine
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            engine = self._engines.get(key)
+            if (
+                engine is not None
+                and engine.version == version
+                and engine.config is config
+            ):
+                return engine
+            log.info("Loading query engine for index at %s", config.output.base_dir)
+            tables = await _load_index_tables(config)
+            engine = IndexQueryEngine(config, tables, version)
+            self._engines[key] = engine
+            return engine
+
+    def _resolve_config(
+        self, root_dir: str | Path, config: GraphRagConfig | None
+    ) -> tuple[str, GraphRagConfig, str]:
+        """Return the registry key, the config to use and the current index version."""
+        key = _registry_key(root_dir)
+        if config is not None:
+            self._configs[key] = (config, None)
+            return key, config, get_index_version(config)
+
+        config_path = _search_for_config_in_root_dir(key)
+        stamp = _file_stamp(config_path) if config_path is not None else None
+        cached = self._configs.get(key)
+        if cached is None or cached[1] != stamp:
+            if cached is not None:
+                log.info("Config of %s changed, reloading it", key)
+            cached = (load_config(Path(key), None, None), stamp)
+            self._configs[key] = cached
+        config = cached[0]
+        return key, config, get_index_version(config, config_path)
+
+    def invalidate(self, root_dir: str | Path | None = None) -> None:
+        """Drop cached engines so the next query reloads them."""
+        if root_dir is None:
+            self._engines.clear()
+            self._configs.clear()
+            return
+        key = _registry_key(root_dir)
+        self._engines.pop(key, None)
+        self._configs.pop(key, None)
+
+
+def _registry_key(root_dir: str | Path) -> str:
+    return str(Path(root_dir).resolve())
+
+
+async def _load_index_tables(config: GraphRagConfig) -> IndexTables:
+    storage = create_storage_from_config(config.output)
+    tables = {
+        name: await load_table_from_storage(name, storage) for name in _REQUIRED_TABLES
+    }
+    covariates = (
+        await load_table_from_storage("covariates", storage)
+        if await storage_has_table("covariates", storage)
+        else None
+    )
+    return IndexTables(**tables, covariates=covariates)
+
+
+_registry = QueryEngineRegistry()
+
+
+def get_query_engine_registry() -> QueryEngineRegistry:
+    """Get the process-wide query engine registry."""
+    return _registry
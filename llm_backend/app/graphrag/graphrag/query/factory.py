@@ -45,8 +45,13 @@ def get_local_search_engine(
     description_embedding_store: BaseVectorStore,
     system_prompt: str | None = None,
     callbacks: list[QueryCallbacks] | None = None,
+    context_builder: LocalSearchMixedContext | None = None,
 ) -> LocalSearch:
-    """Create a local search engine based on data + configuration."""
+    """Create a local search engine based on data + configuration.
+
+    A previously built `context_builder` can be passed in to reuse its indexed
+    entities, relationships and text units instead of rebuilding them.
+    """
     model_settings = config.get_language_model_config(config.local_search.chat_model_id)
 
     if model_settings.max_retries == -1:
@@ -77,10 +82,8 @@ def get_local_search_engine(
 
     ls_config = config.local_search
 
-    return LocalSearch(
-        model=chat_model,
-        system_prompt=system_prompt,
-        context_builder=LocalSearchMixedContext(
+    if context_builder is None:
+        context_builder = LocalSearchMixedContext(
             community_reports=reports,
             text_units=text_units,
             entities=entities,
@@ -90,7 +93,12 @@ def get_local_search_engine(
             embedding_vectorstore_key=EntityVectorStoreKey.ID,  # if the vectorstore uses entity title as ids, set this to EntityVectorStoreKey.TITLE
             text_embedder=embedding_model,
             token_encoder=token_encoder,
-        ),
+        )
+
+    return LocalSearch(
+        model=chat_model,
+        system_prompt=system_prompt,
+        context_builder=context_builder,
         token_encoder=token_encoder,
         model_params={
             "max_tokens": ls_config.llm_max_tokens,  # change this based on the token limit you have on your model (if you are using a model with 8k limit, a good setting could be 1000=1500)
@@ -205,6 +213,9 @@ def get_global_search_engine(
             "context_name": "Reports",
         },
         concurrent_coroutines=gs_config.concurrency,
+        early_reduce_key_points=gs_config.early_reduce_key_points,
+        early_reduce_min_score=gs_config.early_reduce_min_score,
+        map_timeout=gs_config.map_timeout,
         response_type=response_type,
         callbacks=callbacks,
     )
@@ -39,6 +39,7 @@ def read_entities(
     title_col: str = "title",
     type_col: str | None = "type",
     description_col: str | None = "description",
+    description_tokens_col: str | None = "description_tokens",
     name_embedding_col: str | None = "name_embedding",
     description_embedding_col: str | None = "description_embedding",
     community_col: str | None = "community_ids",
@@ -57,6 +58,7 @@ def read_entities(
             title=to_str(row, title_col),
             type=to_optional_str(row, type_col),
             description=to_optional_str(row, description_col),
+            description_tokens=to_optional_int(row, description_tokens_col),
             name_embedding=to_optional_list(row, name_embedding_col, item_type=float),
             description_embedding=to_optional_list(
                 row, description_embedding_col, item_type=float
@@ -81,6 +83,7 @@ def read_relationships(
     source_col: str = "source",
     target_col: str = "target",
     description_col: str | None = "description",
+    description_tokens_col: str | None = "description_tokens",
     rank_col: str | None = "combined_degree",
     description_embedding_col: str | None = "description_embedding",
     weight_col: str | None = "weight",
@@ -98,6 +101,7 @@ def read_relationships(
             source=to_str(row, source_col),
             target=to_str(row, target_col),
             description=to_optional_str(row, description_col),
+            description_tokens=to_optional_int(row, description_tokens_col),
             description_embedding=to_optional_list(
                 row, description_embedding_col, item_type=float
             ),
@@ -194,6 +198,8 @@ def read_community_reports(
     community_col: str = "community",
     summary_col: str = "summary",
     content_col: str = "full_content",
+    summary_tokens_col: str | None = "summary_tokens",
+    content_tokens_col: str | None = "full_content_tokens",
     rank_col: str | None = "rank",
     content_embedding_col: str | None = "full_content_embedding",
     attributes_cols: list[str] | None = None,
@@ -210,6 +216,8 @@ def read_community_reports(
             community_id=to_str(row, community_col),
             summary=to_str(row, summary_col),
             full_content=to_str(row, content_col),
+            summary_tokens=to_optional_int(row, summary_tokens_col),
+            full_content_tokens=to_optional_int(row, content_tokens_col),
             rank=to_optional_float(row, rank_col),
             full_content_embedding=to_optional_list(
                 row, content_embedding_col, item_type=float
@@ -104,7 +104,8 @@ def to_optional_int(data: Mapping[str, Any], column_name: str | None) -> int | N
     if column_name is None or column_name not in data:
         return None
     value = data[column_name]
-    if value is None:
+    # tables concatenated from several indexes leave NaN where a column is missing
+    if value is None or (isinstance(value, float) and np.isnan(value)):
         return None
     if isinstance(value, float):
         value = int(value)
@@ -3,6 +3,8 @@
 
 """Util functions to retrieve relationships from a collection."""
 
+from collections import defaultdict
+from collections.abc import Iterable
 from typing import Any, cast
 
 import pandas as pd
@@ -11,19 +13,79 @@ from graphrag.data_model.entity import Entity
 from graphrag.data_model.relationship import Relationship
 
 
+class RelationshipIndex:
+    """Adjacency index from entity titles to the relationships they take part in.
+
+    Built once over a relationship list so that selecting the relationships of a
+    handful of entities only touches their neighbourhood instead of scanning the
+    whole graph. Positions refer to the list the index was built from, which keeps
+    the original relationship order for results.
+    """
+
+    def __init__(self, relationships: list[Relationship]):
+        self.relationships = relationships
+        self.outgoing: dict[str, list[int]] = defaultdict(list)
+        self.incoming: dict[str, list[int]] = defaultdict(list)
+        for position, relationship in enumerate(relationships):
+            self.outgoing[relationship.source].append(position)
+            self.incoming[relationship.target].append(position)
+        # stop lookups of unknown titles from growing the index
+        self.outgoing.default_factory = None
+        self.incoming.default_factory = None
+
+    def __len__(self) -> int:
+        """Return the number of indexed relationships."""
+        return len(self.relationships)
+
+    def get_outgoing(self, entity_names: Iterable[str]) -> list[int]:
+        """Get positions of relationships whose source is one of the given entities."""
+        return _collect_positions(self.outgoing, entity_names)
+
+    def get_incoming(self, entity_names: Iterable[str]) -> list[int]:
+        """Get positions of relationships whose target is one of the given entities."""
+        return _collect_positions(self.incoming, entity_names)
+
+    def get_relationships(self, positions: Iterable[int]) -> list[Relationship]:
+        """Get relationships by position, in the order of the indexed list."""
+        return [self.relationships[position] for position in sorted(positions)]
+
+
+def _collect_positions(
+    adjacency: dict[str, list[int]], entity_names: Iterable[str]
+) -> list[int]:
+    positions: list[int] = []
+    for name in entity_names:
+        positions.extend(adjacency.get(name, ()))
+    return positions
+
+
 def get_in_network_relationships(
     selected_entities: list[Entity],
     relationships: list[Relationship],
     ranking_attribute: str = "rank",
+    relationship_index: RelationshipIndex | None = None,
 ) -> list[Relationship]:
-    """Get all directed relationships between selected entities, sorted by ranking_attribute."""
-    selected_entity_names = [entity.title for entity in selected_entities]
-    selected_relationships = [
-        relationship
-        for relationship in relationships
-        if relationship.source in selected_entity_names
-        and relationship.target in selected_entity_names
-    ]
+    """Get all directed relationships between selected entities, sorted by ranking_attribute.
+
+    If a relationship_index built over the same relationships is given, only the
+    relationships of the selected entities are visited.
+    """
+    selected_entity_names = {entity.title for entity in selected_entities}
+    if relationship_index is not None:
+        selected_relationships = [
+            relationship
+            for relationship in relationship_index.get_relationships(
+                relationship_index.get_outgoing(selected_entity_names)
+            )
+            if relationship.target in selected_entity_names
+        ]
+    else:
+        selected_relationships = [
+            relationship
+            for relationship in relationships
+            if relationship.source in selected_entity_names
+            and relationship.target in selected_entity_names
+        ]
     if len(selected_relationships) <= 1:
         return selected_relationships
 
@@ -35,21 +97,42 @@ def get_out_network_relationships(
     selected_entities: list[Entity],
     relationships: list[Relationship],
     ranking_attribute: str = "rank",
+    relationship_index: RelationshipIndex | None = None,
 ) -> list[Relationship]:
-    """Get relationships from selected entities to other entities that are not within the selected entities, sorted by ranking_attribute."""
-    selected_entity_names = [entity.title for entity in selected_entities]
-    source_relationships = [
-        relationship
-        for relationship in relationships
-        if relationship.source in selected_entity_names
-        and relationship.target not in selected_entity_names
-    ]
-    target_relationships = [
-        relationship
-        for relationship in relationships
-        if relationship.target in selected_entity_names
-        and relationship.source not in selected_entity_names
-    ]
+    """Get relationships from selected entities to other entities that are not within the selected entities, sorted by ranking_attribute.
+
+    If a relationship_index built over the same relationships is given, only the
+    relationships of the selected entities are visited.
+    """
+    selected_entity_names = {entity.title for entity in selected_entities}
+    if relationship_index is not None:
+        source_relationships = [
+            relationship
+            for relationship in relationship_index.get_relationships(
+                relationship_index.get_outgoing(selected_entity_names)
+            )
+            if relationship.target not in selected_entity_names
+        ]
+        target_relationships = [
+            relationship
+            for relationship in relationship_index.get_relationships(
+                relationship_index.get_incoming(selected_entity_names)
+            )
+            if relationship.source not in selected_entity_names
+        ]
+    else:
+        source_relationships = [
+            relationship
+            for relationship in relationships
+            if relationship.source in selected_entity_names
+            and relationship.target not in selected_entity_names
+        ]
+        target_relationships = [
+            relationship
+            for relationship in relationships
+            if relationship.target in selected_entity_names
+            and relationship.source not in selected_entity_names
+        ]
     selected_relationships = source_relationships + target_relationships
     return sort_relationships_by_rank(selected_relationships, ranking_attribute)
 
@@ -57,9 +140,15 @@ def get_out_network_relationships(
 def get_candidate_relationships(
     selected_entities: list[Entity],
     relationships: list[Relationship],
+    relationship_index: RelationshipIndex | None = None,
 ) -> list[Relationship]:
     """Get all relationships that are associated with the selected entities."""
-    selected_entity_names = [entity.title for entity in selected_entities]
+    selected_entity_names = {entity.title for entity in selected_entities}
+    if relationship_index is not None:
+        return relationship_index.get_relationships(
+            set(relationship_index.get_outgoing(selected_entity_names))
+            | set(relationship_index.get_incoming(selected_entity_names))
+        )
     return [
         relationship
         for relationship in relationships
@@ -72,9 +161,9 @@ def get_entities_from_relationships(
     relationships: list[Relationship], entities: list[Entity]
 ) -> list[Entity]:
     """Get all entities that are associated with the selected relationships."""
-    selected_entity_names = [relationship.source for relationship in relationships] + [
+    selected_entity_names = {relationship.source for relationship in relationships} | {
         relationship.target for relationship in relationships
-    ]
+    }
     return [entity for entity in entities if entity.title in selected_entity_names]
 
 
@@ -12,7 +12,7 @@ from itertools import islice
 import tiktoken
 from json_repair import repair_json
 
-import graphrag.config.defaults as defs
+from graphrag.index.utils.tokens import get_encoding
 
 log = logging.getLogger(__name__)
 
@@ -20,10 +20,48 @@ log = logging.getLogger(__name__)
 def num_tokens(text: str, token_encoder: tiktoken.Encoding | None = None) -> int:
     """Return the number of tokens in the given text."""
     if token_encoder is None:
-        token_encoder = tiktoken.get_encoding(defs.ENCODING_MODEL)
+        token_encoder = get_encoding()
     return len(token_encoder.encode(text))  # type: ignore
 
 
+def num_tokens_batch(
+    texts: list[str], token_encoder: tiktoken.Encoding | None = None
+) -> list[int]:
+    """Return the number of tokens in each of the given texts, encoding them as a batch."""
+    if token_encoder is None:
+        token_encoder = get_encoding()
+    return [len(tokens) for tokens in token_encoder.encode_batch(texts)]
+
+
+def num_row_tokens(
+    rows: list[list[str]],
+    column_delimiter: str,
+    token_encoder: tiktoken.Encoding | None = None,
+    text_column: int | None = None,
+    text_tokens: list[int | None] | None = None,
+) -> list[int]:
+    """Return the number of tokens in each row of a context table.
+
+    Each row is rendered as its columns joined by the delimiter, ending in a newline.
+    Where the token count of the (long) text in `text_column` is already known from
+    indexing, only the rest of the row is encoded and the known count is added, which
+    may differ from encoding the full row by a token at the column boundaries.
+    """
+    texts = []
+    known_tokens = []
+    for row, tokens in zip(rows, text_tokens or [None] * len(rows), strict=True):
+        if text_column is not None and tokens is not None:
+            row = [*row[:text_column], "", *row[text_column + 1 :]]
+        texts.append(column_delimiter.join(row) + "\n")
+        known_tokens.append(tokens or 0)
+    return [
+        count + known
+        for count, known in zip(
+            num_tokens_batch(texts, token_encoder), known_tokens, strict=True
+        )
+    ]
+
+
 def batched(iterable: Iterator, n: int):
     """
     Batch data into tuples of length n. The last batch may be shorter.
@@ -44,7 +82,7 @@ def chunk_text(
 ):
     """Chunk text by token length."""
     if token_encoder is None:
-        token_encoder = tiktoken.get_encoding(defs.ENCODING_MODEL)
+        token_encoder = get_encoding()
     tokens = token_encoder.encode(text)  # type: ignore
     chunk_iterator = batched(iter(tokens), max_tokens)
     yield from (token_encoder.decode(list(chunk)) for chunk in chunk_iterator)
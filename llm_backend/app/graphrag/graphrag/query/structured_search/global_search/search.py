@@ -75,6 +75,9 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
         reduce_llm_params: dict[str, Any] = DEFAULT_REDUCE_LLM_PARAMS,
         context_builder_params: dict[str, Any] | None = None,
         concurrent_coroutines: int = 32,
+        early_reduce_key_points: int | None = None,
+        early_reduce_min_score: int = 50,
+        map_timeout: float | None = None,
     ):
         super().__init__(
             model=model,
@@ -101,6 +104,11 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
             self.map_llm_params.pop("response_format", None)
 
         self.semaphore = asyncio.Semaphore(concurrent_coroutines)
+        # streaming search starts the reduce step once this many key points scoring
+        # at least early_reduce_min_score are in, or once map_timeout seconds passed
+        self.early_reduce_key_points = early_reduce_key_points
+        self.early_reduce_min_score = early_reduce_min_score
+        self.map_timeout = map_timeout
 
     async def stream_search(
         self,
@@ -116,19 +124,17 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
         for callback in self.callbacks:
             callback.on_map_response_start(context_result.context_chunks)  # type: ignore
 
-        map_responses = await asyncio.gather(*[
-            self._map_response_single_batch(
-                context_data=data, query=query, **self.map_llm_params
-            )
-            for data in context_result.context_chunks
-        ])
+        map_responses, key_points = await self._stream_map_responses(
+            context_chunks=context_result.context_chunks,  # type: ignore
+            query=query,
+        )
 
         for callback in self.callbacks:
-            callback.on_map_response_end(map_responses)  # type: ignore
+            callback.on_map_response_end(map_responses)
             callback.on_context(context_result.context_records)
 
         async for response in self._stream_reduce_response(
-            map_responses=map_responses,  # type: ignore
+            key_points=key_points,
             query=query,
             model_parameters=self.reduce_llm_params,
         ):
@@ -205,6 +211,83 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
             output_tokens_categories=output_tokens,
         )
 
+    async def _stream_map_responses(
+        self,
+        context_chunks: list[str],
+        query: str,
+    ) -> tuple[list[SearchResult], list[dict[str, Any]]]:
+        """Run the map step and collect key points as the batches complete.
+
+        Zero-score points are dropped as they arrive. The map step stops early, and
+        cancels the batches still waiting for a model call, once enough high-scoring
+        points are collected or the map timeout expires.
+        """
+        tasks = [
+            asyncio.create_task(
+                self._map_response_single_batch(
+                    context_data=data, query=query, **self.map_llm_params
+                )
+            )
+            for data in context_chunks
+        ]
+        batch_index = {task: index for index, task in enumerate(tasks)}
+        map_responses: list[SearchResult | None] = [None] * len(tasks)
+        key_points = []
+        high_scores = 0
+        deadline = (
+            time.monotonic() + self.map_timeout
+            if self.map_timeout is not None
+            else None
+        )
+        pending = set(tasks)
+        try:
+            while pending:
+                timeout = (
+                    max(0, deadline - time.monotonic())
+                    if deadline is not None
+                    else None
+                )
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    log.warning(
+                        "Map step timed out after %ss, reducing %d of %d batches",
+                        self.map_timeout,
+                        len(tasks) - len(pending),
+                        len(tasks),
+                    )
+                    break
+                for task in done:
+                    index = batch_index[task]
+                    map_responses[index] = task.result()
+                    points = self._key_points(index, map_responses[index])
+                    key_points.extend(points)
+                    high_scores += sum(
+                        point["score"] >= self.early_reduce_min_score
+                        for point in points
+                    )
+                if (
+                    pending
+                    and self.early_reduce_key_points is not None
+                    and high_scores >= self.early_reduce_key_points
+                ):
+                    log.info(
+                        "Collected %d key points, reducing %d of %d batches",
+                        high_scores,
+                        len(tasks) - len(pending),
+                        len(tasks),
+                    )
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        return [
+            response for response in map_responses if response is not None
+        ], key_points
+
     async def _map_response_single_batch(
         self,
         context_data: str,
@@ -289,6 +372,41 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
             if "description" in element and "score" in element
         ]
 
+    @staticmethod
+    def _key_points(index: int, response: SearchResult) -> list[dict[str, Any]]:
+        """Get the key points with a score above zero from a single map response."""
+        if not isinstance(response.response, list):
+            return []
+        return [
+            {
+                "analyst": index,
+                "answer": element["answer"],
+                "score": element["score"],
+            }
+            for element in response.response
+            if isinstance(element, dict)
+            and "answer" in element
+            and "score" in element
+            and element["score"] > 0
+        ]
+
+    def _reduce_context(self, key_points: list[dict[str, Any]]) -> str:
+        """Format the highest scoring key points that fit in the data token budget."""
+        data = []
+        total_tokens = 0
+        for point in sorted(key_points, key=lambda x: x["score"], reverse=True):
+            formatted_response_text = "\n".join([
+                f"----Analyst {point['analyst'] + 1}----",
+                f"Importance Score: {point['score']}",
+                point["answer"],
+            ])
+            tokens = num_tokens(formatted_response_text, self.token_encoder)
+            if total_tokens + tokens > self.max_data_tokens:
+                break
+            data.append(formatted_response_text)
+            total_tokens += tokens
+        return "\n\n".join(data)
+
     async def _reduce_response(
         self,
         map_responses: list[SearchResult],
@@ -300,27 +418,11 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
         search_prompt = ""
         start_time = time.time()
         try:
-            # collect all key points into a single list to prepare for sorting
-            key_points = []
-            for index, response in enumerate(map_responses):
-                if not isinstance(response.response, list):
-                    continue
-                for element in response.response:
-                    if not isinstance(element, dict):
-                        continue
-                    if "answer" not in element or "score" not in element:
-                        continue
-                    key_points.append({
-                        "analyst": index,
-                        "answer": element["answer"],
-                        "score": element["score"],
-                    })
-
             # filter response with score = 0 and rank responses by descending order of score
             filtered_key_points = [
                 point
-                for point in key_points
-                if point["score"] > 0  # type: ignore
+                for index, response in enumerate(map_responses)
+                for point in self._key_points(index, response)
             ]
 
             if len(filtered_key_points) == 0 and not self.allow_general_knowledge:
@@ -338,33 +440,7 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
                     output_tokens=0,
                 )
 
-            filtered_key_points = sorted(
-                filtered_key_points,
-                key=lambda x: x["score"],  # type: ignore
-                reverse=True,  # type: ignore
-            )
-
-            data = []
-            total_tokens = 0
-            for point in filtered_key_points:
-                formatted_response_data = []
-                formatted_response_data.append(
-                    f"----Analyst {point['analyst'] + 1}----"
-                )
-                formatted_response_data.append(
-                    f"Importance Score: {point['score']}"  # type: ignore
-                )
-                formatted_response_data.append(point["answer"])  # type: ignore
-                formatted_response_text = "\n".join(formatted_response_data)
-                if (
-                    total_tokens
-                    + num_tokens(formatted_response_text, self.token_encoder)
-                    > self.max_data_tokens
-                ):
-                    break
-                data.append(formatted_response_text)
-                total_tokens += num_tokens(formatted_response_text, self.token_encoder)
-            text_data = "\n\n".join(data)
+            text_data = self._reduce_context(filtered_key_points)
 
             search_prompt = self.reduce_system_prompt.format(
                 report_data=text_data, response_type=self.response_type
@@ -409,34 +485,11 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
 
     async def _stream_reduce_response(
         self,
-        map_responses: list[SearchResult],
+        key_points: list[dict[str, Any]],
         query: str,
         **llm_kwargs,
     ) -> AsyncGenerator[str, None]:
-        # collect all key points into a single list to prepare for sorting
-        key_points = []
-        for index, response in enumerate(map_responses):
-            if not isinstance(response.response, list):
-                continue
-            for element in response.response:
-                if not isinstance(element, dict):
-                    continue
-                if "answer" not in element or "score" not in element:
-                    continue
-                key_points.append({
-                    "analyst": index,
-                    "answer": element["answer"],
-                    "score": element["score"],
-                })
-
-        # filter response with score = 0 and rank responses by descending order of score
-        filtered_key_points = [
-            point
-            for point in key_points
-            if point["score"] > 0  # type: ignore
-        ]
-
-        if len(filtered_key_points) == 0 and not self.allow_general_knowledge:
+        if len(key_points) == 0 and not self.allow_general_knowledge:
             # return no data answer if no key points are found
             log.warning(
                 "Warning: All map responses have score 0 (i.e., no relevant information found from the dataset), returning a canned 'I do not know' answer. You can try enabling `allow_general_knowledge` to encourage the LLM to incorporate relevant general knowledge, at the risk of increasing hallucinations."
@@ -444,29 +497,7 @@ class GlobalSearch(BaseSearch[GlobalContextBuilder]):
             yield NO_DATA_ANSWER
             return
 
-        filtered_key_points = sorted(
-            filtered_key_points,
-            key=lambda x: x["score"],  # type: ignore
-            reverse=True,  # type: ignore
-        )
-
-        data = []
-        total_tokens = 0
-        for point in filtered_key_points:
-            formatted_response_data = [
-                f"----Analyst {point['analyst'] + 1}----",
-                f"Importance Score: {point['score']}",
-                point["answer"],
-            ]
-            formatted_response_text = "\n".join(formatted_response_data)
-            if (
-                total_tokens + num_tokens(formatted_response_text, self.token_encoder)
-                > self.max_data_tokens
-            ):
-                break
-            data.append(formatted_response_text)
-            total_tokens += num_tokens(formatted_response_text, self.token_encoder)
-        text_data = "\n\n".join(data)
+        text_data = self._reduce_context(key_points)
 
         search_prompt = self.reduce_system_prompt.format(
             report_data=text_data, response_type=self.response_type
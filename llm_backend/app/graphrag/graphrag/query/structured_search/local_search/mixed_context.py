@@ -39,6 +39,7 @@ from graphrag.query.context_builder.source_context import (
 from graphrag.query.input.retrieval.community_reports import (
     get_candidate_communities,
 )
+from graphrag.query.input.retrieval.relationships import RelationshipIndex
 from graphrag.query.input.retrieval.text_units import get_candidate_text_units
 from graphrag.query.llm.text_utils import num_tokens
 from graphrag.query.structured_search.base import LocalContextBuilder
@@ -78,15 +79,22 @@ class LocalSearchMixedContext(LocalContextBuilder):
         self.relationships = {
             relationship.id: relationship for relationship in relationships
         }
+        # built once so per-query relationship selection only visits the neighbourhood
+        self.relationship_index = RelationshipIndex(list(self.relationships.values()))
         self.covariates = covariates
         self.entity_text_embeddings = entity_text_embeddings
         self.text_embedder = text_embedder
         self.token_encoder = token_encoder
         self.embedding_vectorstore_key = embedding_vectorstore_key
+        self.entity_keys: list[int] | list[str] | None = None
 
     def filter_by_entity_keys(self, entity_keys: list[int] | list[str]):
-        """Filter entity text embeddings by entity keys."""
-        self.entity_text_embeddings.filter_by_id(entity_keys)
+        """Filter entity text embeddings by entity keys.
+
+        The keys are passed to each search instead of being set on the vector store,
+        which may be shared with other context builders.
+        """
+        self.entity_keys = entity_keys or None
 
     def build_context(
         self,
@@ -146,6 +154,7 @@ class LocalSearchMixedContext(LocalContextBuilder):
             exclude_entity_names=exclude_entity_names,
             k=top_k_mapped_entities,
             oversample_scaler=2,
+            include_ids=self.entity_keys,
         )
 
         # build context
@@ -318,15 +327,14 @@ class LocalSearchMixedContext(LocalContextBuilder):
         text_unit_ids_set = set()
 
         unit_info_list = []
-        relationship_values = list(self.relationships.values())
+        relationship_index = self.relationship_index
 
         for index, entity in enumerate(selected_entities):
             # get matching relationships
-            entity_relationships = [
-                rel
-                for rel in relationship_values
-                if rel.source == entity.title or rel.target == entity.title
-            ]
+            entity_relationships = relationship_index.get_relationships(
+                set(relationship_index.get_outgoing([entity.title]))
+                | set(relationship_index.get_incoming([entity.title]))
+            )
 
             for text_id in entity.text_unit_ids or []:
                 if text_id not in text_unit_ids_set and text_id in self.text_units:
@@ -416,7 +424,7 @@ class LocalSearchMixedContext(LocalContextBuilder):
                 relationship_context_data,
             ) = build_relationship_context(
                 selected_entities=added_entities,
-                relationships=list(self.relationships.values()),
+                relationships=self.relationship_index.relationships,
                 token_encoder=self.token_encoder,
                 max_tokens=max_tokens,
                 column_delimiter=column_delimiter,
@@ -424,6 +432,7 @@ class LocalSearchMixedContext(LocalContextBuilder):
                 include_relationship_weight=include_relationship_weight,
                 relationship_ranking_attribute=relationship_ranking_attribute,
                 context_name="Relationships",
+                relationship_index=self.relationship_index,
             )
             current_context.append(relationship_context)
             current_context_data["relationships"] = relationship_context_data
@@ -462,11 +471,12 @@ class LocalSearchMixedContext(LocalContextBuilder):
             candidate_context_data = get_candidate_context(
                 selected_entities=selected_entities,
                 entities=list(self.entities.values()),
-                relationships=list(self.relationships.values()),
+                relationships=self.relationship_index.relationships,
                 covariates=self.covariates,
                 include_entity_rank=include_entity_rank,
                 entity_rank_description=rank_description,
                 include_relationship_weight=include_relationship_weight,
+                relationship_index=self.relationship_index,
             )
             for key in candidate_context_data:
                 candidate_df = candidate_context_data[key]
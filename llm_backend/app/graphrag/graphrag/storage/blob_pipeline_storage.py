@@ -3,6 +3,7 @@
 
 """Azure Blob Storage implementation of PipelineStorage."""
 
+import asyncio
 import logging
 import re
 from collections.abc import Iterator
@@ -264,6 +265,32 @@ class BlobPipelineStorage(PipelineStorage):
         blob_client = container_client.get_blob_client(key)
         blob_client.delete_blob()
 
+    async def copy(self, key: str, target: PipelineStorage) -> None:
+        """Copy a blob to another storage, server side when it is in the same account."""
+        if not (
+            isinstance(target, BlobPipelineStorage)
+            and target._blob_service_client.account_name  # noqa: SLF001
+            == self._blob_service_client.account_name
+        ):
+            await super().copy(key, target)
+            return
+
+        source_client = self._blob_service_client.get_blob_client(
+            self._container_name, self._keyname(key)
+        )
+        target_client = target._blob_service_client.get_blob_client(  # noqa: SLF001
+            target._container_name,  # noqa: SLF001
+            target._keyname(key),  # noqa: SLF001
+        )
+        copy = target_client.start_copy_from_url(source_client.url)
+        status = copy["copy_status"]
+        while status == "pending":
+            await asyncio.sleep(1)
+            status = target_client.get_blob_properties().copy.status
+        if status != "success":
+            msg = f"Copying blob {source_client.url} failed with status {status}"
+            raise ValueError(msg)
+
     async def clear(self) -> None:
         """Clear the cache."""
 
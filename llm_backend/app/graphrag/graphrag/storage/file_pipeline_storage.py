@@ -3,17 +3,19 @@
 
 """A module containing 'FileStorage' and 'FilePipelineStorage' models."""
 
+import asyncio
 import logging
 import os
 import re
 import shutil
+import uuid
 from collections.abc import Iterator
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, cast
 
 import aiofiles
-from aiofiles.os import remove
+from aiofiles.os import remove, replace
 from aiofiles.ospath import exists
 
 from graphrag.logger.base import ProgressLogger
@@ -117,12 +119,22 @@ class FilePipelineStorage(PipelineStorage):
         is_bytes = isinstance(value, bytes)
         write_type = "wb" if is_bytes else "w"
         encoding = None if is_bytes else encoding or self._encoding
-        async with aiofiles.open(
-            join_path(self._root_dir, key),
-            cast("Any", write_type),
-            encoding=encoding,
-        ) as f:
-            await f.write(value)
+        # write a new file and swap it in, rather than truncating the existing one:
+        # the old file may be hard linked into a snapshot (see `copy`), and readers
+        # never see a partially written value
+        file_path = join_path(self._root_dir, key)
+        temp_path = file_path.with_name(f".{file_path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            async with aiofiles.open(
+                temp_path,
+                cast("Any", write_type),
+                encoding=encoding,
+            ) as f:
+                await f.write(value)
+            await replace(temp_path, file_path)
+        finally:
+            if await exists(temp_path):
+                await remove(temp_path)
 
     async def has(self, key: str) -> bool:
         """Has method definition."""
@@ -133,6 +145,29 @@ class FilePipelineStorage(PipelineStorage):
         if await self.has(key):
             await remove(join_path(self._root_dir, key))
 
+    async def copy(self, key: str, target: PipelineStorage) -> None:
+        """Copy a file to another storage, hard linking it where possible.
+
+        Files are never modified in place (`set` replaces them), so a hard link is a
+        stable snapshot of the current value. Falls back to a file copy across file
+        systems, and to copying the bytes for storages not backed by files.
+        """
+        source_path = self._file_path(key)
+        target_path = (
+            target._file_path(key)  # noqa: SLF001
+            if isinstance(target, FilePipelineStorage)
+            else None
+        )
+        if source_path is None or target_path is None:
+            await super().copy(key, target)
+            return
+
+        await asyncio.to_thread(_link_or_copy, source_path, target_path)
+
+    def _file_path(self, key: str) -> Path | None:
+        """Get the path of the file holding the given key."""
+        return join_path(self._root_dir, key)
+
     async def clear(self) -> None:
         """Clear method definition."""
         for file in Path(self._root_dir).glob("*"):
@@ -161,6 +196,17 @@ class FilePipelineStorage(PipelineStorage):
         return get_timestamp_formatted_with_local_tz(creation_time_utc)
 
 
+def _link_or_copy(source_path: Path, target_path: Path) -> None:
+    """Hard link a file to the target path, copying it across file systems."""
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    target_path.unlink(missing_ok=True)
+    try:
+        os.link(source_path, target_path)
+    except OSError:
+        log.debug("could not hard link %s, copying it instead", source_path)
+        shutil.copy2(source_path, target_path)
+
+
 def join_path(file_path: str, file_name: str) -> Path:
     """Join a path and a file. Independent of the OS."""
     return Path(file_path) / Path(file_name).parent / Path(file_name).name
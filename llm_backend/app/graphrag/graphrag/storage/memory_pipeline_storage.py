@@ -8,6 +8,8 @@ from typing import TYPE_CHECKING, Any
 from graphrag.storage.file_pipeline_storage import FilePipelineStorage
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from graphrag.storage.pipeline_storage import PipelineStorage
 
 
@@ -65,6 +67,10 @@ class MemoryPipelineStorage(FilePipelineStorage):
         """
         del self._storage[key]
 
+    def _file_path(self, key: str) -> "Path | None":
+        """Values are not backed by files, so they are copied as bytes."""
+        return None
+
     async def clear(self) -> None:
         """Clear the storage."""
         self._storage.clear()
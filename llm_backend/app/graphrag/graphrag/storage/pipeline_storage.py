@@ -74,6 +74,18 @@ class PipelineStorage(metaclass=ABCMeta):
     async def clear(self) -> None:
         """Clear the storage."""
 
+    async def copy(self, key: str, target: "PipelineStorage") -> None:
+        """Copy the value for the given key to the same key in another storage.
+
+        The value is copied as bytes, without parsing it. Storages that can copy
+        within their own backend override this to avoid moving the data at all.
+
+        Args:
+            - key - The key to copy.
+            - target - The storage to copy the value to.
+        """
+        await target.set(key, await self.get(key, as_bytes=True))
+
     @abstractmethod
     def child(self, name: str | None) -> "PipelineStorage":
         """Create a child storage instance."""
@@ -64,15 +64,32 @@ class MultiVectorStore(BaseVectorStore):
             raise ValueError(message)
 
     def similarity_search_by_vector(
-        self, query_embedding: list[float], k: int = 10, **kwargs: Any
+        self,
+        query_embedding: list[float],
+        k: int = 10,
+        include_ids: list[str] | list[int] | None = None,
+        **kwargs: Any,
     ) -> list[VectorStoreSearchResult]:
-        """Perform a vector-based similarity search."""
+        """Perform a vector-based similarity search.
+
+        `include_ids` are ids as returned by this store, i.e. suffixed with the index name.
+        """
+        index_ids: dict[str, list[str]] = {}
+        if include_ids is not None:
+            for id in include_ids:
+                document_id, _, index_name = str(id).rpartition("-")
+                index_ids.setdefault(index_name, []).append(document_id)
         all_results = []
         for index_name, embedding_store in zip(
             self.index_names, self.embedding_stores, strict=False
         ):
+            store_ids = None
+            if include_ids is not None:
+                store_ids = index_ids.get(index_name)
+                if not store_ids:
+                    continue
             results = embedding_store.similarity_search_by_vector(
-                query_embedding=query_embedding, k=k
+                query_embedding=query_embedding, k=k, include_ids=store_ids
             )
             mod_results = []
             for r in results:
@@ -82,13 +99,18 @@ class MultiVectorStore(BaseVectorStore):
         return sorted(all_results, key=lambda x: x.score, reverse=True)[:k]
 
     def similarity_search_by_text(
-        self, text: str, text_embedder: TextEmbedder, k: int = 10, **kwargs: Any
+        self,
+        text: str,
+        text_embedder: TextEmbedder,
+        k: int = 10,
+        include_ids: list[str] | list[int] | None = None,
+        **kwargs: Any,
     ) -> list[VectorStoreSearchResult]:
         """Perform a text-based similarity search."""
         query_embedding = text_embedder(text)
         if query_embedding:
             return self.similarity_search_by_vector(
-                query_embedding=query_embedding, k=k
+                query_embedding=query_embedding, k=k, include_ids=include_ids
             )
         return []
 
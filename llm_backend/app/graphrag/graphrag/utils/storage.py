@@ -7,6 +7,8 @@ import logging
 from io import BytesIO
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from graphrag.storage.pipeline_storage import PipelineStorage
 
@@ -34,6 +36,69 @@ async def write_table_to_storage(
     await storage.set(f"{name}.parquet", table.to_parquet())
 
 
+async def concat_table_to_storage(
+    table: pd.DataFrame,
+    name: str,
+    previous_storage: PipelineStorage,
+    storage: PipelineStorage,
+) -> None:
+    """Write the previous table followed by the given rows to storage.
+
+    The previous rows are copied one row group at a time without converting them to
+    pandas, and the new rows are added as row groups of their own. The whole table is
+    still read and rewritten, so the cost grows with the previous table; this only
+    avoids the pandas round trip.
+    """
+    filename = f"{name}.parquet"
+    previous = pq.ParquetFile(
+        BytesIO(await previous_storage.get(filename, as_bytes=True))
+    )
+    columns = [
+        column
+        for column in previous.schema_arrow.names
+        if not column.startswith("__index_level_")
+    ]
+    rows = pa.Table.from_pandas(table, preserve_index=False)
+    schema = _appendable_schema(
+        pa.schema([previous.schema_arrow.field(column) for column in columns]), rows
+    )
+    if schema is None:
+        log.info("schema of %s changed, rewriting the whole table", filename)
+        merged = pd.concat(
+            [previous.read(columns=columns).to_pandas(), table], ignore_index=True
+        )
+        await write_table_to_storage(merged, name, storage)
+        return
+
+    output = BytesIO()
+    with pq.ParquetWriter(output, schema) as writer:
+        for index in range(previous.num_row_groups):
+            row_group = previous.read_row_group(index, columns=columns)
+            writer.write_table(row_group.cast(schema))
+        writer.write_table(rows.select(columns).cast(schema))
+    await storage.set(filename, output.getvalue())
+
+
+def _appendable_schema(schema: pa.Schema, rows: pa.Table) -> pa.Schema | None:
+    """Get a schema holding both the previous and the new rows, if there is one."""
+    if set(schema.names) != set(rows.column_names):
+        return None
+    try:
+        # e.g. a column that only held nulls so far takes the type of the new values
+        return pa.unify_schemas([schema, rows.schema.remove_metadata()])
+    except pa.ArrowException:
+        return None
+
+
+async def load_column_from_storage(
+    name: str, column: str, storage: PipelineStorage
+) -> pd.Series:
+    """Load a single column of a parquet from the storage instance."""
+    filename = f"{name}.parquet"
+    data = await storage.get(filename, as_bytes=True)
+    return pq.read_table(BytesIO(data), columns=[column]).column(column).to_pandas()
+
+
 async def delete_table_from_storage(name: str, storage: PipelineStorage) -> None:
     """Delete a table to storage."""
     await storage.delete(f"{name}.parquet")
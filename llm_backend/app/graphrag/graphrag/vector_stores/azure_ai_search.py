@@ -143,30 +143,32 @@ class AzureAISearchVectorStore(BaseVectorStore):
 
     def filter_by_id(self, include_ids: list[str] | list[int]) -> Any:
         """Build a query filter to filter documents by a list of ids."""
-        if include_ids is None or len(include_ids) == 0:
-            self.query_filter = None
-            # Returning to keep consistency with other methods, but not needed
-            return self.query_filter
-
-        # More info about odata filtering here: https://learn.microsoft.com/en-us/azure/search/search-query-odata-search-in-function
-        # search.in is faster that joined and/or conditions
-        id_filter = ",".join([f"{id!s}" for id in include_ids])
-        self.query_filter = f"search.in(id, '{id_filter}', ',')"
-
+        self.query_filter = _id_filter(include_ids)
         # Returning to keep consistency with other methods, but not needed
-        # TODO: Refactor on a future PR
         return self.query_filter
 
     def similarity_search_by_vector(
-        self, query_embedding: list[float], k: int = 10, **kwargs: Any
+        self,
+        query_embedding: list[float],
+        k: int = 10,
+        include_ids: list[str] | list[int] | None = None,
+        **kwargs: Any,
     ) -> list[VectorStoreSearchResult]:
         """Perform a vector-based similarity search."""
+        if include_ids is not None and len(include_ids) == 0:
+            # an empty id set matches no documents, as in the other stores
+            return []
         vectorized_query = VectorizedQuery(
             vector=query_embedding, k_nearest_neighbors=k, fields="vector"
         )
 
         response = self.db_connection.search(
             vector_queries=[vectorized_query],
+            filter=(
+                _id_filter(include_ids)
+                if include_ids is not None
+                else self.query_filter
+            ),
         )
 
         return [
@@ -185,13 +187,18 @@ class AzureAISearchVectorStore(BaseVectorStore):
         ]
 
     def similarity_search_by_text(
-        self, text: str, text_embedder: TextEmbedder, k: int = 10, **kwargs: Any
+        self,
+        text: str,
+        text_embedder: TextEmbedder,
+        k: int = 10,
+        include_ids: list[str] | list[int] | None = None,
+        **kwargs: Any,
     ) -> list[VectorStoreSearchResult]:
         """Perform a text-based similarity search."""
         query_embedding = text_embedder(text)
         if query_embedding:
             return self.similarity_search_by_vector(
-                query_embedding=query_embedding, k=k
+                query_embedding=query_embedding, k=k, include_ids=include_ids
             )
         return []
 
@@ -204,3 +211,13 @@ class AzureAISearchVectorStore(BaseVectorStore):
             vector=response.get("vector", []),
             attributes=(json.loads(response.get("attributes", "{}"))),
         )
+
+
+def _id_filter(include_ids: list[str] | list[int] | None) -> str | None:
+    """Build an OData filter matching a list of ids."""
+    if include_ids is None or len(include_ids) == 0:
+        return None
+    # More info about odata filtering here: https://learn.microsoft.com/en-us/azure/search/search-query-odata-search-in-function
+    # search.in is faster that joined and/or conditions
+    id_filter = ",".join([f"{id!s}".replace("'", "''") for id in include_ids])
+    return f"search.in(id, '{id_filter}', ',')"
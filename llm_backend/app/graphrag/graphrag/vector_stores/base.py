@@ -64,21 +64,46 @@ class BaseVectorStore(ABC):
     ) -> None:
         """Load documents into the vector-store."""
 
+    def create_index(self) -> None:  # noqa: B027
+        """Build or refresh the ANN index once all documents are loaded.
+
+        Stores that index on write, or do not support ANN indexes, leave this as a no-op.
+        """
+
     @abstractmethod
     def similarity_search_by_vector(
-        self, query_embedding: list[float], k: int = 10, **kwargs: Any
+        self,
+        query_embedding: list[float],
+        k: int = 10,
+        include_ids: list[str] | list[int] | None = None,
+        **kwargs: Any,
     ) -> list[VectorStoreSearchResult]:
-        """Perform ANN search by vector."""
+        """Perform ANN search by vector.
+
+        When `include_ids` is given, only documents with those ids are searched. The
+        filter applies to this call only, so one store can serve concurrent searches
+        with different filters. Without it, stores apply the filter set by
+        `filter_by_id`, if they support one.
+        """
 
     @abstractmethod
     def similarity_search_by_text(
-        self, text: str, text_embedder: TextEmbedder, k: int = 10, **kwargs: Any
+        self,
+        text: str,
+        text_embedder: TextEmbedder,
+        k: int = 10,
+        include_ids: list[str] | list[int] | None = None,
+        **kwargs: Any,
     ) -> list[VectorStoreSearchResult]:
         """Perform ANN search by text."""
 
     @abstractmethod
     def filter_by_id(self, include_ids: list[str] | list[int]) -> Any:
-        """Build a query filter to filter documents by id."""
+        """Build a query filter to filter documents by id.
+
+        The filter is stored on the store and applies to every later search; prefer
+        passing `include_ids` to the search methods instead.
+        """
 
     @abstractmethod
     def search_by_id(self, id: str) -> VectorStoreDocument:
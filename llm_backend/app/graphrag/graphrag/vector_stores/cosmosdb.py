@@ -150,15 +150,27 @@ class CosmosDBVectoreStore(BaseVectorStore):
                 self._container_client.upsert_item(doc_json)
 
     def similarity_search_by_vector(
-        self, query_embedding: list[float], k: int = 10, **kwargs: Any
+        self,
+        query_embedding: list[float],
+        k: int = 10,
+        include_ids: list[str] | list[int] | None = None,
+        **kwargs: Any,
     ) -> list[VectorStoreSearchResult]:
         """Perform a vector-based similarity search."""
         if self._container_client is None:
             msg = "Container client is not initialized."
             raise ValueError(msg)
 
-        query = f"SELECT TOP {k} c.id, c.text, c.vector, c.attributes, VectorDistance(c.vector, @embedding) AS SimilarityScore FROM c ORDER BY VectorDistance(c.vector, @embedding)"  # noqa: S608
         query_params = [{"name": "@embedding", "value": query_embedding}]
+        where = ""
+        if include_ids is not None:
+            # the ids are passed as a parameter rather than formatted into the query
+            where = "WHERE ARRAY_CONTAINS(@include_ids, c.id) "
+            query_params.append({
+                "name": "@include_ids",
+                "value": [str(id) for id in include_ids],
+            })
+        query = f"SELECT TOP {k} c.id, c.text, c.vector, c.attributes, VectorDistance(c.vector, @embedding) AS SimilarityScore FROM c {where}ORDER BY VectorDistance(c.vector, @embedding)"  # noqa: S608
         items = self._container_client.query_items(
             query=query,
             parameters=query_params,
@@ -179,13 +191,18 @@ class CosmosDBVectoreStore(BaseVectorStore):
         ]
 
     def similarity_search_by_text(
-        self, text: str, text_embedder: TextEmbedder, k: int = 10, **kwargs: Any
+        self,
+        text: str,
+        text_embedder: TextEmbedder,
+        k: int = 10,
+        include_ids: list[str] | list[int] | None = None,
+        **kwargs: Any,
     ) -> list[VectorStoreSearchResult]:
         """Perform a text-based similarity search."""
         query_embedding = text_embedder(text)
         if query_embedding:
             return self.similarity_search_by_vector(
-                query_embedding=query_embedding, k=k
+                query_embedding=query_embedding, k=k, include_ids=include_ids
             )
         return []
 
@@ -4,9 +4,16 @@
 """The LanceDB vector storage implementation package."""
 
 import json  # noqa: I001
+import logging
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
 import pyarrow as pa
+import pyarrow.compute as pc
 
 from graphrag.data_model.types import TextEmbedder
 
@@ -17,15 +24,54 @@ from graphrag.vector_stores.base import (
 )
 import lancedb
 
+log = logging.getLogger(__name__)
+
+VECTOR_DTYPES = {"float32": pa.float32(), "float64": pa.float64()}
+RESULT_COLUMNS = ["id", "text", "vector", "attributes"]
+
+
+@dataclass
+class _IdFilter:
+    """An include_ids filter resolved against one version of the table.
+
+    Small id sets are resolved to the row positions and vectors of the matching
+    rows, which are then searched exactly; large ones use a SQL prefilter.
+    """
+
+    dataset: Any = None
+    positions: np.ndarray | None = None
+    vectors: np.ndarray | None = None
+    squared_norms: np.ndarray | None = None
+    where: str | None = None
+
 
 class LanceDBVectorStore(BaseVectorStore):
     """LanceDB vector storage implementation."""
 
     def __init__(self, **kwargs: Any) -> None:
         super().__init__(**kwargs)
+        self.vector_dtype = kwargs.get("vector_dtype") or "float32"
+        if self.vector_dtype not in VECTOR_DTYPES:
+            msg = f"Unsupported LanceDB vector_dtype: {self.vector_dtype}"
+            raise ValueError(msg)
+        self.index_type = kwargs.get("index_type")
+        self.index_num_partitions = kwargs.get("index_num_partitions")
+        self.index_num_sub_vectors = kwargs.get("index_num_sub_vectors")
+        self.index_min_rows = kwargs.get("index_min_rows") or 0
+        self.index_rebuild_threshold = kwargs.get("index_rebuild_threshold", 0.2)
+        self.nprobes = kwargs.get("nprobes") or 20
+        self.refine_factor = kwargs.get("refine_factor")
+        self.exact_search_max_rows = kwargs.get("exact_search_max_rows", 20_000)
+        self.filter_cache_size = kwargs.get("filter_cache_size", 4)
+        self._filter_lock = threading.Lock()
+        self._id_columns: dict[int, pa.ChunkedArray] = {}
+        self._id_filters: OrderedDict[tuple[int, frozenset[str]], _IdFilter] = (
+            OrderedDict()
+        )
 
     def connect(self, **kwargs: Any) -> Any:
         """Connect to the vector storage."""
+        self._clear_filter_cache()
         self.db_connection = lancedb.connect(kwargs["db_uri"])
         if (
             self.collection_name
@@ -39,108 +85,263 @@ class LanceDBVectorStore(BaseVectorStore):
         self, documents: list[VectorStoreDocument], overwrite: bool = True
     ) -> None:
         """Load documents into vector storage."""
-        data = [
-            {
-                "id": document.id,
-                "text": document.text,
-                "vector": document.vector,
-                "attributes": json.dumps(document.attributes),
-            }
-            for document in documents
-            if document.vector is not None
-        ]
+        self._clear_filter_cache()
+        documents = [document for document in documents if document.vector is not None]
+        data = (
+            pa.table({
+                "id": [document.id for document in documents],
+                "text": [document.text for document in documents],
+                "vector": self._vector_array([
+                    document.vector for document in documents
+                ]),
+                "attributes": [
+                    json.dumps(document.attributes) for document in documents
+                ],
+            })
+            if documents
+            else None
+        )
 
-        if len(data) == 0:
-            data = None
-
-        schema = pa.schema([
-            pa.field("id", pa.string()),
-            pa.field("text", pa.string()),
-            pa.field("vector", pa.list_(pa.float64())),
-            pa.field("attributes", pa.string()),
-        ])
-        # NOTE: If modifying the next section of code, ensure that the schema remains the same.
-        #       The pyarrow format of the 'vector' field may change if the order of operations is changed
-        #       and will break vector search.
-        if overwrite:
+        # NOTE: The table is built with explicit Arrow types so the 'vector' field is
+        #       stored as a fixed-size list (float32 by default), which is what the
+        #       vector search and ANN indexes expect. Without vectors the dimension is
+        #       unknown, so an empty overwrite only drops the table and the first batch
+        #       with vectors creates it.
+        exists = self.collection_name in self.db_connection.table_names()
+        if overwrite or not exists:
             if data:
                 self.document_collection = self.db_connection.create_table(
                     self.collection_name, data=data, mode="overwrite"
                 )
             else:
-                self.document_collection = self.db_connection.create_table(
-                    self.collection_name, schema=schema, mode="overwrite"
-                )
+                if exists:
+                    self.db_connection.drop_table(self.collection_name)
+                self.document_collection = None
+            return
+
+        # add data to existing table
+        self.document_collection = self.db_connection.open_table(self.collection_name)
+        if not data:
+            return
+        vector_type = self.document_collection.schema.field("vector").type
+        if (
+            not pa.types.is_fixed_size_list(vector_type)
+            and self.document_collection.count_rows() == 0
+        ):
+            # an empty table left by an older version, recreate it with the vectors
+            self.document_collection = self.db_connection.create_table(
+                self.collection_name, data=data, mode="overwrite"
+            )
         else:
-            # add data to existing table
-            self.document_collection = self.db_connection.open_table(
-                self.collection_name
+            # keep the existing vector type, e.g. tables written before float32 storage
+            self.document_collection.add(data.cast(self.document_collection.schema))
+
+    def _vector_array(self, vectors: list[list[float]]) -> pa.Array:
+        """Convert vectors into a fixed-size list array of the configured dtype."""
+        matrix = np.asarray(vectors, dtype=self.vector_dtype)
+        if matrix.ndim != 2:
+            msg = "All vectors in a LanceDB collection must have the same dimension"
+            raise ValueError(msg)
+        return pa.FixedSizeListArray.from_arrays(
+            pa.array(matrix.ravel()), matrix.shape[1]
+        )
+
+    def create_index(self) -> None:
+        """Build the ANN index, or add newly loaded rows to the existing one.
+
+        The index is only built when `index_type` is configured and the table has at
+        least `index_min_rows` rows; smaller tables are searched exactly. When rows
+        are appended to an indexed table, they are merged into the existing index
+        unless they exceed `index_rebuild_threshold` of the table, in which case the
+        partitions are retrained.
+        """
+        if not self.index_type or self.document_collection is None:
+            return
+        vector_type = self.document_collection.schema.field("vector").type
+        if not pa.types.is_fixed_size_list(vector_type):
+            log.warning(
+                "Skipping ANN index for %s: vectors are not stored as fixed-size lists",
+                self.collection_name,
             )
-            if data:
-                self.document_collection.add(data)
+            return
+        num_rows = self.document_collection.count_rows()
+        if num_rows < self.index_min_rows:
+            return
+
+        dataset = self.document_collection.to_lance()
+        index_name = next(
+            (
+                index["name"]
+                for index in dataset.list_indices()
+                if "vector" in index["fields"]
+            ),
+            None,
+        )
+        if index_name is not None:
+            num_unindexed = dataset.stats.index_stats(index_name)["num_unindexed_rows"]
+            if num_unindexed <= self.index_rebuild_threshold * num_rows:
+                if num_unindexed:
+                    log.info(
+                        "Adding %d rows to the %s index of %s",
+                        num_unindexed,
+                        self.index_type,
+                        self.collection_name,
+                    )
+                    dataset.optimize.optimize_indices()
+                return
+
+        dimension = vector_type.list_size
+        num_partitions = self.index_num_partitions or max(1, int(math.sqrt(num_rows)))
+        num_sub_vectors = self.index_num_sub_vectors or next(
+            dimension // step for step in (16, 8, 4, 2, 1) if dimension % step == 0
+        )
+        log.info(
+            "Building %s index for %s: %d rows, %d partitions",
+            self.index_type,
+            self.collection_name,
+            num_rows,
+            num_partitions,
+        )
+        self.document_collection.create_index(
+            metric="L2",
+            num_partitions=num_partitions,
+            num_sub_vectors=num_sub_vectors,
+            vector_column_name="vector",
+            replace=True,
+            index_type=self.index_type.upper(),
+        )
 
     def filter_by_id(self, include_ids: list[str] | list[int]) -> Any:
         """Build a query filter to filter documents by id."""
-        if len(include_ids) == 0:
-            self.query_filter = None
-        else:
-            if isinstance(include_ids[0], str):
-                id_filter = ", ".join([f"'{id}'" for id in include_ids])
-                self.query_filter = f"id in ({id_filter})"
-            else:
-                self.query_filter = (
-                    f"id in ({', '.join([str(id) for id in include_ids])})"
-                )
+        self.query_filter = _id_in_clause(include_ids) if include_ids else None
         return self.query_filter
 
     def similarity_search_by_vector(
-        self, query_embedding: list[float], k: int = 10, **kwargs: Any
+        self,
+        query_embedding: list[float],
+        k: int = 10,
+        include_ids: list[str] | list[int] | None = None,
+        **kwargs: Any,
     ) -> list[VectorStoreSearchResult]:
-        """Perform a vector-based similarity search."""
-        if self.query_filter:
-            docs = (
-                self.document_collection.search(
-                    query=query_embedding, vector_column_name="vector"
-                )
-                .where(self.query_filter, prefilter=True)
-                .limit(k)
-                .to_list()
-            )
-        else:
-            docs = (
-                self.document_collection.search(
-                    query=query_embedding, vector_column_name="vector"
-                )
-                .limit(k)
-                .to_list()
-            )
-        return [
-            VectorStoreSearchResult(
-                document=VectorStoreDocument(
-                    id=doc["id"],
-                    text=doc["text"],
-                    vector=doc["vector"],
-                    attributes=json.loads(doc["attributes"]),
-                ),
-                score=1 - abs(float(doc["_distance"])),
-            )
-            for doc in docs
-        ]
+        """Perform a vector-based similarity search.
+
+        `include_ids` restricts this search to the given documents. Sets of up to
+        `exact_search_max_rows` ids are searched exactly against their cached vectors;
+        larger sets are applied as a prefilter to the ANN search.
+        """
+        if self.document_collection is None:
+            return []
+        where = self.query_filter
+        if include_ids is not None:
+            id_filter = self._id_filter(include_ids)
+            if id_filter.where is None:
+                return self._search_included_rows(id_filter, query_embedding, k)
+            where = id_filter.where
+
+        query = self.document_collection.search(
+            query=query_embedding, vector_column_name="vector"
+        ).nprobes(self.nprobes)
+        if self.refine_factor:
+            query = query.refine_factor(self.refine_factor)
+        if where:
+            query = query.where(where, prefilter=True)
+        docs = query.limit(k).to_list()
+        return [_to_search_result(doc, doc["_distance"]) for doc in docs]
 
     def similarity_search_by_text(
-        self, text: str, text_embedder: TextEmbedder, k: int = 10, **kwargs: Any
+        self,
+        text: str,
+        text_embedder: TextEmbedder,
+        k: int = 10,
+        include_ids: list[str] | list[int] | None = None,
+        **kwargs: Any,
     ) -> list[VectorStoreSearchResult]:
         """Perform a similarity search using a given input text."""
         query_embedding = text_embedder(text)
         if query_embedding:
-            return self.similarity_search_by_vector(query_embedding, k)
+            return self.similarity_search_by_vector(
+                query_embedding, k, include_ids=include_ids
+            )
         return []
 
+    def _search_included_rows(
+        self, id_filter: _IdFilter, query_embedding: list[float], k: int
+    ) -> list[VectorStoreSearchResult]:
+        """Exact L2 search over the cached vectors of an id filter."""
+        num_rows = len(id_filter.positions)  # type: ignore
+        if num_rows == 0 or k <= 0:
+            return []
+        query = np.asarray(query_embedding, dtype=id_filter.vectors.dtype)  # type: ignore
+        # squared L2 distance, the same value LanceDB reports as _distance
+        distances = (
+            id_filter.squared_norms - 2 * (id_filter.vectors @ query) + query @ query
+        )
+        top = np.argpartition(distances, min(k, num_rows) - 1)[:k]
+        top = top[np.argsort(distances[top])]
+        docs = id_filter.dataset.take(
+            id_filter.positions[top],  # type: ignore
+            columns=RESULT_COLUMNS,
+        ).to_pylist()
+        return [
+            _to_search_result(doc, distance)
+            for doc, distance in zip(docs, distances[top], strict=True)
+        ]
+
+    def _id_filter(self, include_ids: list[str] | list[int]) -> _IdFilter:
+        """Get the cached filter for a set of ids in the current table version."""
+        ids = frozenset(str(id) for id in include_ids)
+        dataset = self.document_collection.to_lance()
+        key = (dataset.version, ids)
+        with self._filter_lock:
+            id_filter = self._id_filters.get(key)
+            if id_filter is not None:
+                self._id_filters.move_to_end(key)
+                return id_filter
+
+        if len(ids) > self.exact_search_max_rows:
+            id_filter = _IdFilter(where=_id_in_clause(list(ids)))
+        else:
+            mask = pc.is_in(
+                self._id_column(dataset), value_set=pa.array(list(ids), pa.string())
+            )
+            positions = np.flatnonzero(mask.to_numpy(zero_copy_only=False))
+            id_filter = _IdFilter(dataset=dataset, positions=positions)
+            if len(positions):
+                vectors = dataset.take(positions, columns=["vector"]).column("vector")
+                values = vectors.combine_chunks().flatten().to_numpy()
+                id_filter.vectors = values.reshape(len(positions), -1)
+                id_filter.squared_norms = np.einsum(
+                    "ij,ij->i", id_filter.vectors, id_filter.vectors
+                )
+
+        with self._filter_lock:
+            self._id_filters[key] = id_filter
+            while len(self._id_filters) > self.filter_cache_size:
+                self._id_filters.popitem(last=False)
+        return id_filter
+
+    def _id_column(self, dataset: Any) -> pa.ChunkedArray:
+        """Get the id column of a table version, read once and cached."""
+        with self._filter_lock:
+            ids = self._id_columns.get(dataset.version)
+        if ids is None:
+            ids = dataset.to_table(columns=["id"]).column("id").cast(pa.string())
+            with self._filter_lock:
+                self._id_columns = {dataset.version: ids}
+        return ids
+
+    def _clear_filter_cache(self) -> None:
+        with self._filter_lock:
+            self._id_columns = {}
+            self._id_filters.clear()
+
     def search_by_id(self, id: str) -> VectorStoreDocument:
         """Search for a document by id."""
+        if self.document_collection is None:
+            return VectorStoreDocument(id=id, text=None, vector=None)
         doc = (
             self.document_collection.search()
-            .where(f"id == '{id}'", prefilter=True)
+            .where(f"id == {_sql_literal(id)}", prefilter=True)
             .to_list()
         )
         if doc:
@@ -151,3 +352,25 @@ class LanceDBVectorStore(BaseVectorStore):
                 attributes=json.loads(doc[0]["attributes"]),
             )
         return VectorStoreDocument(id=id, text=None, vector=None)
+
+
+def _sql_literal(value: str | int) -> str:
+    """Quote a value as a SQL string literal."""
+    escaped = str(value).replace("'", "''")
+    return f"'{escaped}'"
+
+
+def _id_in_clause(include_ids: list[str] | list[int]) -> str:
+    return f"id in ({', '.join(_sql_literal(id) for id in include_ids)})"
+
+
+def _to_search_result(doc: dict[str, Any], distance: float) -> VectorStoreSearchResult:
+    return VectorStoreSearchResult(
+        document=VectorStoreDocument(
+            id=doc["id"],
+            text=doc["text"],
+            vector=doc["vector"],
+            attributes=json.loads(doc["attributes"]),
+        ),
+        score=1 - abs(float(distance)),
+    )
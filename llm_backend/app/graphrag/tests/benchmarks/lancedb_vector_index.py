@@ -0,0 +1,185 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""Benchmark LanceDB entity-description lookups on synthetic embeddings.
+
+Run with `python -m tests.benchmarks.lancedb_vector_index --rows 1000000`.
+Compares the previous row-by-row load path with the Arrow float32 load path,
+with and without an ANN index, reporting write time, table size, index build
+time, query latency and recall@k against exact search.
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import lancedb
+import numpy as np
+
+from graphrag.vector_stores.base import VectorStoreDocument
+from graphrag.vector_stores.lancedb import LanceDBVectorStore
+
+BATCH_SIZE = 50_000
+
+
+def generate_batches(
+    num_rows: int, dimension: int, num_clusters: int, seed: int
+) -> tuple[np.ndarray, list[np.ndarray]]:
+    """Generate clustered unit vectors with a low intrinsic dimension.
+
+    Text embeddings lie close to a low-dimensional manifold, so the vectors are a
+    random projection of a 32-dimensional Gaussian mixture plus a little noise;
+    isotropic noise in the full dimension would make all neighbours equidistant.
+    """
+    rng = np.random.default_rng(seed)
+    latent_dimension = 32
+    centers = rng.standard_normal((num_clusters, latent_dimension)).astype(np.float32)
+    projection = rng.standard_normal((latent_dimension, dimension)).astype(np.float32)
+    batches = []
+    for start in range(0, num_rows, BATCH_SIZE):
+        size = min(BATCH_SIZE, num_rows - start)
+        latent = centers[rng.integers(num_clusters, size=size)]
+        latent += 0.5 * rng.standard_normal((size, latent_dimension), np.float32)
+        vectors = latent @ projection
+        vectors += 0.5 * rng.standard_normal((size, dimension), np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        batches.append(vectors)
+    queries = batches[0][rng.choice(len(batches[0]), 100, replace=False)]
+    queries = queries + 0.02 * rng.standard_normal(queries.shape, np.float32)
+    return queries, batches
+
+
+def write_legacy_table(db_uri: str, batches: list[np.ndarray]) -> None:
+    """Write the table like the previous load_documents: Python lists in row dicts."""
+    db = lancedb.connect(db_uri)
+    table = None
+    start = 0
+    for vectors in batches:
+        data = [
+            {
+                "id": str(start + j),
+                "text": f"entity {start + j}",
+                "vector": vector.astype(np.float64).tolist(),
+                "attributes": "{}",
+            }
+            for j, vector in enumerate(vectors)
+        ]
+        if table is None:
+            table = db.create_table("entities", data=data, mode="overwrite")
+        else:
+            table.add(data)
+        start += len(vectors)
+
+
+def write_store(db_uri: str, batches: list[np.ndarray], **kwargs) -> LanceDBVectorStore:
+    store = LanceDBVectorStore(collection_name="entities", **kwargs)
+    store.connect(db_uri=db_uri)
+    start = 0
+    for i, vectors in enumerate(batches):
+        store.load_documents(
+            [
+                VectorStoreDocument(
+                    id=str(start + j), text=f"entity {start + j}", vector=vector
+                )
+                for j, vector in enumerate(vectors)
+            ],
+            overwrite=i == 0,
+        )
+        start += len(vectors)
+    return store
+
+
+def directory_size(path: str) -> int:
+    return sum(f.stat().st_size for f in Path(path).rglob("*") if f.is_file())
+
+
+def run_queries(
+    store: LanceDBVectorStore, queries: np.ndarray, k: int
+) -> tuple[float, list[set[str]]]:
+    store.similarity_search_by_vector(queries[0].tolist(), k)  # warm up
+    results = []
+    start = time.perf_counter()
+    for query in queries:
+        results.append({
+            result.document.id
+            for result in store.similarity_search_by_vector(query.tolist(), k)
+        })
+    return (time.perf_counter() - start) / len(queries), results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--partitions", type=int, default=None)
+    parser.add_argument("--nprobes", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    queries, batches = generate_batches(
+        args.rows, args.dimension, args.clusters, args.seed
+    )
+    root = tempfile.mkdtemp()
+    try:
+        print(
+            f"{args.rows} rows, {args.dimension} dimensions, {len(queries)} queries, k={args.k}"
+        )
+        print(
+            f"{'configuration':<28} {'write s':>9} {'size MB':>9} {'index s':>9} "
+            f"{'query ms':>9} {'recall':>8}"
+        )
+
+        legacy_uri = f"{root}/legacy"
+        start = time.perf_counter()
+        write_legacy_table(legacy_uri, batches)
+        write = time.perf_counter() - start
+        legacy = LanceDBVectorStore(collection_name="entities")
+        legacy.connect(db_uri=legacy_uri)
+        latency, exact = run_queries(legacy, queries, args.k)
+        print(
+            f"{'row dicts, flat':<28} {write:>9.1f} "
+            f"{directory_size(legacy_uri) / 2**20:>9.1f} {'-':>9} "
+            f"{latency * 1000:>9.2f} {1.0:>8.3f}"
+        )
+
+        configurations = [
+            ("arrow float32, flat", {}),
+            ("float32, IVF_PQ", {"index_type": "IVF_PQ"}),
+            ("float32, IVF_PQ, refine 5", {"index_type": "IVF_PQ", "refine_factor": 5}),
+            ("float32, IVF_HNSW_SQ", {"index_type": "IVF_HNSW_SQ"}),
+        ]
+        for label, kwargs in configurations:
+            db_uri = f"{root}/{label.replace(' ', '_').replace(',', '')}"
+            start = time.perf_counter()
+            store = write_store(
+                db_uri,
+                batches,
+                index_min_rows=0,
+                index_num_partitions=args.partitions,
+                nprobes=args.nprobes,
+                **kwargs,
+            )
+            write = time.perf_counter() - start
+            start = time.perf_counter()
+            store.create_index()
+            build = time.perf_counter() - start
+            latency, results = run_queries(store, queries, args.k)
+            recall = np.mean([
+                len(found & expected) / args.k
+                for found, expected in zip(results, exact, strict=True)
+            ])
+            print(
+                f"{label:<28} {write:>9.1f} {directory_size(db_uri) / 2**20:>9.1f} "
+                f"{build if kwargs else 0:>9.1f} {latency * 1000:>9.2f} {recall:>8.3f}"
+            )
+            shutil.rmtree(db_uri)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""Benchmark relationship selection for local search on a synthetic graph.
+
+Run with `python -m tests.benchmarks.relationship_filtering --edges 1000000`.
+Compares the full-scan selection with the adjacency-indexed selection used by
+LocalSearchMixedContext.
+"""
+
+import argparse
+import random
+import time
+
+from graphrag.data_model.entity import Entity
+from graphrag.data_model.relationship import Relationship
+from graphrag.query.context_builder.local_context import _filter_relationships
+from graphrag.query.input.retrieval.relationships import (
+    RelationshipIndex,
+    get_candidate_relationships,
+)
+
+
+def build_graph(
+    num_entities: int, num_edges: int, seed: int
+) -> tuple[list[Entity], list[Relationship]]:
+    rng = random.Random(seed)
+    entities = [
+        Entity(id=str(i), short_id=str(i), title=f"entity_{i}")
+        for i in range(num_entities)
+    ]
+    relationships = [
+        Relationship(
+            id=str(i),
+            short_id=str(i),
+            source=f"entity_{rng.randrange(num_entities)}",
+            target=f"entity_{rng.randrange(num_entities)}",
+            rank=rng.randrange(100),
+        )
+        for i in range(num_edges)
+    ]
+    return entities, relationships
+
+
+def timed(label: str, repeats: int, func) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    elapsed = (time.perf_counter() - start) / repeats
+    print(f"{label:<40} {elapsed * 1000:>10.2f} ms")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entities", type=int, default=100_000)
+    parser.add_argument("--edges", type=int, default=1_000_000)
+    parser.add_argument("--selected", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    entities, relationships = build_graph(args.entities, args.edges, args.seed)
+    selected = random.Random(args.seed).sample(entities, args.selected)
+    print(
+        f"{args.edges} relationships, {args.entities} entities, "
+        f"{args.selected} selected entities"
+    )
+
+    start = time.perf_counter()
+    index = RelationshipIndex(relationships)
+    print(
+        f"{'build index (once per engine)':<40} {(time.perf_counter() - start) * 1000:>10.2f} ms"
+    )
+
+    scan = timed(
+        "filter relationships (scan)",
+        args.repeats,
+        lambda: _filter_relationships(selected, relationships),
+    )
+    indexed = timed(
+        "filter relationships (indexed)",
+        args.repeats,
+        lambda: _filter_relationships(
+            selected, relationships, relationship_index=index
+        ),
+    )
+    timed(
+        "candidate relationships (scan)",
+        args.repeats,
+        lambda: get_candidate_relationships(selected, relationships),
+    )
+    timed(
+        "candidate relationships (indexed)",
+        args.repeats,
+        lambda: get_candidate_relationships(
+            selected, relationships, relationship_index=index
+        ),
+    )
+    print(f"speedup for filtering: {scan / indexed:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
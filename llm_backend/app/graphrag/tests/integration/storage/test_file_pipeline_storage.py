@@ -10,6 +10,7 @@ from pathlib import Path
 from graphrag.storage.file_pipeline_storage import (
     FilePipelineStorage,
 )
+from graphrag.storage.memory_pipeline_storage import MemoryPipelineStorage
 
 __dirname__ = os.path.dirname(__file__)
 
@@ -64,3 +65,28 @@ async def test_child():
     await storage.delete("test.txt")
     output = await storage.get("test.txt")
     assert output is None
+
+
+async def test_copy(tmp_path):
+    storage = FilePipelineStorage(str(tmp_path / "output"))
+    snapshot = FilePipelineStorage(str(tmp_path / "previous"))
+    await storage.set("table.parquet", b"previous")
+    await storage.copy("table.parquet", snapshot)
+
+    source = tmp_path / "output" / "table.parquet"
+    copy = tmp_path / "previous" / "table.parquet"
+    assert copy.stat().st_ino == source.stat().st_ino
+
+    # writing the key again leaves the snapshot untouched
+    await storage.set("table.parquet", b"updated")
+    assert await snapshot.get("table.parquet", as_bytes=True) == b"previous"
+    assert await storage.get("table.parquet", as_bytes=True) == b"updated"
+    assert sorted(path.name for path in (tmp_path / "output").iterdir()) == [
+        "table.parquet"
+    ]
+
+    memory = MemoryPipelineStorage()
+    await storage.copy("table.parquet", memory)
+    assert await memory.get("table.parquet") == b"updated"
+    await memory.copy("table.parquet", snapshot)
+    assert await snapshot.get("table.parquet", as_bytes=True) == b"updated"
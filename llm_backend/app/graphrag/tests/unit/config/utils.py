@@ -173,6 +173,7 @@ def assert_input_configs(actual: InputConfig, expected: InputConfig) -> None:
     assert actual.text_column == expected.text_column
     assert actual.title_column == expected.title_column
     assert actual.metadata == expected.metadata
+    assert actual.concurrent_files == expected.concurrent_files
 
 
 def assert_embed_graph_configs(
@@ -339,6 +340,9 @@ def assert_global_search_configs(
     assert actual.map_max_tokens == expected.map_max_tokens
     assert actual.reduce_max_tokens == expected.reduce_max_tokens
     assert actual.concurrency == expected.concurrency
+    assert actual.early_reduce_key_points == expected.early_reduce_key_points
+    assert actual.early_reduce_min_score == expected.early_reduce_min_score
+    assert actual.map_timeout == expected.map_timeout
     assert actual.dynamic_search_llm == expected.dynamic_search_llm
     assert actual.dynamic_search_threshold == expected.dynamic_search_threshold
     assert actual.dynamic_search_keep_parent == expected.dynamic_search_keep_parent
@@ -0,0 +1,122 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+import asyncio
+
+import pytest
+
+from graphrag.cache.factory import CacheFactory
+from graphrag.cache.sqlite_pipeline_cache import (
+    SQLiteCacheStore,
+    SQLitePipelineCache,
+)
+from graphrag.config.enums import CacheType
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+async def test_set_get_roundtrip(tmp_path, compression):
+    cache = SQLitePipelineCache(
+        SQLiteCacheStore(tmp_path, shards=2, compression=compression)
+    )
+    await cache.set("key", {"text": "结果", "n": 1}, debug_data={"input": "x"})
+    assert await cache.has("key")
+    assert await cache.get("key") == {"text": "结果", "n": 1}
+    assert await cache.get("missing") is None
+    assert not await cache.has("missing")
+
+    await cache.delete("key")
+    assert await cache.get("key") is None
+
+
+async def test_entries_are_persisted_in_batches(tmp_path):
+    store = SQLiteCacheStore(tmp_path, write_batch_size=3)
+    cache = SQLitePipelineCache(store)
+    for i in range(5):
+        await cache.set(f"key{i}", i)
+
+    # the first batch is written, the rest is still buffered but readable
+    reopened = SQLitePipelineCache(SQLiteCacheStore(tmp_path))
+    assert [await reopened.get(f"key{i}") for i in range(5)] == [0, 1, 2, None, None]
+    assert await cache.get("key4") == 4
+
+    store.flush()
+    assert await reopened.get("key4") == 4
+
+
+async def test_child_namespaces_and_clear(tmp_path):
+    cache = SQLitePipelineCache(SQLiteCacheStore(tmp_path))
+    child = cache.child("extract_graph")
+    other = cache.child("extractXgraph")
+    await cache.set("key", "root")
+    await child.set("key", "child")
+    await child.child("nested").set("key", "nested")
+    await other.set("key", "other")
+    cache.flush()
+
+    assert await cache.get("key") == "root"
+    assert await child.get("key") == "child"
+
+    await child.clear()
+    assert await child.get("key") is None
+    assert await child.child("nested").get("key") is None
+    assert await other.get("key") == "other"
+    assert await cache.get("key") == "root"
+
+    await cache.clear()
+    assert await other.get("key") is None
+
+
+async def test_reads_entries_written_with_other_compression(tmp_path):
+    plain = SQLitePipelineCache(SQLiteCacheStore(tmp_path))
+    await plain.set("key", "value")
+    plain.flush()
+
+    compressed = SQLitePipelineCache(SQLiteCacheStore(tmp_path, compression="zlib"))
+    assert await compressed.get("key") == "value"
+
+
+async def test_factory_creates_shared_store(tmp_path):
+    kwargs = {"type": CacheType.sqlite, "base_dir": "cache", "shards": 1}
+    first = CacheFactory.create_cache(CacheType.sqlite, str(tmp_path), kwargs)
+    second = CacheFactory.create_cache(CacheType.sqlite, str(tmp_path), kwargs)
+    assert isinstance(first, SQLitePipelineCache)
+    assert (tmp_path / "cache" / "cache-0.db").exists()
+
+    # buffered writes are visible through the other cache as they share a store
+    await first.set("key", "value")
+    assert await second.get("key") == "value"
+
+
+async def test_corrupt_zstd_entry_is_a_miss(tmp_path):
+    store = SQLiteCacheStore(tmp_path, compression="zstd")
+    cache = SQLitePipelineCache(store)
+    await cache.set("key", "value")
+    store.flush()
+    # keep the zstd marker byte but break the frame
+    store._connections[0].execute("UPDATE cache SET value = X'73FFFF'")  # noqa: SLF001
+    store._connections[0].commit()  # noqa: SLF001
+
+    assert await cache.get("key") is None
+    assert not await cache.has("key")
+
+
+def test_timed_flush_survives_closed_loop(tmp_path):
+    store = SQLiteCacheStore(tmp_path, flush_interval=0.01)
+    cache = SQLitePipelineCache(store)
+    reopened = SQLitePipelineCache(SQLiteCacheStore(tmp_path))
+
+    # the first loop closes before its flush timer fires
+    asyncio.run(cache.set("first", 1))
+
+    async def set_and_wait():
+        await cache.set("second", 2)
+        await asyncio.sleep(0.2)
+
+    asyncio.run(set_and_wait())
+    assert asyncio.run(reopened.get("first")) == 1
+    assert asyncio.run(reopened.get("second")) == 2
+
+
+def test_unknown_compression(tmp_path):
+    with pytest.raises(ValueError, match="Unknown cache compression"):
+        SQLiteCacheStore(tmp_path, compression="lz4")
@@ -0,0 +1,86 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+import asyncio
+import re
+
+import pandas as pd
+
+from graphrag.config.enums import InputFileType, InputType
+from graphrag.config.models.input_config import InputConfig
+from graphrag.index.input.util import load_files
+from graphrag.storage.file_pipeline_storage import FilePipelineStorage
+
+BASE_DIR = "tests/unit/indexing/input/data/multiple-csvs"
+
+
+def _config(concurrent_files: int) -> InputConfig:
+    return InputConfig(
+        type=InputType.file,
+        file_type=InputFileType.csv,
+        file_pattern=".*\\.csv$",
+        base_dir=BASE_DIR,
+        concurrent_files=concurrent_files,
+    )
+
+
+async def _load(concurrent_files: int, fail: str | None = None):
+    storage = FilePipelineStorage(root_dir=BASE_DIR)
+    files = sorted(
+        name for name, _ in storage.find(re.compile(_config(1).file_pattern))
+    )
+    in_flight, peak = [0], [0]
+
+    async def loader(path: str, _group: dict | None) -> pd.DataFrame:
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        # the first files take the longest, so they finish last
+        await asyncio.sleep(0.01 * (len(files) - files.index(path)))
+        in_flight[0] -= 1
+        if path == fail:
+            msg = "boom"
+            raise ValueError(msg)
+        return pd.DataFrame([{"path": path}])
+
+    documents = await load_files(loader, _config(concurrent_files), storage, None)
+    return documents, peak[0]
+
+
+async def test_load_files_concurrently_in_order():
+    documents, peak = await _load(concurrent_files=3)
+    serial, serial_peak = await _load(concurrent_files=1)
+
+    assert peak == 3
+    assert serial_peak == 1
+    assert documents["path"].tolist() == serial["path"].tolist()
+
+
+async def test_load_files_skips_failed_files():
+    documents, _ = await _load(concurrent_files=3, fail="input2.csv")
+    serial, _ = await _load(concurrent_files=1)
+
+    expected = [path for path in serial["path"] if path != "input2.csv"]
+    assert documents["path"].tolist() == expected
+
+
+async def test_load_files_bounds_unconsumed_files(tmp_path):
+    for i in range(8):
+        (tmp_path / f"input{i}.csv").write_text("text\nhello\n")
+    config = _config(concurrent_files=2)
+    config.base_dir = str(tmp_path)
+    started: list[str] = []
+
+    async def loader(path: str, _group: dict | None) -> pd.DataFrame:
+        started.append(path)
+        if path == started[0]:
+            # the other files finish while the first one is still loading
+            await asyncio.sleep(0.05)
+            loaded_before_first.append(len(started))
+        return pd.DataFrame([{"path": path}])
+
+    loaded_before_first: list[int] = []
+    storage = FilePipelineStorage(root_dir=str(tmp_path))
+    documents = await load_files(loader, config, storage, None)
+
+    assert loaded_before_first == [4]
+    assert documents["path"].tolist() == started
@@ -89,6 +89,29 @@ class TestRunTokens:
         assert len(chunks) > 0
         assert "123" in chunks[0].text_chunk
 
+    @patch("graphrag.index.operations.chunk_text.strategies.ThreadPoolExecutor")
+    @patch("tiktoken.get_encoding")
+    def test_one_pool_per_call(self, mock_get_encoding, mock_pool):
+        """Every encode batch of a call shares one thread pool."""
+        mock_encoder = Mock()
+        mock_encoder.encode.side_effect = lambda x: list(x.encode())
+        mock_encoder.decode.side_effect = lambda x: bytes(x).decode()
+        mock_get_encoding.return_value = mock_encoder
+        executor = mock_pool.return_value.__enter__.return_value
+        executor.map.side_effect = map
+
+        input = [f"document {i}." for i in range(2500)]
+        config = ChunkingConfig(size=50, overlap=5, encoding_model="fake-encoding")
+        chunks = list(run_tokens(input, config, Mock()))
+
+        assert "".join(c.text_chunk for c in chunks).startswith("document 0.")
+        mock_pool.assert_called_once()
+        assert executor.map.call_count == 3
+
+        mock_pool.reset_mock()
+        list(run_tokens(["single document."], config, Mock()))
+        mock_pool.assert_not_called()
+
 
 @patch("tiktoken.get_encoding")
 def test_get_encoding_fn_encode(mock_get_encoding):
@@ -162,6 +162,38 @@ def test_split_multiple_texts_on_tokens():
     mock_tick.assert_called()
 
 
+def test_split_multiple_texts_on_tokens_source_docs():
+    texts = ["abcdefgh", "", "ij", "", "", "klmnopqrstu", "vw"]
+    mocked_tokenizer = MockTokenizer()
+    mock_tick = MagicMock()
+
+    def encode_batch(texts):
+        return [mocked_tokenizer.encode(text) for text in texts]
+
+    for batch in (None, encode_batch):
+        tokenizer = Tokenizer(
+            chunk_overlap=2,
+            tokens_per_chunk=6,
+            decode=mocked_tokenizer.decode,
+            encode=lambda text: mocked_tokenizer.encode(text),
+            encode_batch=batch,
+        )
+        result = split_multiple_texts_on_tokens(texts, tokenizer, tick=mock_tick)
+
+        assert [
+            (chunk.text_chunk, chunk.source_doc_indices, chunk.n_tokens)
+            for chunk in result
+        ] == [
+            ("abcdef", [0], 6),
+            ("efghij", [0, 2], 6),
+            ("ijklmn", [2, 5], 6),
+            ("mnopqr", [5], 6),
+            ("qrstuv", [5, 6], 6),
+            ("uvw", [5, 6], 3),
+        ]
+    assert split_multiple_texts_on_tokens(["", ""], tokenizer, tick=mock_tick) == []
+
+
 def test_split_single_text_on_tokens_no_overlap():
     text = "This is a test text, meaning to be taken seriously by this test only."
     enc = tiktoken.get_encoding("cl100k_base")
@@ -0,0 +1,119 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from graphrag.callbacks.noop_workflow_callbacks import NoopWorkflowCallbacks
+from graphrag.config.enums import AsyncType
+from graphrag.index.utils.derive_from_rows import (
+    ParallelizationError,
+    derive_from_rows,
+)
+
+
+class RecordingCallbacks(NoopWorkflowCallbacks):
+    def __init__(self):
+        self.logs = []
+
+    def log(self, message, details=None):
+        self.logs.append((message, details))
+
+
+def square(row):
+    return row["value"] ** 2
+
+
+async def test_chunked_preserves_order_and_bounds_concurrency():
+    input = pd.DataFrame({"value": range(250)})
+    in_flight = 0
+    max_in_flight = 0
+
+    async def transform(row):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        return row["value"] * 2
+
+    callbacks = RecordingCallbacks()
+    results = await derive_from_rows(
+        input,
+        transform,
+        callbacks,
+        num_threads=4,
+        async_type=AsyncType.Chunked,
+        chunk_size=100,
+    )
+
+    assert results == [value * 2 for value in range(250)]
+    assert max_in_flight <= 4
+    assert [message for message, _ in callbacks.logs] == [
+        "derive_from_rows chunk queued",
+        "derive_from_rows chunk queued",
+        "derive_from_rows chunk queued",
+        "derive_from_rows completed",
+    ]
+    assert callbacks.logs[-1][1]["completed_rows"] == 250
+
+
+async def test_chunked_runs_sync_transforms_on_executor():
+    input = pd.DataFrame({"value": range(20)})
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = await derive_from_rows(
+            input,
+            square,
+            async_type=AsyncType.Chunked,
+            chunk_size=7,
+            executor=executor,
+        )
+    assert results == [value**2 for value in range(20)]
+
+
+async def test_chunked_raises_after_all_rows():
+    input = pd.DataFrame({"value": range(10)})
+    seen = []
+
+    async def transform(row):
+        await asyncio.sleep(0)
+        seen.append(row["value"])
+        if row["value"] % 3 == 0:
+            msg = "bad row"
+            raise ValueError(msg)
+        return row["value"]
+
+    with pytest.raises(ParallelizationError, match="4 Errors"):
+        await derive_from_rows(input, transform, async_type=AsyncType.Chunked)
+    assert sorted(seen) == list(range(10))
+
+
+class WorkerKilled(BaseException):
+    pass
+
+
+async def test_chunked_cancels_producer_when_workers_die():
+    input = pd.DataFrame({"value": range(100)})
+
+    async def transform(row):
+        await asyncio.sleep(0)
+        raise WorkerKilled
+
+    with pytest.raises(WorkerKilled):
+        await asyncio.wait_for(
+            derive_from_rows(
+                input, transform, num_threads=2, async_type=AsyncType.Chunked
+            ),
+            timeout=5,
+        )
+    assert len(asyncio.all_tasks()) == 1
+
+
+async def test_chunked_empty_input():
+    results = await derive_from_rows(
+        pd.DataFrame({"value": []}), square, async_type=AsyncType.Chunked
+    )
+    assert results == []
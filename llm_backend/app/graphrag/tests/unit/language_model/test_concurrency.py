@@ -0,0 +1,62 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+from types import SimpleNamespace
+
+from openai.types import CreateEmbeddingResponse, Embedding
+from openai.types.create_embedding_response import Usage
+
+from graphrag.cache.memory_pipeline_cache import InMemoryCache
+from graphrag.config.enums import ModelType
+from graphrag.config.models.language_model_config import LanguageModelConfig
+from graphrag.language_model.concurrency import LLMConcurrencyBudget
+from graphrag.language_model.providers.fnllm.models import OpenAIEmbeddingFNLLM
+from graphrag.language_model.rate_limiter import get_rate_limiter
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, input, **kwargs):
+        self.calls += 1
+        return CreateEmbeddingResponse(
+            data=[
+                Embedding(embedding=[1.0, 0.0], index=i, object="embedding")
+                for i in range(len(input))
+            ],
+            model="text-embedding-3-small",
+            object="list",
+            usage=Usage(prompt_tokens=3, total_tokens=3),
+        )
+
+
+async def test_cache_hits_skip_the_shared_rate_limits():
+    config = LanguageModelConfig(
+        type=ModelType.OpenAIEmbedding,
+        api_key="test",
+        api_base="http://cache-hits.test",
+        model="text-embedding-3-small",
+        encoding_model="cl100k_base",
+        max_retries=1,
+    )
+    # only the shared limiter is limited, fnllm's own limiter would wait on its own
+    limiter = get_rate_limiter(config.api_base, config.model, 6, 100_000)
+    model = OpenAIEmbeddingFNLLM(name="test", config=config, cache=InMemoryCache())
+    embeddings = FakeEmbeddings()
+    model.model._client = SimpleNamespace(embeddings=embeddings)  # noqa: SLF001
+    budget = LLMConcurrencyBudget()
+    budget.activate()
+
+    assert await model.aembed("hello") == [1.0, 0.0]
+    requests = limiter._requests  # noqa: SLF001
+    tokens = limiter._tokens  # noqa: SLF001
+    for _ in range(5):
+        assert await model.aembed("hello") == [1.0, 0.0]
+
+    assert embeddings.calls == 1
+    # nothing was taken for the cached calls, and the budget slot was given back
+    assert limiter._requests >= requests  # noqa: SLF001
+    assert limiter._tokens >= tokens  # noqa: SLF001
+    assert limiter._requests < 6  # noqa: SLF001
+    assert budget.semaphore(config)._value == config.concurrent_requests  # noqa: SLF001
@@ -0,0 +1,114 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+import asyncio
+import time
+
+import pytest
+
+from graphrag.index.utils.rate_limiter import RateLimiter
+from graphrag.language_model.rate_limiter import (
+    RequestPriority,
+    TokenBucketLimiter,
+    get_rate_limiter,
+    set_request_priority,
+)
+
+
+async def _drain(limiter: TokenBucketLimiter, requests: int) -> None:
+    for _ in range(requests):
+        await limiter.acquire()
+
+
+async def test_request_limit():
+    # a bucket of 600 requests per minute refills one request every 0.1s
+    limiter = TokenBucketLimiter(requests_per_minute=600)
+    await _drain(limiter, 599)
+    start = time.monotonic()
+    await asyncio.gather(*[limiter.acquire() for _ in range(4)])
+    assert time.monotonic() - start == pytest.approx(0.3, abs=0.1)
+
+
+async def test_token_limit_and_settle():
+    limiter = TokenBucketLimiter(tokens_per_minute=60_000)
+    reservation = await limiter.acquire(59_000)
+    reservation.settle(1_000)
+    start = time.monotonic()
+    # the unused tokens were returned, so this fits without waiting
+    await limiter.acquire(50_000)
+    assert time.monotonic() - start < 0.05
+
+    # requests larger than the bucket wait for it to refill completely
+    limiter = TokenBucketLimiter(tokens_per_minute=6_000)
+    await limiter.acquire(10)
+    start = time.monotonic()
+    await limiter.acquire(1_000_000)
+    assert time.monotonic() - start == pytest.approx(0.1, abs=0.05)
+
+
+async def test_priority_order():
+    limiter = TokenBucketLimiter(requests_per_minute=1200)
+    await _drain(limiter, 1200)
+    served = []
+
+    async def request(name: str, priority: RequestPriority | None = None):
+        await limiter.acquire(priority=priority)
+        served.append(name)
+
+    async def interactive(name: str):
+        await asyncio.sleep(0.01)
+        await request(name)
+
+    async def background(name: str):
+        set_request_priority(RequestPriority.BACKGROUND)
+        await request(name)
+
+    await asyncio.gather(
+        background("b1"),
+        background("b2"),
+        background("b3"),
+        interactive("i1"),
+        request("b4", RequestPriority.BACKGROUND),
+    )
+    # the interactive request arrives while b1 waits and overtakes the queue
+    assert served == ["i1", "b1", "b2", "b3", "b4"]
+
+
+async def test_cancelled_request_leaves_queue():
+    limiter = TokenBucketLimiter(requests_per_minute=60)
+    await _drain(limiter, 60)
+    task = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert limiter._queue == []  # noqa: SLF001
+
+
+def test_acquire_sync():
+    limiter = TokenBucketLimiter(requests_per_minute=600)
+    for _ in range(600):
+        assert limiter.acquire_sync(blocking=False) is not None
+    # the bucket is empty, a non-blocking request is refused right away
+    assert limiter.acquire_sync(blocking=False) is None
+    start = time.monotonic()
+    assert limiter.acquire_sync() is not None
+    assert time.monotonic() - start == pytest.approx(0.1, abs=0.05)
+
+
+async def test_rate_limiter_burst():
+    limiter = RateLimiter(rate=5, per=1)
+    start = time.monotonic()
+    for _ in range(6):
+        await limiter.acquire()
+    # the bucket holds `rate` acquisitions, the sixth waits for a refill
+    assert time.monotonic() - start == pytest.approx(0.2, abs=0.1)
+
+
+def test_endpoint_limiters_are_shared():
+    limiter = get_rate_limiter("http://endpoint/v1/", "model", 100, 0)
+    assert get_rate_limiter("http://endpoint/v1", "model", 0, 5000) is limiter
+    assert get_rate_limiter("http://endpoint/v1", "model", 200, 10000) is limiter
+    assert limiter.requests_per_minute == 100
+    assert limiter.tokens_per_minute == 5000
+    assert get_rate_limiter("http://endpoint/v1", "other") is not limiter
@@ -0,0 +1,101 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+import pandas as pd
+
+from graphrag.data_model.community_report import CommunityReport
+from graphrag.data_model.entity import Entity
+from graphrag.index.operations.compute_token_counts import compute_token_counts
+from graphrag.query.context_builder.community_context import build_community_context
+from graphrag.query.context_builder.local_context import build_entity_context
+from graphrag.query.input.loaders.dfs import read_community_reports
+from graphrag.query.llm.text_utils import num_row_tokens, num_tokens
+
+
+def _reports(**kwargs) -> list[CommunityReport]:
+    return [
+        CommunityReport(
+            id=str(i),
+            short_id=str(i),
+            title=f"Community {i}",
+            community_id=str(i),
+            summary=f"Community {i} is about topic {i}. " * 20,
+            **kwargs,
+        )
+        for i in range(10)
+    ]
+
+
+def test_row_tokens_use_stored_counts():
+    rows = [["1", "Entity", "A long description of the entity."], ["2", "Other", ""]]
+    exact = [num_tokens("|".join(row) + "\n") for row in rows]
+    assert num_row_tokens(rows, "|") == exact
+
+    stored = [num_tokens(rows[0][2]), None]
+    estimated = num_row_tokens(rows, "|", text_column=2, text_tokens=stored)
+    assert abs(estimated[0] - exact[0]) <= 1
+    assert estimated[1] == exact[1]
+
+    # the stored count is trusted rather than encoding the text again
+    assert num_row_tokens(rows, "|", text_column=2, text_tokens=[1000, None])[0] > 1000
+
+
+def test_community_context_uses_stored_counts():
+    reports = _reports()
+    text, _ = build_community_context(reports, shuffle_data=False, max_tokens=1000)
+    tokens = [num_tokens(report.summary) for report in reports]
+    counted = _reports()
+    for report, count in zip(counted, tokens, strict=True):
+        report.summary_tokens = count
+    counted_text, _ = build_community_context(
+        counted, shuffle_data=False, max_tokens=1000
+    )
+    assert counted_text == text
+
+    # reports over the budget by their stored counts are left out
+    inflated = _reports(summary_tokens=400)
+    text, records = build_community_context(
+        inflated, shuffle_data=False, max_tokens=1000
+    )
+    assert len(records["reports"]) == 2
+
+
+def test_entity_context_uses_stored_counts():
+    entities = [
+        Entity(
+            id=str(i),
+            short_id=str(i),
+            title=f"Entity {i}",
+            description="description",
+            description_tokens=300,
+        )
+        for i in range(5)
+    ]
+    _, records = build_entity_context(entities, max_tokens=1000)
+    assert len(records) == 3
+
+
+def test_token_counts_are_loaded_with_reports():
+    reports = pd.DataFrame({
+        "id": ["1", "2"],
+        "community": [1, 2],
+        "title": ["a", "b"],
+        "summary": ["short summary", "a somewhat longer summary text"],
+        "full_content": ["content", "more content"],
+        "rank": [1.0, 2.0],
+    })
+    compute_token_counts(reports, ["summary", "full_content"])
+    assert reports["summary_tokens"].tolist() == [
+        num_tokens("short summary"),
+        num_tokens("a somewhat longer summary text"),
+    ]
+
+    loaded = read_community_reports(reports)
+    assert [report.summary_tokens for report in loaded] == reports[
+        "summary_tokens"
+    ].tolist()
+    assert loaded[0].full_content_tokens == num_tokens("content")
+
+    # tables from older indexes have no counts
+    older = read_community_reports(reports.drop(columns=["summary_tokens"]))
+    assert older[0].summary_tokens is None
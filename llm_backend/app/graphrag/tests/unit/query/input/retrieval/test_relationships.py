@@ -0,0 +1,99 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+from graphrag.data_model.entity import Entity
+from graphrag.data_model.relationship import Relationship
+from graphrag.query.context_builder.local_context import _filter_relationships
+from graphrag.query.input.retrieval.relationships import (
+    RelationshipIndex,
+    get_candidate_relationships,
+    get_in_network_relationships,
+    get_out_network_relationships,
+)
+
+EDGES = [
+    ("A", "B", 3),
+    ("B", "C", 5),
+    ("C", "A", 1),
+    ("A", "X", 2),
+    ("Y", "A", 2),
+    ("B", "X", 4),
+    ("X", "Z", 9),
+    ("Z", "Y", 7),
+]
+
+
+def _relationships() -> list[Relationship]:
+    return [
+        Relationship(
+            id=f"r{i}",
+            short_id=str(i),
+            source=source,
+            target=target,
+            rank=rank,
+        )
+        for i, (source, target, rank) in enumerate(EDGES)
+    ]
+
+
+def _entities(*titles: str) -> list[Entity]:
+    return [Entity(id=title, short_id=title, title=title) for title in titles]
+
+
+def _ids(relationships: list[Relationship]) -> list[str]:
+    return [relationship.id for relationship in relationships]
+
+
+def test_relationship_index_positions():
+    index = RelationshipIndex(_relationships())
+    assert len(index) == len(EDGES)
+    assert sorted(index.get_outgoing(["A"])) == [0, 3]
+    assert sorted(index.get_incoming(["A"])) == [2, 4]
+    assert index.get_outgoing(["missing"]) == []
+    assert "missing" not in index.outgoing
+    assert _ids(index.get_relationships({4, 0, 3})) == ["r0", "r3", "r4"]
+
+
+def test_indexed_selection_matches_scan():
+    relationships = _relationships()
+    index = RelationshipIndex(relationships)
+    for selected in [("A",), ("A", "B"), ("A", "B", "C"), ("X", "Y"), ("missing",)]:
+        entities = _entities(*selected)
+        assert _ids(get_in_network_relationships(entities, relationships)) == _ids(
+            get_in_network_relationships(
+                entities, relationships, relationship_index=index
+            )
+        )
+        assert _ids(get_out_network_relationships(entities, relationships)) == _ids(
+            get_out_network_relationships(
+                entities, relationships, relationship_index=index
+            )
+        )
+        assert _ids(get_candidate_relationships(entities, relationships)) == _ids(
+            get_candidate_relationships(
+                entities, relationships, relationship_index=index
+            )
+        )
+
+
+def test_filter_relationships_prioritizes_mutual_links():
+    relationships = _relationships()
+    entities = _entities("A", "B")
+    expected = ["r0", "r1", "r5", "r3", "r2", "r4"]
+    assert (
+        _ids(_filter_relationships(entities, relationships, top_k_relationships=10))
+        == expected
+    )
+    assert (
+        _ids(
+            _filter_relationships(
+                entities,
+                relationships,
+                top_k_relationships=10,
+                relationship_index=RelationshipIndex(relationships),
+            )
+        )
+        == expected
+    )
+    links = {rel.id: rel.attributes["links"] for rel in relationships if rel.attributes}
+    assert links == {"r1": 2, "r2": 2, "r3": 2, "r4": 1, "r5": 2}
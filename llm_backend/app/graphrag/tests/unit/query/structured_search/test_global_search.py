@@ -0,0 +1,89 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+import asyncio
+import json
+
+from graphrag.language_model.response.base import BaseModelOutput, BaseModelResponse
+from graphrag.prompts.query.global_search_reduce_system_prompt import NO_DATA_ANSWER
+from graphrag.query.context_builder.builders import (
+    ContextBuilderResult,
+    GlobalContextBuilder,
+)
+from graphrag.query.structured_search.global_search.search import GlobalSearch
+
+# batch name -> (seconds until the map response, score of its key point)
+BATCHES = {"slow": (0.5, 90), "empty": (0.01, 0), "fast": (0.02, 80), "low": (0.03, 10)}
+
+
+class BatchContextBuilder(GlobalContextBuilder):
+    async def build_context(self, query, conversation_history=None, **kwargs):
+        return ContextBuilderResult(context_chunks=list(BATCHES), context_records={})
+
+
+class DelayedChatModel:
+    def __init__(self):
+        self.started = []
+        self.reduce_prompts = []
+
+    async def achat(self, prompt, history=None, **kwargs):
+        batch = history[0]["content"]
+        self.started.append(batch)
+        delay, score = BATCHES[batch]
+        await asyncio.sleep(delay)
+        content = json.dumps({"points": [{"description": batch, "score": score}]})
+        return BaseModelResponse(output=BaseModelOutput(content=content))
+
+    async def achat_stream(self, prompt, history=None, **kwargs):
+        self.reduce_prompts.append(history[0]["content"])
+        for token in ("an", "swer"):
+            yield token
+
+
+async def _stream(model: DelayedChatModel, **kwargs) -> str:
+    search = GlobalSearch(
+        model=model,  # type: ignore
+        context_builder=BatchContextBuilder(),
+        map_system_prompt="{context_data}",
+        reduce_system_prompt="{report_data}",
+        **kwargs,
+    )
+    return "".join([token async for token in search.stream_search("query")])
+
+
+async def test_stream_search_waits_for_all_batches():
+    model = DelayedChatModel()
+    assert await _stream(model) == "answer"
+    (report_data,) = model.reduce_prompts
+    analysts = [line for line in report_data.split("\n") if line.startswith("----")]
+    # ranked by score, numbered by batch, zero-score points dropped
+    assert analysts == ["----Analyst 1----", "----Analyst 3----", "----Analyst 4----"]
+
+
+async def test_stream_search_reduces_early():
+    model = DelayedChatModel()
+    start = asyncio.get_running_loop().time()
+    await _stream(model, early_reduce_key_points=1, early_reduce_min_score=50)
+    assert asyncio.get_running_loop().time() - start < 0.4
+    assert "fast" in model.reduce_prompts[0]
+    assert "slow" not in model.reduce_prompts[0]
+
+
+async def test_stream_search_map_timeout():
+    model = DelayedChatModel()
+    await _stream(model, map_timeout=0.1)
+    assert "low" in model.reduce_prompts[0]
+    assert "slow" not in model.reduce_prompts[0]
+
+    model = DelayedChatModel()
+    assert await _stream(model, map_timeout=0.015) == NO_DATA_ANSWER
+    assert model.reduce_prompts == []
+
+
+async def test_stream_search_cancels_queued_batches():
+    model = DelayedChatModel()
+    await _stream(
+        model, concurrent_coroutines=1, early_reduce_key_points=1, map_timeout=0.2
+    )
+    # the timeout expires during the first batch, the others never reach the model
+    assert model.started == ["slow"]
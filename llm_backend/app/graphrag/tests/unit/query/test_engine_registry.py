@@ -0,0 +1,48 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+import os
+import shutil
+from pathlib import Path
+
+from graphrag.query.engine_registry import QueryEngineRegistry, get_index_version
+
+FIXTURE = Path(__file__).parents[1] / "config/fixtures/minimal_config/settings.yaml"
+
+
+def _project(tmp_path: Path) -> Path:
+    shutil.copy(FIXTURE, tmp_path / "settings.yaml")
+    return tmp_path
+
+
+def test_config_is_cached_until_settings_change(tmp_path, monkeypatch):
+    monkeypatch.setenv("CUSTOM_API_KEY", "test")
+    root = _project(tmp_path)
+    registry = QueryEngineRegistry()
+
+    _, config, version = registry._resolve_config(root, None)  # noqa: SLF001
+    _, cached, cached_version = registry._resolve_config(root, None)  # noqa: SLF001
+    assert cached is config
+    assert cached_version == version
+
+    settings = root / "settings.yaml"
+    settings.write_text(settings.read_text() + "\n")
+    stat = settings.stat()
+    os.utime(settings, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    _, reloaded, reloaded_version = registry._resolve_config(root, None)  # noqa: SLF001
+    assert reloaded is not config
+    assert reloaded_version != version
+
+
+def test_index_version_tracks_output_tables(tmp_path, monkeypatch):
+    monkeypatch.setenv("CUSTOM_API_KEY", "test")
+    root = _project(tmp_path)
+    _, config, _ = QueryEngineRegistry()._resolve_config(root, None)  # noqa: SLF001
+    version = get_index_version(config)
+
+    output_dir = Path(config.output.base_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    (output_dir / "entities.parquet").write_bytes(b"x")
+
+    assert get_index_version(config) != version
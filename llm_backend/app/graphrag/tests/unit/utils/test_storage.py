@@ -0,0 +1,55 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+import pandas as pd
+
+from graphrag.storage.memory_pipeline_storage import MemoryPipelineStorage
+from graphrag.utils.storage import (
+    concat_table_to_storage,
+    load_column_from_storage,
+    load_table_from_storage,
+    write_table_to_storage,
+)
+
+
+def _table(start: int, stop: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "id": [str(i) for i in range(start, stop)],
+        "human_readable_id": range(start, stop),
+        "text_unit_ids": [[f"t{i}", f"t{i + 1}"] for i in range(start, stop)],
+        "attributes": [None] * (stop - start),
+    })
+
+
+async def test_concat_table_to_storage():
+    previous = MemoryPipelineStorage()
+    output = MemoryPipelineStorage()
+    await write_table_to_storage(_table(0, 5), "covariates", previous)
+
+    # reordered columns, and values in a column that only held nulls so far
+    delta = _table(5, 8)[["human_readable_id", "id", "text_unit_ids", "attributes"]]
+    delta["attributes"] = ["a", None, "b"]
+    await concat_table_to_storage(delta, "covariates", previous, output)
+
+    merged = await load_table_from_storage("covariates", output)
+    assert merged["id"].tolist() == [str(i) for i in range(8)]
+    assert merged["human_readable_id"].tolist() == list(range(8))
+    assert [list(ids) for ids in merged["text_unit_ids"]] == [
+        [f"t{i}", f"t{i + 1}"] for i in range(8)
+    ]
+    assert merged["attributes"].tolist() == [None] * 5 + ["a", None, "b"]
+    assert merged.index.equals(pd.RangeIndex(8))
+
+    ids = await load_column_from_storage("covariates", "human_readable_id", output)
+    assert ids.max() == 7
+
+
+async def test_concat_table_with_new_columns():
+    previous = MemoryPipelineStorage()
+    await write_table_to_storage(_table(0, 2), "covariates", previous)
+    delta = _table(2, 3).assign(extra="x")
+
+    await concat_table_to_storage(delta, "covariates", previous, previous)
+
+    merged = await load_table_from_storage("covariates", previous)
+    assert merged["extra"].tolist() == [None, None, "x"]
@@ -0,0 +1,166 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+import lancedb
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from graphrag.vector_stores.base import VectorStoreDocument
+from graphrag.vector_stores.lancedb import LanceDBVectorStore
+
+
+def _documents(vectors: np.ndarray, offset: int = 0) -> list[VectorStoreDocument]:
+    return [
+        VectorStoreDocument(
+            id=str(offset + i),
+            text=f"entity {offset + i}",
+            vector=vector.tolist(),
+            attributes={"title": f"entity {offset + i}"},
+        )
+        for i, vector in enumerate(vectors)
+    ]
+
+
+def _vectors(num_rows: int, seed: int = 0) -> np.ndarray:
+    vectors = np.random.default_rng(seed).standard_normal((num_rows, 16))
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _store(tmp_path, **kwargs) -> LanceDBVectorStore:
+    store = LanceDBVectorStore(collection_name="entities", **kwargs)
+    store.connect(db_uri=str(tmp_path))
+    return store
+
+
+def test_vectors_are_stored_as_fixed_size_float32(tmp_path):
+    vectors = _vectors(10)
+    store = _store(tmp_path)
+    store.load_documents(_documents(vectors))
+
+    vector_type = store.document_collection.schema.field("vector").type
+    assert vector_type == pa.list_(pa.float32(), 16)
+
+    results = store.similarity_search_by_vector(vectors[3].tolist(), k=2)
+    assert results[0].document.id == "3"
+    assert results[0].document.attributes == {"title": "entity 3"}
+    assert store.search_by_id("4").text == "entity 4"
+
+
+def test_append_keeps_existing_vector_type(tmp_path):
+    vectors = _vectors(10)
+    db = lancedb.connect(str(tmp_path))
+    db.create_table(
+        "entities",
+        data=pa.table({
+            "id": [str(i) for i in range(5)],
+            "text": [f"entity {i}" for i in range(5)],
+            "vector": pa.FixedSizeListArray.from_arrays(
+                pa.array(vectors[:5].ravel(), pa.float64()), 16
+            ),
+            "attributes": ["{}"] * 5,
+        }),
+    )
+
+    store = _store(tmp_path)
+    store.load_documents(_documents(vectors[5:], offset=5), overwrite=False)
+
+    assert store.document_collection.count_rows() == 10
+    assert store.document_collection.schema.field("vector").type == pa.list_(
+        pa.float64(), 16
+    )
+    assert (
+        store.similarity_search_by_vector(vectors[7].tolist(), k=1)[0].document.id
+        == "7"
+    )
+
+
+def test_empty_overwrite_then_append_is_indexable(tmp_path):
+    vectors = _vectors(300)
+    store = _store(tmp_path, index_type="ivf_pq", index_num_partitions=2)
+    store.load_documents(_documents(vectors[:10]))
+    store.load_documents([], overwrite=True)
+    assert "entities" not in store.db_connection.table_names()
+    assert store.similarity_search_by_vector(vectors[0].tolist(), k=2) == []
+    assert store.search_by_id("0").text is None
+
+    store.load_documents(_documents(vectors[:200]), overwrite=False)
+    store.load_documents(_documents(vectors[200:], offset=200), overwrite=False)
+    vector_type = store.document_collection.schema.field("vector").type
+    assert vector_type == pa.list_(pa.float32(), 16)
+    assert store.document_collection.count_rows() == 300
+
+    store.create_index()
+    assert store.document_collection.to_lance().list_indices()
+
+
+def test_create_index(tmp_path):
+    vectors = _vectors(600)
+    store = _store(
+        tmp_path,
+        index_type="IVF_PQ",
+        index_min_rows=500,
+        index_num_partitions=2,
+        index_rebuild_threshold=0.5,
+        refine_factor=10,
+    )
+    store.load_documents(_documents(vectors[:400]))
+    store.create_index()
+    assert store.document_collection.to_lance().list_indices() == []
+
+    store.load_documents(_documents(vectors[400:], offset=400), overwrite=False)
+    store.create_index()
+    dataset = store.document_collection.to_lance()
+    (index,) = dataset.list_indices()
+    assert dataset.stats.index_stats(index["name"])["num_unindexed_rows"] == 0
+
+    # a small append is added to the existing index
+    store.load_documents(_documents(_vectors(10, seed=1), offset=600), overwrite=False)
+    store.create_index()
+    stats = store.document_collection.to_lance().stats.index_stats(index["name"])
+    assert stats["num_indexed_rows"] == 610
+    assert stats["num_unindexed_rows"] == 0
+
+    results = store.similarity_search_by_vector(vectors[42].tolist(), k=1)
+    assert results[0].document.id == "42"
+
+
+def test_search_include_ids(tmp_path):
+    vectors = _vectors(100)
+    store = _store(tmp_path, exact_search_max_rows=10)
+    store.load_documents(_documents(vectors))
+    query = vectors[3].tolist()
+    ranking = [
+        result.document.id for result in store.similarity_search_by_vector(query, k=100)
+    ]
+
+    small = [str(i) for i in range(1, 20, 2)]
+    large = [str(i) for i in range(1, 100, 2)]
+    for include_ids in (small, large):
+        results = store.similarity_search_by_vector(query, k=3, include_ids=include_ids)
+        assert [result.document.id for result in results] == [
+            id for id in ranking if id in include_ids
+        ][:3]
+    assert store.similarity_search_by_vector(query, include_ids=[]) == []
+
+    # the filter is not kept on the store
+    assert store.query_filter is None
+    assert store.similarity_search_by_vector(query, k=1)[0].document.id == "3"
+
+    # cached filters are resolved again after new rows are loaded
+    store.load_documents(_documents(vectors[3:4], offset=100), overwrite=False)
+    results = store.similarity_search_by_vector(query, k=1, include_ids=["100", "5"])
+    assert results[0].document.id == "100"
+    assert results[0].score == pytest.approx(1.0)
+
+
+def test_ids_are_quoted(tmp_path):
+    store = _store(tmp_path)
+    documents = _documents(_vectors(3))
+    documents[0].id = "it's"
+    store.load_documents(documents)
+
+    assert store.search_by_id("it's").text == "entity 0"
+    store.filter_by_id(["it's", "2"])
+    results = store.similarity_search_by_vector(documents[1].vector, k=3)
+    assert {result.document.id for result in results} == {"it's", "2"}
@@ -1,8 +1,18 @@
 # Copyright (c) 2024 Microsoft Corporation.
 # Licensed under the MIT License
 
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pandas as pd
+
+from graphrag.callbacks.noop_workflow_callbacks import NoopWorkflowCallbacks
 from graphrag.config.create_graphrag_config import create_graphrag_config
-from graphrag.index.workflows.create_base_text_units import run_workflow
+from graphrag.config.enums import ChunkStrategyType
+from graphrag.index.workflows.create_base_text_units import (
+    create_base_text_units,
+    run_workflow,
+)
 from graphrag.utils.storage import load_table_from_storage
 
 from .util import (
@@ -66,3 +76,34 @@ async def test_create_base_text_units_metadata_included_in_chunk():
     actual = await load_table_from_storage("text_units", context.storage)
     # only check the columns from the base workflow - our expected table is the final and will have more
     compare_outputs(actual, expected, columns=["text", "document_ids", "n_tokens"])
+
+
+def test_create_base_text_units_encodes_all_groups_at_once():
+    documents = pd.DataFrame({
+        "id": ["b", "a", "c"],
+        "text": ["the second document", "first", "and the third document here"],
+    })
+    with patch(
+        "graphrag.index.operations.chunk_text.strategies.ThreadPoolExecutor",
+        wraps=ThreadPoolExecutor,
+    ) as pool:
+        output = create_base_text_units(
+            documents,
+            NoopWorkflowCallbacks(),
+            ["id"],
+            size=2,
+            overlap=0,
+            encoding_model="cl100k_base",
+            strategy=ChunkStrategyType.tokens,
+        )
+
+    # one pool encodes the documents of every group
+    pool.assert_called_once()
+    assert all(len(ids) == 1 for ids in output["document_ids"])
+    texts = output.groupby(output["document_ids"].str[0], sort=True)["text"].sum()
+    assert texts.to_dict() == {
+        "a": "first",
+        "b": "the second document",
+        "c": "and the third document here",
+    }
+    assert output["n_tokens"].max() == 2
@@ -0,0 +1,185 @@
+# Copyright (c) 2024 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""Tests for running independent pipeline workflows concurrently."""
+
+import asyncio
+import json
+
+import pandas as pd
+
+from graphrag.cache.memory_pipeline_cache import InMemoryCache
+from graphrag.callbacks.noop_workflow_callbacks import NoopWorkflowCallbacks
+from graphrag.config.create_graphrag_config import create_graphrag_config
+from graphrag.config.models.graph_rag_config import GraphRagConfig
+from graphrag.index.run.run_pipeline import _run_pipeline
+from graphrag.index.typing.context import PipelineRunContext
+from graphrag.index.typing.pipeline import Pipeline
+from graphrag.index.typing.workflow import WorkflowFunctionOutput, WorkflowTables
+from graphrag.index.workflows.factory import PipelineFactory
+from graphrag.language_model.concurrency import (
+    acquire_llm_request_slot,
+    llm_request_slot,
+)
+from graphrag.logger.null_progress import NullProgressLogger
+from graphrag.storage.memory_pipeline_storage import MemoryPipelineStorage
+from tests.verbs.util import DEFAULT_MODEL_CONFIG
+
+
+def test_standard_pipeline_dependencies():
+    config = create_graphrag_config({"models": DEFAULT_MODEL_CONFIG})
+    config.extract_claims.enabled = True
+    pipeline = PipelineFactory.create_pipeline(config)
+    names = pipeline.names()
+    dependencies = {
+        names[position]: {names[dependency] for dependency in waits_for}
+        for position, waits_for in enumerate(pipeline.dependencies())
+    }
+
+    assert dependencies["extract_graph"] == {"create_base_text_units"}
+    assert dependencies["extract_covariates"] == {"create_base_text_units"}
+    assert dependencies["finalize_graph"] == {"extract_graph"}
+    assert dependencies["create_communities"] == {"finalize_graph"}
+    # overwrites text_units, so it also waits for the workflows reading them
+    assert dependencies["create_final_text_units"] == {
+        "create_base_text_units",
+        "create_final_documents",
+        "extract_graph",
+        "extract_covariates",
+        "finalize_graph",
+    }
+    assert "create_final_text_units" in dependencies["generate_text_embeddings"]
+    tables = pipeline.tables["generate_text_embeddings"]
+    assert "vector_store" in tables.writes
+    assert "embeddings.entity.description" in tables.writes
+
+
+def test_workflows_without_tables_run_alone():
+    def workflow(_config, _context):
+        return WorkflowFunctionOutput(result=None)
+
+    tables = WorkflowTables(reads=("documents",), writes=("a",))
+    pipeline = Pipeline(
+        [("first", workflow), ("custom", workflow), ("last", workflow)],
+        {"first": tables, "last": tables},
+    )
+    assert pipeline.dependencies() == [set(), {0}, {0, 1}]
+
+
+async def _run(config: GraphRagConfig, pipeline: Pipeline):
+    storage = MemoryPipelineStorage()
+    results = [
+        result
+        async for result in _run_pipeline(
+            pipeline=pipeline,
+            config=config,
+            dataset=pd.DataFrame({"id": ["1"], "text": ["text"]}),
+            cache=InMemoryCache(),
+            storage=storage,
+            callbacks=NoopWorkflowCallbacks(),
+            logger=NullProgressLogger(),
+        )
+    ]
+    stats = json.loads(await storage.get("stats.json") or "{}")
+    return results, stats
+
+
+def _sleeping_workflow(running: list[int], seen: list[int], fail: bool = False):
+    async def run_workflow(_config: GraphRagConfig, _context: PipelineRunContext):
+        running[0] += 1
+        seen.append(running[0])
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+        if fail:
+            msg = "boom"
+            raise ValueError(msg)
+        return WorkflowFunctionOutput(result=None)
+
+    return run_workflow
+
+
+async def test_independent_workflows_run_concurrently():
+    config = create_graphrag_config({"models": DEFAULT_MODEL_CONFIG})
+    running, seen = [0], []
+    pipeline = Pipeline(
+        [
+            (name, _sleeping_workflow(running, seen))
+            for name in ("chunks", "graph", "claims", "final")
+        ],
+        {
+            "chunks": WorkflowTables(reads=("documents",), writes=("text_units",)),
+            "graph": WorkflowTables(reads=("text_units",), writes=("entities",)),
+            "claims": WorkflowTables(reads=("text_units",), writes=("covariates",)),
+            "final": WorkflowTables(reads=("entities", "covariates")),
+        },
+    )
+
+    results, stats = await _run(config, pipeline)
+
+    assert [result.workflow for result in results] == [
+        "chunks",
+        "graph",
+        "claims",
+        "final",
+    ]
+    assert seen == [1, 1, 2, 1]
+    assert set(stats["workflows"]) == {"chunks", "graph", "claims", "final"}
+    assert stats["workflows"]["final"]["start"] >= stats["workflows"]["graph"]["end"]
+
+    config.concurrent_workflows = 1
+    seen.clear()
+    await _run(config, pipeline)
+    assert seen == [1, 1, 1, 1]
+
+
+async def test_failed_workflow_stops_the_pipeline():
+    config = create_graphrag_config({"models": DEFAULT_MODEL_CONFIG})
+    running, seen = [0], []
+    tables = WorkflowTables(reads=("documents",))
+    pipeline = Pipeline(
+        [
+            ("ok", _sleeping_workflow(running, seen)),
+            ("broken", _sleeping_workflow(running, seen, fail=True)),
+            ("after", _sleeping_workflow(running, seen)),
+        ],
+        {"ok": tables, "broken": tables},
+    )
+
+    results, _ = await _run(config, pipeline)
+
+    assert [result.workflow for result in results] == ["ok", "broken"]
+    assert isinstance(results[-1].errors[0], ValueError)  # type: ignore
+    assert running == [0]
+
+
+async def test_concurrent_workflows_share_llm_budget():
+    config = create_graphrag_config({"models": DEFAULT_MODEL_CONFIG})
+    model_config = config.get_language_model_config(config.extract_graph.model_id)
+    model_config.concurrent_requests = 3
+    in_flight, peak = [0], [0]
+
+    async def request():
+        async with llm_request_slot(model_config):
+            # what the provider does right before it sends a request
+            await acquire_llm_request_slot()
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+
+    async def run_workflow(_config: GraphRagConfig, _context: PipelineRunContext):
+        await asyncio.gather(*[request() for _ in range(3)])
+        return WorkflowFunctionOutput(result=None)
+
+    tables = WorkflowTables(reads=("text_units",))
+    pipeline = Pipeline(
+        [("graph", run_workflow), ("claims", run_workflow)],
+        {"graph": tables, "claims": tables},
+    )
+    await _run(config, pipeline)
+    assert peak[0] == 3
+
+    # outside a pipeline run requests are not limited
+    peak[0] = 0
+    await asyncio.gather(*[request() for _ in range(6)])
+    assert peak[0] == 6
@@ -0,0 +1,612 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import random
+import time
+import zlib
+import aiosqlite
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+    get_checkpoint_metadata,
+)
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Integer,
+    LargeBinary,
+    MetaData,
+    String,
+    Table,
+    delete,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from app.core.config import ROOT_DIR, settings
+from app.core.logger import get_logger
+
+logger = get_logger(service="lg_checkpointer")
+
+# MySQL 检查点表，与业务表分开定义
+metadata_obj = MetaData()
+
+# MySQL 的 BLOB 最大 64KB，长对话的消息列表需要 LONGBLOB
+_Blob = LargeBinary().with_variant(mysql.LONGBLOB(), "mysql")
+
+threads_table = Table(
+    "lg_threads",
+    metadata_obj,
+    Column("thread_id", String(128), primary_key=True),
+    Column("updated_at", DateTime, nullable=False, index=True),  # 最后一次写入检查点的时间，用于清理闲置会话
+)
+
+checkpoints_table = Table(
+    "lg_checkpoints",
+    metadata_obj,
+    Column("thread_id", String(128), primary_key=True),
+    Column("checkpoint_ns", String(255), primary_key=True),
+    Column("checkpoint_id", String(64), primary_key=True),
+    Column("parent_checkpoint_id", String(64), nullable=True),
+    Column("type", String(32), nullable=False),
+    Column("checkpoint", _Blob, nullable=False),  # 不含通道值，通道值按版本存放在 lg_checkpoint_blobs
+    Column("metadata_type", String(32), nullable=False),
+    Column("metadata", _Blob, nullable=False),
+)
+
+blobs_table = Table(
+    "lg_checkpoint_blobs",
+    metadata_obj,
+    Column("thread_id", String(128), primary_key=True),
+    Column("checkpoint_ns", String(255), primary_key=True),
+    Column("channel", String(255), primary_key=True),
+    Column("version", String(64), primary_key=True),
+    Column("type", String(32), nullable=False),
+    Column("blob", _Blob, nullable=True),
+)
+
+writes_table = Table(
+    "lg_checkpoint_writes",
+    metadata_obj,
+    Column("thread_id", String(128), primary_key=True),
+    Column("checkpoint_ns", String(255), primary_key=True),
+    Column("checkpoint_id", String(64), primary_key=True),
+    Column("task_id", String(64), primary_key=True),
+    Column("idx", Integer, primary_key=True),
+    Column("channel", String(255), nullable=False),
+    Column("type", String(32), nullable=False),
+    Column("blob", _Blob, nullable=True),
+    Column("task_path", String(255), nullable=False, default=""),
+)
+
+_COMPRESSED_SUFFIX = "+zlib"
+
+
+class CompressedSerializer(SerializerProtocol):
+    """在 LangGraph 默认序列化(msgpack)之上，对超过阈值的数据再用 zlib 压缩
+
+    压缩过的数据在类型名后加 +zlib 后缀，未压缩的旧数据照常读取。
+    """
+
+    def __init__(self, compress_threshold: int = None, serde: SerializerProtocol = None):
+        self.serde = serde or JsonPlusSerializer()
+        self.compress_threshold = (
+            settings.LANGGRAPH_CHECKPOINT_COMPRESS_THRESHOLD
+            if compress_threshold is None else compress_threshold
+        )
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.serde.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return self.serde.loads(data)
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        type_, data = self.serde.dumps_typed(obj)
+        if self.compress_threshold > 0 and len(data) >= self.compress_threshold:
+            return type_ + _COMPRESSED_SUFFIX, zlib.compress(data)
+        return type_, data
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        type_, blob = data
+        if type_.endswith(_COMPRESSED_SUFFIX):
+            type_ = type_[:-len(_COMPRESSED_SUFFIX)]
+            blob = zlib.decompress(blob)
+        return self.serde.loads_typed((type_, blob or b""))
+
+
+class IdleThreadCleanup:
+    """定期删除闲置超过 ttl 秒的会话，子类实现 setup、evict_idle_threads 和 _close"""
+
+    ttl: int
+    cleanup_interval: int
+    _cleanup_task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """创建检查点表并启动闲置会话的清理任务"""
+        await self.setup()
+        if self.ttl > 0 and self._cleanup_task is None:
+            self._cleanup_task = asyncio.create_task(self._auto_cleanup())
+        logger.info(f"LangGraph checkpointer {type(self).__name__} started, ttl={self.ttl}s")
+
+    async def stop(self):
+        """停止清理任务并关闭数据库连接"""
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            await asyncio.gather(self._cleanup_task, return_exceptions=True)
+            self._cleanup_task = None
+        await self._close()
+
+    async def _auto_cleanup(self):
+        while True:
+            try:
+                evicted = await self.evict_idle_threads()
+                if evicted:
+                    logger.info(f"Evicted {evicted} idle LangGraph threads")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error evicting idle LangGraph threads: {str(e)}", exc_info=True)
+            await asyncio.sleep(self.cleanup_interval)
+
+
+class SqliteCheckpointSaver(IdleThreadCleanup, AsyncSqliteSaver):
+    """基于 langgraph-checkpoint-sqlite 的本地检查点存储，增加闲置会话清理
+
+    读写检查点完全沿用 AsyncSqliteSaver，只额外维护一张 lg_thread_activity 表记录每个会话最后一次
+    写入检查点的时间。数据库连接在第一次使用时才打开，因此可以在模块导入时创建。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: int = None,
+        cleanup_interval: int = None,
+        compress_threshold: int = None
+    ):
+        # 不调用 AsyncSqliteSaver.__init__：它要求在事件循环中创建，事件循环在 setup 时记录
+        BaseCheckpointSaver.__init__(self, serde=CompressedSerializer(compress_threshold))
+        self.jsonplus_serde = JsonPlusSerializer()
+        # 写入冲突时等待锁而不是直接报错
+        self.conn = aiosqlite.connect(path, timeout=5)
+        self.lock = asyncio.Lock()
+        self.loop = None
+        self.is_setup = False
+        self.ttl = settings.LANGGRAPH_CHECKPOINT_TTL if ttl is None else ttl
+        self.cleanup_interval = cleanup_interval or settings.LANGGRAPH_CHECKPOINT_CLEANUP_INTERVAL
+        self._setup_lock = asyncio.Lock()
+
+    async def setup(self):
+        """打开数据库连接，创建检查点表和会话表(如不存在)"""
+        if self.is_setup:
+            return
+        async with self._setup_lock:
+            if self.is_setup:
+                return
+            # 同步接口(get_state 等)通过这个事件循环执行，只能在其他线程中调用
+            self.loop = asyncio.get_running_loop()
+            if not self.conn.is_alive():
+                await self.conn
+            await self.conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS lg_thread_activity (
+                    thread_id TEXT PRIMARY KEY,
+                    updated_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_lg_thread_activity_updated_at ON lg_thread_activity (updated_at);
+                """
+            )
+            await super().setup()
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """保存检查点，并刷新会话的最后写入时间"""
+        next_config = await super().aput(config, checkpoint, metadata, new_versions)
+        async with self.lock:
+            await self.conn.execute(
+                "INSERT INTO lg_thread_activity (thread_id, updated_at) VALUES (?, ?) "
+                "ON CONFLICT(thread_id) DO UPDATE SET updated_at = excluded.updated_at",
+                (str(config["configurable"]["thread_id"]), time.time())
+            )
+            await self.conn.commit()
+        return next_config
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """删除会话的全部检查点"""
+        await self.setup()
+        await self._delete_threads([str(thread_id)])
+
+    async def _delete_threads(self, thread_ids: List[str]):
+        placeholders = ", ".join("?" * len(thread_ids))
+        async with self.lock:
+            for table in ("writes", "checkpoints", "lg_thread_activity"):
+                await self.conn.execute(
+                    f"DELETE FROM {table} WHERE thread_id IN ({placeholders})", thread_ids
+                )
+            await self.conn.commit()
+
+    async def evict_idle_threads(self, ttl: int = None, batch_size: int = 500) -> int:
+        """删除闲置超过 ttl 秒的会话，返回删除的会话数"""
+        await self.setup()
+        ttl = self.ttl if ttl is None else ttl
+        cutoff = time.time() - ttl
+        evicted = 0
+        while True:
+            async with self.lock:
+                async with self.conn.execute(
+                    "SELECT thread_id FROM lg_thread_activity WHERE updated_at < ? LIMIT ?",
+                    (cutoff, batch_size)
+                ) as cursor:
+                    thread_ids = [row[0] for row in await cursor.fetchall()]
+            if not thread_ids:
+                return evicted
+            await self._delete_threads(thread_ids)
+            evicted += len(thread_ids)
+            if len(thread_ids) < batch_size:
+                return evicted
+
+    async def _close(self):
+        if self.conn.is_alive():
+            await self.conn.close()
+
+
+class SQLCheckpointSaver(IdleThreadCleanup, BaseCheckpointSaver[str]):
+    """基于 SQLAlchemy 异步引擎的 LangGraph 检查点存储，用于 MySQL
+
+    会话状态保存在业务数据库中，多台机器上的 worker 可以共享同一会话。
+    存储方式与 MemorySaver 相同：检查点本身不含通道值，通道值按 (通道, 版本) 只保存一份，
+    未变化的通道不会在每一步重复写入；序列化使用 CompressedSerializer。
+    start() 之后后台任务会定期删除闲置超过 ttl 秒的会话。
+
+    只实现了异步接口，调用方需要使用 graph.astream / graph.aget_state 等异步方法。
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        ttl: int = None,
+        cleanup_interval: int = None,
+        compress_threshold: int = None
+    ):
+        super().__init__(serde=CompressedSerializer(compress_threshold))
+        self.engine = engine
+        self.ttl = settings.LANGGRAPH_CHECKPOINT_TTL if ttl is None else ttl
+        self.cleanup_interval = cleanup_interval or settings.LANGGRAPH_CHECKPOINT_CLEANUP_INTERVAL
+        self._setup_lock = asyncio.Lock()
+        self._is_setup = False
+
+    async def setup(self):
+        """创建检查点表(如不存在)"""
+        if self._is_setup:
+            return
+        async with self._setup_lock:
+            if self._is_setup:
+                return
+            async with self.engine.begin() as conn:
+                await conn.run_sync(metadata_obj.create_all, checkfirst=True)
+            self._is_setup = True
+
+    async def _close(self):
+        await self.engine.dispose()
+
+    # ---- 序列化 ----
+
+    def _dumps(self, value: Any) -> Tuple[str, bytes]:
+        return self.serde.dumps_typed(value)
+
+    def _loads(self, type_: str, data: Optional[bytes]) -> Any:
+        return self.serde.loads_typed((type_, data))
+
+    def _insert(self, conn: AsyncConnection, table: Table, update_columns: Sequence[str] = ()):
+        """按方言生成 upsert 语句，update_columns 为空时忽略已存在的行"""
+        dialect = mysql if conn.dialect.name == "mysql" else sqlite
+        stmt = dialect.insert(table)
+        if dialect is mysql:
+            if update_columns:
+                return stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in update_columns})
+            return stmt.prefix_with("IGNORE")
+        if update_columns:
+            return stmt.on_conflict_do_update(
+                index_elements=[c.name for c in table.primary_key.columns],
+                set_={c: stmt.excluded[c] for c in update_columns}
+            )
+        return stmt.on_conflict_do_nothing()
+
+    # ---- 读取 ----
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        """读取指定的检查点，未指定 checkpoint_id 时读取会话最新的检查点"""
+        await self.setup()
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        query = select(checkpoints_table).where(
+            checkpoints_table.c.thread_id == thread_id,
+            checkpoints_table.c.checkpoint_ns == checkpoint_ns
+        )
+        if checkpoint_id := get_checkpoint_id(config):
+            query = query.where(checkpoints_table.c.checkpoint_id == checkpoint_id)
+        else:
+            query = query.order_by(checkpoints_table.c.checkpoint_id.desc()).limit(1)
+
+        async with self.engine.connect() as conn:
+            row = (await conn.execute(query)).first()
+            if row is None:
+                return None
+            return await self._to_tuple(conn, row)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        """按 checkpoint_id 倒序列出检查点"""
+        await self.setup()
+        query = select(checkpoints_table).order_by(checkpoints_table.c.checkpoint_id.desc())
+        if config:
+            query = query.where(checkpoints_table.c.thread_id == str(config["configurable"]["thread_id"]))
+            checkpoint_ns = config["configurable"].get("checkpoint_ns")
+            if checkpoint_ns is not None:
+                query = query.where(checkpoints_table.c.checkpoint_ns == checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                query = query.where(checkpoints_table.c.checkpoint_id == checkpoint_id)
+        if before and (before_id := get_checkpoint_id(before)):
+            query = query.where(checkpoints_table.c.checkpoint_id < before_id)
+        # 元数据过滤需要先反序列化，此时只能在读取后再截断
+        if limit and not filter:
+            query = query.limit(limit)
+
+        async with self.engine.connect() as conn:
+            rows = (await conn.execute(query)).all()
+            count = 0
+            for row in rows:
+                if filter:
+                    metadata = self._loads(row.metadata_type, row.metadata)
+                    if not all(metadata.get(k) == v for k, v in filter.items()):
+                        continue
+                yield await self._to_tuple(conn, row)
+                count += 1
+                if limit and count >= limit:
+                    break
+
+    async def _to_tuple(self, conn: AsyncConnection, row: Any) -> CheckpointTuple:
+        checkpoint: Checkpoint = self._loads(row.type, row.checkpoint)
+        versions = checkpoint["channel_versions"]
+        channel_values = {}
+        if versions:
+            blobs = await conn.execute(
+                select(blobs_table.c.channel, blobs_table.c.type, blobs_table.c.blob).where(
+                    blobs_table.c.thread_id == row.thread_id,
+                    blobs_table.c.checkpoint_ns == row.checkpoint_ns,
+                    tuple_(blobs_table.c.channel, blobs_table.c.version).in_(
+                        [(channel, str(version)) for channel, version in versions.items()]
+                    )
+                )
+            )
+            for channel, type_, blob in blobs:
+                if type_ != "empty":
+                    channel_values[channel] = self._loads(type_, blob)
+
+        writes = await conn.execute(
+            select(writes_table.c.task_id, writes_table.c.channel, writes_table.c.type, writes_table.c.blob)
+            .where(
+                writes_table.c.thread_id == row.thread_id,
+                writes_table.c.checkpoint_ns == row.checkpoint_ns,
+                writes_table.c.checkpoint_id == row.checkpoint_id
+            )
+            .order_by(writes_table.c.task_id, writes_table.c.idx)
+        )
+
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": row.thread_id,
+                    "checkpoint_ns": row.checkpoint_ns,
+                    "checkpoint_id": row.checkpoint_id,
+                }
+            },
+            checkpoint={**checkpoint, "channel_values": channel_values},
+            metadata=self._loads(row.metadata_type, row.metadata),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": row.thread_id,
+                        "checkpoint_ns": row.checkpoint_ns,
+                        "checkpoint_id": row.parent_checkpoint_id,
+                    }
+                }
+                if row.parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self._loads(type_, blob))
+                for task_id, channel, type_, blob in writes
+            ],
+        )
+
+    # ---- 写入 ----
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """保存检查点，只写入本步有新版本的通道值"""
+        await self.setup()
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"]["checkpoint_ns"]
+        c = checkpoint.copy()
+        values: Dict[str, Any] = c.pop("channel_values")
+
+        blob_rows = []
+        for channel, version in new_versions.items():
+            type_, blob = self._dumps(values[channel]) if channel in values else ("empty", None)
+            blob_rows.append({
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "channel": channel,
+                "version": str(version),
+                "type": type_,
+                "blob": blob,
+            })
+        type_, checkpoint_blob = self._dumps(c)
+        metadata_type, metadata_blob = self._dumps(get_checkpoint_metadata(config, metadata))
+
+        async with self.engine.begin() as conn:
+            if blob_rows:
+                await conn.execute(self._insert(conn, blobs_table), blob_rows)
+            await conn.execute(
+                self._insert(conn, checkpoints_table, ("parent_checkpoint_id", "type", "checkpoint", "metadata_type", "metadata")),
+                {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint["id"],
+                    "parent_checkpoint_id": config["configurable"].get("checkpoint_id"),
+                    "type": type_,
+                    "checkpoint": checkpoint_blob,
+                    "metadata_type": metadata_type,
+                    "metadata": metadata_blob,
+                }
+            )
+            await conn.execute(
+                self._insert(conn, threads_table, ("updated_at",)),
+                {"thread_id": thread_id, "updated_at": datetime.now()}
+            )
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """保存任务的中间写入，特殊通道(如中断)覆盖旧值，普通写入只保留第一次"""
+        await self.setup()
+        thread_id = str(config["configurable"]["thread_id"])
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, blob = self._dumps(value)
+            rows.append({
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint_id,
+                "task_id": task_id,
+                "idx": WRITES_IDX_MAP.get(channel, idx),
+                "channel": channel,
+                "type": type_,
+                "blob": blob,
+                "task_path": task_path,
+            })
+        if not rows:
+            return
+        update_columns = ("channel", "type", "blob") if all(w[0] in WRITES_IDX_MAP for w in writes) else ()
+        async with self.engine.begin() as conn:
+            await conn.execute(self._insert(conn, writes_table, update_columns), rows)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        """删除会话的全部检查点"""
+        await self.setup()
+        await self._delete_threads([str(thread_id)])
+
+    async def _delete_threads(self, thread_ids: List[str]):
+        async with self.engine.begin() as conn:
+            for table in (writes_table, blobs_table, checkpoints_table, threads_table):
+                await conn.execute(delete(table).where(table.c.thread_id.in_(thread_ids)))
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        """与 MemorySaver 相同的版本号格式：递增序号加随机后缀，按字符串比较即可排序"""
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    # ---- 清理 ----
+
+    async def evict_idle_threads(self, ttl: int = None, batch_size: int = 500) -> int:
+        """删除闲置超过 ttl 秒的会话，返回删除的会话数"""
+        await self.setup()
+        ttl = self.ttl if ttl is None else ttl
+        cutoff = datetime.now() - timedelta(seconds=ttl)
+        evicted = 0
+        while True:
+            async with self.engine.connect() as conn:
+                result = await conn.execute(
+                    select(threads_table.c.thread_id)
+                    .where(threads_table.c.updated_at < cutoff)
+                    .limit(batch_size)
+                )
+                thread_ids = [row.thread_id for row in result]
+            if not thread_ids:
+                return evicted
+            await self._delete_threads(thread_ids)
+            evicted += len(thread_ids)
+            if len(thread_ids) < batch_size:
+                return evicted
+
+
+def _sqlite_path(path: str) -> str:
+    db_path = Path(path)
+    if not db_path.is_absolute():
+        db_path = ROOT_DIR / db_path
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    return str(db_path)
+
+
+def create_checkpointer(backend: str = None) -> BaseCheckpointSaver:
+    """根据配置创建 LangGraph 检查点存储
+
+    - memory: 进程内存，仅用于调试，重启后会话丢失
+    - sqlite: 本地 SQLite 文件(AsyncSqliteSaver)，适合单机部署
+    - mysql: 使用业务数据库，适合多机部署
+
+    sqlite 和 mysql 只能在异步代码中使用，需要调用 graph.ainvoke / graph.astream / graph.aget_state。
+    mysql 的同步接口(graph.invoke、graph.get_state 等)会抛出 NotImplementedError；
+    sqlite 的同步接口只能在事件循环以外的线程调用，在事件循环线程中调用会抛出 InvalidStateError。
+    """
+    backend = (backend or settings.LANGGRAPH_CHECKPOINTER).lower()
+    if backend == "memory":
+        return MemorySaver()
+    if backend == "sqlite":
+        return SqliteCheckpointSaver(_sqlite_path(settings.LANGGRAPH_CHECKPOINT_DB))
+    if backend == "mysql":
+        engine = create_async_engine(
+            settings.DATABASE_URL,
+            pool_pre_ping=True,
+            pool_recycle=3600
+        )
+        return SQLCheckpointSaver(engine)
+    raise ValueError(f"Unsupported LangGraph checkpointer: {backend}")
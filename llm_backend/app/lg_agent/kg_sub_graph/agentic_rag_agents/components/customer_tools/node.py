@@ -1,4 +1,4 @@
-from typing import Any, Callable, Coroutine, Dict, List
+from typing import Any, Callable, Coroutine, Dict, List, Optional
 import asyncio
 import os
 from pathlib import Path
@@ -6,13 +6,15 @@ from pydantic import BaseModel, Field
 
 # 导入GraphRAG相关模块
 import app.graphrag.graphrag.api as api
-from app.graphrag.graphrag.config.load_config import load_config
 from app.graphrag.graphrag.callbacks.noop_query_callbacks import NoopQueryCallbacks
-from app.graphrag.graphrag.utils.storage import load_table_from_storage
-from app.graphrag.graphrag.storage.file_pipeline_storage import FilePipelineStorage
+from app.graphrag.graphrag.query.engine_registry import get_query_engine_registry
 
 # 导入配置
 from app.core.config import settings
+from app.core.logger import get_logger
+from app.services.graphrag_query_cache import GraphRAGQueryCache
+
+logger = get_logger(service="graphrag_query")
 
 # 定义GraphRAG查询的输入状态类型
 class GraphRAGQueryInputState(BaseModel):
@@ -44,55 +46,63 @@ class GraphRAGAPI:
         self.community_level = community_level or settings.GRAPHRAG_COMMUNITY_LEVEL
         self.dynamic_community_selection = dynamic_community_selection if dynamic_community_selection is not None else settings.GRAPHRAG_DYNAMIC_COMMUNITY
         self.config = None
-        self.storage = None
+        self.engine = None
         self.entities = None
         self.text_units = None
         self.communities = None
         self.community_reports = None
         self.relationships = None
         self.covariates = None
-        self.initialized = False
     
     async def initialize(self):
-        """初始化GraphRAG API，加载必要的数据"""
-        if self.initialized:
-            return
-            
+        """初始化GraphRAG API，从进程内共享的查询引擎注册表获取已加载的数据
+
+        注册表按项目目录缓存配置、数据表、转换后的数据模型对象和向量库连接，
+        只有索引输出文件发生变化时才会重新加载，因此每次查询都可以调用。
+        """
         # 构建完整项目路径
         project_directory = os.path.join(self.project_dir, self.data_dir_name)
         
-        # 加载配置
-        self.config = load_config(Path(project_directory), None, None)
-        
-        # 创建存储路径
-        output_dir = Path(self.config.output.base_dir)
-        if not output_dir.is_absolute():
-            output_dir = Path(project_directory) / output_dir
-        
-        # 创建FilePipelineStorage对象
-        self.storage = FilePipelineStorage(root_dir=str(output_dir))
-        
-        # 加载必要的数据文件
         try:
-            self.entities = await load_table_from_storage("entities", self.storage)
-            self.text_units = await load_table_from_storage("text_units", self.storage)
-            self.communities = await load_table_from_storage("communities", self.storage)
-            self.community_reports = await load_table_from_storage("community_reports", self.storage)
-            self.relationships = await load_table_from_storage("relationships", self.storage)
-            
-            # 尝试加载协变量数据（可能不存在）
-            try:
-                self.covariates = await load_table_from_storage("covariates", self.storage)
-            except Exception:
-                self.covariates = None
-            
-            self.initialized = True
+            self.engine = await get_query_engine_registry().get_engine(project_directory)
         except Exception as e:
             raise Exception(f"加载GraphRAG数据文件时出错: {str(e)}")
+        
+        self.config = self.engine.config
+        tables = self.engine.tables
+        self.entities = tables.entities
+        self.text_units = tables.text_units
+        self.communities = tables.communities
+        self.community_reports = tables.community_reports
+        self.relationships = tables.relationships
+        self.covariates = tables.covariates
     
+    def _get_query_cache(self) -> Optional[GraphRAGQueryCache]:
+        """获取与当前索引版本和查询参数对应的结果缓存，未启用时返回 None"""
+        if not settings.GRAPHRAG_CACHE_ENABLED:
+            return None
+        try:
+            return GraphRAGQueryCache(
+                project_dir=os.path.join(self.project_dir, self.data_dir_name),
+                index_version=self.engine.version,
+                query_type=self.query_type,
+                community_level=self.community_level,
+                response_type=self.response_type,
+                dynamic_community_selection=self.dynamic_community_selection,
+            )
+        except Exception as e:
+            logger.error(f"创建GraphRAG查询缓存失败: {str(e)}", exc_info=True)
+            return None
+
     async def query_graphrag(self, query: str) -> Dict[str, Any]:
-        """执行GraphRAG查询"""
+        """执行GraphRAG查询，相同或语义相近的问题直接返回缓存的结果"""
         await self.initialize()
+
+        cache = self._get_query_cache()
+        if cache is not None:
+            cached_result = await cache.lookup(query)
+            if cached_result is not None:
+                return cached_result
         
         # 创建回调对象
         callbacks = []
@@ -109,17 +119,11 @@ class GraphRAGAPI:
         try:
             # 根据查询类型执行不同的查询
             if self.query_type.lower() == "local":
-                response, context = await api.local_search(
-                    config=self.config,
-                    entities=self.entities,
-                    communities=self.communities,
-                    community_reports=self.community_reports,
-                    text_units=self.text_units,
-                    relationships=self.relationships,
-                    covariates=self.covariates,
+                # 复用常驻的查询引擎，避免每次查询都重新转换数据和连接向量库
+                response, context = await self.engine.local_search(
+                    query=query,
                     community_level=self.community_level,
                     response_type=self.response_type,
-                    query=query,
                     callbacks=callbacks
                 )
             
@@ -166,6 +170,9 @@ class GraphRAGAPI:
                 "response": response,
                 "context": context_data
             }
+
+            if cache is not None:
+                await cache.update(query, result)
             
             return result
             
@@ -1,4 +1,4 @@
-from typing import Any, Callable, Coroutine, Dict, List
+from typing import Any, Callable, Coroutine, Dict, List, Optional
 import asyncio
 import os
 from pathlib import Path
@@ -14,7 +14,11 @@ from app.lg_agent.kg_sub_graph.kg_neo4j_conn import get_neo4j_graph
 from app.core.logger import get_logger
 from langchain_ollama import ChatOllama
 from langchain_deepseek import ChatDeepSeek
+from langchain_core.language_models import BaseChatModel
+from langchain_neo4j import Neo4jGraph
 from app.core.config import settings, ServiceType
+from app.core.llm_rate_limit import deepseek_rate_limiter, ollama_rate_limiter, langchain_rate_limit
+from app.lg_agent.kg_sub_graph.agentic_rag_agents.retrievers.cypher_examples.base import BaseCypherExampleRetriever
 from app.lg_agent.kg_sub_graph.agentic_rag_agents.retrievers.cypher_examples.northwind_retriever import NorthwindCypherRetriever
 from app.lg_agent.kg_sub_graph.agentic_rag_agents.components.cypher_tools.utils import create_text2cypher_generation_node, create_text2cypher_validation_node, create_text2cypher_execution_node
 
@@ -40,6 +44,9 @@ class CypherQueryOutputState(BaseModel):
 # 定义GraphRAG API包装器
 
 def create_cypher_query_node(
+    llm: Optional[BaseChatModel] = None,
+    graph: Optional[Neo4jGraph] = None,
+    cypher_example_retriever: Optional[BaseCypherExampleRetriever] = None,
 ) -> Callable[
     [CypherQueryInputState],
     Coroutine[Any, Any, Dict[str, List[CypherQueryOutputState] | List[str]]],
@@ -47,12 +54,38 @@ def create_cypher_query_node(
     """
     创建 Text2Cypher 查询节点，用于LangGraph工作流。
 
+    模型、Neo4j连接和Cypher示例检索器在创建节点时准备好，之后每次查询都复用。
+
+    参数
+    ----------
+    llm : Optional[BaseChatModel]
+        生成和校验Cypher的模型，默认根据 AGENT_SERVICE 创建
+    graph : Optional[Neo4jGraph]
+        Neo4j图数据库连接，默认使用共享连接
+    cypher_example_retriever : Optional[BaseCypherExampleRetriever]
+        Cypher示例检索器，默认使用 NorthwindCypherRetriever
+
     返回
     -------
     Callable[[CypherQueryInputState], Dict[str, List[CypherQueryOutputState] | List[str]]]
         名为`cypher_query`的LangGraph节点。
     """
 
+    # 使用大模型执行查询/多跳/并行查询计划
+    # 1. 根据.env文件中AGENT_SERVICE的设置，选择使用DeepSeek或Ollama启动的模型服务
+    if llm is not None:
+        model = llm
+    elif settings.AGENT_SERVICE == ServiceType.DEEPSEEK:
+        model = ChatDeepSeek(api_key=settings.DEEPSEEK_API_KEY, model_name=settings.DEEPSEEK_MODEL, temperature=0.7, tags=["research_plan"], **langchain_rate_limit(deepseek_rate_limiter()))
+    else:
+        model = ChatOllama(model=settings.OLLAMA_AGENT_MODEL, base_url=settings.OLLAMA_BASE_URL, temperature=0.7, tags=["research_plan"], **langchain_rate_limit(ollama_rate_limiter(settings.OLLAMA_AGENT_MODEL)))
+
+    # 2. 获取Neo4j图数据库连接
+    neo4j_graph = graph if graph is not None else get_neo4j_graph()
+
+    # step 2. 创建自定义检索器实例，根据 Graph Schema 创建 Cypher 示例，用来引导大模型生成正确的Cypher 查询语句
+    cypher_retriever = cypher_example_retriever if cypher_example_retriever is not None else NorthwindCypherRetriever()
+
     async def cypher_query(
         state: Dict[str, Any],
     ) -> Dict[str, List[CypherQueryOutputState] | List[str]]:
@@ -64,23 +97,6 @@ def create_cypher_query_node(
         query = state.get("task", "")
         if not query:
             errors.append("未提供查询文本")
- 
-        # 使用大模型执行查询/多跳/并行查询计划
-        # 1. 根据.env文件中AGENT_SERVICE的设置，选择使用DeepSeek或Ollama启动的模型服务
-        if settings.AGENT_SERVICE == ServiceType.DEEPSEEK:
-            model = ChatDeepSeek(api_key=settings.DEEPSEEK_API_KEY, model_name=settings.DEEPSEEK_MODEL, temperature=0.7, tags=["research_plan"])
-        else:
-            model = ChatOllama(model=settings.OLLAMA_AGENT_MODEL, base_url=settings.OLLAMA_BASE_URL, temperature=0.7, tags=["research_plan"])
-
-        # 2. 获取Neo4j图数据库连接
-        try:
-            neo4j_graph = get_neo4j_graph()
-            logger.info("success to get Neo4j graph database connection")
-        except Exception as e:
-            logger.error(f"failed to get Neo4j graph database connection: {e}")
-
-        # step 2. 创建自定义检索器实例，根据 Graph Schema 创建 Cypher 示例，用来引导大模型生成正确的Cypher 查询语句
-        cypher_retriever = NorthwindCypherRetriever()
 
         # Step 3.根据自定义的 Cypher 示例，引导大模型生成 当前输入 问题的 Cypher 查询语句
         cypher_generation = create_text2cypher_generation_node(
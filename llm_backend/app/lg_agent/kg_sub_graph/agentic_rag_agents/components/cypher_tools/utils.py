@@ -14,6 +14,9 @@ import regex as re
 from langchain_core.runnables.base import Runnable
 from langchain_neo4j.chains.graph_qa.cypher_utils import CypherQueryCorrector, Schema
 from neo4j.exceptions import CypherSyntaxError
+from app.lg_agent.kg_sub_graph.kg_neo4j_conn import query_neo4j
+from app.lg_agent.kg_sub_graph.kg_schema import get_graph_schema
+from app.lg_agent.kg_sub_graph.agentic_rag_agents.components.text2cypher.validation.value_mapping import find_missing_value_mappings
 
 # 设置Neo4j驱动的日志级别为ERROR，禁止WARNING消息
 logging.getLogger("neo4j").setLevel(logging.ERROR)
@@ -82,9 +85,9 @@ validation_prompt_template = create_text2cypher_validation_prompt_template()
 correction_cypher_prompt = create_text2cypher_correction_prompt_template()
 
 
-def validate_cypher_query_syntax(graph: Neo4jGraph, cypher_statement: str) -> List[str]:
+async def validate_cypher_query_syntax(graph: Neo4jGraph, cypher_statement: str) -> List[str]:
     """
-    Validate the Cypher statement syntax by running an EXPLAIN query.
+    Validate the Cypher statement syntax by running a read-only EXPLAIN query on the graph.
 
     Parameters
     ----------
@@ -101,7 +104,7 @@ def validate_cypher_query_syntax(graph: Neo4jGraph, cypher_statement: str) -> Li
     errors = list()
     try:
         # 使用 EXPLAIN 查询来验证Cypher语句的语法，仅仅查看语法是否正确，而不实际执行查询
-        graph.query(f"EXPLAIN {cypher_statement}")
+        await query_neo4j(f"EXPLAIN {cypher_statement}", graph=graph, read_only=True)
     except CypherSyntaxError as e:
         errors.append(str(e.message))
     return errors
@@ -125,11 +128,8 @@ def correct_cypher_query_relationship_direction(
     str
         The Cypher statement with corrected Relationship directions.
     """
-    # 从数据库中提取关系的结构性信息
-    corrector_schema = [
-        Schema(el["start"], el["type"], el["end"])
-        for el in graph.structured_schema.get("relationships", list())
-    ]
+    # 从图谱结构快照中获取关系的方向信息
+    corrector_schema = get_graph_schema(graph).relationship_directions
 
     # 使用langchain_neo4j 的CypherQueryCorrector 来校验Cypher语句的语法
     # 比如 ：MATCH (a:Person)-[r:FRIENDS_WITH]->(b:Person) ，如果r:FRIENDS_WITH 是反向的，则会被纠正为：MATCH (a:Person)-[r:FRIENDS_WITH]->(b:Person)
@@ -169,19 +169,8 @@ def retrieve_and_parse_schema_from_graph_for_prompts(graph: Neo4jGraph) -> str:
     3. 促进零样本学习：即使没有特定领域的示例，模型也能根据提供的结构信息生成符合语法的查询
     """
     
-    schema: str = graph.get_schema
-
-    # 过滤掉对用户查询不相关的内部结构信息
-    if "CypherQuery" in schema:
-        schema = re.sub(  
-            get_cypher_query_node_graph_schema(), r"\2", schema, flags=re.MULTILINE
-        )
-    
-    # 在这里添加一行：将所有花括号替换为方括号，避免模板变量冲突
-    # 因为 Schema 中包含 { } ，会与 ChatPromptTemplate 模版中的 input_variables 
-    schema = schema.replace("{", "[").replace("}", "]")
-    
-    return schema
+    # 图谱结构文本在快照中只整理一次，图谱结构变化后才重新生成
+    return get_graph_schema(graph).prompt_schema
 
 
 async def validate_cypher_query_with_llm(
@@ -214,13 +203,14 @@ async def validate_cypher_query_with_llm(
 
     errors: List[str] = []
     mapping_errors: List[str] = []
+    schema_snapshot = get_graph_schema(graph)
 
 
     # 使用大模型验证Cypher语句的语法， 通过 Pydantic 结构化输出
     llm_output: ValidateCypherOutput = await validate_cypher_chain.ainvoke(
         {
             "question": question,
-            "schema": retrieve_and_parse_schema_from_graph_for_prompts(graph),
+            "schema": schema_snapshot.prompt_schema,
             "cypher": cypher_statement,
         }
     )
@@ -230,26 +220,19 @@ async def validate_cypher_query_with_llm(
         errors.extend(llm_output.errors)
     # 如果 Pydantic 结构化输出中包含 filters，则遍历每个过滤器。
     if llm_output.filters:
-        for filter in llm_output.filters:
-            # 仅对字符串类型的属性进行映射检查。通过检查 graph.structured_schema 中的节点属性，判断属性类型是否为字符串。
-            if (
-                not [
-                    prop
-                    for prop in graph.structured_schema["node_props"][filter.node_label]
-                    if prop["property"] == filter.property_key
-                ][0]["type"]
-                == "STRING"
-            ):
-                continue
-
-            # 对于每个过滤器，构建一个 Cypher 查询，检查数据库中是否存在具有指定属性值的节点。
-            mapping = graph.query(
-                f"MATCH (n:{filter.node_label}) WHERE toLower(n.`{filter.property_key}`) = toLower($value) RETURN 'yes' LIMIT 1",
-                {"value": filter.property_value},
-            )
-            if not mapping:
-                mapping_error = f"Missing value mapping for {filter.node_label} on property {filter.property_key} with value {filter.property_value}"
-                mapping_errors.append(mapping_error)
+        # 仅对字符串类型的属性进行映射检查。通过图谱结构快照中的节点属性类型，判断属性类型是否为字符串。
+        filters = [
+            (filter.node_label, filter.property_key, filter.property_value)
+            for filter in llm_output.filters
+            if schema_snapshot.node_property_types.get(filter.node_label, {}).get(filter.property_key)
+            == "STRING"
+        ]
+
+        # 用一条 UNWIND 查询检查所有过滤条件，数据库中是否存在具有指定属性值的节点，已确认过的取值直接命中缓存。
+        # 在传入的图上检查，缓存和全文索引只用于共享连接
+        for node_label, property_key, property_value in await find_missing_value_mappings(filters, graph=graph):
+            mapping_error = f"Missing value mapping for {node_label} on property {property_key} with value {property_value}"
+            mapping_errors.append(mapping_error)
     return {"errors": errors, "mapping_errors": mapping_errors}
 
 
@@ -274,79 +257,11 @@ def validate_cypher_query_with_schema(
     List[str]
         A list of any found errors.
     """
-    from app.lg_agent.kg_sub_graph.agentic_rag_agents.components.text2cypher.validation.models import (
-    CypherValidationTask,
-    Neo4jStructuredSchema,
-    Neo4jStructuredSchemaPropertyNumber,
-)
     from app.lg_agent.kg_sub_graph.agentic_rag_agents.components.text2cypher.validation.validators import (
-    extract_entities_for_validation,
-    update_task_list_with_property_type,
-    _validate_node_property_names_with_enum,
-    _validate_node_property_values_with_enum,
-    _validate_node_property_values_with_range,
-    _validate_relationship_property_names_with_enum,
-    _validate_relationship_property_values_with_enum,
-    _validate_relationship_property_values_with_range,
-    )
-
-    schema: Neo4jStructuredSchema = Neo4jStructuredSchema.model_validate(
-        graph.get_structured_schema
-    )
-    nodes_and_rels = extract_entities_for_validation(cypher_statement=cypher_statement)
-
-    node_tasks = update_task_list_with_property_type(
-        nodes_and_rels.get("nodes", list()), schema, "node"
-    )
-    rel_tasks = update_task_list_with_property_type(
-        nodes_and_rels.get("relationships", list()), schema, "rel"
-    )
-
-    errors: List[str] = list()
-
-    node_prop_name_enum_tasks = node_tasks
-    node_prop_val_enum_tasks = [n for n in node_tasks if n.property_type == "STRING"]
-    node_prop_val_range_tasks = [
-        n
-        for n in node_tasks
-        if (n.property_type == "INTEGER" or n.property_type == "FLOAT")
-    ]
-
-    rel_prop_name_enum_tasks = rel_tasks
-    rel_prop_val_enum_tasks = [n for n in rel_tasks if n.property_type == "STRING"]
-    rel_prop_val_range_tasks = [
-        n
-        for n in rel_tasks
-        if (n.property_type == "INTEGER" or n.property_type == "FLOAT")
-    ]
-
-    errors.extend(
-        _validate_node_property_names_with_enum(schema, node_prop_name_enum_tasks)
-    )
-    errors.extend(
-        _validate_node_property_values_with_enum(schema, node_prop_val_enum_tasks)
-    )
-    errors.extend(
-        _validate_node_property_values_with_range(schema, node_prop_val_range_tasks)
-    )
-
-    errors.extend(
-        _validate_relationship_property_names_with_enum(
-            schema, rel_prop_name_enum_tasks
-        )
-    )
-    errors.extend(
-        _validate_relationship_property_values_with_enum(
-            schema, rel_prop_val_enum_tasks
-        )
-    )
-    errors.extend(
-        _validate_relationship_property_values_with_range(
-            schema, rel_prop_val_range_tasks
-        )
+        validate_cypher_query_with_schema as _validate_cypher_query_with_schema,
     )
 
-    return errors
+    return _validate_cypher_query_with_schema(graph=graph, cypher_statement=cypher_statement)
 
 
 def validate_no_writes_in_cypher_query(cypher_statement: str) -> List[str]:
@@ -397,7 +312,7 @@ def create_text2cypher_generation_node(
         """
         task = state.get("task", "")
         # 获取针对当前任务的cypher示例, 选择 k 个
-        examples: str = cypher_example_retriever.get_examples(
+        examples: str = await cypher_example_retriever.aget_examples(
             **{"query": task[0] if isinstance(task, list) else task, "k": 3}
         )
         generated_cypher = await text2cypher_chain.ainvoke(
@@ -448,7 +363,7 @@ def create_text2cypher_validation_node(
         mapping_errors = []
 
         # 1. 语法校验：检查Cypher查询的语法是否正确，例如括号匹配、关键字使用等。
-        syntax_error = validate_cypher_query_syntax(
+        syntax_error = await validate_cypher_query_syntax(
             graph=graph, cypher_statement=cypher_statement
         )
         errors.extend(syntax_error)
@@ -555,7 +470,7 @@ def create_text2cypher_execution_node(
         
         # 清理cypher语句中的换行符
         cypher_statement = cypher["statement"].replace("\n", " ").strip()
-        records = graph.query(cypher_statement)
+        records = await query_neo4j(cypher_statement, graph=graph, read_only=True)
         steps = state.get("steps", list())
         steps.append("execute_cypher")
         
@@ -3,11 +3,10 @@ from typing import Any, Callable, Coroutine, Dict, List
 from langchain_neo4j import Neo4jGraph
 from langchain_core.language_models import BaseChatModel
 
+from app.lg_agent.kg_sub_graph.kg_neo4j_conn import query_neo4j
 from app.lg_agent.kg_sub_graph.agentic_rag_agents.constants import NO_CYPHER_RESULTS
 from app.lg_agent.kg_sub_graph.agentic_rag_agents.components.state import PredefinedCypherInputState
 from app.lg_agent.kg_sub_graph.agentic_rag_agents.components.text2cypher.state import CypherOutputState
-from app.lg_agent.kg_sub_graph.agentic_rag_agents.components.predefined_cypher.utils import create_vector_query_matcher
-from app.lg_agent.kg_sub_graph.agentic_rag_agents.components.predefined_cypher.descriptions import QUERY_DESCRIPTIONS
 
 
 def create_predefined_cypher_node(
@@ -47,7 +46,7 @@ def create_predefined_cypher_node(
         statement = predefined_cypher_dict.get(params.get("query"))
    
         if statement is not None:
-            records = graph.query(query=statement, params=params.get("parameters"))
+            records = await query_neo4j(statement, params.get("parameters"), graph=graph)
             print(f"records: {records}")
             
         else:
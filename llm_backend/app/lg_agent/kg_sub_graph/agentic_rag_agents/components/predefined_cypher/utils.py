@@ -2,10 +2,12 @@
 
 import os
 import numpy as np
-import requests
 from typing import Dict, List, Tuple, Any, Optional
-from sklearn.metrics.pairwise import cosine_similarity
 from app.core.config import settings
+from app.core.logger import get_logger
+from app.services.ollama_embedding_client import get_embedding_client
+
+logger = get_logger(service="predefined_cypher")
 
 class VectorQueryMatcher:
     """基于词向量的查询匹配器，用于将用户问题匹配到预定义的Cypher查询"""
@@ -28,35 +30,26 @@ class VectorQueryMatcher:
         self.query_descriptions = query_descriptions
         self.similarity_threshold = similarity_threshold
         
-        # 使用环境变量获取Ollama的基础URL和模型名称
-        self.ollama_base_url = settings.OLLAMA_BASE_URL.rstrip('/')
+        # 使用共享的向量化客户端，复用连接和向量缓存
+        self.embedding_client = get_embedding_client()
         self.ollama_embedding_model = settings.OLLAMA_EMBEDDING_MODEL
-        self.ollama_api_url = f"{self.ollama_base_url}/api/embed"
         
-        print(f"使用Ollama模型: {self.ollama_embedding_model}, 地址: {self.ollama_base_url}")
+        print(f"使用Ollama模型: {self.ollama_embedding_model}, 地址: {self.embedding_client.base_url}")
         
-        # 预计算查询向量
-        self.query_vectors = self._compute_query_vectors()
+        # 查询向量在首次匹配时计算，并保存为归一化矩阵
+        self.query_keys, self.query_texts = self._build_query_texts()
+        self.query_matrix: Optional[np.ndarray] = None
     
-    def _embed_texts(self, texts: List[str]) -> List[List[float]]:
-        """使用Ollama的embedding API将文本转换为向量"""
-        payload = {
-            "model": self.ollama_embedding_model,
-            "input": texts
-        }
-        
+    def _embed_texts(self, texts: List[str]) -> Optional[List[np.ndarray]]:
+        """使用Ollama的embedding API将文本转换为向量，失败时返回 None"""
         try:
-            response = requests.post(self.ollama_api_url, json=payload)
-            response.raise_for_status()
-            result = response.json()
-            return result["embeddings"]
+            return self.embedding_client.embed_batch_sync(texts, model=self.ollama_embedding_model)
         except Exception as e:
-            print(f"生成embedding时出错: {str(e)}")
-            # 如果调用失败，返回空向量作为后备
-            return [[0.0] * 1024] * len(texts)  # 假设向量维度为1024
+            logger.error(f"Error embedding predefined Cypher queries: {str(e)}")
+            return None
     
-    def _compute_query_vectors(self) -> Dict[str, np.ndarray]:
-        """预计算所有预定义查询的向量表示"""
+    def _build_query_texts(self) -> Tuple[List[str], List[str]]:
+        """为所有预定义查询构建用于向量化的文本"""
         query_texts = []
         query_keys = []
         
@@ -67,12 +60,43 @@ class VectorQueryMatcher:
             query_texts.append(query_text)
             query_keys.append(query_name)
         
-        # 计算向量表示
-        vectors = self._embed_texts(query_texts)
-        
-        # 创建查询名到向量的映射
-        return {key: np.array(vector) for key, vector in zip(query_keys, vectors)}
+        return query_keys, query_texts
+
+    @staticmethod
+    def _normalize(vectors: List[np.ndarray]) -> np.ndarray:
+        """将向量堆叠为矩阵并按行归一化，归一化后内积即余弦相似度"""
+        matrix = np.vstack([np.asarray(v, dtype=np.float32) for v in vectors])
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def _compute_query_vectors(self) -> Optional[np.ndarray]:
+        """预计算所有预定义查询的向量表示，向量化失败时不缓存，下次匹配时重试"""
+        if self.query_matrix is None:
+            vectors = self._embed_texts(self.query_texts)
+            if vectors is None:
+                return None
+            self.query_matrix = self._normalize(vectors)
+        return self.query_matrix
     
+    def _rank(self, question_vector: np.ndarray, query_matrix: np.ndarray, top_k: int) -> List[Dict[str, Any]]:
+        """按余弦相似度对预定义查询排序，过滤掉低于阈值的匹配"""
+        similarities = query_matrix @ self._normalize([question_vector])[0]
+        top = np.argsort(-similarities)[:top_k]
+        
+        results = []
+        for i in top:
+            similarity = float(similarities[i])
+            if similarity >= self.similarity_threshold:
+                query_name = self.query_keys[i]
+                results.append({
+                    "query_name": query_name,
+                    "similarity": similarity,
+                    "cypher": self.predefined_cypher_dict[query_name]
+                })
+        
+        return results
+
     def match_query(self, user_question: str, top_k: int = 3) -> List[Dict[str, Any]]:
         """
         将用户问题匹配到最相似的预定义查询
@@ -82,31 +106,15 @@ class VectorQueryMatcher:
         top_k: 返回的最佳匹配数量
         
         返回:
-        包含匹配查询名称和相似度分数的字典列表，按相似度降序排列
+        包含匹配查询名称和相似度分数的字典列表，按相似度降序排列；向量化失败时返回空列表
         """
-        # 对用户问题进行向量化
-        question_vector = np.array(self._embed_texts([user_question])[0])
-        
-        # 计算用户问题与所有预定义查询的相似度
-        similarities = []
-        for query_name, query_vector in self.query_vectors.items():
-            similarity = cosine_similarity([question_vector], [query_vector])[0][0]
-            similarities.append((query_name, similarity))
-        
-        # 按相似度降序排序
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        
-        # 提取前top_k个结果，但过滤掉低于阈值的匹配
-        results = []
-        for query_name, similarity in similarities[:top_k]:
-            if similarity >= self.similarity_threshold:
-                results.append({
-                    "query_name": query_name,
-                    "similarity": float(similarity),
-                    "cypher": self.predefined_cypher_dict[query_name]
-                })
-        
-        return results
+        query_matrix = self._compute_query_vectors()
+        if query_matrix is None:
+            return []
+        question_vectors = self._embed_texts([user_question])
+        if question_vectors is None:
+            return []
+        return self._rank(question_vectors[0], query_matrix, top_k)
     
     def extract_parameters(self, user_question: str, query_name: str, llm=None) -> Dict[str, str]:
         """
@@ -30,7 +30,7 @@ def create_text2cypher_generation_node(
 
         task = state.get("task", "")
         # 获取针对当前任务的cypher示例, 选择 k 个
-        examples: str = cypher_example_retriever.get_examples(
+        examples: str = await cypher_example_retriever.aget_examples(
             **{"query": task[0] if isinstance(task, list) else task, "k": 3}
         )
         generated_cypher = await text2cypher_chain.ainvoke(
@@ -73,7 +73,7 @@ def create_text2cypher_validation_node(
         mapping_errors = []
 
         # 检查Cypher查询的语法是否正确，例如括号匹配、关键字使用等。
-        syntax_error = validate_cypher_query_syntax(
+        syntax_error = await validate_cypher_query_syntax(
             graph=graph, cypher_statement=state.get("statement", "")
         )
 
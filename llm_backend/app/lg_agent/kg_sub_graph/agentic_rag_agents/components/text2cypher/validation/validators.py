@@ -6,17 +6,19 @@ from typing import Any, Dict, List, Literal, Optional, Set, Tuple, Union
 
 from langchain_core.runnables.base import Runnable
 from langchain_neo4j import Neo4jGraph
-from langchain_neo4j.chains.graph_qa.cypher_utils import CypherQueryCorrector, Schema
+from langchain_neo4j.chains.graph_qa.cypher_utils import CypherQueryCorrector
 from neo4j.exceptions import CypherSyntaxError
 
+from app.lg_agent.kg_sub_graph.kg_neo4j_conn import query_neo4j
+from app.lg_agent.kg_sub_graph.kg_schema import GraphSchemaSnapshot, get_graph_schema
+
 from ....components.text2cypher.validation.models import ValidateCypherOutput
 from ....constants import WRITE_CLAUSES
-from ...utils.utils import retrieve_and_parse_schema_from_graph_for_prompts
 from .models import (
     CypherValidationTask,
-    Neo4jStructuredSchema,
     Neo4jStructuredSchemaPropertyNumber,
 )
+from .value_mapping import find_missing_value_mappings
 from .utils.cypher_extractors import (
     extract_entities_for_validation,
 )
@@ -25,9 +27,11 @@ from .utils.cypher_extractors import (
 from .utils.utils import update_task_list_with_property_type
 
 
-def validate_cypher_query_syntax(graph: Neo4jGraph, cypher_statement: str) -> List[str]:
+async def validate_cypher_query_syntax(
+    graph: Neo4jGraph, cypher_statement: str
+) -> List[str]:
     """
-    Validate the Cypher statement syntax by running an EXPLAIN query.
+    Validate the Cypher statement syntax by running a read-only EXPLAIN query on the graph.
 
     Parameters
     ----------
@@ -43,7 +47,7 @@ def validate_cypher_query_syntax(graph: Neo4jGraph, cypher_statement: str) -> Li
     """
     errors = list()
     try:
-        graph.query(f"EXPLAIN {cypher_statement}")
+        await query_neo4j(f"EXPLAIN {cypher_statement}", graph=graph, read_only=True)
     except CypherSyntaxError as e:
         errors.append(str(e.message))
     return errors
@@ -68,10 +72,7 @@ def correct_cypher_query_relationship_direction(
         The Cypher statement with corrected Relationship directions.
     """
     # Cypher query corrector is experimental
-    corrector_schema = [
-        Schema(el["start"], el["type"], el["end"])
-        for el in graph.structured_schema.get("relationships", list())
-    ]
+    corrector_schema = get_graph_schema(graph).relationship_directions
     cypher_query_corrector = CypherQueryCorrector(corrector_schema)
 
     corrected_cypher: str = cypher_query_corrector(cypher_statement)
@@ -109,35 +110,32 @@ async def validate_cypher_query_with_llm(
 
     errors: List[str] = []
     mapping_errors: List[str] = []
+    schema_snapshot = get_graph_schema(graph)
 
     llm_output: ValidateCypherOutput = await validate_cypher_chain.ainvoke(
         {
             "question": question,
-            "schema": retrieve_and_parse_schema_from_graph_for_prompts(graph),
+            "schema": schema_snapshot.prompt_schema,
             "cypher": cypher_statement,
         }
     )
     if llm_output.errors:
         errors.extend(llm_output.errors)
     if llm_output.filters:
-        for filter in llm_output.filters:
-            # Do mapping only for string values
-            if (
-                not [
-                    prop
-                    for prop in graph.structured_schema["node_props"][filter.node_label]
-                    if prop["property"] == filter.property_key
-                ][0]["type"]
-                == "STRING"
-            ):
-                continue
-            mapping = graph.query(
-                f"MATCH (n:{filter.node_label}) WHERE toLower(n.`{filter.property_key}`) = toLower($value) RETURN 'yes' LIMIT 1",
-                {"value": filter.property_value},
+        # Do mapping only for string values
+        filters = [
+            (filter.node_label, filter.property_key, filter.property_value)
+            for filter in llm_output.filters
+            if schema_snapshot.node_property_types.get(filter.node_label, {}).get(
+                filter.property_key
             )
-            if not mapping:
-                mapping_error = f"Missing value mapping for {filter.node_label} on property {filter.property_key} with value {filter.property_value}"
-                mapping_errors.append(mapping_error)
+            == "STRING"
+        ]
+        # Check every value in a single round trip
+        missing = await find_missing_value_mappings(filters, graph=graph)
+        for node_label, property_key, property_value in missing:
+            mapping_error = f"Missing value mapping for {node_label} on property {property_key} with value {property_value}"
+            mapping_errors.append(mapping_error)
     return {"errors": errors, "mapping_errors": mapping_errors}
 
 
@@ -163,16 +161,19 @@ def validate_cypher_query_with_schema(
         A list of any found errors.
     """
 
-    schema: Neo4jStructuredSchema = Neo4jStructuredSchema.model_validate(
-        graph.get_structured_schema
-    )
+    schema = get_graph_schema(graph)
+    if schema.validation_schema is None:
+        raise ValueError(
+            "Validating Cypher with the graph schema requires property values, "
+            "create the Neo4jGraph with `enhanced_schema=True`."
+        )
     nodes_and_rels = extract_entities_for_validation(cypher_statement=cypher_statement)
 
     node_tasks = update_task_list_with_property_type(
-        nodes_and_rels.get("nodes", list()), schema, "node"
+        nodes_and_rels.get("nodes", list()), schema.validation_schema, "node"
     )
     rel_tasks = update_task_list_with_property_type(
-        nodes_and_rels.get("relationships", list()), schema, "rel"
+        nodes_and_rels.get("relationships", list()), schema.validation_schema, "rel"
     )
 
     errors: List[str] = list()
@@ -223,9 +224,9 @@ def validate_cypher_query_with_schema(
 
 
 def _validate_node_property_values_with_enum(
-    structure_graph_schema: Neo4jStructuredSchema, tasks: List[CypherValidationTask]
+    structure_graph_schema: GraphSchemaSnapshot, tasks: List[CypherValidationTask]
 ) -> List[str]:
-    prop_values_enum = structure_graph_schema.get_node_property_values_enum()
+    prop_values_enum = structure_graph_schema.node_property_values_enum
 
     errors = list()
 
@@ -246,9 +247,9 @@ def _validate_node_property_values_with_enum(
 
 
 def _validate_node_property_names_with_enum(
-    structure_graph_schema: Neo4jStructuredSchema, tasks: List[CypherValidationTask]
+    structure_graph_schema: GraphSchemaSnapshot, tasks: List[CypherValidationTask]
 ) -> List[str]:
-    prop_enum = structure_graph_schema.get_node_properties_enum()
+    prop_enum = structure_graph_schema.node_properties_enum
 
     errors = list()
 
@@ -268,9 +269,9 @@ def _validate_node_property_names_with_enum(
 
 
 def _validate_relationship_property_names_with_enum(
-    structure_graph_schema: Neo4jStructuredSchema, tasks: List[CypherValidationTask]
+    structure_graph_schema: GraphSchemaSnapshot, tasks: List[CypherValidationTask]
 ) -> List[str]:
-    prop_enum = structure_graph_schema.get_relationship_properties_enum()
+    prop_enum = structure_graph_schema.relationship_properties_enum
 
     errors = list()
 
@@ -290,9 +291,9 @@ def _validate_relationship_property_names_with_enum(
 
 
 def _validate_relationship_property_values_with_enum(
-    structure_graph_schema: Neo4jStructuredSchema, tasks: List[CypherValidationTask]
+    structure_graph_schema: GraphSchemaSnapshot, tasks: List[CypherValidationTask]
 ) -> List[str]:
-    prop_values_enum = structure_graph_schema.get_relationship_property_values_enum()
+    prop_values_enum = structure_graph_schema.relationship_property_values_enum
 
     errors = list()
 
@@ -312,10 +313,10 @@ def _validate_relationship_property_values_with_enum(
 
 
 def _validate_node_property_values_with_range(
-    structure_graph_schema: Neo4jStructuredSchema,
+    structure_graph_schema: GraphSchemaSnapshot,
     tasks: List[CypherValidationTask],
 ) -> List[str]:
-    prop_values_range = structure_graph_schema.get_node_property_values_range()
+    prop_values_range = structure_graph_schema.node_property_values_range
 
     errors = list()
 
@@ -335,10 +336,10 @@ def _validate_node_property_values_with_range(
 
 
 def _validate_relationship_property_values_with_range(
-    structure_graph_schema: Neo4jStructuredSchema,
+    structure_graph_schema: GraphSchemaSnapshot,
     tasks: List[CypherValidationTask],
 ) -> List[str]:
-    prop_values_range = structure_graph_schema.get_relationship_property_values_range()
+    prop_values_range = structure_graph_schema.relationship_property_values_range
 
     errors = list()
 
@@ -0,0 +1,244 @@
+"""
+Batched value-mapping checks for the property values an LLM extracts from a question.
+
+All (label, property, value) filters of a Cypher statement are checked with a single
+UNION ALL / UNWIND query. A property backed by a `value_mapping_*` full-text index is
+looked up through the index instead of scanning every node of the label. Confirmed
+values are cached in-process until the graph schema changes. The indexes and the cache
+belong to the shared connection; other graphs are checked with plain label scans.
+"""
+
+import asyncio
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from langchain_neo4j import Neo4jGraph
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.lg_agent.kg_sub_graph.kg_neo4j_conn import (
+    get_neo4j_graph,
+    is_shared_neo4j_graph,
+    query_neo4j,
+)
+from app.lg_agent.kg_sub_graph.kg_schema import (
+    GraphSchemaSnapshot,
+    get_graph_schema,
+    get_schema_service,
+)
+
+logger = get_logger(service="value_mapping")
+
+# (node label, property key, property value)
+ValueMappingFilter = Tuple[str, str, str]
+
+VALUE_MAPPING_INDEX_PREFIX = "value_mapping"
+# lowercases tokens and keeps stop words, so every token of a value can be matched
+VALUE_MAPPING_INDEX_ANALYZER = "standard-no-stop-words"
+
+
+class ValueMappingCache:
+    """LRU set of (label, property, lowercase value) triples found in the database."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: "OrderedDict[Tuple[str, str, str], None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(label: str, property_key: str, value: str) -> Tuple[str, str, str]:
+        return (label, property_key, str(value).lower())
+
+    def __contains__(self, item: ValueMappingFilter) -> bool:
+        key = self._key(*item)
+        with self._lock:
+            if key not in self._items:
+                return False
+            self._items.move_to_end(key)
+            return True
+
+    def add(self, item: ValueMappingFilter) -> None:
+        if self.max_size <= 0:
+            return
+        key = self._key(*item)
+        with self._lock:
+            self._items[key] = None
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+_confirmed_values = ValueMappingCache(settings.NEO4J_VALUE_MAPPING_CACHE_SIZE)
+# a changed schema may come with changed data, forget what was confirmed before
+get_schema_service().add_listener(lambda snapshot: _confirmed_values.clear())
+
+# names of the online full-text indexes, read once and reset after creating indexes
+_fulltext_indexes: Optional[Set[str]] = None
+
+
+def value_mapping_index_name(label: str, property_key: str) -> str:
+    """Name of the full-text index backing value mapping for a node property."""
+    name = f"{VALUE_MAPPING_INDEX_PREFIX}_{label}_{property_key}"
+    return re.sub(r"[^0-9A-Za-z_]", "_", name)
+
+
+def _quote_name(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
+
+
+def _phrase_query(value: str) -> str:
+    """Lucene phrase query matching the tokens of the value in order."""
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+async def _get_fulltext_indexes() -> Set[str]:
+    global _fulltext_indexes
+    if _fulltext_indexes is None:
+        records = await query_neo4j(
+            "SHOW FULLTEXT INDEXES YIELD name, state WHERE state = 'ONLINE' RETURN name"
+        )
+        _fulltext_indexes = {record["name"] for record in records}
+    return _fulltext_indexes
+
+
+def build_value_mapping_query(
+    groups: Dict[Tuple[str, str], List[str]], indexes: Set[str]
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Build one query checking the values of every (label, property) group.
+
+    Parameters
+    ----------
+    groups : Dict[Tuple[str, str], List[str]]
+        The values to check, grouped by node label and property key.
+    indexes : Set[str]
+        Names of the online full-text indexes.
+
+    Returns
+    -------
+    Tuple[str, Dict[str, Any]]
+        The query and its parameters. The query returns a `group` and `value` row
+        for every value with at least one matching node.
+    """
+    parts: List[str] = []
+    params: Dict[str, Any] = {}
+    for i, ((label, property_key), values) in enumerate(groups.items()):
+        prop = _quote_name(property_key)
+        index_name = value_mapping_index_name(label, property_key)
+        if index_name in indexes:
+            params[f"index{i}"] = index_name
+            params[f"values{i}"] = [
+                {"value": value, "phrase": _phrase_query(value)} for value in values
+            ]
+            lookup = (
+                f"CALL db.index.fulltext.queryNodes($index{i}, value.phrase) YIELD node "
+                f"WHERE toLower(node.{prop}) = toLower(value.value) "
+                "RETURN node LIMIT 1"
+            )
+        else:
+            params[f"values{i}"] = [{"value": value} for value in values]
+            lookup = (
+                f"MATCH (node:{_quote_name(label)}) "
+                f"WHERE toLower(node.{prop}) = toLower(value.value) "
+                "RETURN node LIMIT 1"
+            )
+        parts.append(
+            f"UNWIND $values{i} AS value "
+            f"CALL {{ WITH value {lookup} }} "
+            f"RETURN {i} AS group, value.value AS value"
+        )
+    return " UNION ALL ".join(parts), params
+
+
+async def find_missing_value_mappings(
+    filters: List[ValueMappingFilter], graph: Optional[Neo4jGraph] = None
+) -> List[ValueMappingFilter]:
+    """
+    Find the filters with no node whose property matches the value, ignoring case.
+
+    Parameters
+    ----------
+    filters : List[ValueMappingFilter]
+        (node label, property key, property value) triples of string properties.
+    graph : Optional[Neo4jGraph], optional
+        The graph to check, by default the shared connection.
+
+    Returns
+    -------
+    List[ValueMappingFilter]
+        The filters without a match, in their original order.
+    """
+    shared = is_shared_neo4j_graph(graph)
+    unchecked = [f for f in filters if not shared or f not in _confirmed_values]
+    if not unchecked:
+        return []
+
+    groups: Dict[Tuple[str, str], List[str]] = {}
+    for label, property_key, value in unchecked:
+        values = groups.setdefault((label, property_key), [])
+        if all(str(v).lower() != str(value).lower() for v in values):
+            values.append(value)
+
+    indexes = await _get_fulltext_indexes() if shared else set()
+    query, params = build_value_mapping_query(groups, indexes)
+    records = await query_neo4j(query, params, graph=graph, read_only=True)
+
+    group_keys = list(groups.keys())
+    found: Set[ValueMappingFilter] = set()
+    for record in records:
+        label, property_key = group_keys[record["group"]]
+        if shared:
+            _confirmed_values.add((label, property_key, record["value"]))
+        found.add((label, property_key, str(record["value"]).lower()))
+
+    return [
+        (label, property_key, value)
+        for label, property_key, value in unchecked
+        if (label, property_key, str(value).lower()) not in found
+    ]
+
+
+async def create_value_mapping_indexes(snapshot: GraphSchemaSnapshot) -> List[str]:
+    """
+    Create a lowercase full-text index for every string node property in the schema
+    and wait for the indexes to come online.
+
+    Returns
+    -------
+    List[str]
+        The names of the value-mapping indexes.
+    """
+    global _fulltext_indexes
+    names: List[str] = []
+    for label, properties in snapshot.node_property_types.items():
+        for property_key, property_type in properties.items():
+            if property_type != "STRING":
+                continue
+            name = value_mapping_index_name(label, property_key)
+            await query_neo4j(
+                f"CREATE FULLTEXT INDEX {_quote_name(name)} IF NOT EXISTS "
+                f"FOR (n:{_quote_name(label)}) ON EACH [n.{_quote_name(property_key)}] "
+                f"OPTIONS {{indexConfig: {{`fulltext.analyzer`: '{VALUE_MAPPING_INDEX_ANALYZER}'}}}}"
+            )
+            names.append(name)
+    if names:
+        await query_neo4j("CALL db.awaitIndexes(300)", timeout=0)
+    _fulltext_indexes = None
+    return names
+
+
+async def init_value_mapping_indexes():
+    """Create the value-mapping indexes at startup, failures are only logged."""
+    try:
+        graph = await asyncio.to_thread(get_neo4j_graph)
+        names = await create_value_mapping_indexes(get_graph_schema(graph))
+        logger.info(f"Value mapping indexes online: {len(names)}")
+    except Exception as e:
+        logger.error(f"Failed to create value mapping indexes: {str(e)}")
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import Any
+import asyncio
 from pydantic import BaseModel, ConfigDict
 import re
 
@@ -29,3 +30,10 @@ class BaseCypherExampleRetriever(BaseModel, ABC):
             格式化的示例字符串，每个示例包含问题和对应的Cypher查询
         """
         pass
+
+    async def aget_examples(self, query: str, k: int = 5) -> str:
+        """
+        get_examples 的异步版本，在 LangGraph 的异步节点中使用。
+        默认在线程中执行 get_examples，需要访问网络的检索器可以重写为真正的异步实现。
+        """
+        return await asyncio.to_thread(self.get_examples, query, k)
@@ -0,0 +1,207 @@
+from typing import Any, Dict, List, Optional
+import threading
+import numpy as np
+from pydantic import Field, PrivateAttr
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.services.ollama_embedding_client import get_embedding_client
+from app.lg_agent.kg_sub_graph.agentic_rag_agents.embeddings import EmbedderProtocol
+from app.lg_agent.kg_sub_graph.agentic_rag_agents.ingest.cypher_examples.models import CypherIngestRecord
+from app.lg_agent.kg_sub_graph.agentic_rag_agents.retrievers.cypher_examples.base import BaseCypherExampleRetriever
+from app.lg_agent.kg_sub_graph.agentic_rag_agents.retrievers.cypher_examples.northwind_retriever import NORTHWIND_CYPHER_EXAMPLES
+
+logger = get_logger(service="cypher_examples")
+
+
+def normalize_rows(vectors: List[Any]) -> np.ndarray:
+    """将向量堆叠为矩阵并按行归一化，归一化后内积即余弦相似度"""
+    matrix = np.vstack([np.asarray(v, dtype=np.float32) for v in vectors])
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def maximal_marginal_relevance(
+    query_vector: np.ndarray,
+    matrix: np.ndarray,
+    k: int,
+    lambda_mult: float = 0.5,
+    fetch_k: int = 20,
+) -> List[int]:
+    """
+    按最大边际相关性(MMR)从归一化矩阵中选出 k 行
+
+    先按余弦相似度取出 fetch_k 个候选，再逐个挑选与问题相关、又与已选示例不重复的候选。
+
+    参数:
+    query_vector: 归一化后的问题向量
+    matrix: 按行归一化的示例向量矩阵
+    k: 返回的示例数量
+    lambda_mult: 相关性与多样性的权衡，1 表示只看相关性，0 表示只看多样性
+    fetch_k: 参与挑选的候选数量
+
+    返回:
+    选中的行号，按选中的先后排列
+    """
+    n = matrix.shape[0]
+    if n == 0 or k <= 0:
+        return []
+    similarities = matrix @ query_vector
+    fetch = min(max(fetch_k, k), n)
+    candidates = np.argpartition(-similarities, fetch - 1)[:fetch]
+    candidates = candidates[np.argsort(-similarities[candidates])]
+
+    candidate_matrix = matrix[candidates]
+    relevance = similarities[candidates]
+    # 每个候选与已选示例的最大相似度
+    redundancy = np.full(fetch, -np.inf, dtype=np.float32)
+    selected: List[int] = []
+    available = np.ones(fetch, dtype=bool)
+    for _ in range(min(k, fetch)):
+        if selected:
+            scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        else:
+            scores = relevance.copy()
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, candidate_matrix @ candidate_matrix[best])
+    return [int(candidates[i]) for i in selected]
+
+
+class EmbeddingCypherExampleRetriever(BaseCypherExampleRetriever):
+    """
+    基于向量相似度的Cypher示例检索器
+
+    所有示例问题只向量化一次，保存为按行归一化的 NumPy 矩阵，检索时只需要向量化用户问题，
+    再做一次矩阵乘法和 MMR 挑选，结果不再依赖中文分词和关键词规则。
+    """
+
+    examples: List[Dict[str, str]] = Field(
+        description="Cypher示例列表，每个示例包含 question 和 cypher"
+    )
+    embedder: Optional[EmbedderProtocol] = Field(
+        default=None, description="向量化模型，默认使用共享的 Ollama 向量化客户端"
+    )
+    lambda_mult: float = Field(
+        default=0.5, description="MMR 中相关性与多样性的权衡，1 表示只看相关性"
+    )
+    fetch_k: int = Field(default=20, description="参与 MMR 挑选的候选数量")
+
+    _matrix: Optional[np.ndarray] = PrivateAttr(default=None)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @classmethod
+    def from_ingest_records(
+        cls, records: List[CypherIngestRecord], **kwargs: Any
+    ) -> "EmbeddingCypherExampleRetriever":
+        """使用 ingest/cypher_examples 流程中已经计算好的向量创建检索器，不再重复向量化"""
+        retriever = cls(
+            examples=[
+                {"question": r.question, "cypher": r.cypher_statement} for r in records
+            ],
+            **kwargs,
+        )
+        if records:
+            retriever._matrix = normalize_rows([r.question_embedding for r in records])
+        return retriever
+
+    def _embed(self, texts: List[str]) -> List[Any]:
+        if self.embedder is None:
+            return get_embedding_client().embed_batch_sync(texts, model=settings.OLLAMA_EMBEDDING_MODEL)
+        return [self.embedder.embed_query(text) for text in texts]
+
+    async def _aembed(self, texts: List[str]) -> List[Any]:
+        if self.embedder is None:
+            return await get_embedding_client().embed_batch(texts, model=settings.OLLAMA_EMBEDDING_MODEL)
+        return [self.embedder.embed_query(text) for text in texts]
+
+    def build_index(self) -> np.ndarray:
+        """向量化全部示例问题，只在第一次调用时执行"""
+        if self._matrix is None:
+            with self._lock:
+                if self._matrix is None:
+                    questions = [example["question"] for example in self.examples]
+                    self._matrix = normalize_rows(self._embed(questions))
+                    logger.info(f"Cypher example index built: {len(questions)} examples")
+        return self._matrix
+
+    async def abuild_index(self) -> np.ndarray:
+        """build_index 的异步版本，可以在服务启动时预先调用"""
+        if self._matrix is None:
+            questions = [example["question"] for example in self.examples]
+            matrix = normalize_rows(await self._aembed(questions))
+            with self._lock:
+                if self._matrix is None:
+                    self._matrix = matrix
+                    logger.info(f"Cypher example index built: {len(questions)} examples")
+        return self._matrix
+
+    def _select(self, matrix: np.ndarray, query_vector: Any, k: int) -> str:
+        """按 MMR 选出示例，并格式化为 text2cypher 期望的格式"""
+        indices = maximal_marginal_relevance(
+            normalize_rows([query_vector])[0],
+            matrix,
+            k,
+            lambda_mult=self.lambda_mult,
+            fetch_k=self.fetch_k,
+        )
+        return "\n\n".join([
+            f"Question: {self.examples[i]['question']}\nCypher: {self.examples[i]['cypher']}"
+            for i in indices
+        ])
+
+    def _fallback(self, k: int, error: Exception) -> str:
+        """向量化失败时按原始顺序返回前 k 个示例，避免整个查询失败"""
+        logger.warning(f"Failed to embed Cypher examples, using the first {k}: {str(error)}")
+        return "\n\n".join([
+            f"Question: {example['question']}\nCypher: {example['cypher']}"
+            for example in self.examples[:k]
+        ])
+
+    def get_examples(self, query: str, k: int = 5) -> str:
+        """
+        根据用户查询返回相关的Cypher查询示例
+
+        Parameters
+        ----------
+        query : str
+            用户的自然语言查询
+        k : int, optional
+            返回的示例数量, by default 5
+
+        Returns
+        -------
+        str
+            格式化的示例字符串，每个示例包含问题和对应的Cypher查询
+        """
+        if not self.examples:
+            return ""
+        try:
+            matrix = self.build_index()
+            query_vector = self._embed([query])[0]
+        except Exception as e:
+            return self._fallback(k, e)
+        return self._select(matrix, query_vector, k)
+
+    async def aget_examples(self, query: str, k: int = 5) -> str:
+        """get_examples 的异步版本，向量化时不阻塞事件循环"""
+        if not self.examples:
+            return ""
+        try:
+            matrix = await self.abuild_index()
+            query_vector = (await self._aembed([query]))[0]
+        except Exception as e:
+            return self._fallback(k, e)
+        return self._select(matrix, query_vector, k)
+
+
+def create_northwind_embedding_retriever(**kwargs: Any) -> EmbeddingCypherExampleRetriever:
+    """使用内置的 Northwind 示例创建向量检索器"""
+    examples = [
+        example
+        for category_examples in NORTHWIND_CYPHER_EXAMPLES.values()
+        for example in category_examples
+    ]
+    return EmbeddingCypherExampleRetriever(examples=examples, **kwargs)
@@ -111,7 +111,9 @@ def create_multi_tool_workflow(
     planner = create_planner_node(llm=llm)
 
     # 3. 创建cypher_query节点，用来根据用户的问题生成Cypher查询语句
-    cypher_query = create_cypher_query_node()
+    cypher_query = create_cypher_query_node(
+        llm=llm, graph=graph, cypher_example_retriever=cypher_example_retriever
+    )
 
     predefined_cypher = create_predefined_cypher_node(
         graph=graph, predefined_cypher_dict=predefined_cypher_dict
@@ -1,7 +1,11 @@
 from langchain_neo4j import Neo4jGraph
+from neo4j import AsyncDriver, AsyncGraphDatabase, Query, RoutingControl
 from app.core.config import settings
 from app.core.logger import get_logger
+from typing import Any, Dict, List, Optional
+import asyncio
 import logging
+import threading
 
 # 获取日志记录器
 logger = get_logger(service="kg_builder")
@@ -14,23 +18,111 @@ logging.getLogger("langchain_neo4j").setLevel(logging.ERROR)
 logging.getLogger("neo4j.io").setLevel(logging.ERROR)
 logging.getLogger("neo4j.bolt").setLevel(logging.ERROR)
 
+# 进程内共享的 Neo4j 连接，创建时会读取一次图谱结构
+_neo4j_graph: Optional[Neo4jGraph] = None
+_neo4j_graph_lock = threading.Lock()
+# 异步查询使用的驱动，自带有上限的连接池，在服务的事件循环中共享
+_async_driver: Optional[AsyncDriver] = None
+
 def get_neo4j_graph() -> Neo4jGraph:
     """
-    创建并返回一个Neo4jGraph实例，使用配置文件中的设置。
+    返回共享的Neo4jGraph实例，第一次调用时使用配置文件中的设置创建。
+
+    Neo4jGraph 内部的驱动自带连接池并且线程安全，所有请求复用同一个实例，
+    避免每次提问都重新建立连接、重新读取图谱结构。创建失败时不缓存，下次调用会重试。
     
     Returns:
         Neo4jGraph: 配置好的Neo4j图数据库连接实例
     """
-    logger.info(f"initialize Neo4j connection: {settings.NEO4J_URL}")
-    
-    try:
-        # 创建Neo4j图实例
-        neo4j_graph = Neo4jGraph(
-            url=settings.NEO4J_URL,
-            username=settings.NEO4J_USERNAME,
-            password=settings.NEO4J_PASSWORD,
-            database=settings.NEO4J_DATABASE
+    global _neo4j_graph
+    if _neo4j_graph is not None:
+        return _neo4j_graph
+    with _neo4j_graph_lock:
+        if _neo4j_graph is None:
+            logger.info(f"initialize Neo4j connection: {settings.NEO4J_URL}")
+            # 创建Neo4j图实例
+            _neo4j_graph = Neo4jGraph(
+                url=settings.NEO4J_URL,
+                username=settings.NEO4J_USERNAME,
+                password=settings.NEO4J_PASSWORD,
+                database=settings.NEO4J_DATABASE
+            )
+        return _neo4j_graph
+
+def refresh_neo4j_schema():
+    """图谱结构变化后，重新读取共享连接上缓存的图谱结构并更新图谱结构快照"""
+    # 延迟导入，kg_schema 依赖的配置和工具模块较多
+    from app.lg_agent.kg_sub_graph.kg_schema import get_schema_service
+
+    if _neo4j_graph is not None:
+        snapshot = get_schema_service().refresh(_neo4j_graph)
+        logger.info(f"Neo4j graph schema refreshed, version: {snapshot.version}")
+
+def get_async_neo4j_driver() -> AsyncDriver:
+    """
+    返回共享的 Neo4j 异步驱动，第一次调用时创建。
+
+    LangGraph 节点都是异步执行的，通过异步驱动查询时不会阻塞事件循环，
+    并行的多个子任务可以同时等待各自的查询结果。连接池大小由 NEO4J_MAX_CONNECTION_POOL_SIZE 限制。
+    """
+    global _async_driver
+    if _async_driver is None:
+        _async_driver = AsyncGraphDatabase.driver(
+            settings.NEO4J_URL,
+            auth=(settings.NEO4J_USERNAME, settings.NEO4J_PASSWORD),
+            max_connection_pool_size=settings.NEO4J_MAX_CONNECTION_POOL_SIZE,
         )
-        return neo4j_graph
-    except Exception as e:
-        raise
\ No newline at end of file
+    return _async_driver
+
+def is_shared_neo4j_graph(graph: Optional[Neo4jGraph]) -> bool:
+    """是否为共享连接(或未指定连接)，此时查询走共享的异步驱动"""
+    return graph is None or graph is _neo4j_graph
+
+async def query_neo4j(
+    query: str,
+    params: Optional[Dict[str, Any]] = None,
+    timeout: Optional[float] = None,
+    graph: Optional[Neo4jGraph] = None,
+    read_only: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    异步执行一条 Cypher 查询，返回格式与 Neo4jGraph.query 相同。
+
+    Args:
+        query: Cypher 查询语句
+        params: 查询参数
+        timeout: 查询超时时间(秒)，默认使用 NEO4J_QUERY_TIMEOUT，超时后由数据库终止事务并抛出异常
+        graph: 执行查询的图谱连接，未指定或为共享连接时使用共享的异步驱动；
+            其他 Neo4jGraph(例如连接到其他数据库的实例)在线程池中使用它自己的驱动和数据库执行
+        read_only: 以只读事务执行，集群中路由到读节点，数据库会拒绝其中的写操作。
+            执行大模型生成的语句时应设为 True
+
+    Returns:
+        List[Dict[str, Any]]: 每条记录转换成的字典
+    """
+    if timeout is None:
+        timeout = settings.NEO4J_QUERY_TIMEOUT or None
+    routing = RoutingControl.READ if read_only else RoutingControl.WRITE
+    if is_shared_neo4j_graph(graph):
+        records, _, _ = await get_async_neo4j_driver().execute_query(
+            Query(text=query, timeout=timeout),
+            parameters_=params,
+            database_=settings.NEO4J_DATABASE,
+            routing_=routing,
+        )
+    else:
+        records, _, _ = await asyncio.to_thread(
+            graph._driver.execute_query,
+            Query(text=query, timeout=timeout),
+            parameters_=params,
+            database_=graph._database,
+            routing_=routing,
+        )
+    return [record.data() for record in records]
+
+async def close_async_neo4j_driver():
+    """服务关闭时释放异步驱动的连接池"""
+    global _async_driver
+    if _async_driver is not None:
+        await _async_driver.close()
+        _async_driver = None
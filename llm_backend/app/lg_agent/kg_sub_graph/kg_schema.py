@@ -0,0 +1,171 @@
+from typing import Any, Callable, Dict, List, Optional, Set
+from dataclasses import dataclass, field
+import asyncio
+import hashlib
+import json
+import threading
+import weakref
+import regex as re
+from langchain_neo4j import Neo4jGraph
+from langchain_neo4j.chains.graph_qa.cypher_utils import Schema
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.lg_agent.kg_sub_graph.agentic_rag_agents.components.utils.regex_patterns import get_cypher_query_node_graph_schema
+
+logger = get_logger(service="kg_schema")
+
+
+def parse_schema_for_prompts(schema: str) -> str:
+    """把 Neo4jGraph 的图谱结构文本整理成可以直接放进提示词模版的形式"""
+    # 过滤掉对用户查询不相关的内部结构信息
+    if "CypherQuery" in schema:
+        schema = re.sub(
+            get_cypher_query_node_graph_schema(), r"\2", schema, flags=re.MULTILINE
+        )
+
+    # 将所有花括号替换为方括号，避免与 ChatPromptTemplate 模版中的 input_variables 冲突
+    return schema.replace("{", "[").replace("}", "]")
+
+
+@dataclass(frozen=True)
+class GraphSchemaSnapshot:
+    """某一时刻的图谱结构，以及提示词和校验器需要的预计算结果
+
+    快照创建后不再修改，可以在多个请求、多个线程之间共享。
+    """
+
+    version: str                                  # 结构化图谱结构的哈希
+    structured_schema: Dict[str, Any]             # Neo4jGraph.structured_schema 原始数据
+    prompt_schema: str                            # 提示词中使用的图谱结构文本
+    relationship_directions: List[Schema]         # 关系方向，用于纠正 Cypher 中的关系方向
+    node_property_types: Dict[str, Dict[str, str]]  # 节点标签 -> 属性名 -> 属性类型
+    validation_schema: Optional[Any] = None       # Neo4jStructuredSchema，结构中没有属性取值信息时为 None
+    node_properties_enum: Dict[str, Set[str]] = field(default_factory=dict)
+    relationship_properties_enum: Dict[str, Set[str]] = field(default_factory=dict)
+    node_property_values_enum: Dict[str, Dict[str, Set[str]]] = field(default_factory=dict)
+    relationship_property_values_enum: Dict[str, Dict[str, Set[str]]] = field(default_factory=dict)
+    node_property_values_range: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    relationship_property_values_range: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+
+
+def compute_schema_version(structured_schema: Dict[str, Any]) -> str:
+    """按结构化图谱结构的内容计算版本号，结构不变时版本号不变"""
+    data = json.dumps(structured_schema, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.md5(data.encode("utf-8")).hexdigest()
+
+
+def build_schema_snapshot(graph: Neo4jGraph) -> GraphSchemaSnapshot:
+    """根据 Neo4jGraph 上缓存的图谱结构生成快照，不访问数据库"""
+    # 延迟导入，避免与 text2cypher 校验模块之间的循环导入
+    from app.lg_agent.kg_sub_graph.agentic_rag_agents.components.text2cypher.validation.models import Neo4jStructuredSchema
+
+    structured_schema = graph.structured_schema
+    snapshot = dict(
+        version=compute_schema_version(structured_schema),
+        structured_schema=structured_schema,
+        prompt_schema=parse_schema_for_prompts(graph.get_schema),
+        relationship_directions=[
+            Schema(el["start"], el["type"], el["end"])
+            for el in structured_schema.get("relationships", list())
+        ],
+        node_property_types={
+            label: {prop["property"]: prop["type"] for prop in props}
+            for label, props in structured_schema.get("node_props", {}).items()
+        },
+    )
+    try:
+        # 只有 enhanced_schema=True 的连接才带有属性取值信息，才能按结构校验 Cypher
+        schema = Neo4jStructuredSchema.model_validate(structured_schema)
+    except ValueError:
+        return GraphSchemaSnapshot(**snapshot)
+    return GraphSchemaSnapshot(
+        **snapshot,
+        validation_schema=schema,
+        node_properties_enum=schema.get_node_properties_enum(),
+        relationship_properties_enum=schema.get_relationship_properties_enum(),
+        node_property_values_enum=schema.get_node_property_values_enum(),
+        relationship_property_values_enum=schema.get_relationship_property_values_enum(),
+        node_property_values_range=schema.get_node_property_values_range(),
+        relationship_property_values_range=schema.get_relationship_property_values_range(),
+    )
+
+
+class Neo4jSchemaService:
+    """图谱结构快照服务
+
+    - 每个 Neo4jGraph 只在图谱结构变化后重新生成快照，提示词、Cypher 生成和校验共用同一份结果
+    - 可以按固定间隔从 Neo4j 重新读取图谱结构，版本号变化时通知已注册的回调
+    """
+
+    def __init__(self, refresh_interval: float = None):
+        self.refresh_interval = (
+            settings.NEO4J_SCHEMA_REFRESH_INTERVAL if refresh_interval is None else refresh_interval
+        )
+        self._snapshots: "weakref.WeakKeyDictionary[Neo4jGraph, GraphSchemaSnapshot]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[GraphSchemaSnapshot], None]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    def get(self, graph: Neo4jGraph) -> GraphSchemaSnapshot:
+        """获取图谱结构快照；Neo4jGraph 重新读取过图谱结构后会自动重建"""
+        snapshot = self._snapshots.get(graph)
+        if snapshot is not None and snapshot.structured_schema is graph.structured_schema:
+            return snapshot
+        with self._lock:
+            previous = self._snapshots.get(graph)
+            if previous is not None and previous.structured_schema is graph.structured_schema:
+                return previous
+            snapshot = build_schema_snapshot(graph)
+            self._snapshots[graph] = snapshot
+        if previous is not None and previous.version != snapshot.version:
+            logger.info(f"Neo4j graph schema changed: {previous.version} -> {snapshot.version}")
+            for listener in self._listeners:
+                listener(snapshot)
+        return snapshot
+
+    def refresh(self, graph: Neo4jGraph) -> GraphSchemaSnapshot:
+        """从 Neo4j 重新读取图谱结构并更新快照，属于阻塞操作"""
+        graph.refresh_schema()
+        return self.get(graph)
+
+    def add_listener(self, listener: Callable[[GraphSchemaSnapshot], None]):
+        """注册图谱结构版本变化时的回调"""
+        self._listeners.append(listener)
+
+    async def start(self, get_graph: Callable[[], Neo4jGraph]):
+        """启动定时刷新任务，refresh_interval 为 0 时不启动"""
+        if self._task is None and self.refresh_interval > 0:
+            self._task = asyncio.create_task(self._refresh_loop(get_graph))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_loop(self, get_graph: Callable[[], Neo4jGraph]):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await asyncio.to_thread(lambda: self.refresh(get_graph()))
+            except Exception as e:
+                logger.warning(f"Failed to refresh Neo4j graph schema: {str(e)}")
+
+
+_schema_service: Optional[Neo4jSchemaService] = None
+
+
+def get_schema_service() -> Neo4jSchemaService:
+    """获取进程内共享的图谱结构快照服务"""
+    global _schema_service
+    if _schema_service is None:
+        _schema_service = Neo4jSchemaService()
+    return _schema_service
+
+
+def get_graph_schema(graph: Neo4jGraph) -> GraphSchemaSnapshot:
+    """获取图谱结构快照"""
+    return get_schema_service().get(graph)
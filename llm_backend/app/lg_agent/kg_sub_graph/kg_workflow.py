@@ -0,0 +1,139 @@
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import threading
+from langchain_deepseek import ChatDeepSeek
+from langchain_ollama import ChatOllama
+from langgraph.graph.state import CompiledStateGraph
+from pydantic import BaseModel
+from app.core.config import settings, ServiceType
+from app.core.llm_rate_limit import deepseek_rate_limiter, ollama_rate_limiter, langchain_rate_limit
+from app.core.logger import get_logger
+from app.lg_agent.kg_sub_graph.kg_neo4j_conn import get_neo4j_graph, refresh_neo4j_schema
+from app.lg_agent.kg_sub_graph.kg_schema import GraphSchemaSnapshot, get_schema_service
+from app.lg_agent.kg_sub_graph.kg_tools_list import cypher_query, predefined_cypher, microsoft_graphrag_query
+from app.lg_agent.kg_sub_graph.agentic_rag_agents.components.predefined_cypher.cypher_dict import predefined_cypher_dict
+from app.lg_agent.kg_sub_graph.agentic_rag_agents.retrievers.cypher_examples.base import BaseCypherExampleRetriever
+from app.lg_agent.kg_sub_graph.agentic_rag_agents.retrievers.cypher_examples.northwind_retriever import NorthwindCypherRetriever
+from app.lg_agent.kg_sub_graph.agentic_rag_agents.retrievers.cypher_examples.embedding_retriever import (
+    EmbeddingCypherExampleRetriever,
+    create_northwind_embedding_retriever,
+)
+from app.lg_agent.kg_sub_graph.agentic_rag_agents.workflows.multi_agent.multi_tool import create_multi_tool_workflow
+
+logger = get_logger(service="kg_workflow")
+
+# 电商经营范围
+SCOPE_DESCRIPTION = """
+    个人电商经营范围：智能家居产品，包括但不限于：
+    - 智能照明（灯泡、灯带、开关）
+    - 智能安防（摄像头、门锁、传感器）
+    - 智能控制（温控器、遥控器、集线器）
+    - 智能音箱（语音助手、音响）
+    - 智能厨电（电饭煲、冰箱、洗碗机）
+    - 智能清洁（扫地机器人、洗衣机）
+
+    不包含：服装、鞋类、体育用品、化妆品、食品等非智能家居产品。
+    """
+
+# 按模型配置缓存编译好的多工具工作流
+_workflows: Dict[Tuple[str, str], CompiledStateGraph] = {}
+_workflows_lock = threading.Lock()
+# Cypher示例检索器，示例向量只计算一次，工作流重新编译时继续复用
+_cypher_example_retriever: Optional[BaseCypherExampleRetriever] = None
+
+
+def _model_config() -> Tuple[str, str]:
+    """当前 Agent 使用的模型服务和模型名称"""
+    if settings.AGENT_SERVICE == ServiceType.DEEPSEEK:
+        return ServiceType.DEEPSEEK.value, settings.DEEPSEEK_MODEL
+    return ServiceType.OLLAMA.value, settings.OLLAMA_AGENT_MODEL
+
+
+def get_cypher_example_retriever() -> BaseCypherExampleRetriever:
+    """根据 CYPHER_EXAMPLE_RETRIEVER 配置获取共享的Cypher示例检索器"""
+    global _cypher_example_retriever
+    if _cypher_example_retriever is None:
+        if settings.CYPHER_EXAMPLE_RETRIEVER == "northwind":
+            _cypher_example_retriever = NorthwindCypherRetriever()
+        else:
+            _cypher_example_retriever = create_northwind_embedding_retriever()
+    return _cypher_example_retriever
+
+
+def _build_multi_tool_workflow() -> CompiledStateGraph:
+    """创建模型、Neo4j连接和Cypher示例检索器，并编译多工具工作流"""
+    if settings.AGENT_SERVICE == ServiceType.DEEPSEEK:
+        model = ChatDeepSeek(api_key=settings.DEEPSEEK_API_KEY, model_name=settings.DEEPSEEK_MODEL, temperature=0.7, tags=["research_plan"], **langchain_rate_limit(deepseek_rate_limiter()))
+    else:
+        model = ChatOllama(model=settings.OLLAMA_AGENT_MODEL, base_url=settings.OLLAMA_BASE_URL, temperature=0.7, tags=["research_plan"], **langchain_rate_limit(ollama_rate_limiter(settings.OLLAMA_AGENT_MODEL)))
+
+    # 1. Neo4j图数据库连接 - 所有请求共享
+    neo4j_graph = get_neo4j_graph()
+
+    # 2. 创建自定义检索器实例，根据 Graph Schema 创建 Cypher 示例，用来引导大模型生成正确的Cypher 查询语句
+    cypher_retriever = get_cypher_example_retriever()
+
+    # 3. 定义工具模式列表
+    tool_schemas: List[type[BaseModel]] = [cypher_query, predefined_cypher, microsoft_graphrag_query]
+
+    return create_multi_tool_workflow(
+        llm=model,
+        graph=neo4j_graph,
+        tool_schemas=tool_schemas,
+        predefined_cypher_dict=predefined_cypher_dict,
+        cypher_example_retriever=cypher_retriever,
+        scope_description=SCOPE_DESCRIPTION,
+        llm_cypher_validation=True,
+    )
+
+
+def get_multi_tool_workflow() -> CompiledStateGraph:
+    """获取当前模型配置下编译好的多工具工作流，第一次调用时创建
+
+    创建时会连接 Neo4j 并读取图谱结构，属于阻塞操作，在事件循环中请通过线程调用。
+    """
+    key = _model_config()
+    workflow = _workflows.get(key)
+    if workflow is not None:
+        return workflow
+    with _workflows_lock:
+        workflow = _workflows.get(key)
+        if workflow is None:
+            logger.info(f"Building multi tool workflow for {key[0]}:{key[1]}")
+            workflow = _workflows[key] = _build_multi_tool_workflow()
+        return workflow
+
+
+def _clear_workflows(snapshot: GraphSchemaSnapshot = None):
+    """丢弃已编译的工作流
+
+    工作流中的提示词在编译时就拼入了图谱结构，所以图谱结构变化后需要在下次使用时重新编译。
+    """
+    with _workflows_lock:
+        _workflows.clear()
+    logger.info("Multi tool workflow will be rebuilt with the refreshed graph schema")
+
+
+# 定时刷新发现图谱结构版本变化时，同样丢弃已编译的工作流
+get_schema_service().add_listener(_clear_workflows)
+
+
+def refresh_multi_tool_workflow():
+    """图谱结构变化后调用：重新读取图谱结构，并丢弃已编译的工作流"""
+    refresh_neo4j_schema()
+    _clear_workflows()
+
+
+async def init_multi_tool_workflow():
+    """服务启动时预先编译工作流并向量化Cypher示例，失败时只记录日志，第一次提问时会再尝试"""
+    try:
+        await asyncio.to_thread(get_multi_tool_workflow)
+    except Exception as e:
+        logger.error(f"Failed to build multi tool workflow: {str(e)}", exc_info=True)
+
+    retriever = get_cypher_example_retriever()
+    if isinstance(retriever, EmbeddingCypherExampleRetriever):
+        try:
+            await retriever.abuild_index()
+        except Exception as e:
+            logger.error(f"Failed to build Cypher example index: {str(e)}")
@@ -13,15 +13,15 @@ from langchain_core.runnables import RunnableConfig
 from langchain_deepseek import ChatDeepSeek
 from langchain_ollama import ChatOllama
 from app.core.config import settings, ServiceType
+from app.core.llm_rate_limit import deepseek_rate_limiter, ollama_rate_limiter, langchain_rate_limit
 from app.core.logger import get_logger
 from typing import cast, Literal, TypedDict, List, Dict, Any
 from langchain_core.messages import BaseMessage
-from langgraph.checkpoint.memory import MemorySaver
+from app.lg_agent.checkpointer import create_checkpointer
 from langgraph.graph import END, START, StateGraph
 from app.lg_agent.lg_states import AgentState, InputState, Router, GradeHallucinations
-from app.lg_agent.kg_sub_graph.agentic_rag_agents.retrievers.cypher_examples.northwind_retriever import NorthwindCypherRetriever
 from app.lg_agent.kg_sub_graph.agentic_rag_agents.components.planner.node import create_planner_node
-from app.lg_agent.kg_sub_graph.agentic_rag_agents.workflows.multi_agent.multi_tool import create_multi_tool_workflow
+from app.lg_agent.kg_sub_graph.kg_workflow import get_multi_tool_workflow
 from app.lg_agent.kg_sub_graph.kg_neo4j_conn import get_neo4j_graph
 from pydantic import BaseModel
 from typing import Dict, List
@@ -71,10 +71,10 @@ async def analyze_and_route_query(
     """
     # 选择模型实例，通过.env文件中的AGENT_SERVICE参数选择
     if settings.AGENT_SERVICE == ServiceType.DEEPSEEK:
-        model = ChatDeepSeek(api_key=settings.DEEPSEEK_API_KEY, model_name=settings.DEEPSEEK_MODEL, temperature=0.7, tags=["router"])
+        model = ChatDeepSeek(api_key=settings.DEEPSEEK_API_KEY, model_name=settings.DEEPSEEK_MODEL, temperature=0.7, tags=["router"], **langchain_rate_limit(deepseek_rate_limiter()))
         logger.info(f"Using DeepSeek model: {settings.DEEPSEEK_MODEL}")
     else:
-        model = ChatOllama(model=settings.OLLAMA_AGENT_MODEL, base_url=settings.OLLAMA_BASE_URL, temperature=0.7, tags=["router"])
+        model = ChatOllama(model=settings.OLLAMA_AGENT_MODEL, base_url=settings.OLLAMA_BASE_URL, temperature=0.7, tags=["router"], **langchain_rate_limit(ollama_rate_limiter(settings.OLLAMA_AGENT_MODEL)))
         logger.info(f"Using Ollama model: {settings.OLLAMA_AGENT_MODEL}")
 
     # 拼接提示模版 + 用户的实时问题（包含历史上下文对话） 
@@ -140,9 +140,9 @@ async def respond_to_general_query(
     
     # 使用大模型生成回复
     if settings.AGENT_SERVICE == ServiceType.DEEPSEEK:
-        model = ChatDeepSeek(api_key=settings.DEEPSEEK_API_KEY, model_name=settings.DEEPSEEK_MODEL, temperature=0.7, tags=["general_query"])
+        model = ChatDeepSeek(api_key=settings.DEEPSEEK_API_KEY, model_name=settings.DEEPSEEK_MODEL, temperature=0.7, tags=["general_query"], **langchain_rate_limit(deepseek_rate_limiter()))
     else:
-        model = ChatOllama(model=settings.OLLAMA_AGENT_MODEL, base_url=settings.OLLAMA_BASE_URL, temperature=0.7, tags=["general_query"])
+        model = ChatOllama(model=settings.OLLAMA_AGENT_MODEL, base_url=settings.OLLAMA_BASE_URL, temperature=0.7, tags=["general_query"], **langchain_rate_limit(ollama_rate_limiter(settings.OLLAMA_AGENT_MODEL)))
     
     system_prompt = GENERAL_QUERY_SYSTEM_PROMPT.format(
         logic=state.router["logic"]
@@ -170,9 +170,9 @@ async def get_additional_info(
     
     # 使用大模型生成回复
     if settings.AGENT_SERVICE == ServiceType.DEEPSEEK:
-        model = ChatDeepSeek(api_key=settings.DEEPSEEK_API_KEY, model_name=settings.DEEPSEEK_MODEL, temperature=0.7, tags=["additional_info"])
+        model = ChatDeepSeek(api_key=settings.DEEPSEEK_API_KEY, model_name=settings.DEEPSEEK_MODEL, temperature=0.7, tags=["additional_info"], **langchain_rate_limit(deepseek_rate_limiter()))
     else:
-        model = ChatOllama(model=settings.OLLAMA_AGENT_MODEL, base_url=settings.OLLAMA_BASE_URL, temperature=0.7, tags=["additional_info"])
+        model = ChatOllama(model=settings.OLLAMA_AGENT_MODEL, base_url=settings.OLLAMA_BASE_URL, temperature=0.7, tags=["additional_info"], **langchain_rate_limit(ollama_rate_limiter(settings.OLLAMA_AGENT_MODEL)))
 
     # 如果用户的问题是电商相关，但与自己的业务无关，则需要返回"无关问题"
 
@@ -353,9 +353,9 @@ async def create_image_query(
                     
                     # 构建回复请求
                     if settings.AGENT_SERVICE == ServiceType.DEEPSEEK:
-                        model = ChatDeepSeek(api_key=settings.DEEPSEEK_API_KEY, model_name=settings.DEEPSEEK_MODEL, temperature=0.7, tags=["image_query"])
+                        model = ChatDeepSeek(api_key=settings.DEEPSEEK_API_KEY, model_name=settings.DEEPSEEK_MODEL, temperature=0.7, tags=["image_query"], **langchain_rate_limit(deepseek_rate_limiter()))
                     else:
-                        model = ChatOllama(model=settings.OLLAMA_AGENT_MODEL, base_url=settings.OLLAMA_BASE_URL, temperature=0.7, tags=["image_query"])
+                        model = ChatOllama(model=settings.OLLAMA_AGENT_MODEL, base_url=settings.OLLAMA_BASE_URL, temperature=0.7, tags=["image_query"], **langchain_rate_limit(ollama_rate_limiter(settings.OLLAMA_AGENT_MODEL)))
                     # 使用专门的图片查询提示模板
                     system_prompt = GET_IMAGE_SYSTEM_PROMPT.format(
                         image_description=image_description
@@ -398,53 +398,8 @@ async def create_research_plan(
     """
     logger.info("------execute local knowledge base query------")
 
-    # 使用大模型生成查询/多跳、并行查询计划
-    if settings.AGENT_SERVICE == ServiceType.DEEPSEEK:
-        model = ChatDeepSeek(api_key=settings.DEEPSEEK_API_KEY, model_name=settings.DEEPSEEK_MODEL, temperature=0.7, tags=["research_plan"])
-    else:
-        model = ChatOllama(model=settings.OLLAMA_AGENT_MODEL, base_url=settings.OLLAMA_BASE_URL, temperature=0.7, tags=["research_plan"])
-    
-    # 初始化必要参数
-    # 1. Neo4j图数据库连接 - 使用配置中的连接信息
-    try:
-        neo4j_graph = get_neo4j_graph()
-        logger.info("success to get Neo4j graph database connection")
-    except Exception as e:
-        logger.error(f"failed to get Neo4j graph database connection: {e}")
-
-    # 2. 创建自定义检索器实例，根据 Graph Schema 创建 Cypher 示例，用来引导大模型生成正确的Cypher 查询语句
-    cypher_retriever = NorthwindCypherRetriever()
-
-    # step 3. 定义工具模式列表    
-    from app.lg_agent.kg_sub_graph.kg_tools_list import cypher_query, predefined_cypher, microsoft_graphrag_query
-    tool_schemas: List[type[BaseModel]] = [cypher_query, predefined_cypher, microsoft_graphrag_query]
-
-    # 3. 预定义的Cypher查询 - 为电商场景定义有用的查询
-    from app.lg_agent.kg_sub_graph.agentic_rag_agents.components.predefined_cypher.cypher_dict import predefined_cypher_dict
-
-    # 定义电商经营范围
-    scope_description = """
-    个人电商经营范围：智能家居产品，包括但不限于：
-    - 智能照明（灯泡、灯带、开关）
-    - 智能安防（摄像头、门锁、传感器）
-    - 智能控制（温控器、遥控器、集线器）
-    - 智能音箱（语音助手、音响）
-    - 智能厨电（电饭煲、冰箱、洗碗机）
-    - 智能清洁（扫地机器人、洗衣机）
-    
-    不包含：服装、鞋类、体育用品、化妆品、食品等非智能家居产品。
-    """
-
-    # 创建多工具工作流
-    multi_tool_workflow = create_multi_tool_workflow(
-        llm=model,
-        graph=neo4j_graph,
-        tool_schemas=tool_schemas,
-        predefined_cypher_dict=predefined_cypher_dict,
-        cypher_example_retriever=cypher_retriever,
-        scope_description=scope_description,
-        llm_cypher_validation=True,
-    )
+    # 多工具工作流(模型、Neo4j连接、Cypher示例检索器)只在第一次使用时创建，之后所有请求复用
+    multi_tool_workflow = await asyncio.to_thread(get_multi_tool_workflow)
     
     # return multi_tool_workflow
     # 准备输入状态
@@ -475,9 +430,9 @@ async def check_hallucinations(
         dict[str, Router]: A dictionary containing the 'router' key with the classification result (classification type and logic).
     """
     if settings.AGENT_SERVICE == ServiceType.DEEPSEEK:
-        model = ChatDeepSeek(api_key=settings.DEEPSEEK_API_KEY, model_name=settings.DEEPSEEK_MODEL, temperature=0.7, tags=["hallucinations"])
+        model = ChatDeepSeek(api_key=settings.DEEPSEEK_API_KEY, model_name=settings.DEEPSEEK_MODEL, temperature=0.7, tags=["hallucinations"], **langchain_rate_limit(deepseek_rate_limiter()))
     else:
-        model = ChatOllama(model=settings.OLLAMA_AGENT_MODEL, base_url=settings.OLLAMA_BASE_URL, temperature=0.7, tags=["hallucinations"])
+        model = ChatOllama(model=settings.OLLAMA_AGENT_MODEL, base_url=settings.OLLAMA_BASE_URL, temperature=0.7, tags=["hallucinations"], **langchain_rate_limit(ollama_rate_limiter(settings.OLLAMA_AGENT_MODEL)))
     
     system_prompt = CHECK_HALLUCINATIONS.format(
         documents=state.documents,
@@ -495,9 +450,9 @@ async def check_hallucinations(
     return {"hallucination": response} 
 
 
-# 定义持久化存储，也可以使用SQLiteSaver()、PostgresSaver()等
+# 定义持久化存储，由 LANGGRAPH_CHECKPOINTER 配置选择 memory / sqlite / mysql
 # LangGraph官方地址：https://langchain-ai.github.io/langgraph/how-tos/persistence/
-checkpointer = MemorySaver()
+checkpointer = create_checkpointer()
 
 # 定义状态图
 builder = StateGraph(AgentState, input=InputState)
@@ -1,6 +1,7 @@
 from app.models.user import User
 from app.models.conversation import Conversation
 from app.models.message import Message
+from app.models.indexing_job import IndexingJob
 
 # 导出所有模型类
-__all__ = ["User", "Conversation", "Message"] 
\ No newline at end of file
+__all__ = ["User", "Conversation", "Message", "IndexingJob"] 
\ No newline at end of file
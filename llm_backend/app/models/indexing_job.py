@@ -0,0 +1,51 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, UniqueConstraint, func
+from app.core.database import Base
+
+
+class IndexingJobStatus:
+    PENDING = "pending"    # 等待执行
+    RUNNING = "running"    # 正在构建索引
+    SUCCESS = "success"    # 索引构建完成
+    ERROR = "error"        # 索引构建失败，重新上传同一文件会重新排队
+
+
+class IndexingJob(Base):
+    """后台索引任务，同一用户相同内容的文件只建立一个任务"""
+    __tablename__ = "indexing_jobs"
+    __table_args__ = (
+        UniqueConstraint("user_id", "file_hash", name="uq_indexing_jobs_user_file_hash"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False, index=True)
+    file_name = Column(String(255), nullable=False)
+    file_path = Column(String(512), nullable=False)
+    file_hash = Column(String(64), nullable=False)  # 文件内容的 SHA-256
+    status = Column(String(20), nullable=False, default=IndexingJobStatus.PENDING, index=True)
+    progress = Column(String(100), nullable=True)  # 当前执行到的工作流
+    error = Column(Text, nullable=True)
+    result = Column(JSON, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    owner = Column(String(128), nullable=True)  # 领取任务的 worker，格式为 主机名:进程号:随机串
+    heartbeat_at = Column(DateTime, nullable=True)  # worker 最近一次续约的时间，超过租约时长视为 worker 已退出
+    created_at = Column(DateTime, server_default=func.now())
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "file_name": self.file_name,
+            "file_hash": self.file_hash,
+            "status": self.status,
+            "progress": self.progress,
+            "error": self.error,
+            "result": self.result,
+            "attempts": self.attempts,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
@@ -3,6 +3,7 @@ from openai import AsyncOpenAI
 from app.core.config import settings
 import json
 from app.core.logger import get_logger
+from app.core.llm_rate_limit import deepseek_rate_limiter, acquire_rate_limit, settle_usage, settle_completion
 from app.core.database import AsyncSessionLocal
 from app.models.conversation import Conversation, DialogueType
 from app.models.message import Message
@@ -21,6 +22,7 @@ class DeepseekService:
         )
         # 优先使用配置中的 DEEPSEEK_MODEL，其次使用传入的 model
         self.model = settings.DEEPSEEK_MODEL or model 
+        self.rate_limiter = deepseek_rate_limiter(self.model)
         self.cache = RedisSemanticCache(prefix="deepseek")
 
     async def _stream_cached_response(self, response: str, delay: float = 0.05) -> AsyncGenerator[str, None]:
@@ -61,6 +63,7 @@ class DeepseekService:
 
             # 缓存未命中,调用API
             full_response = []
+            reservation = await acquire_rate_limit(self.rate_limiter, messages)
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
@@ -77,6 +80,7 @@ class DeepseekService:
             
             # 完整响应
             complete_response = "".join(full_response)
+            settle_completion(reservation, complete_response)
             
             # 更新缓存
             await cache.update(messages, complete_response)
@@ -96,11 +100,13 @@ class DeepseekService:
     async def generate(self, messages: List[Dict]) -> str:
         """非流式生成回复"""
         try:
+            reservation = await acquire_rate_limit(self.rate_limiter, messages)
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=messages,
                 stream=False
             )
+            settle_usage(reservation, response)
             return response.choices[0].message.content
         except Exception as e:
             print(f"Generation error: {str(e)}")
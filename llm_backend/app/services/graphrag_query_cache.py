@@ -0,0 +1,126 @@
+from typing import Any, Dict, Optional, Set, Tuple
+import hashlib
+import json
+import re
+import pandas as pd
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.services.redis_semantic_cache import RedisSemanticCache
+
+logger = get_logger(service="graphrag_query_cache")
+
+# 问句末尾不影响语义的标点
+_TRAILING_PUNCTUATION = "?？!！.。,，;；~～ "
+
+
+def normalize_query(query: str) -> str:
+    """归一化查询文本: 合并空白、统一大小写并去掉末尾标点，作为精确匹配的键"""
+    query = re.sub(r"\s+", " ", query).strip().casefold()
+    return query.rstrip(_TRAILING_PUNCTUATION) or query
+
+
+def _dump_result(result: Dict[str, Any]) -> str:
+    """把查询结果序列化为 JSON，上下文中的 DataFrame 按行记录保存"""
+    context = result.get("context") or {}
+    if isinstance(context, dict):
+        context = {
+            name: {"records": value.to_dict(orient="records")}
+            if isinstance(value, pd.DataFrame)
+            else value
+            for name, value in context.items()
+        }
+    return json.dumps(
+        {"response": result.get("response"), "context": context},
+        ensure_ascii=False,
+        default=str,
+    )
+
+
+def _load_result(data: str) -> Dict[str, Any]:
+    """还原 _dump_result 保存的查询结果"""
+    result = json.loads(data)
+    context = result.get("context")
+    if isinstance(context, dict):
+        result["context"] = {
+            name: pd.DataFrame(value["records"])
+            if isinstance(value, dict) and set(value) == {"records"}
+            else value
+            for name, value in context.items()
+        }
+    return result
+
+
+class GraphRAGQueryCache:
+    """GraphRAG 查询结果缓存
+
+    先按归一化后的查询文本精确匹配，未命中时再按向量相似度匹配，
+    两层都存放在 Redis 语义缓存中。缓存前缀由索引输出版本、项目目录、查询类型、
+    社区级别和响应类型共同决定，索引重新构建后版本变化，旧结果自然不再命中。
+    """
+
+    # 每个项目当前的索引版本，以及该版本下已创建的缓存前缀
+    _active: Dict[str, Tuple[str, Set[str]]] = {}
+
+    def __init__(
+        self,
+        project_dir: str,
+        index_version: str,
+        query_type: str,
+        community_level: Optional[int],
+        response_type: str,
+        dynamic_community_selection: bool = False,
+    ):
+        key = "|".join([
+            project_dir,
+            index_version,
+            query_type.lower(),
+            str(community_level),
+            response_type,
+            str(dynamic_community_selection),
+        ])
+        self.prefix = f"graphrag:{hashlib.md5(key.encode()).hexdigest()}"
+        self._activate(project_dir, index_version)
+        self.cache = RedisSemanticCache(
+            prefix=self.prefix,
+            score_threshold=settings.GRAPHRAG_CACHE_THRESHOLD,
+            max_cache_size=settings.GRAPHRAG_CACHE_MAX_SIZE,
+        )
+
+    def _activate(self, project_dir: str, index_version: str):
+        """记录项目当前的索引版本，版本变化时释放旧版本缓存占用的进程内资源"""
+        version, prefixes = self._active.get(project_dir, (None, set()))
+        if version != index_version:
+            for prefix in prefixes:
+                RedisSemanticCache.release(prefix)
+            if version is not None:
+                logger.info(f"GraphRAG index changed, query cache reset for {project_dir}")
+            prefixes = set()
+            self._active[project_dir] = (index_version, prefixes)
+        prefixes.add(self.prefix)
+
+    async def lookup(self, query: str) -> Optional[Dict[str, Any]]:
+        """查找缓存的查询结果，返回包含 response 和 context 的字典"""
+        normalized = normalize_query(query)
+        if not normalized:
+            return None
+        cached = await self.cache.lookup_exact(normalized)
+        if cached is None:
+            cached = await self.cache.lookup([{"role": "user", "content": normalized}])
+        if cached is None:
+            return None
+        try:
+            return _load_result(cached)
+        except (ValueError, KeyError) as e:
+            logger.error(f"Error loading cached GraphRAG result: {str(e)}", exc_info=True)
+            return None
+
+    async def update(self, query: str, result: Dict[str, Any]):
+        """缓存查询结果，精确匹配和语义匹配共用一条记录"""
+        normalized = normalize_query(query)
+        if not normalized or not result.get("response"):
+            return
+        await self.cache.update(
+            [{"role": "user", "content": normalized}],
+            _dump_result(result),
+            expire=settings.GRAPHRAG_CACHE_EXPIRE,
+        )
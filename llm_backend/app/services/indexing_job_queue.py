@@ -0,0 +1,403 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set
+import asyncio
+import hashlib
+import json
+import os
+import socket
+import uuid
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, engine
+from app.core.logger import get_logger
+from app.models.indexing_job import IndexingJob, IndexingJobStatus
+from app.services.indexing_service import IndexingService
+
+logger = get_logger(service="indexing_job_queue")
+
+
+def compute_file_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    """分块计算文件内容的 SHA-256，用于识别重复上传"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class IndexingJobQueue:
+    """持久化在数据库中的后台索引任务队列
+
+    上传接口只负责登记任务，后台 worker 从 indexing_jobs 表中领取待执行的任务，
+    每次领取一批交给 IndexingService 批量构建索引，并把进度、结果和错误写回任务记录。
+
+    领取任务时记录 owner 和 heartbeat_at，执行期间定时续约。多个进程共用任务表时，
+    只有超过 INDEXING_JOB_LEASE 未续约的 running 任务(所属进程已退出)才会重新排队，
+    不会抢走其他存活进程正在构建的任务；结果和进度也只由当前 owner 写回。
+    """
+
+    def __init__(
+        self,
+        num_workers: int = None,
+        batch_size: int = None,
+        poll_interval: float = None,
+        lease: float = None
+    ):
+        self.num_workers = num_workers or settings.INDEXING_WORKERS
+        self.batch_size = batch_size or settings.INDEXING_BATCH_SIZE
+        self.poll_interval = poll_interval or settings.INDEXING_POLL_INTERVAL
+        self.lease = lease or settings.INDEXING_JOB_LEASE
+        # 区分不同主机、不同进程的 worker
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.indexing_service = IndexingService()
+
+        self._workers: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._progress_tasks: Set[asyncio.Task] = set()
+
+    async def start(self):
+        """创建任务表(如不存在)，恢复租约已过期的任务并启动 worker"""
+        if self._workers:
+            return
+        async with engine.begin() as conn:
+            await conn.run_sync(IndexingJob.__table__.create, checkfirst=True)
+
+        await self._requeue_expired_jobs()
+
+        self._wakeup = asyncio.Event()
+        self._workers = [
+            asyncio.create_task(self._worker(worker_id))
+            for worker_id in range(self.num_workers)
+        ]
+        logger.info(f"Indexing job queue started with {self.num_workers} workers")
+
+    async def stop(self):
+        """停止所有 worker，并把正在执行的任务交还队列，由之后启动的 worker 重新执行"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        # 主动交还本进程领取的任务，其他进程不必等待租约过期
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(IndexingJob)
+                .where(
+                    IndexingJob.owner == self.owner,
+                    IndexingJob.status == IndexingJobStatus.RUNNING
+                )
+                .values(status=IndexingJobStatus.PENDING, progress=None, owner=None, heartbeat_at=None)
+            )
+            await db.commit()
+
+    async def enqueue(self, user_id: int, file_path: str, file_name: str) -> Dict[str, Any]:
+        """登记一个索引任务
+
+        同一用户已上传过内容相同的文件时不会重复建立索引，直接返回已有任务；
+        已有任务失败时重新排队。
+        """
+        file_hash = await asyncio.to_thread(compute_file_hash, file_path)
+
+        async with AsyncSessionLocal() as db:
+            job = await self._get_job_by_hash(db, user_id, file_hash)
+            if job is None:
+                job = IndexingJob(
+                    user_id=user_id,
+                    file_name=file_name,
+                    file_path=file_path,
+                    file_hash=file_hash,
+                    status=IndexingJobStatus.PENDING
+                )
+                db.add(job)
+                try:
+                    await db.commit()
+                except IntegrityError:
+                    # 同一文件被并发上传，另一个请求已经登记了任务
+                    await db.rollback()
+                    job = await self._get_job_by_hash(db, user_id, file_hash)
+                    return {**job.to_dict(), "duplicate": True}
+                await db.refresh(job)
+                logger.info(f"Queued indexing job {job.id} for user {user_id}: {file_name}")
+                self._notify()
+                return {**job.to_dict(), "duplicate": False}
+
+            if job.status == IndexingJobStatus.ERROR:
+                job.status = IndexingJobStatus.PENDING
+                job.file_name = file_name
+                job.file_path = file_path
+                job.progress = None
+                job.error = None
+                await db.commit()
+                await db.refresh(job)
+                logger.info(f"Requeued failed indexing job {job.id} for user {user_id}: {file_name}")
+                self._notify()
+                return {**job.to_dict(), "duplicate": False}
+
+            logger.info(f"Skipped duplicate upload for user {user_id}: {file_name} (job {job.id})")
+            return {**job.to_dict(), "duplicate": True}
+
+    async def get_job(self, job_id: int, user_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """查询任务状态，指定 user_id 时只返回该用户的任务"""
+        async with AsyncSessionLocal() as db:
+            job = await db.get(IndexingJob, job_id)
+            if job is None or (user_id is not None and job.user_id != user_id):
+                return None
+            return job.to_dict()
+
+    async def list_jobs(self, user_id: int, limit: int = 50) -> List[Dict[str, Any]]:
+        """按创建时间倒序列出用户的任务"""
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(IndexingJob)
+                .where(IndexingJob.user_id == user_id)
+                .order_by(IndexingJob.id.desc())
+                .limit(limit)
+            )
+            return [job.to_dict() for job in result.scalars().all()]
+
+    @staticmethod
+    async def _get_job_by_hash(db, user_id: int, file_hash: str) -> Optional[IndexingJob]:
+        result = await db.execute(
+            select(IndexingJob).where(
+                IndexingJob.user_id == user_id,
+                IndexingJob.file_hash == file_hash
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def _requeue_expired_jobs(self):
+        """把租约已过期的 running 任务重新排队
+
+        仍在续约的任务属于其他存活的进程，不做处理。
+        """
+        expired_before = datetime.now() - timedelta(seconds=self.lease)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(IndexingJob)
+                .where(
+                    IndexingJob.status == IndexingJobStatus.RUNNING,
+                    or_(
+                        IndexingJob.heartbeat_at.is_(None),
+                        IndexingJob.heartbeat_at < expired_before
+                    )
+                )
+                .values(status=IndexingJobStatus.PENDING, progress=None, owner=None, heartbeat_at=None)
+            )
+            await db.commit()
+            if result.rowcount:
+                logger.info(f"Requeued {result.rowcount} indexing jobs with an expired lease")
+
+    async def _heartbeat(self, job_ids: List[int]):
+        """执行期间定时续约，直到任务结束时被取消"""
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(
+                        update(IndexingJob)
+                        .where(
+                            IndexingJob.id.in_(job_ids),
+                            IndexingJob.owner == self.owner,
+                            IndexingJob.status == IndexingJobStatus.RUNNING
+                        )
+                        .values(heartbeat_at=datetime.now())
+                    )
+                    await db.commit()
+            except Exception as e:
+                logger.error(f"Error renewing lease of indexing jobs {job_ids}: {str(e)}")
+
+    def _notify(self):
+        """唤醒等待中的 worker，不必等到下一次轮询"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _claim_jobs(self) -> List[IndexingJob]:
+        """领取一批待执行的任务
+
+        SKIP LOCKED 让多个 worker 跳过彼此锁定的行，
+        再用带状态条件的 UPDATE 认领并写入 owner，不支持行锁的数据库上也不会重复领取。
+
+        同一用户的索引写入同一个输出目录，不能由两个进程同时构建：
+        有存活 running 任务的用户不参与领取；认领提交后再检查一次，
+        其他存活进程同时认领了同一用户的任务时交还本次认领的任务，等下一轮再领取。
+        两个进程中后检查的一方一定能看到对方已提交的认领，所以不会同时构建。
+        进程内同一用户的批次由 IndexingService 的用户锁串行执行。
+        """
+        await self._requeue_expired_jobs()
+        live_after = datetime.now() - timedelta(seconds=self.lease)
+        async with AsyncSessionLocal() as db:
+            busy_users = (
+                select(IndexingJob.user_id)
+                .where(
+                    IndexingJob.status == IndexingJobStatus.RUNNING,
+                    IndexingJob.heartbeat_at >= live_after
+                )
+            )
+            result = await db.execute(
+                select(IndexingJob)
+                .where(
+                    IndexingJob.status == IndexingJobStatus.PENDING,
+                    IndexingJob.user_id.not_in(busy_users)
+                )
+                .order_by(IndexingJob.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            )
+            candidates = list(result.scalars().all())
+            now = datetime.now()
+            jobs = []
+            for job in candidates:
+                claimed = await db.execute(
+                    update(IndexingJob)
+                    .where(
+                        IndexingJob.id == job.id,
+                        IndexingJob.status == IndexingJobStatus.PENDING
+                    )
+                    .values(
+                        status=IndexingJobStatus.RUNNING,
+                        owner=self.owner,
+                        heartbeat_at=now,
+                        started_at=now,
+                        finished_at=None,
+                        attempts=IndexingJob.attempts + 1
+                    )
+                )
+                if claimed.rowcount:
+                    jobs.append(job)
+            await db.commit()
+            if not jobs:
+                return jobs
+
+            # 认领已提交，检查是否有其他存活进程同时认领了同一用户的任务
+            result = await db.execute(
+                select(IndexingJob.user_id)
+                .where(
+                    IndexingJob.user_id.in_({job.user_id for job in jobs}),
+                    IndexingJob.status == IndexingJobStatus.RUNNING,
+                    IndexingJob.owner != self.owner,
+                    IndexingJob.heartbeat_at >= live_after
+                )
+                .distinct()
+            )
+            contended = set(result.scalars().all())
+            if contended:
+                released = [job.id for job in jobs if job.user_id in contended]
+                await db.execute(
+                    update(IndexingJob)
+                    .where(
+                        IndexingJob.id.in_(released),
+                        IndexingJob.owner == self.owner,
+                        IndexingJob.status == IndexingJobStatus.RUNNING
+                    )
+                    .values(
+                        status=IndexingJobStatus.PENDING,
+                        owner=None,
+                        heartbeat_at=None,
+                        started_at=None,
+                        attempts=IndexingJob.attempts - 1
+                    )
+                )
+                await db.commit()
+                logger.info(
+                    f"Released indexing jobs {released}: users {sorted(contended)} "
+                    f"are being indexed by another process"
+                )
+                jobs = [job for job in jobs if job.user_id not in contended]
+            return jobs
+
+    async def _worker(self, worker_id: int):
+        while True:
+            try:
+                self._wakeup.clear()
+                jobs = await self._claim_jobs()
+                if not jobs:
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                logger.info(f"Worker {worker_id} claimed jobs {[job.id for job in jobs]}")
+                await self._run_jobs(jobs)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in indexing worker {worker_id}: {str(e)}", exc_info=True)
+                await asyncio.sleep(self.poll_interval)
+
+    async def _run_jobs(self, jobs: List[IndexingJob]):
+        """批量执行一组任务并写回结果"""
+        loop = asyncio.get_running_loop()
+        job_ids = {job.file_path: job.id for job in jobs}
+
+        def on_progress(file_path: str, status: str, detail: Optional[str]):
+            job_id = job_ids.get(file_path)
+            if job_id is not None and status in ("staged", "indexing"):
+                # GraphRAG 的回调可能来自工作线程，切回事件循环后再写数据库
+                loop.call_soon_threadsafe(self._schedule_progress, job_id, detail or status)
+
+        file_infos = [
+            {"path": job.file_path, "original_name": job.file_name, "user_id": job.user_id}
+            for job in jobs
+        ]
+        heartbeat = asyncio.create_task(self._heartbeat(list(job_ids.values())))
+        try:
+            results = await self.indexing_service.process_files(file_infos, on_progress)
+        except Exception as e:
+            logger.error(f"Indexing jobs {list(job_ids.values())} failed: {str(e)}", exc_info=True)
+            results = [{"status": "error", "error": str(e)} for _ in jobs]
+        finally:
+            heartbeat.cancel()
+
+        async with AsyncSessionLocal() as db:
+            now = datetime.now()
+            for job, result in zip(jobs, results):
+                failed = result.get("status") != "success"
+                # 租约过期后任务可能已被其他 worker 重新领取，只有仍是 owner 时才写回结果
+                await db.execute(
+                    update(IndexingJob)
+                    .where(IndexingJob.id == job.id, IndexingJob.owner == self.owner)
+                    .values(
+                        status=IndexingJobStatus.ERROR if failed else IndexingJobStatus.SUCCESS,
+                        progress=None,
+                        owner=None,
+                        heartbeat_at=None,
+                        error=str(result.get("error") or result.get("errors")) if failed else None,
+                        # 工作流错误是异常对象，转换为字符串后再存入 JSON 列
+                        result=json.loads(json.dumps(result, default=str)),
+                        finished_at=now
+                    )
+                )
+            await db.commit()
+
+    def _schedule_progress(self, job_id: int, progress: str):
+        task = asyncio.create_task(self._update_progress(job_id, progress))
+        self._progress_tasks.add(task)
+        task.add_done_callback(self._progress_tasks.discard)
+
+    async def _update_progress(self, job_id: int, progress: str):
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(
+                    update(IndexingJob)
+                    .where(
+                        IndexingJob.id == job_id,
+                        IndexingJob.owner == self.owner,
+                        IndexingJob.status == IndexingJobStatus.RUNNING
+                    )
+                    .values(progress=progress[:100], heartbeat_at=datetime.now())
+                )
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Error updating progress of indexing job {job_id}: {str(e)}")
+
+
+_indexing_job_queue: Optional[IndexingJobQueue] = None
+
+
+def get_indexing_job_queue() -> IndexingJobQueue:
+    """获取进程内共享的索引任务队列"""
+    global _indexing_job_queue
+    if _indexing_job_queue is None:
+        _indexing_job_queue = IndexingJobQueue()
+    return _indexing_job_queue
@@ -1,8 +1,10 @@
 import os
+import re
 import asyncio
+import hashlib
 import logging
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, List, Tuple
 import mimetypes
 import shutil
 import uuid
@@ -10,6 +12,8 @@ import uuid
 import graphrag.api as api
 from graphrag.config.load_config import load_config
 from graphrag.config.enums import IndexingMethod
+from graphrag.config.models.graph_rag_config import GraphRagConfig
+from graphrag.callbacks.noop_workflow_callbacks import NoopWorkflowCallbacks
 from graphrag.logger.rich_progress import RichProgressLogger
 from graphrag.index.typing.pipeline_run_result import PipelineRunResult
 
@@ -18,7 +22,28 @@ from app.core.logger import get_logger
 
 logger = get_logger(service="indexing")
 
+# 进度回调: (原始文件路径, 状态, 详情)，状态为 staged / indexing / success / error
+ProgressCallback = Callable[[str, str, Optional[str]], None]
+
+
+class _BatchProgressCallbacks(NoopWorkflowCallbacks):
+    """把 GraphRAG 工作流的进度转发为批次中每个文件的进度"""
+
+    def __init__(self, file_paths: List[str], on_progress: ProgressCallback):
+        self.file_paths = file_paths
+        self.on_progress = on_progress
+
+    def workflow_start(self, name: str, instance: object) -> None:
+        for file_path in self.file_paths:
+            self.on_progress(file_path, 'indexing', name)
+
+
 class IndexingService:
+    # 同一用户的索引写入同一个输出目录，必须串行执行：进程内由用户锁保证，
+    # 多个进程之间由 IndexingJobQueue 领取任务时保证；不同用户之间由信号量限制并发数
+    _user_locks: Dict[int, asyncio.Lock] = {}
+    _index_semaphore: Optional[asyncio.Semaphore] = None
+
     def __init__(self):
         self.project_dir = settings.GRAPHRAG_PROJECT_DIR
         self.data_dir_name = settings.GRAPHRAG_DATA_DIR
@@ -27,6 +52,8 @@ class IndexingService:
 
         # 默认配置文件
         self.default_config = 'settings.yaml'
+        # 文件MIME类型 -> 配置文件名，未配置的类型使用默认配置
+        self.config_mapping: Dict[str, str] = {}
         
     def _get_file_type(self, file_path: str) -> str:
         """获取文件MIME类型"""
@@ -37,11 +64,9 @@ class IndexingService:
         """根据文件类型获取对应的配置文件"""
         return self.config_mapping.get(file_type, self.default_config)
     
-    def _check_existing_index(self, file_path: str, output_dir: str) -> bool:
-        """检查文件是否已经建立索引"""
-        file_name = Path(file_path).stem
-        index_path = os.path.join(output_dir, f"{file_name}_index")
-        return os.path.exists(index_path)
+    def _check_existing_index(self, output_dir: str) -> bool:
+        """检查输出目录中是否已有索引，已有时只对新增文档做增量更新"""
+        return os.path.exists(os.path.join(output_dir, "documents.parquet"))
     
     def _prepare_user_directories(self, user_id: int) -> tuple:
         """为用户准备输入和输出目录"""
@@ -59,8 +84,13 @@ class IndexingService:
         return user_input_dir, user_output_dir
     
     def _copy_file_to_input_dir(self, file_path: str, input_dir: str) -> str:
-        """将文件复制到用户的输入目录"""
-        file_name = os.path.basename(file_path)
+        """将文件复制到用户的输入目录
+
+        暂存文件名带上源路径的哈希前缀，同一批次中不同目录下的同名文件不会互相覆盖，
+        同一个源文件再次暂存时覆盖自己之前的副本。
+        """
+        path_hash = hashlib.sha1(os.path.abspath(file_path).encode("utf-8")).hexdigest()[:12]
+        file_name = f"{path_hash}_{os.path.basename(file_path)}"
         dest_path = os.path.join(input_dir, file_name)
         
         # 复制文件
@@ -69,109 +99,200 @@ class IndexingService:
         
         return dest_path
     
-    async def process_file(self, file_info: Dict[str, Any]) -> Dict[str, Any]:
-        """处理单个文件的索引构建"""
-        try:
+    def _get_config_path(self, config_file: str) -> str:
+        """获取配置文件路径，不存在时回退到默认配置"""
+        config_path = os.path.join(self.data_dir, config_file)
+        if not os.path.exists(config_path):
+            logger.warning(f"配置文件不存在: {config_path}，使用默认配置")
+            config_path = os.path.join(self.data_dir, self.default_config)
+        return config_path
+
+    def _load_index_config(
+        self,
+        config_file: str,
+        input_dir: str,
+        output_dir: str,
+        file_names: List[str]
+    ) -> GraphRagConfig:
+        """加载一个批次的索引配置，输入只匹配本批次暂存的文件"""
+        file_pattern = "|".join(re.escape(name) for name in file_names)
+        config_overrides = {
+            'input.base_dir': input_dir,
+            'output.base_dir': output_dir,
+            'input.file_pattern': f".*({file_pattern})$"
+        }
+        return load_config(
+            Path(self.data_dir),
+            Path(self._get_config_path(config_file)),
+            config_overrides
+        )
+
+    @classmethod
+    def _get_user_lock(cls, user_id: int) -> asyncio.Lock:
+        lock = cls._user_locks.get(user_id)
+        if lock is None:
+            lock = cls._user_locks[user_id] = asyncio.Lock()
+        return lock
+
+    @classmethod
+    def _get_index_semaphore(cls) -> asyncio.Semaphore:
+        if cls._index_semaphore is None:
+            cls._index_semaphore = asyncio.Semaphore(settings.GRAPHRAG_MAX_CONCURRENT_INDEX_JOBS)
+        return cls._index_semaphore
+
+    async def _index_batch(
+        self,
+        user_id: int,
+        config_file: str,
+        file_infos: List[Dict[str, Any]],
+        on_progress: Optional[ProgressCallback] = None
+    ) -> List[Dict[str, Any]]:
+        """暂存同一用户的一批文件，并对整个批次只运行一次(增量)索引构建"""
+        def report(file_path: str, status: str, detail: Optional[str] = None):
+            if on_progress:
+                on_progress(file_path, status, detail)
+
+        user_input_dir, user_output_dir = self._prepare_user_directories(user_id)
+        results: List[Optional[Dict[str, Any]]] = [None] * len(file_infos)
+        staged: List[Tuple[int, str]] = []
+
+        # 先把所有文件复制到用户输入目录，单个文件失败不影响批次中的其他文件
+        for position, file_info in enumerate(file_infos):
             file_path = file_info['path']
-            file_type = self._get_file_type(file_path)
-            user_id = file_info.get('user_id', 0)  # 获取用户ID，默认为0
-            
-            logger.info(f"开始处理文件: {file_path}, 类型: {file_type}, 用户ID: {user_id}")
-            
-            # 准备用户目录
-            user_input_dir, user_output_dir = self._prepare_user_directories(user_id)
-            
-            # 复制文件到输入目录
-            input_file_path = self._copy_file_to_input_dir(file_path, user_input_dir)
-            
-            # 获取配置文件
-            config_file = self._get_config_file(file_type)
-            logger.info(f"使用配置文件: {config_file}")
-            
-            # 检查是否需要增量更新
-            is_update = self._check_existing_index(input_file_path, user_output_dir)
-            
-            # 准备配置
-            config_path = os.path.join(self.data_dir, config_file)
-            if not os.path.exists(config_path):
-                logger.warning(f"配置文件不存在: {config_path}，使用默认配置")
-                config_path = os.path.join(self.data_dir, self.default_config)
-            
-            # 设置配置覆盖
-            config_overrides = {
-                'input.base_dir': user_input_dir,
-                'output.base_dir': user_output_dir,
-                # 更新文件匹配模式以匹配文件名
-                'input.file_pattern': f".*{os.path.basename(input_file_path)}$$"
-            }
-            
-            # 加载配置
-            graphrag_config = load_config(
-                Path(self.data_dir),
-                Path(config_path),
-                config_overrides
-            )
-            
-            # 创建进度记录器
-            progress_logger = RichProgressLogger(prefix="graphrag-index")
-            
-            logger.info(f"开始{'增量更新' if is_update else '构建'}索引: {input_file_path}")
-            logger.info(f"输入目录: {user_input_dir}")
-            logger.info(f"输出目录: {user_output_dir}")
-            
-            # 执行索引构建
-            index_result = await api.build_index(
-                config=graphrag_config,
-                method=IndexingMethod.Standard,
-                is_update_run=is_update,
-                memory_profile=False,
-                progress_logger=progress_logger
-            )
-            
-            # 处理结果
+            try:
+                input_file_path = await asyncio.to_thread(
+                    self._copy_file_to_input_dir, file_path, user_input_dir
+                )
+                staged.append((position, input_file_path))
+                report(file_path, 'staged')
+            except Exception as e:
+                logger.error(f"暂存文件失败: {file_path}, {str(e)}", exc_info=True)
+                results[position] = {'file_path': file_path, 'status': 'error', 'error': str(e)}
+                report(file_path, 'error', str(e))
+
+        if not staged:
+            return results
+
+        staged_paths = [file_infos[position]['path'] for position, _ in staged]
+        is_update = False
+        errors = None
+        try:
+            # 同一用户的批次串行执行，不同用户的批次在并发上限内同时执行
+            async with self._get_user_lock(user_id), self._get_index_semaphore():
+                is_update = self._check_existing_index(user_output_dir)
+                graphrag_config = self._load_index_config(
+                    config_file,
+                    user_input_dir,
+                    user_output_dir,
+                    [os.path.basename(path) for _, path in staged]
+                )
+
+                logger.info(
+                    f"开始{'增量更新' if is_update else '构建'}索引: 用户ID {user_id}, "
+                    f"{len(staged)} 个文件, 配置文件 {config_file}"
+                )
+                logger.info(f"输入目录: {user_input_dir}")
+                logger.info(f"输出目录: {user_output_dir}")
+
+                index_result = await api.build_index(
+                    config=graphrag_config,
+                    method=IndexingMethod.Standard,
+                    is_update_run=is_update,
+                    memory_profile=False,
+                    callbacks=[_BatchProgressCallbacks(staged_paths, on_progress)] if on_progress else None,
+                    progress_logger=RichProgressLogger(prefix="graphrag-index")
+                )
+
+            # 检查是否有错误
+            for workflow_result in index_result:
+                if workflow_result.errors:
+                    errors = workflow_result.errors
+                    logger.error(f"索引构建失败: {workflow_result.errors}")
+        except Exception as e:
+            logger.error(f"索引构建时发生错误: {str(e)}", exc_info=True)
+            for position, _ in staged:
+                file_path = file_infos[position]['path']
+                results[position] = {'file_path': file_path, 'status': 'error', 'error': str(e)}
+                report(file_path, 'error', str(e))
+            return results
+
+        for position, input_file_path in staged:
+            file_path = file_infos[position]['path']
             result_info = {
                 'original_file_path': file_path,
                 'input_file_path': input_file_path,
-                'file_type': file_type,
+                'file_type': self._get_file_type(file_path),
                 'config_used': config_file,
                 'is_update': is_update,
                 'status': 'success',
                 'user_id': user_id,
                 'input_dir': user_input_dir,
-                'output_dir': user_output_dir
-            }
-            
-            # 检查是否有错误
-            for workflow_result in index_result:
-                if workflow_result.errors:
-                    result_info['status'] = 'error'
-                    result_info['errors'] = workflow_result.errors
-                    logger.error(f"索引构建失败: {workflow_result.errors}")
-            
-            return result_info
-            
-        except Exception as e:
-            logger.error(f"处理文件时发生错误: {str(e)}", exc_info=True)
-            return {
-                'file_path': file_path,
-                'status': 'error',
-                'error': str(e)
+                'output_dir': user_output_dir,
+                'batch_size': len(staged)
             }
+            if errors:
+                result_info['status'] = 'error'
+                result_info['errors'] = errors
+            results[position] = result_info
+            report(file_path, result_info['status'], str(errors) if errors else None)
+        return results
+
+    async def process_files(
+        self,
+        file_infos: List[Dict[str, Any]],
+        on_progress: Optional[ProgressCallback] = None
+    ) -> List[Dict[str, Any]]:
+        """批量处理多个文件的索引构建
+
+        按用户和配置文件分组，每组文件暂存后只运行一次索引构建，
+        不同组并发执行(受 GRAPHRAG_MAX_CONCURRENT_INDEX_JOBS 限制)。
+        返回结果与 file_infos 一一对应。
+        """
+        groups: Dict[Tuple[int, str], List[int]] = {}
+        for position, file_info in enumerate(file_infos):
+            user_id = file_info.get('user_id', 0)  # 获取用户ID，默认为0
+            config_file = self._get_config_file(self._get_file_type(file_info['path']))
+            groups.setdefault((user_id, config_file), []).append(position)
+
+        group_results = await asyncio.gather(*[
+            self._index_batch(
+                user_id,
+                config_file,
+                [file_infos[position] for position in positions],
+                on_progress
+            )
+            for (user_id, config_file), positions in groups.items()
+        ])
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(file_infos)
+        for positions, batch_results in zip(groups.values(), group_results):
+            for position, result in zip(positions, batch_results):
+                results[position] = result
+        return results
+
+    async def process_file(self, file_info: Dict[str, Any]) -> Dict[str, Any]:
+        """处理单个文件的索引构建"""
+        logger.info(f"开始处理文件: {file_info['path']}, 用户ID: {file_info.get('user_id', 0)}")
+        return (await self.process_files([file_info]))[0]
     
-    async def process_directory(self, directory_path: str, user_id: int = 0) -> Dict[str, Any]:
-        """处理整个目录的索引构建"""
+    async def process_directory(
+        self,
+        directory_path: str,
+        user_id: int = 0,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """处理整个目录的索引构建，目录中的文件作为一个批次只构建一次索引"""
         try:
-            results = []
+            file_infos = []
             for root, _, files in os.walk(directory_path):
                 for file in files:
-                    file_path = os.path.join(root, file)
-                    file_info = {
-                        'path': file_path,
+                    file_infos.append({
+                        'path': os.path.join(root, file),
                         'original_name': file,
                         'user_id': user_id
-                    }
-                    result = await self.process_file(file_info)
-                    results.append(result)
+                    })
+
+            results = await self.process_files(file_infos, on_progress)
             
             return {
                 'status': 'success',
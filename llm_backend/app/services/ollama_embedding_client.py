@@ -0,0 +1,225 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+import asyncio
+import hashlib
+import threading
+import aiohttp
+import numpy as np
+import requests
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(service="ollama_embedding")
+
+
+class EmbeddingLRUCache:
+    """按 (模型, 文本哈希) 缓存向量的 LRU，线程安全"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._items: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, text: str) -> Tuple[str, str]:
+        return model, hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def get(self, key: Tuple[str, str]) -> Optional[np.ndarray]:
+        with self._lock:
+            vector = self._items.get(key)
+            if vector is not None:
+                self._items.move_to_end(key)
+            return vector
+
+    def put(self, key: Tuple[str, str], vector: np.ndarray):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._items[key] = vector
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class OllamaEmbeddingClient:
+    """共享的 Ollama 向量化客户端
+
+    - 复用一个 aiohttp 会话(连接池)，不再每次请求新建连接
+    - 并发的单条请求会在很短的时间窗口内合并为一次 `input: [...]` 批量调用
+    - 相同文本的并发请求只发送一次，结果写入 LRU 缓存供后续复用
+    """
+
+    def __init__(
+        self,
+        base_url: str = None,
+        model_name: str = None,
+        cache_size: int = None,
+        max_batch_size: int = None,
+        batch_wait_ms: float = None,
+        max_connections: int = 10,
+        timeout: float = 60
+    ):
+        self.base_url = (base_url or settings.OLLAMA_BASE_URL).rstrip('/')
+        self.model_name = model_name or settings.OLLAMA_EMBEDDING_MODEL
+        self.api_url = f"{self.base_url}/api/embed"
+        self.max_batch_size = max_batch_size or settings.EMBEDDING_BATCH_SIZE
+        self.batch_wait = (batch_wait_ms if batch_wait_ms is not None else settings.EMBEDDING_BATCH_WAIT_MS) / 1000
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.cache = EmbeddingLRUCache(cache_size if cache_size is not None else settings.EMBEDDING_CACHE_SIZE)
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._sync_session: Optional[requests.Session] = None
+        # 等待合并发送的请求: (模型, 文本, 缓存键, future)
+        self._pending: List[Tuple[str, str, Tuple[str, str], asyncio.Future]] = []
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # 正在发送的批量请求，保留引用以免任务在完成前被回收
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """获取持久的 aiohttp 会话"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def _post(self, model: str, texts: List[str]) -> List[np.ndarray]:
+        """调用 Ollama embed API，一次请求处理多条文本"""
+        session = self._get_session()
+        async with session.post(self.api_url, json={"model": model, "input": texts}) as response:
+            response.raise_for_status()
+            result = await response.json()
+        # Ollama embed API 返回格式为 {"embeddings": [[...], ...]}
+        return [np.asarray(vector, dtype=np.float32) for vector in result["embeddings"]]
+
+    async def embed(self, text: str, model: str = None) -> np.ndarray:
+        """获取单条文本的向量，并发调用会被合并为批量请求"""
+        model = model or self.model_name
+        key = self.cache.make_key(model, text)
+        vector = self.cache.get(key)
+        if vector is not None:
+            return vector
+
+        future = self._inflight.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._inflight[key] = future
+            self._pending.append((model, text, key, future))
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.batch_wait, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self):
+        """把当前等待中的请求按模型分组后发送"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        groups: Dict[str, List[Tuple[str, Tuple[str, str], asyncio.Future]]] = {}
+        for model, text, key, future in pending:
+            groups.setdefault(model, []).append((text, key, future))
+        for model, items in groups.items():
+            task = asyncio.create_task(self._send_batch(model, items))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _send_batch(self, model: str, items: List[Tuple[str, Tuple[str, str], asyncio.Future]]):
+        try:
+            vectors = await self._post(model, [text for text, _, _ in items])
+            for (_, key, future), vector in zip(items, vectors):
+                self.cache.put(key, vector)
+                if not future.done():
+                    future.set_result(vector)
+        except Exception as e:
+            logger.error(f"Error getting Ollama embeddings: {str(e)}", exc_info=True)
+            for _, _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            for _, key, _ in items:
+                self._inflight.pop(key, None)
+
+    async def embed_batch(self, texts: List[str], model: str = None) -> List[np.ndarray]:
+        """批量获取向量，只请求缓存中没有的文本"""
+        model = model or self.model_name
+        results: List[Optional[np.ndarray]] = [self.cache.get(self.cache.make_key(model, text)) for text in texts]
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, results) if vector is None))
+        fetched: Dict[str, np.ndarray] = {}
+        for start in range(0, len(missing), self.max_batch_size):
+            batch = missing[start:start + self.max_batch_size]
+            fetched.update(zip(batch, await self._post(model, batch)))
+        return self._merge_results(model, texts, results, fetched)
+
+    def embed_batch_sync(self, texts: List[str], model: str = None) -> List[np.ndarray]:
+        """同步版本的批量向量化，供无法使用 await 的调用方使用，同样复用连接和缓存"""
+        model = model or self.model_name
+        results: List[Optional[np.ndarray]] = [self.cache.get(self.cache.make_key(model, text)) for text in texts]
+        missing = list(dict.fromkeys(text for text, vector in zip(texts, results) if vector is None))
+        if missing and self._sync_session is None:
+            self._sync_session = requests.Session()
+        fetched: Dict[str, np.ndarray] = {}
+        for start in range(0, len(missing), self.max_batch_size):
+            batch = missing[start:start + self.max_batch_size]
+            response = self._sync_session.post(
+                self.api_url, json={"model": model, "input": batch}, timeout=self.timeout
+            )
+            response.raise_for_status()
+            fetched.update(
+                (text, np.asarray(vector, dtype=np.float32))
+                for text, vector in zip(batch, response.json()["embeddings"])
+            )
+        return self._merge_results(model, texts, results, fetched)
+
+    def _merge_results(
+        self,
+        model: str,
+        texts: List[str],
+        cached: List[Optional[np.ndarray]],
+        fetched: Dict[str, np.ndarray]
+    ) -> List[np.ndarray]:
+        """合并缓存命中和新请求到的向量，并写入缓存"""
+        for text, vector in fetched.items():
+            self.cache.put(self.cache.make_key(model, text), vector)
+        return [
+            vector if vector is not None else fetched[text]
+            for text, vector in zip(texts, cached)
+        ]
+
+    async def close(self):
+        """等待正在发送的批量请求结束后关闭底层连接"""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._sync_session is not None:
+            self._sync_session.close()
+            self._sync_session = None
+
+
+_embedding_client: Optional[OllamaEmbeddingClient] = None
+
+
+def get_embedding_client() -> OllamaEmbeddingClient:
+    """获取进程内共享的向量化客户端"""
+    global _embedding_client
+    if _embedding_client is None:
+        _embedding_client = OllamaEmbeddingClient()
+    return _embedding_client
+
+
+async def close_embedding_client():
+    """关闭共享的向量化客户端，在应用退出时调用"""
+    global _embedding_client
+    if _embedding_client is not None:
+        await _embedding_client.close()
+        _embedding_client = None
@@ -3,6 +3,7 @@ import aiohttp
 import json
 from app.core.config import settings
 from app.core.logger import get_logger
+from app.core.llm_rate_limit import ollama_rate_limiter, acquire_rate_limit, settle_completion
 
 logger = get_logger(service="ollama")
 
@@ -27,6 +28,7 @@ class OllamaService:
             logger.info(f"Using model: {model}")
             
             full_response = []
+            reservation = await acquire_rate_limit(ollama_rate_limiter(model), messages)
             async with aiohttp.ClientSession() as session:
                 async with session.post(
                     f"{self.base_url}/api/chat",
@@ -53,9 +55,11 @@ class OllamaService:
                                 logger.error(f"JSON decode error: {str(e)}")
                                 continue
 
+            complete_response = "".join(full_response)
+            settle_completion(reservation, complete_response)
+
             # 如果有回调函数，调用它
             if on_complete:
-                complete_response = "".join(full_response)
                 await on_complete(user_id, conversation_id, messages, complete_response)
 
         except Exception as e:
@@ -67,6 +71,7 @@ class OllamaService:
     async def generate(self, messages: List[Dict]) -> str:
         """非流式生成回复"""
         try:
+            reservation = await acquire_rate_limit(ollama_rate_limiter(self.chat_model), messages)
             async with aiohttp.ClientSession() as session:
                 async with session.post(
                     f"{self.base_url}/api/chat",
@@ -81,6 +86,10 @@ class OllamaService:
                     }
                 ) as response:
                     result = await response.json()
+                    # Ollama 返回的是提示词和生成内容各自的 token 数
+                    used = result.get("prompt_eval_count", 0) + result.get("eval_count", 0)
+                    if used:
+                        reservation.settle(used)
                     return result["message"]["content"]
 
         except Exception as e:
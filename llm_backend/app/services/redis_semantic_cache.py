@@ -1,19 +1,37 @@
 from typing import Dict, List, Optional
-import redis
 import hashlib
 import numpy as np
-import json
 import time
-import aiohttp
 from app.core.config import settings
+from app.core.redis_client import get_async_redis
+from app.services.ollama_embedding_client import get_embedding_client
 from app.core.logger import get_logger
+from app.services.semantic_cache_index import (
+    SemanticVectorIndex,
+    create_vector_index,
+    normalize_vector,
+    vector_from_bytes,
+    vector_to_bytes,
+)
 import asyncio
 from datetime import datetime
 
 logger = get_logger(service="redis_cache")
 
 class RedisSemanticCache:
-    """基于语义的 Redis 缓存实现"""
+    """基于语义的 Redis 缓存实现
+
+    向量以 float32 二进制形式存放在每个前缀一个的 Redis Hash 中，
+    进程内为每个前缀维护一个向量索引，通过版本号与 Redis 保持同步，
+    查询时只需一次最近邻搜索，而不用逐个读取所有向量。
+    所有实例共享异步连接池，缓存项的访问时间记录在有序集合中用于 LRU 清理。
+    """
+
+    # 进程内共享的向量索引和对应的 Redis 版本号，按前缀区分
+    _indexes: Dict[str, SemanticVectorIndex] = {}
+    _index_versions: Dict[str, Optional[int]] = {}
+    # 每个前缀只运行一个自动清理任务
+    _cleanup_tasks: Dict[str, asyncio.Task] = {}
     
     def __init__(
         self,
@@ -23,62 +41,115 @@ class RedisSemanticCache:
         prefix: str = "cache",
         user_id: Optional[int] = None,  # 添加用户ID
         max_cache_size: int = 1000,  # 每个用户最大缓存条数
-        cleanup_interval: int = 3600  # 清理间隔(秒)
+        cleanup_interval: int = 3600,  # 清理间隔(秒)
+        index_type: str = None  # 向量索引类型: matrix 或 hnsw
     ):
-        self.redis = redis.from_url(redis_url or settings.REDIS_URL)
+        self.redis = get_async_redis(redis_url)
         self.model_name = model_name or settings.OLLAMA_EMBEDDING_MODEL
         self.score_threshold = score_threshold or settings.REDIS_CACHE_THRESHOLD
         self.prefix = f"{prefix}:{user_id}" if user_id else prefix
         self.max_cache_size = max_cache_size
         self.cleanup_interval = cleanup_interval
+        self.index_type = index_type or settings.REDIS_CACHE_INDEX_TYPE
         
-        # 启动自动清理任务
-        asyncio.create_task(self._auto_cleanup())
+        # 启动自动清理任务，同一前缀的多个实例共用一个
+        task = self._cleanup_tasks.get(self.prefix)
+        if task is None or task.done():
+            self._cleanup_tasks[self.prefix] = asyncio.create_task(self._auto_cleanup())
         
-    async def _get_ollama_embedding(self, text: str) -> List[float]:
-        """使用Ollama生成文本向量"""
+    @classmethod
+    def release(cls, prefix: str):
+        """停止前缀的自动清理任务并释放进程内索引，前缀不再使用时调用
+
+        Redis 中的数据不会立即删除，而是按过期时间自然清理。
+        """
+        task = cls._cleanup_tasks.pop(prefix, None)
+        if task is not None:
+            task.cancel()
+        cls._indexes.pop(prefix, None)
+        cls._index_versions.pop(prefix, None)
+
+    async def _get_ollama_embedding(self, text: str) -> np.ndarray:
+        """使用Ollama生成文本向量，通过共享客户端复用连接和向量缓存"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{settings.OLLAMA_BASE_URL}/api/embed",
-                    json={
-                        "model": self.model_name,
-                        "input": text  # 使用 input 而不是 prompt
-                    }
-                ) as response:
-                    result = await response.json()
-                    # Ollama embed API 返回格式为 {"embeddings": [[...], ...]}
-                    return result["embeddings"][0]  # 返回第一个向量
+            return await get_embedding_client().embed(text, model=self.model_name)
         except Exception as e:
             logger.error(f"Error getting Ollama embedding: {str(e)}", exc_info=True)
             raise
 
-    async def _get_embedding(self, text: str) -> List[float]:
+    async def _get_embedding(self, text: str) -> np.ndarray:
         """获取文本向量"""
         try:
             # 直接使用 ollama 的 embedding 接口
             embedding = await self._get_ollama_embedding(text)
-            if not embedding:
+            if embedding is None or len(embedding) == 0:
                 raise ValueError("Failed to get embedding")
             return embedding
         except Exception as e:
             logger.error(f"Error in get_embedding: {str(e)}", exc_info=True)
             raise
         
-    def _get_vector_key(self, message: str) -> str:
-        """生成向量存储的键名"""
-        message_hash = hashlib.md5(message.encode()).hexdigest()
-        return f"{self.prefix}:vec:{message_hash}"
-        
-    def _get_response_key(self, message: str) -> str:
+    def _get_hash_id(self, message: str) -> str:
+        """生成缓存项的哈希ID"""
+        return hashlib.md5(message.encode()).hexdigest()
+
+    def _get_vectors_key(self) -> str:
+        """存储当前前缀所有向量的 Hash 键名"""
+        return f"{self.prefix}:vecs"
+
+    def _get_version_key(self) -> str:
+        """向量集合版本号的键名，每次增删向量时递增"""
+        return f"{self.prefix}:vecs:version"
+
+    def _get_lru_key(self) -> str:
+        """按最后访问时间排序的有序集合键名，用于 LRU 清理"""
+        return f"{self.prefix}:lru"
+
+    def _get_response_key(self, hash_id: str) -> str:
         """生成响应存储的键名"""
-        message_hash = hashlib.md5(message.encode()).hexdigest()
-        return f"{self.prefix}:resp:{message_hash}"
+        return f"{self.prefix}:resp:{hash_id}"
         
-    def _get_metadata_key(self, message: str) -> str:
+    def _get_metadata_key(self, hash_id: str) -> str:
         """生成元数据存储的键名"""
-        message_hash = hashlib.md5(message.encode()).hexdigest()
-        return f"{self.prefix}:meta:{message_hash}"
+        return f"{self.prefix}:meta:{hash_id}"
+
+    def _get_index(self) -> SemanticVectorIndex:
+        """获取当前前缀的进程内向量索引"""
+        index = self._indexes.get(self.prefix)
+        if index is None:
+            index = create_vector_index(self.index_type)
+            self._indexes[self.prefix] = index
+            self._index_versions[self.prefix] = None
+        return index
+
+    async def _sync_index(self) -> SemanticVectorIndex:
+        """确保进程内索引与 Redis 中的向量集合一致
+
+        版本号未变化时只需一次 GET，变化时通过一次流水线同时读取版本号和全部向量重建索引。
+        """
+        index = self._get_index()
+        version = await self.redis.get(self._get_version_key())
+        version = int(version) if version is not None else 0
+        if self._index_versions.get(self.prefix) == version:
+            return index
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.get(self._get_version_key())
+            pipe.hgetall(self._get_vectors_key())
+            version, raw_vectors = await pipe.execute()
+        vectors = {
+            hash_id.decode('utf-8'): vector_from_bytes(data)
+            for hash_id, data in raw_vectors.items()
+        }
+        index.build(vectors)
+        self._index_versions[self.prefix] = int(version) if version is not None else 0
+        logger.info(f"Semantic cache index loaded for prefix {self.prefix}: {len(index)} vectors")
+        return index
+
+    def _record_version(self, previous_version: Optional[int], new_version: int):
+        """本地索引已同步修改后记录新版本号；若期间有其他进程写入，则留待下次查询时重建"""
+        if previous_version is not None and new_version == previous_version + 1:
+            self._index_versions[self.prefix] = new_version
 
     def _get_last_user_message(self, messages: List[Dict]) -> str:
         """获取最后一条用户消息"""
@@ -91,26 +162,24 @@ class RedisSemanticCache:
         """自动清理过期和超量的缓存"""
         while True:
             try:
-                # 获取当前用户的所有缓存键
-                pattern = f"{self.prefix}:meta:*"
-                all_keys = [key.decode('utf-8') for key in self.redis.keys(pattern)]  # 解码key
-                
-                if len(all_keys) > self.max_cache_size:
-                    # 按访问时间排序
-                    cache_items = []
-                    for key in all_keys:
-                        metadata = json.loads(self.redis.get(key.encode('utf-8')).decode('utf-8'))  # 编码key再获取
-                        cache_items.append((key, metadata.get("last_access", 0)))
-                    
-                    # 按最后访问时间排序
-                    cache_items.sort(key=lambda x: x[1])
-                    
-                    # 删除最旧的条目直到达到限制
-                    items_to_remove = len(all_keys) - self.max_cache_size
-                    for key, _ in cache_items[:items_to_remove]:
-                        hash_id = key.split(":")[-1]
-                        await self._remove_cache_item(hash_id)
-                        
+                # 超出上限时按最后访问时间删除最旧的条目
+                cache_size = await self.redis.zcard(self._get_lru_key())
+                if cache_size > self.max_cache_size:
+                    items_to_remove = cache_size - self.max_cache_size
+                    oldest = await self.redis.zrange(self._get_lru_key(), 0, items_to_remove - 1)
+                    await self._remove_cache_items([h.decode('utf-8') for h in oldest])
+
+                # 向量 Hash 中的字段没有单独的过期时间，分批扫描并清理响应已过期的向量
+                expired = []
+                async for batch in self._scan_vector_ids():
+                    async with self.redis.pipeline(transaction=False) as pipe:
+                        for hash_id in batch:
+                            pipe.exists(self._get_response_key(hash_id))
+                        exists = await pipe.execute()
+                    expired.extend(h for h, e in zip(batch, exists) if not e)
+                if expired:
+                    await self._remove_cache_items(expired)
+
                 logger.info(f"Cache cleanup completed for prefix {self.prefix}")
                 
             except Exception as e:
@@ -118,37 +187,70 @@ class RedisSemanticCache:
                 
             await asyncio.sleep(self.cleanup_interval)
 
+    async def _scan_vector_ids(self, batch_size: int = 500):
+        """用 HSCAN 分批遍历向量 Hash 中的哈希ID，不会像 KEYS 那样阻塞 Redis"""
+        cursor = 0
+        while True:
+            cursor, fields = await self.redis.hscan(
+                self._get_vectors_key(), cursor=cursor, count=batch_size
+            )
+            if fields:
+                yield [h.decode('utf-8') for h in fields]
+            if cursor == 0:
+                break
+
     async def _remove_cache_item(self, hash_id: str):
         """删除一个缓存项的所有相关键"""
+        await self._remove_cache_items([hash_id])
+
+    async def _remove_cache_items(self, hash_ids: List[str]):
+        """在一个事务中删除一批缓存项的所有相关键"""
+        if not hash_ids:
+            return
         try:
-            # 所有key都需要编码
-            self.redis.delete(
-                f"{self.prefix}:vec:{hash_id}".encode('utf-8'),
-                f"{self.prefix}:resp:{hash_id}".encode('utf-8'),
-                f"{self.prefix}:meta:{hash_id}".encode('utf-8')
-            )
+            previous_version = self._index_versions.get(self.prefix)
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.hdel(self._get_vectors_key(), *hash_ids)
+                pipe.zrem(self._get_lru_key(), *hash_ids)
+                pipe.delete(*[self._get_response_key(h) for h in hash_ids])
+                pipe.delete(*[self._get_metadata_key(h) for h in hash_ids])
+                pipe.incr(self._get_version_key())
+                new_version = (await pipe.execute())[-1]
+            index = self._get_index()
+            for hash_id in hash_ids:
+                index.remove(hash_id)
+            self._record_version(previous_version, new_version)
         except Exception as e:
-            logger.error(f"Error removing cache item: {str(e)}", exc_info=True)
+            logger.error(f"Error removing cache items: {str(e)}", exc_info=True)
 
-    async def _update_metadata(self, message: str):
-        """更新缓存项的元数据"""
+    async def _update_metadata(self, hash_id: str):
+        """更新缓存项的元数据和 LRU 访问时间，一次流水线完成，无需先读取"""
         try:
-            meta_key = self._get_metadata_key(message)
-            # 从Redis读取的是bytes,需要解码
-            current_meta = self.redis.get(meta_key)
-            if current_meta:
-                current_meta = json.loads(current_meta.decode('utf-8'))
-            else:
-                current_meta = {"access_count": 0}
-                
-            metadata = {
-                "last_access": datetime.now().timestamp(),
-                "access_count": current_meta["access_count"] + 1
-            }
-            self.redis.set(meta_key, json.dumps(metadata), ex=settings.REDIS_CACHE_EXPIRE)
+            now = datetime.now().timestamp()
+            meta_key = self._get_metadata_key(hash_id)
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.hset(meta_key, "last_access", now)
+                pipe.hincrby(meta_key, "access_count", 1)
+                pipe.expire(meta_key, settings.REDIS_CACHE_EXPIRE)
+                pipe.zadd(self._get_lru_key(), {hash_id: now})
+                await pipe.execute()
         except Exception as e:
             logger.error(f"Error updating metadata: {str(e)}", exc_info=True)
 
+    async def lookup_exact(self, message: str) -> Optional[str]:
+        """按原文精确查找缓存的响应，命中时不需要计算向量"""
+        try:
+            hash_id = self._get_hash_id(message)
+            cached_response = await self.redis.get(self._get_response_key(hash_id))
+            if not cached_response:
+                return None
+            await self._update_metadata(hash_id)
+            logger.info("Cache hit with exact match")
+            return cached_response.decode('utf-8')
+        except Exception as e:
+            logger.error(f"Error in exact lookup: {str(e)}", exc_info=True)
+            return None
+
     async def lookup(self, messages: List[Dict]) -> Optional[str]:
         """查找缓存的响应"""
         try:
@@ -156,34 +258,27 @@ class RedisSemanticCache:
             if not user_message:
                 return None
 
-            current_vector = await self._get_embedding(user_message)
+            current_vector = normalize_vector(await self._get_embedding(user_message))
             
-            # 获取当前用户的所有缓存向量
-            pattern = f"{self.prefix}:vec:*"
-            all_vectors = [key.decode('utf-8') for key in self.redis.keys(pattern)]  # 解码key
-            max_similarity = 0
-            most_similar_key = None
+            # 在进程内向量索引中查找最相似的缓存项
+            index = await self._sync_index()
+            matches = index.search(current_vector, k=1)
+            if not matches:
+                return None
+            hash_id, max_similarity = matches[0]
             
-            for vec_key in all_vectors:
-                cached_vector = json.loads(self.redis.get(vec_key.encode('utf-8')).decode('utf-8'))  # 编码key再获取
-                similarity = np.dot(current_vector, cached_vector) / (
-                    np.linalg.norm(current_vector) * np.linalg.norm(cached_vector)
-                )
+            if max_similarity >= self.score_threshold:
+                cached_response = await self.redis.get(self._get_response_key(hash_id))
                 
-                if similarity > max_similarity:
-                    max_similarity = similarity
-                    most_similar_key = vec_key
-            
-            if max_similarity >= self.score_threshold and most_similar_key:
-                hash_id = most_similar_key.split(":")[-1]
-                resp_key = f"{self.prefix}:resp:{hash_id}"
-                cached_response = self.redis.get(resp_key.encode('utf-8'))  # 编码key
+                if not cached_response:
+                    # 响应已过期，清理对应的向量
+                    await self._remove_cache_item(hash_id)
+                    return None
                 
-                if cached_response:
-                    # 更新访问元数据
-                    await self._update_metadata(user_message)
-                    logger.info(f"Cache hit with similarity: {max_similarity:.4f}")
-                    return cached_response.decode('utf-8')
+                # 更新访问元数据
+                await self._update_metadata(hash_id)
+                logger.info(f"Cache hit with similarity: {max_similarity:.4f}")
+                return cached_response.decode('utf-8')
                     
             return None
             
@@ -198,24 +293,39 @@ class RedisSemanticCache:
             if not user_message:
                 return
 
-            vector = await self._get_embedding(user_message)
+            vector = normalize_vector(await self._get_embedding(user_message))
             
-            vec_key = self._get_vector_key(user_message)
-            resp_key = self._get_response_key(user_message)
-            meta_key = self._get_metadata_key(user_message)
+            hash_id = self._get_hash_id(user_message)
+            resp_key = self._get_response_key(hash_id)
+            meta_key = self._get_metadata_key(hash_id)
             
             expire = expire or settings.REDIS_CACHE_EXPIRE
             
-            # 存储向量、响应和元数据 - 确保存储为字符串
-            self.redis.set(vec_key, json.dumps(vector), ex=expire)
-            self.redis.set(resp_key, response.encode('utf-8'), ex=expire)  # 编码为bytes
-            
+            now = datetime.now().timestamp()
             metadata = {
-                "created_at": datetime.now().timestamp(),
-                "last_access": datetime.now().timestamp(),
+                "created_at": now,
+                "last_access": now,
                 "access_count": 1
             }
-            self.redis.set(meta_key, json.dumps(metadata), ex=expire)
+            
+            # 向量、响应、元数据和 LRU 记录在一个事务中写入，并递增版本号
+            index = self._get_index()
+            previous_version = self._index_versions.get(self.prefix)
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.hset(self._get_vectors_key(), hash_id, vector_to_bytes(vector))
+                pipe.expire(self._get_vectors_key(), expire)
+                pipe.set(resp_key, response.encode('utf-8'), ex=expire)  # 编码为bytes
+                pipe.delete(meta_key)
+                pipe.hset(meta_key, mapping=metadata)
+                pipe.expire(meta_key, expire)
+                pipe.zadd(self._get_lru_key(), {hash_id: now})
+                pipe.expire(self._get_lru_key(), expire)
+                pipe.incr(self._get_version_key())
+                new_version = (await pipe.execute())[-1]
+            
+            if previous_version is not None:
+                index.add(hash_id, vector)
+                self._record_version(previous_version, new_version)
             
             logger.info(f"Cache updated for message: {user_message[:50]}...")
             
@@ -4,6 +4,7 @@ import asyncio
 from app.tools.search import SearchTool
 from openai import AsyncOpenAI
 from app.core.config import settings
+from app.core.llm_rate_limit import deepseek_rate_limiter, acquire_rate_limit, settle_usage, settle_completion
 from app.core.logger import get_logger
 from app.tools.definitions import SEARCH_TOOL, TOOL_DEFINITIONS
 from app.services.function_tools import ToolRegistry, FunctionTool
@@ -20,6 +21,7 @@ class SearchService:
             base_url=settings.DEEPSEEK_BASE_URL
         )
         self.model = settings.DEEPSEEK_MODEL
+        self.rate_limiter = deepseek_rate_limiter(self.model)
         self.search_tool = SearchTool()
         
         # 初始化工具注册中心
@@ -73,12 +75,14 @@ class SearchService:
 
             logger.info(f"Messages: {query}")
             
+            reservation = await acquire_rate_limit(self.rate_limiter, query)
             response = await self.client.chat.completions.create(
                 model=self.model,
                 messages=query,
                 tools=self.tool_registry.get_tools_definition(),
                 tool_choice="auto"  # 让模型自己决定是否使用工具
             )
+            settle_usage(reservation, response)
             
             logger.info(f"Model response: {response.choices[0]}")
             return response.choices[0]
@@ -169,17 +173,22 @@ class SearchService:
                             yield f"data: {json.dumps(search_data, ensure_ascii=False)}\n\n"
                             
                             # 使用新的消息上下文生成回复
+                            summary_messages = [
+                                {"role": "system", "content": context_prompt}
+                            ]
+                            reservation = await acquire_rate_limit(self.rate_limiter, summary_messages)
+                            summary = []
                             async for chunk in await self.client.chat.completions.create(
                                 model=self.model,
-                                messages=[
-                                    {"role": "system", "content": context_prompt}
-                                ],
+                                messages=summary_messages,
                                 stream=True
                             ):      
 
                                 if chunk.choices[0].delta.content:
+                                    summary.append(chunk.choices[0].delta.content)
                                     content = json.dumps(chunk.choices[0].delta.content, ensure_ascii=False)
                                     yield f"data: {content}\n\n"
+                            settle_completion(reservation, "".join(summary))
              
                     except Exception as e:
                         pass
@@ -192,6 +201,7 @@ class SearchService:
                 yield f"data: {json.dumps({'type': 'direct_answer'}, ensure_ascii=False)}\n\n"
                 
                 # 使用流式API重新生成回答
+                reservation = await acquire_rate_limit(self.rate_limiter, messages)
                 stream_response = await self.client.chat.completions.create(
                     model=self.model,
                     messages=messages,
@@ -209,6 +219,8 @@ class SearchService:
                             'content': content
                         }, ensure_ascii=False)}\n\n"
                 
+                settle_completion(reservation, "".join(full_response))
+                
                 # 如果需要保存对话
                 if on_complete and user_id is not None and conversation_id is not None:
                     complete_response = "".join(full_response)
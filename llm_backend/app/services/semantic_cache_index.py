@@ -0,0 +1,257 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.core.logger import get_logger
+
+logger = get_logger(service="semantic_cache_index")
+
+
+def normalize_vector(vector) -> np.ndarray:
+    """转换为归一化的 float32 向量，归一化后内积即余弦相似度"""
+    vec = np.asarray(vector, dtype=np.float32).reshape(-1)
+    norm = np.linalg.norm(vec)
+    if norm > 0:
+        vec = vec / norm
+    return vec
+
+
+def vector_to_bytes(vector: np.ndarray) -> bytes:
+    """将向量编码为紧凑的二进制格式(float32)"""
+    return np.asarray(vector, dtype=np.float32).tobytes()
+
+
+def vector_from_bytes(data: bytes) -> np.ndarray:
+    """从二进制数据还原 float32 向量"""
+    return np.frombuffer(data, dtype=np.float32)
+
+
+class SemanticVectorIndex(ABC):
+    """语义缓存的向量索引基类，key 为缓存项的哈希ID"""
+
+    def __init__(self):
+        self.dimension: Optional[int] = None
+
+    @abstractmethod
+    def add(self, key: str, vector: np.ndarray) -> None:
+        """添加或替换一个已归一化的向量"""
+
+    @abstractmethod
+    def remove(self, key: str) -> None:
+        """删除一个向量，不存在时忽略"""
+
+    @abstractmethod
+    def search(self, vector: np.ndarray, k: int = 1) -> List[Tuple[str, float]]:
+        """返回与查询向量最相似的 k 个 (key, 相似度)，按相似度降序"""
+
+    @abstractmethod
+    def reset(self) -> None:
+        """清空索引"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    def build(self, items: Dict[str, np.ndarray]) -> None:
+        """用一批向量重建索引"""
+        self.reset()
+        for key, vector in items.items():
+            self.add(key, vector)
+
+    def _check_dimension(self, vector: np.ndarray) -> bool:
+        if self.dimension is None:
+            self.dimension = vector.shape[0]
+        return vector.shape[0] == self.dimension
+
+
+class MatrixVectorIndex(SemanticVectorIndex):
+    """进程内的归一化 float32 矩阵，一次矩阵乘法完成精确最近邻搜索"""
+
+    def __init__(self, initial_capacity: int = 256):
+        super().__init__()
+        self._initial_capacity = initial_capacity
+        self._matrix: Optional[np.ndarray] = None
+        self._keys: List[str] = []
+        self._positions: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def reset(self) -> None:
+        self.dimension = None
+        self._matrix = None
+        self._keys = []
+        self._positions = {}
+
+    def build(self, items: Dict[str, np.ndarray]) -> None:
+        self.reset()
+        if not items:
+            return
+        keys = list(items.keys())
+        matrix = np.vstack([np.asarray(items[key], dtype=np.float32) for key in keys])
+        self.dimension = matrix.shape[1]
+        self._matrix = matrix
+        self._keys = keys
+        self._positions = {key: i for i, key in enumerate(keys)}
+
+    def add(self, key: str, vector: np.ndarray) -> None:
+        if not self._check_dimension(vector):
+            raise ValueError(
+                f"Vector dimension {vector.shape[0]} does not match index dimension {self.dimension}"
+            )
+        position = self._positions.get(key)
+        if position is not None:
+            self._matrix[position] = vector
+            return
+
+        size = len(self._keys)
+        if self._matrix is None:
+            self._matrix = np.empty((self._initial_capacity, self.dimension), dtype=np.float32)
+        elif size >= self._matrix.shape[0]:
+            # 容量翻倍，避免每次添加都复制整个矩阵
+            grown = np.empty((self._matrix.shape[0] * 2, self.dimension), dtype=np.float32)
+            grown[:size] = self._matrix[:size]
+            self._matrix = grown
+
+        self._matrix[size] = vector
+        self._keys.append(key)
+        self._positions[key] = size
+
+    def remove(self, key: str) -> None:
+        position = self._positions.pop(key, None)
+        if position is None:
+            return
+        # 用最后一行填补被删除的位置
+        last = len(self._keys) - 1
+        if position != last:
+            last_key = self._keys[last]
+            self._matrix[position] = self._matrix[last]
+            self._keys[position] = last_key
+            self._positions[last_key] = position
+        self._keys.pop()
+
+    def search(self, vector: np.ndarray, k: int = 1) -> List[Tuple[str, float]]:
+        size = len(self._keys)
+        if size == 0 or vector.shape[0] != self.dimension:
+            return []
+        scores = self._matrix[:size] @ vector
+        k = min(k, size)
+        if k == 1:
+            top = np.array([int(np.argmax(scores))])
+        else:
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+        return [(self._keys[i], float(scores[i])) for i in top]
+
+
+class HNSWVectorIndex(SemanticVectorIndex):
+    """基于 FAISS HNSW 的近似最近邻索引，适合单个前缀下缓存条目很多的场景
+
+    HNSW 不支持物理删除，删除的条目先记为墓碑，搜索时过滤，
+    墓碑过多时用剩余向量重建索引。
+    """
+
+    def __init__(self, m: int = 32, ef_construction: int = 200, ef_search: int = 64,
+                 rebuild_ratio: float = 0.3):
+        super().__init__()
+        import faiss  # 可选依赖，仅在使用 hnsw 索引时需要
+
+        self._faiss = faiss
+        self._m = m
+        self._ef_construction = ef_construction
+        self._ef_search = ef_search
+        self._rebuild_ratio = rebuild_ratio
+        self._index = None
+        self._labels: List[Optional[str]] = []
+        self._key_to_label: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._key_to_label)
+
+    def _create_index(self, dimension: int):
+        index = self._faiss.IndexHNSWFlat(dimension, self._m, self._faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = self._ef_construction
+        index.hnsw.efSearch = self._ef_search
+        return index
+
+    def reset(self) -> None:
+        self.dimension = None
+        self._index = None
+        self._labels = []
+        self._key_to_label = {}
+
+    def build(self, items: Dict[str, np.ndarray]) -> None:
+        self.reset()
+        if not items:
+            return
+        keys = list(items.keys())
+        matrix = np.vstack([np.asarray(items[key], dtype=np.float32) for key in keys])
+        self.dimension = matrix.shape[1]
+        self._index = self._create_index(self.dimension)
+        self._index.add(matrix)
+        self._labels = list(keys)
+        self._key_to_label = {key: i for i, key in enumerate(keys)}
+
+    def add(self, key: str, vector: np.ndarray) -> None:
+        if not self._check_dimension(vector):
+            raise ValueError(
+                f"Vector dimension {vector.shape[0]} does not match index dimension {self.dimension}"
+            )
+        if self._index is None:
+            self._index = self._create_index(self.dimension)
+        self.remove(key)
+        self._index.add(np.asarray(vector, dtype=np.float32).reshape(1, -1))
+        self._key_to_label[key] = len(self._labels)
+        self._labels.append(key)
+
+    def remove(self, key: str) -> None:
+        label = self._key_to_label.pop(key, None)
+        if label is None:
+            return
+        self._labels[label] = None
+        tombstones = len(self._labels) - len(self._key_to_label)
+        if tombstones > len(self._labels) * self._rebuild_ratio:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        live = {
+            key: self._index.reconstruct(label)
+            for key, label in self._key_to_label.items()
+        }
+        logger.info(f"Rebuilding HNSW index with {len(live)} live vectors")
+        dimension = self.dimension
+        self.build(live)
+        self.dimension = dimension
+
+    def search(self, vector: np.ndarray, k: int = 1) -> List[Tuple[str, float]]:
+        if not self._key_to_label or vector.shape[0] != self.dimension:
+            return []
+        # 多取一些结果以抵消墓碑
+        tombstones = len(self._labels) - len(self._key_to_label)
+        fetch = min(k + tombstones, len(self._labels))
+        scores, labels = self._index.search(
+            np.asarray(vector, dtype=np.float32).reshape(1, -1), fetch
+        )
+        results = []
+        for score, label in zip(scores[0], labels[0]):
+            if label < 0:
+                continue
+            key = self._labels[label]
+            if key is None:
+                continue
+            results.append((key, float(score)))
+            if len(results) >= k:
+                break
+        return results
+
+
+def create_vector_index(index_type: str = "matrix") -> SemanticVectorIndex:
+    """根据类型创建向量索引: matrix 或 hnsw"""
+    if index_type == "hnsw":
+        try:
+            return HNSWVectorIndex()
+        except ImportError:
+            logger.warning("faiss is not installed, falling back to matrix vector index")
+            return MatrixVectorIndex()
+    if index_type != "matrix":
+        logger.warning(f"Unknown vector index type {index_type}, using matrix vector index")
+    return MatrixVectorIndex()
@@ -0,0 +1,96 @@
+"""LangGraph 检查点存储的往返测试：SQLite(AsyncSqliteSaver) 和 SQLAlchemy 实现(在 aiosqlite 上运行)"""
+import asyncio
+from typing import TypedDict
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+from langgraph.types import Command, interrupt
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.lg_agent.checkpointer import SQLCheckpointSaver, SqliteCheckpointSaver
+
+
+class State(TypedDict):
+    value: str
+
+
+def _build_graph(checkpointer):
+    """父图中嵌套一个会中断等待人工输入的子图"""
+    def ask(state: State):
+        answer = interrupt(f"confirm {state['value']}")
+        return {"value": state["value"] + answer}
+
+    sub = StateGraph(State)
+    sub.add_node("ask", ask)
+    sub.add_edge(START, "ask")
+    sub.add_edge("ask", END)
+
+    builder = StateGraph(State)
+    builder.add_node("prepare", lambda state: {"value": state["value"] + "-prepared"})
+    builder.add_node("sub", sub.compile())
+    builder.add_edge(START, "prepare")
+    builder.add_edge("prepare", "sub")
+    builder.add_edge("sub", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def _create_saver(kind: str, tmp_path):
+    # 阈值设小，让较大的状态走压缩路径
+    if kind == "sqlite":
+        return SqliteCheckpointSaver(str(tmp_path / "checkpoints.db"), ttl=3600, compress_threshold=64)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'sql.db'}")
+    return SQLCheckpointSaver(engine, ttl=3600, compress_threshold=64)
+
+
+async def _roundtrip(saver):
+    await saver.start()
+    try:
+        graph = _build_graph(saver)
+        config = {"configurable": {"thread_id": "t1"}}
+
+        # 运行到子图中的中断为止
+        await graph.ainvoke({"value": "x" * 100}, config)
+
+        # 中断作为未完成任务的写入保存在检查点中
+        state = await graph.aget_state(config, subgraphs=True)
+        assert state.next == ("sub",)
+        assert state.tasks[0].interrupts[0].value == f"confirm {'x' * 100}-prepared"
+        assert state.tasks[0].state.next == ("ask",)
+        latest = await saver.aget_tuple(config)
+        assert any(channel == "__interrupt__" for _, channel, _ in latest.pending_writes)
+
+        # 子图有自己命名空间的检查点
+        tuples = [t async for t in saver.alist(config)]
+        namespaces = {t.config["configurable"]["checkpoint_ns"] for t in tuples}
+        assert "" in namespaces
+        assert any(ns.startswith("sub:") for ns in namespaces)
+
+        # 恢复执行
+        result = await graph.ainvoke(Command(resume="-ok"), config)
+        assert result["value"] == "x" * 100 + "-prepared-ok"
+        state = await graph.aget_state(config)
+        assert state.next == ()
+        assert state.values["value"].endswith("-ok")
+
+        # 按 checkpoint_id 读取历史检查点，并按 before/limit 列出
+        root = {"configurable": {"thread_id": "t1", "checkpoint_ns": ""}}
+        history = [t async for t in saver.alist(root)]
+        assert len(history) >= 3
+        oldest = await saver.aget_tuple(history[-1].config)
+        assert oldest.checkpoint["id"] == history[-1].checkpoint["id"]
+        before = [t async for t in saver.alist(root, before=history[0].config, limit=1)]
+        assert [t.checkpoint["id"] for t in before] == [history[1].checkpoint["id"]]
+
+        # 其他会话不受影响，闲置会话被清理
+        await graph.ainvoke({"value": "y"}, {"configurable": {"thread_id": "t2"}})
+        assert await saver.evict_idle_threads(ttl=3600) == 0
+        assert await saver.evict_idle_threads(ttl=0) == 2
+        assert await saver.aget_tuple(config) is None
+        assert [t async for t in saver.alist(config)] == []
+    finally:
+        await saver.stop()
+
+
+@pytest.mark.parametrize("kind", ["sqlite", "sql"])
+def test_checkpointer_roundtrip(kind, tmp_path):
+    asyncio.run(_roundtrip(_create_saver(kind, tmp_path)))
@@ -14,17 +14,24 @@ from app.core.middleware import LoggingMiddleware
 from app.core.config import settings
 from app.api import api_router
 from app.core.database import AsyncSessionLocal
+from app.core.redis_client import close_redis_pools
+from app.services.ollama_embedding_client import close_embedding_client
 from app.models.conversation import Conversation, DialogueType
 from app.models.message import Message
 from sqlalchemy import select
 from app.services.conversation_service import ConversationService
 import uuid
 import os
-from app.services.indexing_service import IndexingService
+from app.services.indexing_job_queue import get_indexing_job_queue
 import sys
 from app.lg_agent.lg_states import AgentState, InputState
 from app.lg_agent.utils import new_uuid
-from app.lg_agent.lg_builder import graph
+from app.lg_agent.lg_builder import graph, checkpointer
+from app.lg_agent.kg_sub_graph.kg_workflow import init_multi_tool_workflow
+from app.lg_agent.kg_sub_graph.kg_schema import get_schema_service
+from app.lg_agent.kg_sub_graph.agentic_rag_agents.components.text2cypher.validation.value_mapping import init_value_mapping_indexes
+from app.lg_agent.kg_sub_graph.kg_neo4j_conn import get_neo4j_graph, close_async_neo4j_driver
+from app.lg_agent.checkpointer import IdleThreadCleanup
 from langgraph.types import Command
 import json
 
@@ -87,6 +94,28 @@ class LangGraphResumeRequest(BaseModel):
     conversation_id: str
 
 
+@app.on_event("startup")
+async def startup_event():
+    """启动后台索引任务队列和 LangGraph 会话状态存储，预先编译知识库查询工作流，并定时刷新图谱结构"""
+    await get_indexing_job_queue().start()
+    if isinstance(checkpointer, IdleThreadCleanup):
+        await checkpointer.start()
+    await init_multi_tool_workflow()
+    await get_schema_service().start(get_neo4j_graph)
+    if settings.NEO4J_VALUE_MAPPING_INDEXES:
+        await init_value_mapping_indexes()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """停止后台索引任务和图谱结构刷新任务，关闭会话状态存储、共享的 Redis 连接池、向量化客户端和 Neo4j 异步驱动"""
+    await get_indexing_job_queue().stop()
+    await get_schema_service().stop()
+    if isinstance(checkpointer, IdleThreadCleanup):
+        await checkpointer.stop()
+    await close_redis_pools()
+    await close_embedding_client()
+    await close_async_neo4j_driver()
+
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
@@ -194,12 +223,15 @@ async def upload_file(
             "directory": str(second_level_dir)
         }
         
-        # 4. 处理文件索引
-        indexing_service = IndexingService()
-        index_result = await indexing_service.process_file(file_info)
+        # 4. 登记后台索引任务，通过 /api/indexing/jobs/{job_id} 查询进度
+        job = await get_indexing_job_queue().enqueue(
+            user_id=user_id,
+            file_path=file_info["path"],
+            file_name=file.filename
+        )
         
         # 合并结果
-        result = {**file_info, "index_result": index_result}
+        result = {**file_info, "job": job}
         
         return result
         
@@ -207,6 +239,23 @@ async def upload_file(
         logger.error(f"Upload failed for user {user_id}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/indexing/jobs/{job_id}")
+async def get_indexing_job(job_id: int, user_id: int):
+    """查询索引任务的状态、进度和错误信息"""
+    job = await get_indexing_job_queue().get_job(job_id, user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Indexing job not found")
+    return job
+
+@app.get("/api/indexing/jobs")
+async def list_indexing_jobs(user_id: int, limit: int = Query(50, ge=1, le=200)):
+    """列出用户最近的索引任务"""
+    try:
+        return await get_indexing_job_queue().list_jobs(user_id, limit)
+    except Exception as e:
+        logger.error(f"Error listing indexing jobs: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/chat-rag")
 async def rag_chat_endpoint(request: RAGChatRequest):
     """基于文档的问答接口"""
@@ -328,7 +377,7 @@ async def langgraph_query(
         try:
             # 检查是否有现有的会话状态
             if thread_id:
-                state_history = graph.get_state(thread_config)
+                state_history = await graph.aget_state(thread_config)
                 if state_history:
                     logger.info(f"Found existing conversation state for thread_id: {thread_id}")
         except Exception as e:
@@ -356,7 +405,7 @@ async def langgraph_query(
                         logger.debug(f"Tool call: {tool_data}")
                         
                 # 处理中断情况
-                state = graph.get_state(thread_config)
+                state = await graph.aget_state(thread_config)
                 if len(state) > 0 and len(state[-1]) > 0:
                     if len(state[-1][0].interrupts) > 0:
                         interrupt_json = json.dumps({"interruption": True, "conversation_id": thread_id})
@@ -385,7 +434,7 @@ async def langgraph_query(
                         logger.debug(f"Tool call: {tool_data}")
                         
                 # 处理中断情况
-                state = graph.get_state(thread_config)
+                state = await graph.aget_state(thread_config)
                 if len(state) > 0 and len(state[-1]) > 0:
                     if len(state[-1][0].interrupts) > 0:
                         interrupt_json = json.dumps({"interruption": True, "conversation_id": thread_id})
@@ -12,7 +12,7 @@ sys.path.append(str(ROOT_DIR))
 
 import asyncio
 from app.core.database import engine, Base
-from app.models import User, Conversation, Message
+from app.models import User, Conversation, Message, IndexingJob
 from app.core.logger import get_logger
 
 logger = get_logger(service="init_db")